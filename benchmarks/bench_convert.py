@@ -0,0 +1,78 @@
+"""
+MSG -> Markdown 일괄 변환 벤치마크 (순차 vs 프로세스 풀)
+
+합성 MSG 파일을 임시 디렉토리에 생성한 뒤 files/sec를 비교한다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_convert
+  python -m benchmarks.bench_convert --files 2000 --workers 8
+  python -m benchmarks.bench_convert --msg-dir ./data/msg_files
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from email_writer.config import Settings
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from tests.msg_factory import write_msg
+
+
+def make_corpus(directory: Path, count: int) -> Path:
+    """합성 MSG 파일 count개 생성"""
+    directory.mkdir(parents=True, exist_ok=True)
+    body = "\r\n".join(f"{i}번째 줄: 프로젝트 진행 상황을 공유드립니다." for i in range(40))
+    for i in range(count):
+        write_msg(
+            directory / f"email_{i:05d}.msg",
+            subject=f"RE: 주간 보고 {i}",
+            body=body,
+            attachments=i % 3,
+        )
+    return directory
+
+
+def run(msg_dir: Path, workers: int | None = None) -> dict:
+    """순차/병렬 변환을 각각 수행하고 처리량(files/sec)을 반환"""
+    settings = Settings(gemini_api_key="benchmark")
+    converter = MsgToMarkdownConverter(settings)
+    file_count = len(list(msg_dir.glob("*.msg")))
+
+    with tempfile.TemporaryDirectory() as out:
+        start = time.perf_counter()
+        converter.convert_batch_parallel(str(msg_dir), f"{out}/serial", workers=1)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        converter.convert_batch_parallel(str(msg_dir), f"{out}/parallel", workers=workers)
+        parallel = time.perf_counter() - start
+
+    return {
+        "files": file_count,
+        "serial_files_per_sec": file_count / serial,
+        "parallel_files_per_sec": file_count / parallel,
+        "speedup": serial / parallel,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MSG 변환 벤치마크")
+    parser.add_argument("--files", type=int, default=400, help="생성할 합성 MSG 파일 수")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="병렬 워커 수 (기본: CPU 코어 수)"
+    )
+    parser.add_argument("--msg-dir", default=None, help="합성 대신 사용할 실제 MSG 디렉토리")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        msg_dir = Path(args.msg_dir) if args.msg_dir else make_corpus(Path(tmp), args.files)
+        result = run(msg_dir, workers=args.workers if args.workers is not None else 0)
+
+    print(f"파일 수: {result['files']}")
+    print(f"순차: {result['serial_files_per_sec']:.1f} files/sec")
+    print(f"병렬: {result['parallel_files_per_sec']:.1f} files/sec")
+    print(f"속도 향상: {result['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+/api/generate-email 동시성 부하 테스트 (스텁 모델)
+
+Gemini 호출을 고정 지연의 스텁으로 대체하고, 기존 동기 엔드포인트
+(threadpool 실행)와 비동기 엔드포인트에 같은 수의 동시 요청을 보내 비교한다.
+실제 API를 호출하지 않는다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_generate_concurrency
+  python -m benchmarks.bench_generate_concurrency --requests 400 --latency 1.0 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("EMAIL_WRITER_GEMINI_API_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI
+
+from email_writer import server
+from email_writer.config import Settings
+from email_writer.core.generator import EmailGenerator
+from email_writer.models.request import GenerateEmailRequest
+from email_writer.models.response import GenerateEmailResponse
+
+
+class StubGeminiClient:
+    """고정 지연 후 응답하는 Gemini 스텁 (동기/비동기)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_with_file_search(self, prompt: str, metadata_filter: str | None = None) -> str:
+        time.sleep(self.latency)
+        return "스텁 응답"
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        await asyncio.sleep(self.latency)
+        return "스텁 응답"
+
+
+def build_generator(latency: float, concurrency: int) -> EmailGenerator:
+    settings = Settings(gemini_api_key="benchmark", generation_concurrency=concurrency)
+    generator = EmailGenerator(settings)
+    generator.gemini_client = StubGeminiClient(latency)
+    return generator
+
+
+def build_sync_app(generator: EmailGenerator) -> FastAPI:
+    """비교용: 기존 방식의 동기 엔드포인트"""
+    app = FastAPI()
+
+    @app.post("/api/generate-email", response_model=GenerateEmailResponse)
+    def generate_email(request: GenerateEmailRequest):
+        return GenerateEmailResponse(success=True, generated_text=generator.generate(request))
+
+    return app
+
+
+async def drive(app, requests: int) -> float:
+    """동시 요청 전송 후 전체 소요 시간(초) 반환"""
+    payload = {"full_body": "<p>원본 메일</p>", "selected_text": "일정 확인 요청"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post("/api/generate-email", json=payload) for _ in range(requests))
+        )
+        elapsed = time.perf_counter() - start
+    assert all(r.json()["success"] for r in responses)
+    return elapsed
+
+
+def run(requests: int = 200, latency: float = 0.5, concurrency: int = 200) -> dict:
+    """동기/비동기 엔드포인트 처리량(req/sec) 비교"""
+    generator = build_generator(latency, concurrency)
+
+    sync_elapsed = asyncio.run(drive(build_sync_app(generator), requests))
+
+    original = server.generator
+    server.generator = generator
+    try:
+        async_elapsed = asyncio.run(drive(server.app, requests))
+    finally:
+        server.generator = original
+
+    return {
+        "requests": requests,
+        "sync_req_per_sec": requests / sync_elapsed,
+        "async_req_per_sec": requests / async_elapsed,
+        "speedup": sync_elapsed / async_elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="생성 엔드포인트 동시성 부하 테스트")
+    parser.add_argument("--requests", type=int, default=200, help="동시 요청 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="스텁 모델 응답 지연 (초)")
+    parser.add_argument(
+        "--concurrency", type=int, default=200, help="generation_concurrency 설정값"
+    )
+    args = parser.parse_args()
+
+    result = run(args.requests, args.latency, args.concurrency)
+    print(f"동시 요청: {result['requests']}")
+    print(f"동기 (threadpool): {result['sync_req_per_sec']:.1f} req/sec")
+    print(f"비동기 (세마포어): {result['async_req_per_sec']:.1f} req/sec")
+    print(f"향상: {result['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
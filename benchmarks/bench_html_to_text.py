@@ -0,0 +1,79 @@
+"""
+HTML 본문 텍스트 추출 벤치마크 (BeautifulSoup 트리 vs 스트리밍 추출기)
+
+긴 인용 스레드와 Word 스타일이 포함된 수백 KB 크기의 Outlook 회신 본문으로 측정한다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_html_to_text
+  python -m benchmarks.bench_html_to_text --messages 200 --repeat 10
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from email_writer.core.html_text import html_to_text
+from tests.html_factory import outlook_html
+
+
+def _bs4_html_to_text(html: str) -> str:
+    """기존 구현 (BeautifulSoup)"""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "head"]):
+        tag.decompose()
+    text = soup.get_text(separator="\n")
+    lines = [line.strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def _time_ms(func, html: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(html)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(messages: int = 100, css_rules: int = 200, repeat: int = 5, max_chars: int = 8000) -> dict:
+    """본문 1건당 평균 추출 시간(ms) 비교"""
+    html = outlook_html(messages=messages, css_rules=css_rules)
+    assert html_to_text(html) == _bs4_html_to_text(html)
+
+    bs4_ms = _time_ms(_bs4_html_to_text, html, repeat)
+    full_ms = _time_ms(html_to_text, html, repeat)
+    limited_ms = _time_ms(lambda h: html_to_text(h, max_chars=max_chars), html, repeat)
+
+    return {
+        "html_kb": len(html.encode("utf-8")) / 1024,
+        "bs4_ms": bs4_ms,
+        "streaming_ms": full_ms,
+        "streaming_limited_ms": limited_ms,
+        "speedup": bs4_ms / full_ms,
+        "speedup_limited": bs4_ms / limited_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 텍스트 추출 벤치마크")
+    parser.add_argument("--messages", type=int, default=100, help="인용 스레드의 메일 수")
+    parser.add_argument("--css-rules", type=int, default=200, help="<head> 스타일 규칙 수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수")
+    parser.add_argument(
+        "--max-chars", type=int, default=8000, help="조기 종료 기준 글자 수 (max_context_length)"
+    )
+    args = parser.parse_args()
+
+    result = run(args.messages, args.css_rules, args.repeat, args.max_chars)
+
+    print(f"본문 크기: {result['html_kb']:.0f} KB")
+    print(f"BeautifulSoup:           {result['bs4_ms']:.1f} ms")
+    print(
+        f"스트리밍 (전체):         {result['streaming_ms']:.1f} ms ({result['speedup']:.1f}x)"
+    )
+    print(
+        f"스트리밍 (max_chars):    {result['streaming_limited_ms']:.1f} ms "
+        f"({result['speedup_limited']:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
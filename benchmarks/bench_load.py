@@ -0,0 +1,247 @@
+"""
+/api/generate-email 부하 테스트 (목표 요청률, 지연 백분위수)
+
+실행 중인 서버에 목표 요청률(req/sec)로 요청을 보내고(응답을 기다리지 않고 일정한
+간격으로 보내는 open-loop 방식) p50/p95/p99 지연 시간, 처리량, 오류율을 보고한다.
+요청마다 작성 요지를 달리해 응답 캐시/요청 병합 없이 모두 모델 호출까지 가게 한다.
+
+--spawn을 주면 가짜 Gemini 서버(benchmarks.fake_gemini)와 이 프로젝트 서버를 새 프로세스로
+띄우고 그 서버에 부하를 건다. 서버 설정(EMAIL_WRITER_GENERATION_CONCURRENCY,
+EMAIL_WRITER_GEMINI_TIMEOUT 등)은 환경변수로, 워커 수는 --server-workers로 바꿔 가며
+비교할 수 있다. 실제 API를 호출하지 않는다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_load --spawn --rate 20 --duration 30
+  python -m benchmarks.bench_load --spawn --rate 50 --latency-median 1.5 --rate-limit-rate 0.05
+  EMAIL_WRITER_GENERATION_CONCURRENCY=64 python -m benchmarks.bench_load --spawn --rate 80
+  python -m benchmarks.bench_load --url http://127.0.0.1:8599 --rate 10 --duration 60
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+import httpx
+import numpy as np
+
+from tests.html_factory import outlook_html
+
+_PATH = "/api/generate-email"
+
+
+def _payload(index: int, body: str) -> dict:
+    return {
+        "full_body": body,
+        "selected_text": f"일정 확인 요청 {index}",
+        "subject": "RE: 프로젝트 일정 협의",
+        "to_recipients": "홍길동 <hong@example.com>",
+        "is_reply": True,
+    }
+
+
+def _error_kind(response: httpx.Response) -> str | None:
+    """응답의 오류 종류 (성공이면 None)"""
+    if response.status_code != 200:
+        return f"http_{response.status_code}"
+    data = response.json()
+    if data.get("success"):
+        return None
+    message = data.get("error_message") or ""
+    if "429" in message or "RESOURCE_EXHAUSTED" in message:
+        return "rate_limited"
+    if "timed out" in message.lower() or "timeout" in message.lower():
+        return "upstream_timeout"
+    return "generation_failed"
+
+
+async def run(
+    url: str,
+    rate: float = 10.0,
+    duration: float = 10.0,
+    timeout: float = 60.0,
+    max_in_flight: int = 256,
+    poisson: bool = False,
+    messages: int = 10,
+) -> dict:
+    """목표 요청률로 duration초 동안 요청을 보내고 결과 집계.
+
+    Args:
+        url: 서버 주소 (예: http://127.0.0.1:8599)
+        rate: 초당 요청 수
+        duration: 요청을 보내는 시간 (초, 끝난 뒤 진행 중인 요청은 끝까지 기다림)
+        timeout: 요청당 타임아웃 (초)
+        max_in_flight: 동시에 진행할 최대 요청 수 (넘으면 보내지 않고 dropped로 집계)
+        poisson: 요청 간격을 지수분포로 (기본은 일정 간격)
+        messages: 요청 본문에 인용된 메일 수
+    """
+    body = outlook_html(messages=messages)
+    latencies: list[float] = []
+    errors: Counter = Counter()
+    in_flight = 0
+    dropped = 0
+
+    async def send(client: httpx.AsyncClient, index: int) -> None:
+        nonlocal in_flight
+        started = time.perf_counter()
+        try:
+            response = await client.post(_PATH, json=_payload(index, body))
+            kind = _error_kind(response)
+        except httpx.TimeoutException:
+            kind = "timeout"
+        except httpx.TransportError:
+            kind = "connection"
+        finally:
+            in_flight -= 1
+        if kind is None:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors[kind] += 1
+
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        tasks = []
+        started = time.perf_counter()
+        next_at = started
+        index = 0
+        while next_at < started + duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight >= max_in_flight:
+                dropped += 1
+            else:
+                in_flight += 1
+                tasks.append(asyncio.create_task(send(client, index)))
+            index += 1
+            next_at += random.expovariate(rate) if poisson else 1.0 / rate
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    sent = len(tasks)
+    failed = sum(errors.values())
+    result = {
+        "offered": index,
+        "sent": sent,
+        "dropped": dropped,
+        "succeeded": len(latencies),
+        "failed": failed,
+        "errors": dict(errors),
+        "error_rate": failed / sent if sent else 0.0,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+    }
+    if latencies:
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        result.update(p50_ms=p50, p95_ms=p95, p99_ms=p99, max_ms=max(latencies) * 1000)
+    return result
+
+
+def free_port() -> int:
+    """사용하지 않는 로컬 포트 번호"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료됨 (코드 {process.returncode}): {url}")
+        try:
+            if httpx.get(url, timeout=0.5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"응답 없음: {url}")
+
+
+def _start(stack: ExitStack, command: list[str], env: dict | None = None) -> subprocess.Popen:
+    process = subprocess.Popen(command, env=env)
+    stack.callback(process.wait, timeout=10)
+    stack.callback(process.terminate)
+    return process
+
+
+def spawn(stack: ExitStack, fake_args: list[str], server_workers: int = 1) -> str:
+    """가짜 Gemini 서버와 이 프로젝트 서버를 띄우고 서버 주소 반환 (stack 종료 시 정리)"""
+    fake_port = free_port()
+    fake = _start(
+        stack,
+        [sys.executable, "-m", "benchmarks.fake_gemini", "--port", str(fake_port), *fake_args],
+    )
+    _wait_ready(f"http://127.0.0.1:{fake_port}/v1beta/models/fake", fake)
+
+    port = free_port()
+    env = dict(os.environ)
+    env.setdefault("EMAIL_WRITER_GEMINI_API_KEY", "load-test")
+    env["EMAIL_WRITER_GEMINI_BASE_URL"] = f"http://127.0.0.1:{fake_port}"
+    server = _start(
+        stack,
+        [
+            sys.executable, "-m", "uvicorn", "email_writer.server:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(server_workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    _wait_ready(f"{url}/api/ready", server)
+    return url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="생성 엔드포인트 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:8599", help="서버 주소")
+    parser.add_argument("--rate", type=float, default=10.0, help="초당 요청 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="요청을 보내는 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청당 타임아웃 (초)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="최대 동시 요청 수")
+    parser.add_argument("--poisson", action="store_true", help="요청 간격을 지수분포로")
+    parser.add_argument("--messages", type=int, default=10, help="요청 본문에 인용된 메일 수")
+    spawn_group = parser.add_argument_group("--spawn (가짜 Gemini + 서버를 새로 띄움)")
+    spawn_group.add_argument("--spawn", action="store_true", help="서버를 직접 띄워 테스트")
+    spawn_group.add_argument("--server-workers", type=int, default=1, help="uvicorn 워커 수")
+    spawn_group.add_argument("--latency-median", type=float, default=0.8)
+    spawn_group.add_argument("--latency-sigma", type=float, default=0.4)
+    spawn_group.add_argument("--error-rate", type=float, default=0.0)
+    spawn_group.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        url = args.url
+        if args.spawn:
+            fake_args = [
+                "--latency-median", str(args.latency_median),
+                "--latency-sigma", str(args.latency_sigma),
+                "--error-rate", str(args.error_rate),
+                "--rate-limit-rate", str(args.rate_limit_rate),
+            ]
+            url = spawn(stack, fake_args, args.server_workers)
+        result = asyncio.run(
+            run(url, args.rate, args.duration, args.timeout, args.max_in_flight,
+                args.poisson, args.messages)
+        )
+
+    print(
+        f"요청: {result['sent']}건 "
+        f"(목표 {args.rate:g} req/sec, 보내지 못함 {result['dropped']}건)"
+    )
+    print(f"처리량: {result['throughput']:.1f} req/sec ({result['elapsed']:.1f}초)")
+    print(f"오류율: {result['error_rate']:.1%} {result['errors'] or ''}")
+    if result["succeeded"]:
+        print(
+            f"지연: p50 {result['p50_ms']:.0f} ms, p95 {result['p95_ms']:.0f} ms, "
+            f"p99 {result['p99_ms']:.0f} ms, 최대 {result['max_ms']:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+MSG 단일 파싱 벤치마크 (MarkItDown + extract-msg 2회 파싱 vs extract-msg 1회 파싱)
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_msg_parse
+  python -m benchmarks.bench_msg_parse --files 300 --attachment-size 1048576
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from email_writer.config import Settings
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from tests.msg_factory import write_msg
+
+
+def make_corpus(directory: Path, count: int, attachment_size: int) -> list[Path]:
+    """첨부파일이 포함된 합성 MSG 파일 생성"""
+    body = "\r\n".join(f"{i}번째 줄: 검토 의견을 회신드립니다." for i in range(60))
+    return [
+        write_msg(
+            directory / f"email_{i:05d}.msg",
+            subject=f"RE: 검토 요청 {i}",
+            body=body,
+            attachments=2,
+            attachment_size=attachment_size,
+        )
+        for i in range(count)
+    ]
+
+
+def _time_per_file(converter: MsgToMarkdownConverter, paths: list[Path], output_dir: str) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        converter.convert_single(str(path), output_dir)
+    return (time.perf_counter() - start) / len(paths)
+
+
+def run(paths: list[Path]) -> dict:
+    """두 경로의 파일당 평균 변환 시간(ms) 비교"""
+    base = Settings(gemini_api_key="benchmark")
+    legacy = MsgToMarkdownConverter(base.model_copy(update={"msg_single_parse": False}))
+    single = MsgToMarkdownConverter(base)
+    legacy.converter  # MarkItDown 초기화 비용은 측정에서 제외
+
+    with tempfile.TemporaryDirectory() as out:
+        legacy_ms = _time_per_file(legacy, paths, out) * 1000
+        single_ms = _time_per_file(single, paths, out) * 1000
+
+    return {
+        "files": len(paths),
+        "legacy_ms_per_file": legacy_ms,
+        "single_parse_ms_per_file": single_ms,
+        "saving_ms_per_file": legacy_ms - single_ms,
+        "speedup": legacy_ms / single_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MSG 단일 파싱 벤치마크")
+    parser.add_argument("--files", type=int, default=200, help="생성할 합성 MSG 파일 수")
+    parser.add_argument(
+        "--attachment-size", type=int, default=256 * 1024, help="첨부파일 1개 크기 (바이트)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(Path(tmp), args.files, args.attachment_size)
+        result = run(paths)
+
+    print(f"파일 수: {result['files']}")
+    print(f"기존 (2회 파싱): {result['legacy_ms_per_file']:.2f} ms/file")
+    print(f"단일 파싱:       {result['single_parse_ms_per_file']:.2f} ms/file")
+    print(f"파일당 절감:     {result['saving_ms_per_file']:.2f} ms ({result['speedup']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+로컬 검색 인덱스 vs File Search 벤치마크 (스텁 모델)
+
+합성 메일 코퍼스로 로컬 검색 인덱스를 만들고, 같은 요청들을
+retrieval_mode=file_search / local 로 생성했을 때의 지연 시간과 입력 토큰 수를 비교한다.
+실제 API를 호출하지 않는다. 스텁 모델의 지연은
+  기본 지연 + 입력 토큰당 지연 x 입력 토큰 (+ File Search 모드면 검색 지연)
+으로 계산하며, File Search 모드의 입력 토큰에는 도구가 가져온 검색 결과 토큰을 더한다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_retrieval
+  python -m benchmarks.bench_retrieval --emails 5000 --queries 50 --file-search-latency 1.2
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from email_writer.config import Settings
+from email_writer.core.generator import EmailGenerator
+from email_writer.core.token_estimator import TokenEstimator
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.request import GenerateEmailRequest
+from email_writer.retrieval.index import RetrievalIndex
+
+_TOPICS = [
+    "회의 일정", "견적서", "청구서", "주간 보고",
+    "출장 계획", "계약 검토", "납기 지연", "교육 안내",
+]
+_PHRASES = [
+    "확인 부탁드립니다.", "검토 후 회신 주시기 바랍니다.", "첨부 파일을 참고해 주세요.",
+    "일정 조율이 필요합니다.", "감사합니다.", "문의 사항은 언제든 연락 주세요.",
+]
+
+
+class StubGeminiClient:
+    """입력 토큰 수에 비례해 지연되는 Gemini 스텁"""
+
+    def __init__(
+        self,
+        estimator: TokenEstimator,
+        base_latency: float,
+        per_token_latency: float,
+        file_search_latency: float = 0.0,
+        file_search_tokens: int = 0,
+    ):
+        self.estimator = estimator
+        self.base_latency = base_latency
+        self.per_token_latency = per_token_latency
+        self.file_search_latency = file_search_latency
+        self.file_search_tokens = file_search_tokens
+        self.input_tokens: list[int] = []
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        tokens = self.estimator.estimate(prompt) + self.file_search_tokens
+        self.input_tokens.append(tokens)
+        await asyncio.sleep(
+            self.base_latency + self.file_search_latency + tokens * self.per_token_latency
+        )
+        return "스텁 응답"
+
+
+def write_corpus(directory: Path, count: int, seed: int = 0) -> list[EmailMetadata]:
+    """합성 메일 마크다운 파일 생성"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        topic = rng.choice(_TOPICS)
+        body = " ".join(rng.choice(_PHRASES) for _ in range(rng.randint(5, 30)))
+        path = directory / f"email_{i:05d}.md"
+        text = f"# {topic} 관련 ({i})\n\n안녕하세요, {topic} 건으로 연락드립니다. {body}"
+        path.write_text(text, encoding="utf-8")
+        items.append(
+            EmailMetadata(
+                file_name=path.with_suffix(".msg").name,
+                subject=f"{topic} 관련 ({i})",
+                sender="me@example.com",
+                recipients="you@example.com",
+                markdown_path=str(path),
+            )
+        )
+    return items
+
+
+async def drive(generator: EmailGenerator, requests: list[GenerateEmailRequest]) -> list[float]:
+    """요청을 하나씩 보내고 요청별 지연 시간(초) 반환"""
+    latencies = []
+    for request in requests:
+        start = time.perf_counter()
+        await generator.generate_async(request)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run(
+    emails: int = 2000,
+    queries: int = 20,
+    base_latency: float = 0.3,
+    per_token_latency: float = 0.0001,
+    file_search_latency: float = 0.8,
+    file_search_tokens: int = 2000,
+) -> dict:
+    """인덱스 생성/검색 시간과 모드별 생성 지연/입력 토큰 비교"""
+    rng = random.Random(1)
+    requests = [
+        GenerateEmailRequest(
+            full_body=f"<p>{rng.choice(_TOPICS)} 관련 문의드립니다.</p>",
+            selected_text=f"{rng.choice(_TOPICS)} 회신",
+            subject=rng.choice(_TOPICS),
+        )
+        for _ in range(queries)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "md").mkdir()
+        items = write_corpus(tmp / "md", emails)
+
+        start = time.perf_counter()
+        RetrievalIndex.build(items, tmp / "index")
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = RetrievalIndex.load(tmp / "index")
+        load_seconds = time.perf_counter() - start
+
+        search_times = []
+        for request in requests:
+            start = time.perf_counter()
+            index.search(f"{request.subject}\n{request.selected_text}")
+            search_times.append(time.perf_counter() - start)
+
+        results = {}
+        for mode in ("file_search", "local"):
+            settings = Settings(
+                gemini_api_key="benchmark",
+                retrieval_mode=mode,
+                retrieval_index_dir=str(tmp / "index"),
+            )
+            generator = EmailGenerator(settings)
+            stub = StubGeminiClient(
+                generator.prompt_builder.estimator,
+                base_latency,
+                per_token_latency,
+                file_search_latency if mode == "file_search" else 0.0,
+                file_search_tokens if mode == "file_search" else 0,
+            )
+            generator.gemini_client = stub
+            latencies = asyncio.run(drive(generator, requests))
+            results[mode] = {
+                "latency_p50": statistics.median(latencies),
+                "input_tokens_mean": statistics.mean(stub.input_tokens),
+            }
+
+    return {
+        "emails": emails,
+        "build_seconds": build_seconds,
+        "load_seconds": load_seconds,
+        "search_p50": statistics.median(search_times),
+        **results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 검색 인덱스 vs File Search 벤치마크")
+    parser.add_argument("--emails", type=int, default=2000, help="합성 메일 수")
+    parser.add_argument("--queries", type=int, default=20, help="생성 요청 수")
+    parser.add_argument("--base-latency", type=float, default=0.3, help="스텁 모델 기본 지연 (초)")
+    parser.add_argument(
+        "--per-token-latency", type=float, default=0.0001, help="입력 토큰당 지연 (초)"
+    )
+    parser.add_argument(
+        "--file-search-latency", type=float, default=0.8, help="File Search 도구 검색 지연 (초)"
+    )
+    parser.add_argument(
+        "--file-search-tokens", type=int, default=2000, help="File Search 검색 결과 입력 토큰 수"
+    )
+    args = parser.parse_args()
+
+    result = run(
+        args.emails,
+        args.queries,
+        args.base_latency,
+        args.per_token_latency,
+        args.file_search_latency,
+        args.file_search_tokens,
+    )
+    print(f"메일 수: {result['emails']}")
+    print(f"인덱스 생성: {result['build_seconds']:.2f}초")
+    print(f"인덱스 로드: {result['load_seconds'] * 1000:.1f} ms")
+    print(f"로컬 검색 (p50): {result['search_p50'] * 1000:.2f} ms")
+    for mode in ("file_search", "local"):
+        print(
+            f"{mode:12s} 지연 p50 {result[mode]['latency_p50'] * 1000:.0f} ms, "
+            f"입력 토큰 평균 {result[mode]['input_tokens_mean']:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
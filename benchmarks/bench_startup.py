@@ -0,0 +1,129 @@
+"""
+서버 시작 시간 벤치마크
+
+새 프로세스에서 측정한다:
+  - email_writer.server import 시간과 import 직후 로드된 무거운 모듈
+  - uvicorn 실행부터 /api/health 첫 응답, /api/ready 준비 완료까지 걸린 시간
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.bench_startup
+  python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+# 서버 import 시점에는 로드되지 않아야 하는 모듈 (lifespan 초기화에서 로드)
+HEAVY_MODULES = ("google.genai", "pydantic_settings", "markitdown", "extract_msg", "bs4")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import email_writer.server
+for name in {eager!r}:
+    __import__(name)
+elapsed = time.perf_counter() - started
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+
+def _server_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("EMAIL_WRITER_GEMINI_API_KEY", "benchmark")
+    # 네트워크 없이도 측정할 수 있도록 예열/keep-alive는 끔
+    env["EMAIL_WRITER_WARMUP_ON_STARTUP"] = "false"
+    env["EMAIL_WRITER_KEEPALIVE_INTERVAL"] = "0"
+    return env
+
+
+def measure_import(eager: bool = False) -> dict:
+    """새 프로세스에서 서버 모듈 import 시간 측정
+
+    eager=True면 무거운 모듈까지 바로 import한 시간 (지연 import가 없을 때의 비교 기준)
+    """
+    script = _IMPORT_SCRIPT.format(heavy=HEAVY_MODULES, eager=HEAVY_MODULES if eager else ())
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_server_env(),
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=0.5).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"응답 없음: {url}")
+
+
+def measure_first_health(timeout: float = 30.0) -> dict:
+    """uvicorn 실행부터 첫 헬스체크 응답/준비 완료까지 걸린 시간 측정"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "email_writer.server:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        env=_server_env(),
+    )
+    try:
+        deadline = started + timeout
+        healthy = _wait_for(f"{base_url}/api/health", deadline)
+        ready = _wait_for(f"{base_url}/api/ready", deadline)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    return {"health_seconds": healthy - started, "ready_seconds": ready - started}
+
+
+def run(repeat: int = 3) -> dict:
+    """import 시간과 첫 응답 시간의 중앙값"""
+    imports = [measure_import() for _ in range(repeat)]
+    starts = [measure_first_health() for _ in range(repeat)]
+    return {
+        "import_seconds": statistics.median(item["seconds"] for item in imports),
+        "heavy_modules": sorted({name for item in imports for name in item["heavy_modules"]}),
+        "health_seconds": statistics.median(item["health_seconds"] for item in starts),
+        "ready_seconds": statistics.median(item["ready_seconds"] for item in starts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    result = run(args.repeat)
+
+    print(f"서버 모듈 import:  {result['import_seconds'] * 1000:.0f} ms")
+    print(f"import 시 로드된 무거운 모듈: {', '.join(result['heavy_modules']) or '없음'}")
+    print(f"첫 헬스체크 응답:  {result['health_seconds'] * 1000:.0f} ms")
+    print(f"준비 완료:         {result['ready_seconds'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
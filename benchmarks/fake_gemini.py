@@ -0,0 +1,285 @@
+"""
+로컬 가짜 Gemini API 서버 (부하 테스트/용량 산정용)
+
+genai.Client가 base URL(EMAIL_WRITER_GEMINI_BASE_URL)로 가리킬 수 있도록
+Gemini Developer API(v1beta) 중 이 프로젝트가 쓰는 부분만 흉내낸다:
+  - models: generateContent, streamGenerateContent(SSE), countTokens, get(연결 예열)
+  - File Search Store: 생성, 파일 업로드(resumable), 업로드 작업 조회, 문서 목록/삭제
+
+생성 호출의 응답 지연은 로그 정규분포(중앙값, sigma)에서 뽑고, 설정한 비율만큼
+500(내부 오류)과 429(RESOURCE_EXHAUSTED)를 돌려준다. 업로드는 오류 없이
+--index-latency초 뒤에 인덱싱이 끝난 것으로 처리한다. 실제 API를 호출하지 않는다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.fake_gemini --port 8600
+  python -m benchmarks.fake_gemini --latency-median 1.2 --latency-sigma 0.5 \\
+      --error-rate 0.01 --rate-limit-rate 0.05
+  EMAIL_WRITER_GEMINI_BASE_URL=http://127.0.0.1:8600 python scripts/start_server.py
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+# 생성 응답 본문 (스트리밍이면 조각으로 나누어 보냄)
+RESPONSE_TEXT = (
+    "안녕하세요.\n\n"
+    "보내주신 일정 변경 건 확인했습니다. 말씀하신 대로 다음 주 화요일까지 "
+    "수정된 납품 일정을 확정하여 회신드리겠습니다.\n\n"
+    "추가로 필요하신 자료가 있으시면 편하게 말씀해 주세요.\n\n"
+    "감사합니다."
+)
+
+_ERRORS = {
+    429: ("RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota)."),
+    500: ("INTERNAL", "An internal error has occurred."),
+}
+
+
+class FakeGeminiBehavior:
+    """가짜 서버의 응답 지연/오류 설정
+
+    Args:
+        latency_median: 생성 응답 지연 중앙값 (초)
+        latency_sigma: 로그 정규분포 sigma (0이면 항상 중앙값)
+        error_rate: 500 오류 비율 (0~1)
+        rate_limit_rate: 429 오류 비율 (0~1)
+        stream_chunks: 스트리밍 응답 조각 수
+        chunk_interval: 스트리밍 조각 사이 간격 (초, 첫 조각은 지연 후 바로)
+        index_latency: 업로드 후 인덱싱 완료까지 걸리는 시간 (초)
+        seed: 난수 시드 (None이면 매번 다름)
+    """
+
+    def __init__(
+        self,
+        latency_median: float = 0.8,
+        latency_sigma: float = 0.4,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        stream_chunks: int = 8,
+        chunk_interval: float = 0.05,
+        index_latency: float = 0.5,
+        seed: int | None = None,
+    ):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.stream_chunks = max(1, stream_chunks)
+        self.chunk_interval = chunk_interval
+        self.index_latency = index_latency
+        self.random = random.Random(seed)
+
+    def latency(self) -> float:
+        """생성 응답 지연 (초)"""
+        if self.latency_median <= 0:
+            return 0.0
+        return self.random.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+    def failure(self) -> int | None:
+        """이번 호출이 실패할 상태 코드 (성공이면 None)"""
+        draw = self.random.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+
+def _error(status: int) -> JSONResponse:
+    code, message = _ERRORS[status]
+    return JSONResponse(
+        {"error": {"code": status, "message": message, "status": code}}, status_code=status
+    )
+
+
+def _prompt_chars(body: dict) -> int:
+    return sum(
+        len(part.get("text", ""))
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+def _chunk(text: str, model: str, prompt_tokens: int, final: bool) -> dict:
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if final:
+        candidate["finishReason"] = "STOP"
+    output_tokens = len(RESPONSE_TEXT) // 2
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        },
+        "modelVersion": model,
+    }
+
+
+def create_app(behavior: FakeGeminiBehavior | None = None) -> FastAPI:
+    """가짜 Gemini API 앱 (app.state.stats에 호출 수 집계)"""
+    behavior = behavior or FakeGeminiBehavior()
+    app = FastAPI(title="Fake Gemini API")
+    ids = itertools.count(1)
+    # 업로드 작업 이름 -> (인덱싱 완료 시각, Store 이름, 문서 이름)
+    operations: dict[str, tuple[float, str, str]] = {}
+    documents: dict[str, dict[str, str]] = {}
+    stats = app.state.stats = {"generate": 0, "stream": 0, "errors": 0, "uploads": 0}
+
+    async def generation_delay() -> int | None:
+        await asyncio.sleep(behavior.latency())
+        status = behavior.failure()
+        if status is not None:
+            stats["errors"] += 1
+        return status
+
+    @app.get("/v1beta/models/{model}")
+    async def get_model(model: str):
+        return {"name": f"models/{model}", "displayName": model, "inputTokenLimit": 1048576}
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        stats["generate"] += 1
+        body = await request.json()
+        status = await generation_delay()
+        if status is not None:
+            return _error(status)
+        prompt_tokens = _prompt_chars(body) // 2
+        count = body.get("generationConfig", {}).get("candidateCount", 1)
+        response = _chunk(RESPONSE_TEXT, model, prompt_tokens, final=True)
+        response["candidates"] = [
+            {**response["candidates"][0], "index": index} for index in range(count)
+        ]
+        return response
+
+    @app.post("/v1beta/models/{model}:streamGenerateContent")
+    async def stream_generate_content(model: str, request: Request):
+        stats["stream"] += 1
+        body = await request.json()
+        status = await generation_delay()
+        if status is not None:
+            return _error(status)
+        prompt_tokens = _prompt_chars(body) // 2
+        size = math.ceil(len(RESPONSE_TEXT) / behavior.stream_chunks)
+        pieces = [RESPONSE_TEXT[i : i + size] for i in range(0, len(RESPONSE_TEXT), size)]
+
+        async def events():
+            for index, piece in enumerate(pieces):
+                if index:
+                    await asyncio.sleep(behavior.chunk_interval)
+                final = index == len(pieces) - 1
+                chunk = _chunk(piece, model, prompt_tokens, final)
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1beta/models/{model}:countTokens")
+    async def count_tokens(model: str, request: Request):
+        return {"totalTokens": max(1, _prompt_chars(await request.json()) // 2)}
+
+    @app.post("/v1beta/fileSearchStores")
+    async def create_store(request: Request):
+        body = await request.json()
+        name = f"fileSearchStores/fake-store-{next(ids)}"
+        documents[name] = {}
+        return {"name": name, "displayName": body.get("displayName", "")}
+
+    @app.post("/upload/v1beta/fileSearchStores/{store}:uploadToFileSearchStore")
+    async def upload_to_store(store: str, request: Request):
+        # resumable 업로드: start 요청에 업로드 URL을 주고, 마지막 조각(finalize)에 작업 반환
+        command = request.headers.get("x-goog-upload-command", "")
+        body = await request.body()
+        if "start" in command:
+            upload_url = str(request.url.include_query_params(upload_id=next(ids)))
+            return Response(
+                headers={"x-goog-upload-url": upload_url, "x-goog-upload-status": "active"}
+            )
+        if "finalize" not in command:
+            return Response(headers={"x-goog-upload-status": "active"})
+
+        stats["uploads"] += 1
+        store_name = f"fileSearchStores/{store}"
+        upload_id = next(ids)
+        operation = f"{store_name}/upload/operations/op-{upload_id}"
+        document = f"{store_name}/documents/doc-{upload_id}"
+        operations[operation] = (time.monotonic() + behavior.index_latency, store_name, document)
+        documents.setdefault(store_name, {})[document] = f"{len(body)} bytes"
+        return JSONResponse(
+            {"name": operation, "done": False}, headers={"x-goog-upload-status": "final"}
+        )
+
+    @app.get("/v1beta/fileSearchStores/{store}/documents")
+    async def list_documents(store: str):
+        names = documents.get(f"fileSearchStores/{store}", {})
+        return {"documents": [{"name": name} for name in names]}
+
+    @app.get("/v1beta/{name:path}")
+    async def get_operation(name: str):
+        if name not in operations:
+            return JSONResponse(
+                {"error": {"code": 404, "message": f"{name} not found", "status": "NOT_FOUND"}},
+                status_code=404,
+            )
+        ready_at, store_name, document = operations[name]
+        if time.monotonic() < ready_at:
+            return {"name": name, "done": False}
+        return {
+            "name": name,
+            "done": True,
+            "response": {"parent": store_name, "documentName": document},
+        }
+
+    @app.delete("/v1beta/{name:path}")
+    async def delete_resource(name: str):
+        store_name = name.split("/documents/")[0]
+        documents.get(store_name, {}).pop(name, None)
+        return {}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="로컬 가짜 Gemini API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--latency-median", type=float, default=0.8, help="응답 지연 중앙값 (초)")
+    parser.add_argument(
+        "--latency-sigma", type=float, default=0.4, help="응답 지연 로그 정규분포 sigma"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 오류 비율 (0~1)")
+    parser.add_argument("--stream-chunks", type=int, default=8, help="스트리밍 응답 조각 수")
+    parser.add_argument(
+        "--chunk-interval", type=float, default=0.05, help="스트리밍 조각 간격 (초)"
+    )
+    parser.add_argument(
+        "--index-latency", type=float, default=0.5, help="업로드 인덱싱 완료까지 시간 (초)"
+    )
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    args = parser.parse_args()
+
+    behavior = FakeGeminiBehavior(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        stream_chunks=args.stream_chunks,
+        chunk_interval=args.chunk_interval,
+        index_latency=args.index_latency,
+        seed=args.seed,
+    )
+    print(f"가짜 Gemini API: http://{args.host}:{args.port}")
+    uvicorn.run(create_app(behavior), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
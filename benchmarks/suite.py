@@ -0,0 +1,342 @@
+"""
+성능 회귀 검사용 벤치마크 모음
+
+로컬에서 만든 합성 데이터(긴 Outlook 회신 HTML, 긴 회신 스레드, 합성 MSG 파일)로
+주요 경로의 1회 실행 시간을 측정하고 기준값 파일(benchmarks/baselines.json)에 기록된
+같은 기계의 기준값과 비교한다. 기준보다 threshold 비율 넘게 느려진 항목이 있으면
+종료 코드 1로 끝난다.
+Gemini는 스텁으로 대체하므로 네트워크 없이 실행된다.
+
+측정 항목:
+  html_to_text         수백 KB Outlook 회신 본문 텍스트 추출
+  prompt_build         긴 회신 스레드로 프롬프트 구성 (글자 수 기준 압축)
+  prompt_build_budget  같은 스레드로 프롬프트 구성 (토큰 예산 배분)
+  convert_single       첨부파일이 있는 MSG 1건 변환
+  convert_batch        MSG 50건 순차 일괄 변환 (convert_batch)
+  api_generate         /api/generate-email 요청 1건 (스텁 GeminiClient, 응답 지연 없음)
+
+절대 시간은 기계마다 다르므로 기준값은 기계 식별자(호스트 이름, CPU 아키텍처, 코어 수)별로
+저장한다. 기준값이 없는 기계에서는 비교하지 않으므로 먼저 --update-baselines로 만든다.
+CI처럼 호스트 이름이 매번 바뀌는 환경은 --machine으로 이름을 고정한다.
+
+사용법 (저장소 루트에서):
+  python -m benchmarks.suite
+  python -m benchmarks.suite --only html_to_text prompt_build
+  python -m benchmarks.suite --threshold 0.5
+  python -m benchmarks.suite --update-baselines
+  python -m benchmarks.suite --machine ci-runner
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from pathlib import Path
+
+import httpx
+
+from email_writer.config import Settings
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from email_writer.core.html_text import html_to_text
+from email_writer.core.prompt_builder import PromptBuilder
+from tests.html_factory import outlook_html
+from tests.msg_factory import write_msg
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# 기준값 파일에 threshold가 없을 때 허용하는 느려짐 비율 (0.3 = 30%)
+DEFAULT_THRESHOLD = 0.3
+
+_SELECTED_TEXT = "납품 일정 변경 건, 다음 주 화요일까지 확정 회신 요청"
+
+
+def _settings(workdir: Path, **overrides) -> Settings:
+    """작업 디렉토리 밖의 데이터 파일(매니페스트, 보정 계수 등)을 읽지 않는 설정"""
+    return Settings(
+        gemini_api_key="benchmark",
+        manifest_path=str(workdir / "manifest.sqlite3"),
+        token_calibration_path=str(workdir / "token_calibration.json"),
+        warmup_on_startup=False,
+        keepalive_interval=0,
+        **overrides,
+    )
+
+
+def _html_to_text(workdir: Path, stack: ExitStack) -> Callable[[], object]:
+    html = outlook_html(messages=100, css_rules=200)
+    return lambda: html_to_text(html)
+
+
+def _prompt_builder(settings: Settings) -> Callable[[], object]:
+    thread = html_to_text(outlook_html(messages=40))
+    builder = PromptBuilder(settings)
+    return lambda: builder.build(
+        context_body=thread,
+        selected_text=_SELECTED_TEXT,
+        subject="RE: 프로젝트 일정 협의",
+        to_recipients="홍길동 <hong@example.com>; Park Minsu <minsu@example.co.kr>",
+        is_reply=True,
+        additional_prompt="정중하게 작성",
+    )
+
+
+def _prompt_build(workdir: Path, stack: ExitStack) -> Callable[[], object]:
+    return _prompt_builder(_settings(workdir))
+
+
+def _prompt_build_budget(workdir: Path, stack: ExitStack) -> Callable[[], object]:
+    return _prompt_builder(_settings(workdir, prompt_token_budget=4000))
+
+
+def _msg_body(lines: int) -> str:
+    return "\r\n".join(
+        f"{i}번째 줄: 프로젝트 진행 상황과 검토 의견을 공유드립니다." for i in range(lines)
+    )
+
+
+def _convert_single(workdir: Path, stack: ExitStack) -> Callable[[], object]:
+    converter = MsgToMarkdownConverter(_settings(workdir))
+    path = write_msg(
+        workdir / "single.msg",
+        subject="RE: 검토 요청",
+        body=_msg_body(200),
+        attachments=2,
+        attachment_size=256 * 1024,
+    )
+    output_dir = str(workdir / "single_out")
+    Path(output_dir).mkdir()
+    return lambda: converter.convert_single(str(path), output_dir)
+
+
+def _convert_batch(workdir: Path, stack: ExitStack) -> Callable[[], object]:
+    converter = MsgToMarkdownConverter(_settings(workdir))
+    msg_dir = workdir / "batch"
+    msg_dir.mkdir()
+    body = _msg_body(40)
+    for i in range(50):
+        write_msg(msg_dir / f"email_{i:03d}.msg", subject=f"RE: 주간 보고 {i}", body=body,
+                  attachments=i % 3)
+    return lambda: converter.convert_batch(str(msg_dir), str(workdir / "batch_out"))
+
+
+class StubGeminiClient:
+    """지연 없이 바로 응답하는 GeminiClient 스텁 (모델 호출을 뺀 서버 경로만 측정)"""
+
+    def generate_with_file_search(self, prompt: str, metadata_filter: str | None = None) -> str:
+        return "스텁 응답"
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None, **options
+    ) -> str:
+        return "스텁 응답"
+
+
+def _api_generate(workdir: Path, stack: ExitStack) -> Callable[[], object]:
+    from email_writer import server
+    from email_writer.core.generator import EmailGenerator
+
+    settings = _settings(workdir)
+    generator = EmailGenerator(settings)
+    generator.gemini_client = StubGeminiClient()
+
+    # 초기화가 끝난 서버로 간주되도록 설정과 generator를 교체하고, 끝나면 되돌림
+    original = (server.settings, server.generator)
+    server.settings, server.generator = settings, generator
+    stack.callback(lambda: setattr(server, "settings", original[0]))
+    stack.callback(lambda: setattr(server, "generator", original[1]))
+
+    loop = asyncio.new_event_loop()
+    stack.callback(loop.close)
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=server.app), base_url="http://bench"
+    )
+    stack.callback(lambda: loop.run_until_complete(client.aclose()))
+    payload = {
+        "full_body": outlook_html(messages=20, css_rules=100),
+        "selected_text": _SELECTED_TEXT,
+        "subject": "RE: 프로젝트 일정 협의",
+        "to_recipients": "홍길동 <hong@example.com>",
+        "is_reply": True,
+    }
+
+    def request():
+        response = loop.run_until_complete(client.post("/api/generate-email", json=payload))
+        if not response.json()["success"]:
+            raise RuntimeError(f"생성 실패: {response.json()['error_message']}")
+
+    return request
+
+
+# 이름 -> 준비 함수 (작업 디렉토리와 정리용 ExitStack을 받아 측정할 함수를 반환)
+CASES: dict[str, Callable[[Path, ExitStack], Callable[[], object]]] = {
+    "html_to_text": _html_to_text,
+    "prompt_build": _prompt_build,
+    "prompt_build_budget": _prompt_build_budget,
+    "convert_single": _convert_single,
+    "convert_batch": _convert_batch,
+    "api_generate": _api_generate,
+}
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_seconds: float = 0.2) -> dict:
+    """1회 실행 시간(ms)의 최솟값/중앙값.
+
+    예열 1회 후, 짧은 함수는 한 라운드가 min_seconds를 넘도록 여러 번 묶어 실행하고
+    라운드마다 평균을 구한다. 다른 프로세스 때문에 생기는 지연은 시간을 늘리기만 하므로
+    라운드 중 최솟값을 비교에 쓴다 (timeit과 같은 방식).
+    """
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    loops = max(1, int(min_seconds / max(once, 1e-6)))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops * 1000)
+    return {"min_ms": min(samples), "median_ms": statistics.median(samples), "loops": loops}
+
+
+def run(names: list[str] | None = None, repeat: int = 5) -> dict:
+    """선택한 항목(없으면 전체)을 측정해 {이름: 측정 결과} 반환"""
+    results = {}
+    for name in names or list(CASES):
+        with tempfile.TemporaryDirectory() as workdir, ExitStack() as stack:
+            func = CASES[name](Path(workdir), stack)
+            results[name] = measure(func, repeat=repeat)
+    return results
+
+
+def machine_id() -> str:
+    """기준값을 구분하는 기계 식별자 (호스트 이름, CPU 아키텍처, 코어 수)"""
+    host = re.sub(r"[^\w.-]+", "_", platform.node()) or "unknown"
+    return f"{host}-{platform.machine() or 'unknown'}-{os.cpu_count() or 0}cpu"
+
+
+def _read(path: str | Path) -> dict:
+    path = Path(path)
+    if not path.is_file():
+        return {"threshold": DEFAULT_THRESHOLD, "machines": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_baselines(path: str | Path = BASELINES_PATH, machine: str | None = None) -> dict:
+    """machine(기본: 현재 기계)의 기준값 {"threshold": ..., "cases": {...}}.
+
+    그 기계의 기준값이 없으면 cases가 비어 있어 compare가 아무 항목도 비교하지 않는다.
+    """
+    stored = _read(path)
+    cases = stored.get("machines", {}).get(machine or machine_id(), {})
+    return {"threshold": stored.get("threshold", DEFAULT_THRESHOLD), "cases": cases}
+
+
+def save_baselines(
+    results: dict,
+    path: str | Path = BASELINES_PATH,
+    threshold: float | None = None,
+    machine: str | None = None,
+) -> None:
+    """machine의 기준값을 측정 결과로 갱신.
+
+    다른 기계의 기준값, 측정하지 않은 항목, 항목별 threshold는 그대로 둔다.
+    """
+    stored = _read(path)
+    if threshold is not None:
+        stored["threshold"] = threshold
+    cases = stored.setdefault("machines", {}).setdefault(machine or machine_id(), {})
+    for name, result in results.items():
+        case = cases.setdefault(name, {})
+        case["min_ms"] = round(result["min_ms"], 4)
+    Path(path).write_text(
+        json.dumps(stored, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+
+def compare(results: dict, baselines: dict, threshold: float | None = None) -> list[dict]:
+    """기준보다 허용 비율 넘게 느려진 항목 목록 (기준값이 없는 항목은 건너뜀).
+
+    항목별 threshold가 있으면 그것을, 없으면 인자 또는 파일 전체의 threshold를 쓴다.
+    """
+    default = threshold if threshold is not None else baselines.get("threshold", DEFAULT_THRESHOLD)
+    regressions = []
+    for name, result in results.items():
+        case = baselines.get("cases", {}).get(name)
+        if not case:
+            continue
+        allowed = case.get("threshold", default)
+        ratio = result["min_ms"] / case["min_ms"]
+        if ratio > 1 + allowed:
+            regressions.append(
+                {
+                    "name": name,
+                    "baseline_ms": case["min_ms"],
+                    "min_ms": result["min_ms"],
+                    "ratio": ratio,
+                    "threshold": allowed,
+                }
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="성능 회귀 검사 벤치마크")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), help="측정할 항목")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 측정 라운드 수")
+    parser.add_argument(
+        "--baselines", default=str(BASELINES_PATH), help="기준값 JSON 경로"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=None,
+        help="허용 느려짐 비율 (기본: 기준값 파일의 threshold, 0.3 = 30%%)",
+    )
+    parser.add_argument(
+        "--machine", default=None, help="기준값을 구분할 기계 이름 (기본: 호스트/CPU로 생성)"
+    )
+    parser.add_argument(
+        "--update-baselines", action="store_true", help="비교하지 않고 측정 결과로 기준값 갱신"
+    )
+    args = parser.parse_args()
+
+    machine = args.machine or machine_id()
+    results = run(args.only, repeat=args.repeat)
+    baselines = load_baselines(args.baselines, machine)
+    for name, result in results.items():
+        baseline = baselines.get("cases", {}).get(name, {}).get("min_ms")
+        change = f"{result['min_ms'] / baseline - 1:+.0%}" if baseline else "기준 없음"
+        print(
+            f"{name:20s} {result['min_ms']:10.3f} ms  "
+            f"(중앙값 {result['median_ms']:.3f} ms, 기준 대비 {change})"
+        )
+
+    if args.update_baselines:
+        save_baselines(results, args.baselines, args.threshold, machine)
+        print(f"기준값 갱신: {args.baselines} ({machine})")
+        return
+    if not baselines["cases"]:
+        print(f"이 기계({machine})의 기준값 없음: --update-baselines로 먼저 만든다")
+        return
+
+    regressions = compare(results, baselines, args.threshold)
+    for regression in regressions:
+        print(
+            f"느려짐: {regression['name']} {regression['baseline_ms']:.3f} ms -> "
+            f"{regression['min_ms']:.3f} ms ({regression['ratio']:.2f}x, "
+            f"허용 {1 + regression['threshold']:.2f}x)"
+        )
+    if regressions:
+        sys.exit(1)
+    print("기준 대비 느려진 항목 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,53 @@ Option Explicit
 ' === 설정 ===
 Const SERVER_URL As String = "http://localhost:8599"
 Const API_ENDPOINT As String = "/api/generate-email"
+Const STREAM_ENDPOINT As String = "/api/generate-email/stream"
 Const REQUEST_TIMEOUT As Long = 30000  ' 30초
+Const STREAM_IDLE_TIMEOUT As Long = 30000  ' 스트리밍 모드: 새 데이터 없이 기다리는 최대 시간 (30초)
 
 ' ============================================================
 ' 메인 진입점: 이메일 생성
 ' ============================================================
 Sub GenerateEmail()
+    Dim wordEditor As Object
+    Dim json As String
+    If Not PrepareRequest(wordEditor, json) Then Exit Sub
+
+    Dim response As String
+    response = SendRequest(json)
+
+    ' 응답 파싱 후 선택 영역 대체
+    Dim generatedText As String
+    generatedText = ParseResponse(response)
+
+    If Len(generatedText) > 0 Then
+        wordEditor.Application.Selection.Text = generatedText
+    End If
+End Sub
+
+' ============================================================
+' 스트리밍 진입점: 생성되는 텍스트를 도착하는 대로 선택 영역에 입력
+' ============================================================
+Sub GenerateEmailStream()
+    Dim wordEditor As Object
+    Dim json As String
+    If Not PrepareRequest(wordEditor, json) Then Exit Sub
+
+    StreamRequest json, wordEditor.Application.Selection
+End Sub
+
+' ============================================================
+' 요청 준비: 메일 본문/선택 영역/메타데이터 수집 후 JSON 구성
+' ============================================================
+Function PrepareRequest(ByRef wordEditor As Object, ByRef json As String) As Boolean
+    PrepareRequest = False
+
     Dim inspector As Outlook.inspector
     Set inspector = Application.ActiveInspector
 
     If inspector Is Nothing Then
         MsgBox "열려있는 메일 편집기가 없습니다.", vbExclamation
-        Exit Sub
+        Exit Function
     End If
 
     Dim mailItem As Outlook.mailItem
@@ -26,14 +61,13 @@ Sub GenerateEmail()
     fullBody = mailItem.HTMLBody
 
     ' 2. 선택된 텍스트 (Word Editor 사용)
-    Dim wordEditor As Object
     Set wordEditor = inspector.WordEditor
     Dim selectedText As String
     selectedText = wordEditor.Application.Selection.Text
 
     If Len(Trim(selectedText)) = 0 Then
         MsgBox "이메일 본문에서 텍스트를 블록 선택한 후 실행하세요.", vbExclamation
-        Exit Sub
+        Exit Function
     End If
 
     ' 3. 메타데이터
@@ -48,21 +82,10 @@ Sub GenerateEmail()
     Dim additionalPrompt As String
     additionalPrompt = ShowPromptDialog()
 
-    ' 5. JSON 구성 및 전송
-    Dim json As String
+    ' 5. JSON 구성
     json = BuildJson(fullBody, selectedText, toRecipients, subject, isReply, additionalPrompt)
-
-    Dim response As String
-    response = SendRequest(json)
-
-    ' 6. 응답 파싱 후 선택 영역 대체
-    Dim generatedText As String
-    generatedText = ParseResponse(response)
-
-    If Len(generatedText) > 0 Then
-        wordEditor.Application.Selection.Text = generatedText
-    End If
-End Sub
+    PrepareRequest = True
+End Function
 
 ' ============================================================
 ' JSON 빌드
@@ -104,6 +127,87 @@ Function SendRequest(jsonPayload As String) As String
     SendRequest = http.responseText
 End Function
 
+' ============================================================
+' HTTP 스트리밍 전송 (Server-Sent Events)
+' ============================================================
+Sub StreamRequest(jsonPayload As String, selection As Object)
+    Dim http As Object
+    Set http = CreateObject("MSXML2.XMLHTTP.6.0")
+
+    ' 비동기 모드로 열어야 수신 중(readyState 3)에 부분 응답을 읽을 수 있음
+    http.Open "POST", SERVER_URL & STREAM_ENDPOINT, True
+    http.setRequestHeader "Content-Type", "application/json; charset=utf-8"
+    http.setRequestHeader "Accept", "text/event-stream"
+    http.Send jsonPayload
+
+    ' 선택 영역을 비우고 그 위치에 이어서 입력
+    selection.Text = ""
+
+    Dim buffer As String
+    Dim processed As Long
+    Dim eventEnd As Long
+    Dim finished As Boolean
+    Dim lastActivity As Single
+    processed = 0
+    finished = False
+    lastActivity = Timer
+
+    Do
+        DoEvents
+
+        If http.readyState >= 3 Then
+            buffer = http.responseText
+            ' 빈 줄("\n\n")로 끝난 완전한 이벤트만 처리
+            Do
+                eventEnd = InStr(processed + 1, buffer, vbLf & vbLf)
+                If eventEnd = 0 Then Exit Do
+                finished = HandleStreamEvent(Mid(buffer, processed + 1, eventEnd - processed - 1), selection)
+                processed = eventEnd + 1
+                lastActivity = Timer
+                If finished Then Exit Do
+            Loop
+        End If
+
+        If finished Or http.readyState = 4 Then Exit Do
+
+        ' 자정에 Timer가 0으로 돌아가는 경우도 활동으로 간주
+        If Timer < lastActivity Then lastActivity = Timer
+        If (Timer - lastActivity) * 1000 > STREAM_IDLE_TIMEOUT Then
+            http.abort
+            MsgBox "서버 응답이 없습니다 (스트리밍 시간 초과).", vbCritical
+            Exit Do
+        End If
+    Loop
+End Sub
+
+' ============================================================
+' SSE 이벤트 처리. 스트림이 끝났으면 True 반환
+' ============================================================
+Function HandleStreamEvent(eventText As String, selection As Object) As Boolean
+    HandleStreamEvent = False
+
+    Dim eventName As String
+    eventName = "message"
+    If Left(eventText, 7) = "event: " Then
+        eventName = Mid(eventText, 8, InStr(eventText, vbLf) - 8)
+    End If
+
+    Select Case eventName
+        Case "done"
+            HandleStreamEvent = True
+        Case "error"
+            MsgBox "서버 에러: " & ExtractJsonString(eventText, "error_message"), vbCritical
+            HandleStreamEvent = True
+        Case Else
+            Dim chunk As String
+            chunk = ExtractJsonString(eventText, "text")
+            If Len(chunk) > 0 Then
+                selection.InsertAfter chunk
+                selection.Collapse 0  ' wdCollapseEnd: 입력한 텍스트 뒤로 커서 이동
+            End If
+    End Select
+End Function
+
 ' ============================================================
 ' JSON 응답 파싱
 ' ============================================================
@@ -136,6 +240,23 @@ Function ParseResponse(jsonText As String) As String
         Exit Function
     End If
 
+    ParseResponse = ExtractJsonString(jsonText, "generated_text")
+End Function
+
+' ============================================================
+' JSON 문자열 값 추출: "key": "value" 형식에서 value를 이스케이프 복원하여 반환
+' ============================================================
+Function ExtractJsonString(jsonText As String, keyName As String) As String
+    Dim key As String
+    key = """" & keyName & """: """
+
+    Dim startPos As Long
+    startPos = InStr(1, jsonText, key)
+    If startPos = 0 Then
+        ExtractJsonString = ""
+        Exit Function
+    End If
+
     ' 값 시작 위치 (키 + 따옴표 이후)
     Dim valueStart As Long
     valueStart = startPos + Len(key)
@@ -157,17 +278,18 @@ Function ParseResponse(jsonText As String) As String
         i = i + 1
     Loop
 
-    Dim rawValue As String
-    rawValue = Mid(jsonText, valueStart, valueEnd - valueStart)
+    ExtractJsonString = UnescapeJson(Mid(jsonText, valueStart, valueEnd - valueStart))
+End Function
 
+Function UnescapeJson(rawValue As String) As String
     ' JSON 이스케이프 시퀀스 복원
-    rawValue = Replace(rawValue, "\n", vbLf)
-    rawValue = Replace(rawValue, "\r", vbCr)
-    rawValue = Replace(rawValue, "\t", vbTab)
-    rawValue = Replace(rawValue, "\""", """")
-    rawValue = Replace(rawValue, "\\", "\")
-
-    ParseResponse = rawValue
+    Dim result As String
+    result = Replace(rawValue, "\n", vbLf)
+    result = Replace(result, "\r", vbCr)
+    result = Replace(result, "\t", vbTab)
+    result = Replace(result, "\""", """")
+    result = Replace(result, "\\", "\")
+    UnescapeJson = result
 End Function
 
 ' ============================================================
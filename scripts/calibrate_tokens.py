@@ -0,0 +1,50 @@
+"""
+토큰 추정기 보정 CLI
+
+변환된 마크다운 메일 일부를 모델의 count_tokens로 세어 로컬 토큰 추정기의
+보정 계수를 구하고, 모델별로 token_calibration_path에 저장한다.
+프롬프트 토큰 예산(EMAIL_WRITER_PROMPT_TOKEN_BUDGET)을 쓰기 전에 한 번 실행한다.
+
+사용법:
+  python scripts/calibrate_tokens.py
+  python scripts/calibrate_tokens.py --md-dir ./data/converted_md --samples 100
+"""
+import argparse
+import random
+from pathlib import Path
+
+from email_writer.config import Settings
+from email_writer.core.token_estimator import TokenEstimator
+from email_writer.gemini.client import GeminiClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description="토큰 추정기 보정 도구")
+    parser.add_argument("--md-dir", default=None, help="변환된 마크다운 디렉토리 (기본: 설정값)")
+    parser.add_argument("--samples", type=int, default=50, help="보정에 사용할 파일 수")
+    args = parser.parse_args()
+
+    settings = Settings()
+    md_paths = sorted(Path(args.md_dir or settings.md_output_dir).glob("*.md"))
+    if not md_paths:
+        print("보정에 사용할 마크다운 파일이 없습니다. 먼저 prepare_emails.py를 실행하세요.")
+        return
+
+    samples = [
+        path.read_text(encoding="utf-8")
+        for path in random.sample(md_paths, min(args.samples, len(md_paths)))
+    ]
+
+    client = GeminiClient(settings)
+    estimator = TokenEstimator.load(settings.token_calibration_path, settings.gemini_model)
+    previous = estimator.scale
+    scale = estimator.calibrate(samples, client.count_tokens)
+    estimator.save(settings.token_calibration_path, settings.gemini_model)
+
+    print(f"샘플 {len(samples)}개, 모델 {settings.gemini_model}")
+    print(f"보정 계수: {previous:.3f} -> {scale:.3f}")
+    print(f"저장: {settings.token_calibration_path}")
+
+
+if __name__ == "__main__":
+    main()
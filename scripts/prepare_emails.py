@@ -1,15 +1,32 @@
 """
 MSG 파일 변환 + Gemini File Search Store 등록 CLI
 
+변환이 끝난 파일부터 바로 업로드하므로 변환(CPU)과 업로드(네트워크)가 함께 진행된다.
+매니페스트(SQLite)에 파일별 내용 해시와 업로드 상태를 기록하므로,
+재실행 시 새로 추가되거나 변경된 파일만 변환/업로드하고
+원본이 사라진 파일은 Store에서 삭제한다. --bundle을 주면 짧은 메일을 수신 도메인
+(또는 월)별 묶음 문서로 합쳐 올리고, 구성 메일이 바뀐 묶음만 다시 만든다.
+마지막으로 변환된 전체 메일로 로컬 검색 인덱스(retrieval_mode가 local/hybrid일 때 사용)를
+다시 만든다.
+
 사용법:
   python scripts/prepare_emails.py --msg-dir ./data/msg_files
   python scripts/prepare_emails.py --msg-dir ./data/msg_files --store-name "my-email-store"
+  python scripts/prepare_emails.py --msg-dir ./data/msg_files --workers 8
+  python scripts/prepare_emails.py --msg-dir ./data/msg_files --full
+  python scripts/prepare_emails.py --msg-dir ./data/msg_files --skip-index
+  python scripts/prepare_emails.py --msg-dir ./data/msg_files --dedup --dedup-threshold 0.9
+  python scripts/prepare_emails.py --msg-dir ./data/msg_files --bundle --bundle-group-by month
 """
 import argparse
+from pathlib import Path
 
 from email_writer.config import Settings
+from email_writer.converter.manifest import UPLOAD_DUPLICATE, ConversionManifest
 from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from email_writer.converter.pipeline import IngestPipeline
 from email_writer.gemini.file_search import FileSearchManager
+from email_writer.retrieval.index import RetrievalIndex
 
 
 def main():
@@ -19,32 +36,124 @@ def main():
         "--output-dir", default="./data/converted_md", help="변환 출력 디렉토리"
     )
     parser.add_argument(
-        "--store-name", default=None, help="기존 File Search Store 이름 (없으면 새로 생성)"
+        "--store-name", default=None,
+        help="기존 File Search Store 이름 (없으면 매니페스트의 Store, 그것도 없으면 새로 생성)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="병렬 변환 워커 수 (기본: 설정값, 0이면 CPU 코어 수)",
+    )
+    parser.add_argument(
+        "--upload-concurrency", type=int, default=None,
+        help="동시 업로드 작업 수 (기본: 설정값)",
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=None,
+        help="변환 후 업로드 대기 큐 크기 (기본: 설정값)",
+    )
+    parser.add_argument(
+        "--dedup", action=argparse.BooleanOptionalAction, default=None,
+        help="유사 중복 메일 제외 (기본: 설정값)",
+    )
+    parser.add_argument(
+        "--dedup-threshold", type=float, default=None,
+        help="중복으로 볼 유사도 (0~1, 기본: 설정값)",
+    )
+    parser.add_argument(
+        "--bundle", action=argparse.BooleanOptionalAction, default=None,
+        help="짧은 메일을 묶음 문서로 합쳐 업로드 (기본: 설정값)",
+    )
+    parser.add_argument(
+        "--bundle-group-by", choices=["recipient", "month"], default=None,
+        help="묶음 기준: 수신 도메인 또는 월 (기본: 설정값)",
+    )
+    parser.add_argument(
+        "--manifest", default=None, help="매니페스트 경로 (기본: 설정값)"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="매니페스트를 무시하고 전체 재변환/재업로드"
+    )
+    parser.add_argument(
+        "--index-dir", default=None, help="로컬 검색 인덱스 디렉토리 (기본: 설정값)"
+    )
+    parser.add_argument(
+        "--skip-index", action="store_true", help="로컬 검색 인덱스를 만들지 않음"
     )
     args = parser.parse_args()
 
     settings = Settings()
+    if args.dedup_threshold is not None:
+        settings = settings.model_copy(update={"dedup_threshold": args.dedup_threshold})
+    if args.bundle_group_by is not None:
+        settings = settings.model_copy(update={"bundle_group_by": args.bundle_group_by})
+    manifest = ConversionManifest(args.manifest or settings.manifest_path)
 
-    # 1. MSG -> Markdown 일괄 변환
-    converter = MsgToMarkdownConverter(settings)
-    metadata_list = converter.convert_batch(args.msg_dir, args.output_dir)
-    print(f"변환 완료: {len(metadata_list)}개 파일")
+    # 1. 변경분 확인
+    msg_paths = sorted(Path(args.msg_dir).glob("*.msg"))
+    plan = manifest.plan(msg_paths, force=args.full)
+    print(
+        f"신규 {len(plan.new)}개, 변경 {len(plan.changed)}개, "
+        f"변경 없음 {len(plan.unchanged)}개, 삭제 {len(plan.removed)}개"
+    )
 
     # 2. File Search Store 생성 또는 기존 사용
     fs_manager = FileSearchManager(settings)
-    if args.store_name:
-        store_name = args.store_name
-    else:
+    store_name = args.store_name or manifest.get_store_name()
+    if not store_name:
         store_name = fs_manager.create_store("email-patterns")
         print(f"Store 생성: {store_name}")
+    manifest.set_store_name(store_name)
+
+    pipeline = IngestPipeline(
+        MsgToMarkdownConverter(settings),
+        fs_manager,
+        manifest,
+        store_name,
+        queue_size=args.queue_size,
+        report=print,
+        dedup=args.dedup,
+        bundle=args.bundle,
+    )
+
+    # 3. 원본이 사라진 파일 정리 (묶음에 들어 있던 메일이면 그 묶음을 해제)
+    pipeline.remove_sources(plan.removed)
+
+    # 4. 변환(신규/변경 파일)과 업로드(변환 완료분 + 이전 미완료분)를 겹쳐 실행
+    summary = pipeline.run(
+        plan,
+        args.output_dir,
+        workers=args.workers,
+        upload_concurrency=args.upload_concurrency,
+    )
+    print(
+        f"변환 {summary.converted}개 (실패 {summary.convert_failed}개), "
+        f"업로드 {summary.uploaded}개 (실패 {summary.upload_failed}개), "
+        f"중복 제외 {summary.duplicates}개, "
+        f"묶음 {summary.bundles}개 ({summary.bundled}개 메일), "
+        f"{summary.elapsed:.1f}초"
+    )
+    if summary.original_chars:
+        saved = 1 - summary.markdown_chars / summary.original_chars
+        print(
+            f"본문 크기: {summary.original_chars:,}자 -> {summary.markdown_chars:,}자 "
+            f"(인용/서명 제거로 {saved:.0%} 감소)"
+        )
+
+    # 5. 로컬 검색 인덱스 재생성 (변환된 전체 메일 대상)
+    if not args.skip_index:
+        index_dir = args.index_dir or settings.retrieval_index_dir
+        items = [
+            entry.metadata
+            for entry in manifest.entries()
+            if entry.upload_status != UPLOAD_DUPLICATE and Path(entry.markdown_path).is_file()
+        ]
+        index = RetrievalIndex.build(items, index_dir, vectors=settings.retrieval_vectors)
+        print(f"검색 인덱스 생성: {len(index)}개 메일 -> {index_dir}")
 
-    # 3. 변환된 파일 업로드
-    for metadata in metadata_list:
-        fs_manager.upload_markdown(store_name, metadata.markdown_path, metadata)
-        print(f"업로드: {metadata.file_name}")
+    manifest.close()
 
-    # 4. Store 이름 안내
-    print(f"\n완료! .env 파일에 다음을 추가하세요:")
+    # 6. Store 이름 안내
+    print("\n완료! .env 파일에 다음을 추가하세요:")
     print(f"EMAIL_WRITER_FILE_SEARCH_STORE_NAME={store_name}")
 
 
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -5,20 +7,102 @@ class Settings(BaseSettings):
     # Gemini API
     gemini_api_key: str
     gemini_model: str = "gemini-2.5-flash"
+    gemini_temperature: float = 0.7
+    gemini_base_url: str = ""  # 지정하면 이 주소로 API 호출 (로컬 가짜 서버 등, 비우면 기본 주소)
+    gemini_timeout: float = 0.0  # API 요청 타임아웃 (초, 0이면 SDK 기본값)
 
     # File Search Store
     file_search_store_name: str = ""
 
+    # 참고 메일 검색 방식
+    # file_search: Gemini File Search 도구, local: 로컬 인덱스 검색 결과를 프롬프트에 포함,
+    # hybrid: 둘 다 사용
+    retrieval_mode: Literal["file_search", "local", "hybrid"] = "file_search"
+    retrieval_index_dir: str = "./data/retrieval_index"  # 로컬 검색 인덱스 (prepare_emails.py)
+    retrieval_top_k: int = 3  # 프롬프트에 포함할 참고 메일 수
+    retrieval_vectors: bool = True  # 인덱스 생성 시 해시 임베딩 벡터도 저장
+    retrieval_vector_weight: float = 0.3  # 검색 점수 중 벡터 유사도 비율
+    retrieval_example_chars: int = 1500  # 참고 메일 1건당 최대 글자 수
+
+    # Gemini 컨텍스트 캐시 (시스템 지시문/File Search 도구/대표 예시 메일을 캐시에 두고 참조)
+    # 모델별 최소 캐시 토큰 수(예: 1024)를 넘도록 대표 예시 메일을 함께 넣어야 생성된다
+    context_cache_enabled: bool = False
+    context_cache_ttl: int = 3600  # 캐시 TTL (초)
+    context_cache_refresh_margin: int = 300  # 만료까지 이 시간(초)보다 적게 남으면 TTL 연장
+    context_cache_exemplar_dir: str = ""  # 캐시에 넣을 대표 예시 메일(.md) 디렉토리
+    context_cache_max_exemplars: int = 20  # 캐시에 넣을 최대 예시 메일 수
+
+    # File Search 메타데이터 필터 (업로드 매니페스트로 조건별 문서 수를 확인)
+    metadata_filter_enabled: bool = False  # 요청의 수신자/회신 여부로 검색 범위 제한
+    metadata_filter_same_domain: bool = True  # 같은 수신자 도메인의 메일만 검색
+    metadata_filter_same_reply: bool = True  # 회신 여부가 같은 메일만 검색
+    metadata_filter_recent_years: int = 3  # 최근 N년 메일만 검색 (0이면 기간 제한 없음)
+    metadata_filter_min_documents: int = 50  # 필터 결과가 이보다 적으면 조건을 완화
+
     # 서버
     server_host: str = "127.0.0.1"
     server_port: int = 8599
+    generation_concurrency: int = 16  # 프로세스당 동시 Gemini 생성 호출 수
+    coalesce_requests: bool = True  # 동일 프롬프트의 동시 요청이 Gemini 호출 1건을 공유
+    # 후보 초안 생성 방식: parallel(온도를 달리한 동시 호출), candidate_count(한 번의 호출)
+    candidate_strategy: Literal["parallel", "candidate_count"] = "parallel"
+    candidate_temperature_spread: float = 0.4  # parallel 방식의 후보별 온도 범위 (기본 온도 중심)
+    batch_max_requests: int = 20  # 일괄 생성 요청당 최대 메일 수
+    batch_concurrency: int = 4  # 일괄 생성 요청 1건 안에서 동시에 생성하는 메일 수
+    server_timing_header: bool = False  # 생성 응답에 단계별 소요 시간 Server-Timing 헤더 추가
+
+    # Gemini HTTP 연결
+    http_max_connections: int = 32  # 연결 풀 최대 연결 수
+    http_max_keepalive_connections: int = 16  # 유휴 상태로 유지할 최대 연결 수
+    http_keepalive_expiry: float = 120.0  # 유휴 연결 유지 시간 (초)
+    warmup_on_startup: bool = True  # 서버 시작 시 API 연결을 미리 열어 둠
+    keepalive_interval: float = 60.0  # 유휴 연결 유지용 요청 간격 (초, 0이면 끔)
 
     # 변환
     msg_input_dir: str = "./data/msg_files"
     md_output_dir: str = "./data/converted_md"
+    convert_workers: int = 0  # 병렬 변환 워커 수 (0이면 CPU 코어 수)
+    msg_single_parse: bool = True  # False면 MarkItDown + extract-msg 2회 파싱 경로 사용
+    md_strip_quoted: bool = True  # 인용된 이전 메일, 서명, 면책 문구를 빼고 작성 본문만 저장
+    md_keep_stripped: bool = False  # 뺀 부분을 <파일명>.stripped.txt로 함께 저장
+    manifest_path: str = "./data/manifest.sqlite3"  # 증분 변환/업로드 매니페스트
+    upload_concurrency: int = 8  # File Search 동시 업로드 작업 수
+    upload_poll_initial: float = 0.1  # 업로드 상태 첫 폴링 간격 (초)
+    upload_poll_max: float = 5.0  # 업로드 상태 최대 폴링 간격 (초)
+    upload_poll_multiplier: float = 1.5  # 폴링 간격 증가 배수
+    upload_poll_jitter: float = 0.2  # 폴링 간격 지터 비율 (±)
+    ingest_queue_size: int = 64  # 변환 후 업로드를 기다리는 파일 수 상한 (백프레셔)
+
+    # 유사 중복 제외 (업로드 전 MinHash 서명 + LSH로 묶어 묶음마다 가장 긴 메일만 업로드)
+    dedup_enabled: bool = False
+    dedup_threshold: float = 0.85  # 중복으로 볼 추정 Jaccard 유사도
+    dedup_num_perm: int = 128  # MinHash 서명 길이
+    dedup_shingle_size: int = 5  # 문자 shingle 길이
+
+    # 작은 메일 묶음 업로드 (짧은 메일을 그룹별로 합쳐 업로드 문서 수를 줄임)
+    bundle_enabled: bool = False
+    bundle_group_by: Literal["recipient", "month"] = "recipient"  # 수신 도메인 또는 월별로 묶음
+    bundle_max_chars: int = 20000  # 묶음 문서 1개의 최대 글자 수
+    bundle_small_chars: int = 4000  # 이 글자 수 이하인 메일만 묶음
+    bundle_dir: str = "./data/bundles"  # 묶음 마크다운 저장 디렉토리
+
+    # 응답 캐시 (동일 요청 재시도 시 Gemini 호출 생략)
+    response_cache_enabled: bool = False
+    response_cache_max_entries: int = 256
+    response_cache_ttl: float = 3600.0  # 초
+    response_cache_path: str = ""  # 지정 시 SQLite 파일에 저장 (재시작 후에도 유지)
 
     # 프롬프트 설정
     max_context_length: int = 8000
+    context_compaction: bool = True  # 인용 스레드를 메일 단위로 나눠 최근 메일부터 채움
+    context_scan_length: int = 32000  # 압축 전 HTML 본문에서 추출할 최대 글자 수
+    prompt_token_budget: int = 0  # 프롬프트 전체 추정 토큰 예산 (0이면 글자 수 기준만 적용)
+    selected_text_token_budget: int = 1000  # 작성 요지/키워드 최대 토큰
+    additional_prompt_token_budget: int = 500  # 추가 지시사항 최대 토큰
+    examples_token_budget: int = 1500  # 로컬 검색 참고 메일 최대 토큰
+    subject_token_budget: int = 100  # 제목 최대 토큰
+    recipients_token_budget: int = 200  # 수신자 목록 최대 토큰
+    token_calibration_path: str = "./data/token_calibration.json"  # 모델별 토큰 추정 보정 계수
     default_language: str = "ko"
 
     model_config = {"env_file": ".env", "env_prefix": "EMAIL_WRITER_"}
@@ -0,0 +1,126 @@
+import hashlib
+import re
+from pathlib import Path
+
+from email_writer.core.metadata_filter import recipient_domain
+from email_writer.models.email_metadata import EmailMetadata
+
+# 묶음 문서의 메일 구분선
+BUNDLE_SEPARATOR = "\n\n---\n\n"
+
+# 업로드 메타데이터에 넣는 받는 사람 목록 최대 길이
+_MAX_RECIPIENTS_CHARS = 200
+
+_HEADING = re.compile(r"^(#+) ", re.MULTILINE)
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def group_key(metadata: EmailMetadata, group_by: str) -> str:
+    """묶음 그룹 키 (수신 도메인 또는 월 + 회신 여부, 메타데이터 필터와 어긋나지 않도록)"""
+    if group_by == "month":
+        base = metadata.date.strftime("%Y-%m") if metadata.date else "unknown"
+    else:
+        base = recipient_domain(metadata.recipients) or "unknown"
+    return f"{base}-{'reply' if metadata.is_reply else 'new'}"
+
+
+def bundle_id(key: str, source_paths: list[str]) -> str:
+    """묶음 식별자 (그룹 키 + 구성 파일 해시, 구성이 바뀌면 달라짐)"""
+    digest = hashlib.sha1("\n".join(sorted(source_paths)).encode("utf-8")).hexdigest()
+    return f"bundle-{_UNSAFE.sub('_', key)}-{digest[:10]}"
+
+
+def render_bundle(key: str, members: list[EmailMetadata]) -> str:
+    """메일들을 하나의 마크다운 문서로 합침.
+
+    메일마다 구분선과 번호/제목/파일명/날짜 헤더를 두고, 원래 마크다운의 제목 수준을
+    한 단계씩 내려 검색 결과 조각만 보고도 어느 메일인지 알 수 있게 한다.
+    """
+    parts = [f"# 메일 묶음: {key} ({len(members)}건)"]
+    for number, metadata in enumerate(members, start=1):
+        text = Path(metadata.markdown_path).read_text(encoding="utf-8").strip()
+        # 원래 첫 제목("# Email Message")은 메일 번호와 제목으로 대체
+        if _HEADING.match(text):
+            text = text.partition("\n")[2].lstrip("\n")
+        text = _HEADING.sub(lambda m: f"#{m.group(1)} ", text)
+        header = f"## [{number}] {metadata.subject or metadata.file_name}\n\n"
+        header += f"**File:** {metadata.file_name}\n"
+        if metadata.date:
+            header += f"**Date:** {metadata.date.isoformat()}\n"
+        parts.append(f"{header}\n{text}")
+    return BUNDLE_SEPARATOR.join(parts) + "\n"
+
+
+def bundle_metadata(key: str, members: list[EmailMetadata], markdown_path: str) -> EmailMetadata:
+    """묶음 문서 업로드용 메타데이터 (날짜는 가장 최근 메일 기준)"""
+    dates = [m.date for m in members if m.date]
+    senders = {m.sender for m in members}
+    recipients = "; ".join(dict.fromkeys(m.recipients for m in members if m.recipients))
+    return EmailMetadata(
+        file_name=Path(markdown_path).name,
+        subject=f"메일 묶음 {len(members)}건 ({key})",
+        sender=senders.pop() if len(senders) == 1 else members[0].sender,
+        recipients=recipients[:_MAX_RECIPIENTS_CHARS],
+        date=max(dates, key=lambda date: date.timestamp()) if dates else None,
+        is_reply=members[0].is_reply,
+        has_attachments=any(m.has_attachments for m in members),
+        markdown_path=markdown_path,
+        original_chars=sum(m.original_chars for m in members),
+        markdown_chars=sum(m.markdown_chars for m in members),
+    )
+
+
+class PendingBundle:
+    """아직 업로드하지 않은 묶음 1개 (그룹 키와 구성 메일)"""
+
+    def __init__(self, key: str):
+        self.key = key
+        # (원본 경로, 메타데이터, 글자 수)
+        self.members: list[tuple[str, EmailMetadata, int]] = []
+
+    @property
+    def chars(self) -> int:
+        return sum(chars for _, _, chars in self.members)
+
+    @property
+    def source_paths(self) -> list[str]:
+        return [source_path for source_path, _, _ in self.members]
+
+    @property
+    def metadata(self) -> list[EmailMetadata]:
+        return [metadata for _, metadata, _ in self.members]
+
+
+class BundleBuilder:
+    """작은 메일을 그룹별로 모아 max_chars를 넘지 않는 묶음으로 만듦"""
+
+    def __init__(self, max_chars: int, group_by: str = "recipient"):
+        self.max_chars = max_chars
+        self.group_by = group_by
+        self._open: dict[str, PendingBundle] = {}
+
+    def add(self, source_path: str, metadata: EmailMetadata, chars: int) -> PendingBundle | None:
+        """메일 추가. 넣으면 max_chars를 넘는 경우 기존 묶음을 닫아 반환"""
+        key = group_key(metadata, self.group_by)
+        sealed = None
+        bundle = self._open.get(key)
+        if bundle and bundle.members and bundle.chars + chars > self.max_chars:
+            sealed = self._open.pop(key)
+            bundle = None
+        if bundle is None:
+            bundle = self._open[key] = PendingBundle(key)
+        bundle.members.append((source_path, metadata, chars))
+        return sealed
+
+    def discard(self, source_path: str) -> None:
+        """아직 닫히지 않은 묶음에서 메일 제외"""
+        for key, bundle in list(self._open.items()):
+            bundle.members = [m for m in bundle.members if m[0] != source_path]
+            if not bundle.members:
+                del self._open[key]
+
+    def flush(self) -> list[PendingBundle]:
+        """남은 묶음을 모두 닫아 반환"""
+        bundles = list(self._open.values())
+        self._open.clear()
+        return bundles
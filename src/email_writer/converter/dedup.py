@@ -0,0 +1,138 @@
+import re
+import zlib
+from collections import defaultdict
+from collections.abc import Hashable
+
+import numpy as np
+
+# MinHash 순열 해시 (a * x + b) mod p 에 쓰는 메르센 소수와 32비트 마스크
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# LSH 파라미터 선택 시 오탐/누락 가중치
+_FALSE_POSITIVE_WEIGHT = 0.1
+_FALSE_NEGATIVE_WEIGHT = 0.9
+
+# 서명 계산 시 한 번에 처리하는 shingle 수
+_CHUNK = 4096
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def shingles(text: str, size: int = 5) -> set[str]:
+    """공백을 정규화한 소문자 텍스트의 문자 size-gram 집합 (짧으면 전체 1개)"""
+    normalized = _WHITESPACE.sub(" ", text.lower()).strip()
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+class MinHasher:
+    """문자 shingle 집합의 MinHash 서명 생성기.
+
+    두 서명에서 값이 같은 위치의 비율이 두 문서 shingle 집합의 Jaccard 유사도
+    추정치가 된다. 해시 계수는 seed로 고정되므로 실행이 달라도 서명을 비교할 수 있다.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        prime = int(_MERSENNE_PRIME)
+        self._a = rng.integers(1, prime, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, prime, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """텍스트의 MinHash 서명 (uint32, 길이 num_perm)"""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles(text, self.shingle_size)),
+            dtype=np.uint64,
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, int(_MAX_HASH), dtype=np.uint32)
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # 긴 메일도 (num_perm x 청크) 크기 행렬만 쓰도록 나누어 최솟값 누적
+        for start in range(0, hashes.size, _CHUNK):
+            chunk = hashes[start : start + _CHUNK]
+            # uint64 곱셈은 2^64에서 순환하며, 순열 해시로 쓰기에는 충분하다
+            permuted = ((self._a * chunk + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+
+def lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """Jaccard 임계값에 맞는 LSH 밴드 수와 밴드당 행 수.
+
+    후보가 될 확률 1 - (1 - s^r)^b 곡선에서, 임계값 아래의 오탐 면적과
+    임계값 위의 누락 면적의 가중합이 가장 작은 (b, r)을 고른다. 후보는 서명 비교로
+    다시 걸러지므로 오탐은 비교 한 번의 비용이지만 누락은 중복이 그대로 업로드된다.
+    """
+    # 구간 중점에서의 평균값 * 구간 길이로 면적 근사
+    below = (np.arange(200) + 0.5) / 200 * threshold
+    above = threshold + (np.arange(200) + 0.5) / 200 * (1.0 - threshold)
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positive = np.mean(1 - (1 - below**rows) ** bands) * threshold
+        false_negative = np.mean((1 - above**rows) ** bands) * (1.0 - threshold)
+        error = _FALSE_POSITIVE_WEIGHT * false_positive + _FALSE_NEGATIVE_WEIGHT * false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    """MinHash 서명의 LSH 인덱스 (유사 중복 후보 검색).
+
+    서명을 밴드로 나누어 밴드가 하나라도 같은 문서를 후보로 찾고,
+    후보마다 서명 일치 비율로 유사도를 다시 계산해 임계값 이상만 돌려준다.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._buckets: list[dict[bytes, set[Hashable]]] = [
+            defaultdict(set) for _ in range(self.bands)
+        ]
+        self._signatures: dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            bucket[band].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            keys = bucket[band]
+            keys.discard(key)
+            if not keys:
+                del bucket[band]
+
+    def query(self, signature: np.ndarray) -> list[tuple[Hashable, float]]:
+        """유사도가 임계값 이상인 문서 (유사도 내림차순)"""
+        candidates = set()
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            candidates.update(bucket.get(band, ()))
+        matches = []
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def _bands(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[i * self.rows : (i + 1) * self.rows].tobytes() for i in range(self.bands)
+        ]
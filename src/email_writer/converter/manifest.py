@@ -0,0 +1,487 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from email_writer.models.email_metadata import EmailMetadata
+
+UPLOAD_PENDING = "pending"
+UPLOAD_DONE = "uploaded"
+UPLOAD_FAILED = "failed"
+# 다른 메일(대표 메일)의 유사 중복이라 업로드하지 않음
+UPLOAD_DUPLICATE = "duplicate"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    source_path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    markdown_path TEXT NOT NULL,
+    metadata_json TEXT NOT NULL,
+    store_name TEXT,
+    document_name TEXT,
+    upload_status TEXT NOT NULL,
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    upload_metadata_json TEXT
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    source_path TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    text_length INTEGER NOT NULL,
+    duplicate_of TEXT
+);
+CREATE TABLE IF NOT EXISTS bundles (
+    bundle_id TEXT PRIMARY KEY,
+    markdown_path TEXT NOT NULL,
+    store_name TEXT,
+    document_name TEXT,
+    upload_status TEXT NOT NULL,
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    upload_metadata_json TEXT
+);
+CREATE TABLE IF NOT EXISTS bundle_members (
+    source_path TEXT PRIMARY KEY,
+    bundle_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# 이전 버전 매니페스트에 없는 열 (테이블 -> 열 이름과 정의)
+_ADDED_COLUMNS = {
+    "files": {"upload_metadata_json": "TEXT"},
+    "bundles": {"upload_metadata_json": "TEXT"},
+}
+
+
+class ManifestEntry(BaseModel):
+    """매니페스트에 기록된 원본 MSG 파일 1건"""
+
+    source_path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    markdown_path: str
+    metadata: EmailMetadata
+    store_name: str | None = None
+    document_name: str | None = None
+    upload_status: str = UPLOAD_PENDING
+    error: str | None = None
+
+
+class BundleEntry(BaseModel):
+    """여러 메일을 합쳐 업로드한 묶음 문서 1건"""
+
+    bundle_id: str
+    markdown_path: str
+    members: list[str] = Field(default_factory=list)
+    store_name: str | None = None
+    document_name: str | None = None
+    upload_status: str = UPLOAD_PENDING
+    error: str | None = None
+
+
+class ManifestPlan(BaseModel):
+    """디렉토리 스캔 결과: 변환이 필요한 파일과 사라진 파일"""
+
+    new: list[str] = Field(default_factory=list)
+    changed: list[str] = Field(default_factory=list)
+    unchanged: list[str] = Field(default_factory=list)
+    removed: list[ManifestEntry] = Field(default_factory=list)
+    # 변환 대상 파일의 내용 해시 (record_conversion에 그대로 전달)
+    hashes: dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def to_convert(self) -> list[str]:
+        return self.new + self.changed
+
+
+def hash_file(path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """변환/업로드 상태를 기록하는 로컬 SQLite 매니페스트.
+
+    원본 MSG 파일별로 내용 해시, 출력 마크다운 경로, 메타데이터,
+    File Search 업로드 상태를 저장하여 재실행 시 변경분만 처리할 수 있게 한다.
+    크기와 수정 시각이 그대로인 파일은 해시 계산 없이 변경 없음으로 본다.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ConversionManifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def plan(self, msg_paths: list[str | Path], force: bool = False) -> ManifestPlan:
+        """현재 MSG 파일 목록을 매니페스트와 비교하여 처리 계획 수립.
+
+        Args:
+            msg_paths: 현재 디렉토리의 MSG 파일 경로 목록
+            force: True면 모든 파일을 변경된 것으로 취급
+        """
+        plan = ManifestPlan()
+        known = {entry.source_path: entry for entry in self.entries()}
+        seen = set()
+
+        for path in msg_paths:
+            source_path = str(Path(path).resolve())
+            seen.add(source_path)
+            stat = Path(source_path).stat()
+            entry = known.get(source_path)
+
+            if entry is None:
+                plan.new.append(source_path)
+                plan.hashes[source_path] = hash_file(source_path)
+                continue
+
+            if not force and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                plan.unchanged.append(source_path)
+                continue
+
+            content_hash = hash_file(source_path)
+            if not force and content_hash == entry.content_hash:
+                # 내용은 같고 수정 시각만 바뀐 경우: 다음 실행부터 해시 계산 생략
+                self._touch(source_path, stat.st_size, stat.st_mtime_ns)
+                plan.unchanged.append(source_path)
+            else:
+                plan.changed.append(source_path)
+                plan.hashes[source_path] = content_hash
+
+        plan.removed = [entry for path, entry in known.items() if path not in seen]
+        return plan
+
+    def record_conversion(
+        self, source_path: str, content_hash: str, metadata: EmailMetadata
+    ) -> None:
+        """변환 결과 기록. 업로드 상태는 pending으로 되돌린다.
+
+        이전 버전의 document_name은 유지하므로 업로드 단계에서 교체 대상으로 삭제할 수 있다.
+        """
+        stat = Path(source_path).stat()
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.execute(
+            """
+            INSERT INTO files (source_path, size, mtime_ns, content_hash, markdown_path,
+                               metadata_json, upload_status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_path) DO UPDATE SET
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                content_hash = excluded.content_hash,
+                markdown_path = excluded.markdown_path,
+                metadata_json = excluded.metadata_json,
+                upload_status = excluded.upload_status,
+                error = NULL,
+                updated_at = excluded.updated_at,
+                upload_metadata_json = NULL
+            """,
+            (
+                source_path,
+                stat.st_size,
+                stat.st_mtime_ns,
+                content_hash,
+                metadata.markdown_path,
+                metadata.model_dump_json(),
+                UPLOAD_PENDING,
+                now,
+            ),
+        )
+        # 내용이 바뀌었으므로 중복 판정을 처음부터 다시 함
+        self._forget_signature(source_path)
+        self.conn.commit()
+
+    def pending_uploads(self, store_name: str) -> list[ManifestEntry]:
+        """업로드가 필요한 항목 (미업로드/실패/다른 Store에 업로드된 항목, 중복 제외)"""
+        return [
+            entry
+            for entry in self.entries()
+            if entry.upload_status != UPLOAD_DUPLICATE
+            and (entry.upload_status != UPLOAD_DONE or entry.store_name != store_name)
+        ]
+
+    def mark_uploaded(self, source_path: str, store_name: str, document_name: str | None) -> None:
+        """업로드 완료. 업로드한 메타데이터(File Search 필터 키의 원본)도 함께 기록"""
+        self.conn.execute(
+            "UPDATE files SET upload_metadata_json = metadata_json WHERE source_path = ?",
+            (source_path,),
+        )
+        self._update(
+            source_path,
+            store_name=store_name,
+            document_name=document_name,
+            upload_status=UPLOAD_DONE,
+            error=None,
+        )
+
+    def clear_document(self, source_path: str) -> None:
+        """Store에서 삭제된 이전 버전 문서 정보 제거"""
+        self._update(
+            source_path, store_name=None, document_name=None, upload_metadata_json=None
+        )
+
+    def mark_upload_failed(self, source_path: str, error: str) -> None:
+        self._update(source_path, upload_status=UPLOAD_FAILED, error=error)
+
+    def mark_duplicate(self, source_path: str, representative: str) -> None:
+        """유사 중복으로 표시. 이 메일을 대표로 삼던 중복들도 새 대표를 가리키게 함"""
+        self.conn.execute(
+            "UPDATE signatures SET duplicate_of = ? WHERE source_path = ? OR duplicate_of = ?",
+            (representative, source_path, source_path),
+        )
+        self._update(source_path, upload_status=UPLOAD_DUPLICATE, error=None)
+
+    def save_signature(self, source_path: str, signature: bytes, text_length: int) -> None:
+        """중복 판정용 MinHash 서명 저장"""
+        self.conn.execute(
+            """
+            INSERT INTO signatures (source_path, signature, text_length) VALUES (?, ?, ?)
+            ON CONFLICT(source_path) DO UPDATE SET
+                signature = excluded.signature,
+                text_length = excluded.text_length
+            """,
+            (source_path, signature, text_length),
+        )
+        self.conn.commit()
+
+    def signatures(self) -> dict[str, tuple[bytes, int]]:
+        """저장된 MinHash 서명 (원본 경로 -> (서명, 텍스트 길이))"""
+        rows = self.conn.execute("SELECT source_path, signature, text_length FROM signatures")
+        return {row["source_path"]: (row["signature"], row["text_length"]) for row in rows}
+
+    def duplicate_of(self, source_path: str) -> str | None:
+        """중복으로 제외된 메일의 대표 메일 원본 경로"""
+        row = self.conn.execute(
+            "SELECT duplicate_of FROM signatures WHERE source_path = ?", (source_path,)
+        ).fetchone()
+        return row["duplicate_of"] if row else None
+
+    def remove(self, source_path: str) -> None:
+        self.conn.execute("DELETE FROM files WHERE source_path = ?", (source_path,))
+        self.conn.execute("DELETE FROM bundle_members WHERE source_path = ?", (source_path,))
+        self._forget_signature(source_path)
+        self.conn.commit()
+
+    def record_bundle(self, bundle_id: str, markdown_path: str, members: list[str]) -> None:
+        """묶음 문서와 구성 메일 기록 (업로드 대기 상태)"""
+        now = datetime.now(timezone.utc).isoformat()
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO bundles (bundle_id, markdown_path, upload_status, updated_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (bundle_id, markdown_path, UPLOAD_PENDING, now),
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO bundle_members (source_path, bundle_id) VALUES (?, ?)",
+            [(source_path, bundle_id) for source_path in members],
+        )
+        self.conn.commit()
+
+    def mark_bundle_uploaded(
+        self, bundle_id: str, store_name: str, document_name: str, metadata: EmailMetadata
+    ) -> None:
+        """묶음 업로드 완료. 구성 메일도 업로드된 것으로 표시 (중복 제외된 메일은 그대로)
+
+        metadata는 묶음 문서를 올릴 때 쓴 메타데이터 (구성 메일을 합친 값)
+        """
+        self._update_bundle(
+            bundle_id,
+            store_name=store_name,
+            document_name=document_name,
+            upload_status=UPLOAD_DONE,
+            error=None,
+            upload_metadata_json=metadata.model_dump_json(),
+        )
+        self._update_members(
+            bundle_id, store_name=store_name, document_name=None, upload_status=UPLOAD_DONE,
+            error=None, upload_metadata_json=None,
+        )
+        self.conn.commit()
+
+    def mark_bundle_failed(self, bundle_id: str, error: str) -> None:
+        self._update_bundle(bundle_id, upload_status=UPLOAD_FAILED, error=error)
+        self._update_members(bundle_id, upload_status=UPLOAD_FAILED, error=error)
+        self.conn.commit()
+
+    def release_bundle(self, bundle_id: str) -> None:
+        """묶음 해제: 기록을 지우고 구성 메일을 다시 업로드 대기로 돌림"""
+        self._update_members(
+            bundle_id, store_name=None, document_name=None, upload_status=UPLOAD_PENDING
+        )
+        self.conn.execute("DELETE FROM bundle_members WHERE bundle_id = ?", (bundle_id,))
+        self.conn.execute("DELETE FROM bundles WHERE bundle_id = ?", (bundle_id,))
+        self.conn.commit()
+
+    def bundles(self) -> list[BundleEntry]:
+        rows = self.conn.execute("SELECT * FROM bundles ORDER BY bundle_id").fetchall()
+        return [self._to_bundle(row) for row in rows]
+
+    def bundle_of(self, source_path: str) -> BundleEntry | None:
+        """메일이 들어 있는 묶음 (없으면 None)"""
+        row = self.conn.execute(
+            """
+            SELECT bundles.* FROM bundles
+            JOIN bundle_members ON bundle_members.bundle_id = bundles.bundle_id
+            WHERE bundle_members.source_path = ?
+            """,
+            (source_path,),
+        ).fetchone()
+        return self._to_bundle(row) if row else None
+
+    def uploaded_documents(self, store_name: str) -> list[EmailMetadata]:
+        """Store에 올라간 문서별 업로드 메타데이터 (File Search 필터 대상 문서 수 계산용)
+
+        묶음은 구성 메일이 아니라 묶음 문서 1건(합친 메타데이터)으로 센다. 업로드 메타데이터가
+        기록되기 전 버전으로 올린 문서는 필터 키(recipient_domain, date_ymd)가 없어
+        필터에 걸리지 않으므로 제외한다.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT upload_metadata_json FROM files
+            WHERE upload_status = ? AND store_name = ? AND upload_metadata_json IS NOT NULL
+                AND source_path NOT IN (SELECT source_path FROM bundle_members)
+            UNION ALL
+            SELECT upload_metadata_json FROM bundles
+            WHERE upload_status = ? AND store_name = ? AND upload_metadata_json IS NOT NULL
+            """,
+            (UPLOAD_DONE, store_name, UPLOAD_DONE, store_name),
+        ).fetchall()
+        return [EmailMetadata.model_validate_json(row["upload_metadata_json"]) for row in rows]
+
+    def entries(self) -> list[ManifestEntry]:
+        rows = self.conn.execute("SELECT * FROM files ORDER BY source_path").fetchall()
+        return [self._to_entry(row) for row in rows]
+
+    def get(self, source_path: str) -> ManifestEntry | None:
+        row = self.conn.execute(
+            "SELECT * FROM files WHERE source_path = ?", (source_path,)
+        ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def get_store_name(self) -> str | None:
+        """마지막으로 사용한 File Search Store 이름"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'store_name'").fetchone()
+        return row["value"] if row else None
+
+    def set_store_name(self, store_name: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('store_name', ?)", (store_name,)
+        )
+        self.conn.commit()
+
+    def _migrate(self) -> None:
+        """이전 버전 매니페스트에 새 열 추가 (기존 행은 NULL)"""
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row["name"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+        self.conn.commit()
+
+    def _forget_signature(self, source_path: str) -> None:
+        """서명을 지우고, 이 메일의 중복으로 제외됐던 메일은 다시 업로드 대기로 돌림"""
+        self.conn.execute("DELETE FROM signatures WHERE source_path = ?", (source_path,))
+        self.conn.execute(
+            """
+            UPDATE files SET upload_status = ?, updated_at = ?
+            WHERE upload_status = ? AND source_path IN (
+                SELECT source_path FROM signatures WHERE duplicate_of = ?
+            )
+            """,
+            (
+                UPLOAD_PENDING,
+                datetime.now(timezone.utc).isoformat(),
+                UPLOAD_DUPLICATE,
+                source_path,
+            ),
+        )
+        self.conn.execute(
+            "UPDATE signatures SET duplicate_of = NULL WHERE duplicate_of = ?", (source_path,)
+        )
+
+    def _update_bundle(self, bundle_id: str, **fields) -> None:
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self.conn.execute(
+            f"UPDATE bundles SET {assignments} WHERE bundle_id = ?",
+            (*fields.values(), bundle_id),
+        )
+
+    def _update_members(self, bundle_id: str, **fields) -> None:
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self.conn.execute(
+            f"""
+            UPDATE files SET {assignments}
+            WHERE upload_status != ? AND source_path IN (
+                SELECT source_path FROM bundle_members WHERE bundle_id = ?
+            )
+            """,
+            (*fields.values(), UPLOAD_DUPLICATE, bundle_id),
+        )
+
+    def _to_bundle(self, row: sqlite3.Row) -> BundleEntry:
+        members = self.conn.execute(
+            "SELECT source_path FROM bundle_members WHERE bundle_id = ? ORDER BY source_path",
+            (row["bundle_id"],),
+        ).fetchall()
+        return BundleEntry(
+            bundle_id=row["bundle_id"],
+            markdown_path=row["markdown_path"],
+            members=[member["source_path"] for member in members],
+            store_name=row["store_name"],
+            document_name=row["document_name"],
+            upload_status=row["upload_status"],
+            error=row["error"],
+        )
+
+    def _touch(self, source_path: str, size: int, mtime_ns: int) -> None:
+        self._update(source_path, size=size, mtime_ns=mtime_ns)
+
+    def _update(self, source_path: str, **fields) -> None:
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self.conn.execute(
+            f"UPDATE files SET {assignments} WHERE source_path = ?",
+            (*fields.values(), source_path),
+        )
+        self.conn.commit()
+
+    def _to_entry(self, row: sqlite3.Row) -> ManifestEntry:
+        return ManifestEntry(
+            source_path=row["source_path"],
+            size=row["size"],
+            mtime_ns=row["mtime_ns"],
+            content_hash=row["content_hash"],
+            markdown_path=row["markdown_path"],
+            metadata=EmailMetadata.model_validate_json(row["metadata_json"]),
+            store_name=row["store_name"],
+            document_name=row["document_name"],
+            upload_status=row["upload_status"],
+            error=row["error"],
+        )
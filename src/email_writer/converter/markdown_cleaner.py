@@ -0,0 +1,187 @@
+import re
+
+from email_writer.core.context_compactor import split_messages
+
+# 변환 마크다운에서 헤더와 본문을 나누는 제목
+CONTENT_HEADING = "## Content"
+
+# RFC 3676 서명 구분선 ("-- ", 줄 끝 공백은 변환 시 제거됨)
+_SIGNATURE_DELIMITER = re.compile(r"^--\s*$")
+# 구분선 뒤 서명으로 볼 최대 줄 수 (더 길면 본문 중간의 "--"로 봄)
+_DELIMITED_SIGNATURE_LINES = 6
+# 면책/기밀 유지 문구의 정형화된 표현
+_DISCLAIMER = re.compile(
+    r"confidential|disclaimer|intended (solely |only )?for|privileged|"
+    r"if you (have )?received this|"
+    r"기밀 ?(정보|유지)|비밀 ?정보|면책|수신자가 아닌|"
+    r"잘못 (전달|수신|발송)|무단 (사용|배포|복제|전재)",
+    re.IGNORECASE,
+)
+# 표현이 하나뿐인 문단을 면책 문구로 볼 최소 글자 수 (정형 문구 길이)
+_DISCLAIMER_MIN_CHARS = 150
+# 대문자로만 쓴 면책 문구로 볼 최소 영문자 수
+_DISCLAIMER_UPPER_LETTERS = 20
+# 서명 블록의 연락처 줄 (전화/팩스/메일/웹사이트)
+_CONTACT = re.compile(
+    r"\b(tel|phone|mobile|cell|fax|e-?mail|web)\b\s*[:.]?|"
+    r"(전화|휴대폰|핸드폰|팩스|이메일|주소)\s*[:：]?|"
+    r"\+?\d{2,4}[-.\s)]\d{3,4}[-.\s]\d{4}|[\w.+-]+@[\w-]+\.[\w.-]+|https?://|www\.",
+    re.IGNORECASE,
+)
+# 문장으로 끝나는 줄 (서명 블록이 아닌 본문)
+_SENTENCE_END = re.compile(r"[.!?。]\s*$")
+# 본문에 속하는 맺음말 줄 ("감사합니다.", "김철수 드림", "Best regards,")
+_CLOSING = re.compile(
+    r"(감사합니다|고맙습니다|수고하세요|수고하십시오|드림|올림|배상)[.!]?$|"
+    r"^(thanks|thank you|many thanks|best|best regards|(kind |warm )?regards|"
+    r"sincerely( yours)?|cheers)[,.!]?$",
+    re.IGNORECASE,
+)
+# 목록 항목 ("1.", "-", "*", "•")
+_LIST_ITEM = re.compile(r"^(\d+[.)]|[-*•])\s")
+# 구분선만 있는 줄 ("______", "=====")
+_SEPARATOR = re.compile(r"^[-_=*~]{3,}$")
+
+# 서명/면책 문구를 찾을 본문 끝부분 줄 수
+_SIGNATURE_LINES = 12
+# 서명 블록에서 이름/직함으로 볼 최대 줄 길이
+_SIGNATURE_LINE_CHARS = 40
+
+
+def _is_closing(line: str) -> bool:
+    return bool(_CLOSING.search(line.strip()))
+
+
+def _is_disclaimer(paragraph: list[str]) -> bool:
+    """정형화된 면책 문구 문단인지.
+
+    표현 하나만으로는 본문 문장일 수 있으므로 서로 다른 표현 2개 이상,
+    또는 대문자로만 쓴 문구나 정형 문구 길이를 함께 요구한다.
+    """
+    text = " ".join(line.strip() for line in paragraph)
+    keywords = {match.group(0).lower() for match in _DISCLAIMER.finditer(text)}
+    if len(keywords) >= 2:
+        return True
+    if not keywords:
+        return False
+    letters = [char for char in text if char.isascii() and char.isalpha()]
+    all_caps = len(letters) >= _DISCLAIMER_UPPER_LETTERS and text.upper() == text
+    return all_caps or len(text) >= _DISCLAIMER_MIN_CHARS
+
+
+def _last_paragraph(lines: list[str], end: int) -> tuple[int, int] | None:
+    """lines[:end]의 마지막 문단 (시작, 끝) 줄 번호 (없으면 None)"""
+    while end > 0 and not lines[end - 1].strip():
+        end -= 1
+    if end == 0:
+        return None
+    start = end
+    while start > 0 and lines[start - 1].strip():
+        start -= 1
+    return start, end
+
+
+def _is_signature_line(line: str) -> bool:
+    """서명 블록의 이름/직함/연락처 줄로 볼 수 있는지"""
+    if _is_closing(line) or _LIST_ITEM.match(line):
+        return False
+    return bool(_CONTACT.search(line)) or (
+        len(line) <= _SIGNATURE_LINE_CHARS and not _SENTENCE_END.search(line)
+    )
+
+
+def _delimited_signature(lines: list[str], end: int) -> int | None:
+    """끝부분의 "-- " 구분선 줄 번호 (뒤에 짧은 서명 줄만 있을 때만, 없으면 None)"""
+    for index in range(end - 1, max(0, end - _SIGNATURE_LINES) - 1, -1):
+        if not _SIGNATURE_DELIMITER.match(lines[index]):
+            continue
+        block = [line.strip() for line in lines[index + 1 : end] if line.strip()]
+        if (
+            0 < len(block) <= _DELIMITED_SIGNATURE_LINES
+            and all(_is_signature_line(line) for line in block)
+        ):
+            return index
+        return None
+    return None
+
+
+def _contact_signature(lines: list[str], end: int) -> int | None:
+    """맺음말 문단 뒤에 따로 붙은 이름/직함/연락처 블록의 시작 줄 번호 (없으면 None)"""
+    tail_start = max(0, end - _SIGNATURE_LINES)
+    index = end
+    while index > tail_start:
+        line = lines[index - 1].strip()
+        if line and not _is_signature_line(line):
+            break
+        index -= 1
+    # 바로 앞이 맺음말이어야 함 (맺음말 없이 끝나는 본문의 연락처 줄은 본문으로 봄)
+    if index == 0 or not _is_closing(lines[index - 1]):
+        return None
+    # 맺음말 문단("Best,\nPark")은 남기고 그다음 문단부터 서명으로 봄
+    while index < end and lines[index].strip():
+        index += 1
+    block = [line.strip() for line in lines[index:end] if line.strip()]
+    if len(block) < 2 or not any(_CONTACT.search(line) for line in block):
+        return None
+    while not lines[index].strip():
+        index += 1
+    return index
+
+
+def _signature_start(lines: list[str]) -> int:
+    """작성 본문 끝의 서명/면책 문구 시작 줄 번호 (없으면 len(lines)).
+
+    메일 끝에 붙은 블록만 제거한다: 끝에서부터 면책 문구/구분선 문단을 걷어내고,
+    그 앞이 "-- " 서명이거나 맺음말 뒤의 연락처 블록이면 그것도 제거한다.
+    본문 문장이나 맺음말을 지나서는 자르지 않는다.
+    """
+    end = len(lines)
+    while (paragraph := _last_paragraph(lines, end)) is not None:
+        start, stop = paragraph
+        block = lines[start:stop]
+        if not (_is_disclaimer(block) or all(_SEPARATOR.match(line.strip()) for line in block)):
+            break
+        end = start
+
+    signature = _delimited_signature(lines, end)
+    if signature is None:
+        signature = _contact_signature(lines, end)
+    return signature if signature is not None else end
+
+
+def split_authored(body: str) -> tuple[str, str]:
+    """메일 본문을 작성한 부분과 제거할 부분(인용된 이전 메일, 서명, 면책 문구)으로 분리.
+
+    Returns:
+        (작성 본문, 제거된 텍스트) - 둘 다 앞뒤 공백 제거
+    """
+    messages = split_messages(body)
+    if not messages:
+        return "", ""
+
+    authored = messages[0]
+    cut = _signature_start(authored)
+    if not any(line.strip() for line in authored[:cut]):
+        # 본문 전체가 서명처럼 보이면 잘못 판단한 것으로 보고 그대로 둠
+        cut = len(authored)
+    stripped = ["\n".join(authored[cut:])] + ["\n".join(message) for message in messages[1:]]
+    kept = "\n".join(authored[:cut]).strip()
+    return kept, "\n\n".join(part.strip() for part in stripped if part.strip())
+
+
+def clean_markdown(markdown: str) -> tuple[str, str]:
+    """변환된 메일 마크다운에서 본문(## Content 아래)의 작성 부분만 남김.
+
+    헤더(보낸 사람, 받는 사람, 제목)는 그대로 두고 본문에만 split_authored를 적용한다.
+
+    Returns:
+        (정리된 마크다운, 제거된 텍스트)
+    """
+    head, heading, body = markdown.partition(CONTENT_HEADING)
+    if not heading:
+        head, body = "", markdown
+    kept, stripped = split_authored(body)
+    if not heading:
+        return kept, stripped
+    cleaned = f"{head}{heading}\n\n{kept}" if kept else f"{head}{heading}"
+    return cleaned.strip(), stripped
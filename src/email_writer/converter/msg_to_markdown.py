@@ -1,31 +1,123 @@
+import codecs
+import os
+import re
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import repeat
 from pathlib import Path
 
 import extract_msg
+from charset_normalizer import from_bytes
 from markitdown import MarkItDown
 
 from email_writer.config import Settings
+from email_writer.converter.markdown_cleaner import clean_markdown
+from email_writer.models.conversion import ConversionResult
 from email_writer.models.email_metadata import EmailMetadata
 
+# MarkItDown OutlookMsgConverter와 동일한 헤더 속성 (레이블, MAPI 속성 ID)
+_HEADER_PROPERTIES = (
+    ("From", "0C1F"),  # PR_SENDER_EMAIL_ADDRESS
+    ("To", "0E04"),  # PR_DISPLAY_TO
+    ("Subject", "0037"),  # PR_SUBJECT
+)
+_BODY_PROPERTY = "1000"  # PR_BODY
+
+# 비유니코드(PT_STRING8) MSG의 코드 페이지 속성 (PT_LONG)
+_MESSAGE_CODEPAGE = "3FFD0003"  # PR_MESSAGE_CODEPAGE
+_INTERNET_CODEPAGE = "3FDE0003"  # PR_INTERNET_CPID
+
+# "cp<번호>"가 아닌 Python 코덱 이름을 쓰는 Windows 코드 페이지 (MarkItDown과 동일)
+_CODEPAGE_CODECS = {
+    708: "iso8859-6",
+    20127: "ascii",
+    20866: "koi8-r",
+    21866: "koi8-u",
+    28591: "iso8859-1",
+    28592: "iso8859-2",
+    28593: "iso8859-3",
+    28594: "iso8859-4",
+    28595: "iso8859-5",
+    28596: "iso8859-6",
+    28597: "iso8859-7",
+    28598: "iso8859-8",
+    28599: "iso8859-9",
+    28603: "iso8859-13",
+    28605: "iso8859-15",
+    10000: "mac_roman",
+    10006: "mac_greek",
+    10007: "mac_cyrillic",
+    10029: "mac_latin2",
+    10079: "mac_iceland",
+    10081: "mac_turkish",
+    50220: "iso2022_jp",
+    50221: "iso2022_jp_ext",
+    50222: "iso2022_jp_ext",
+    50225: "iso2022_kr",
+    51932: "euc_jp",
+    51936: "gb2312",
+    51949: "euc_kr",
+    54936: "gb18030",
+    65000: "utf-7",
+    65001: "utf-8",
+}
+
+# 마크다운에서 뺀 인용/서명 부분을 저장하는 사이드카 파일 접미사 (*.md 검색에 걸리지 않도록)
+STRIPPED_SUFFIX = ".stripped.txt"
+
+# 워커 프로세스별 변환기 (프로세스 풀 initializer에서 생성)
+_worker_converter: "MsgToMarkdownConverter | None" = None
+
+
+def _init_worker(settings: Settings) -> None:
+    """워커 프로세스 초기화: 프로세스마다 자체 변환기(MarkItDown 포함)를 둔다"""
+    global _worker_converter
+    _worker_converter = MsgToMarkdownConverter(settings)
+
+
+def _convert_in_worker(msg_path: str, output_dir: str) -> ConversionResult:
+    return _worker_converter.convert_safe(msg_path, output_dir)
+
 
 class MsgToMarkdownConverter:
     """MSG 파일을 Markdown으로 변환"""
 
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.converter = MarkItDown()
+        self._markitdown: MarkItDown | None = None
+
+    @property
+    def converter(self) -> MarkItDown:
+        """MarkItDown 인스턴스 (기존 2회 파싱 경로에서만 필요하므로 지연 생성)"""
+        if self._markitdown is None:
+            self._markitdown = MarkItDown()
+        return self._markitdown
 
     def convert_single(self, msg_path: str, output_dir: str) -> EmailMetadata:
         """단일 MSG 파일 변환, 메타데이터 반환"""
         msg_file = Path(msg_path)
 
-        result = self.converter.convert(str(msg_file))
-        markdown_content = result.text_content
+        if self.settings.msg_single_parse:
+            markdown_content, metadata = self._convert_single_parse(msg_file)
+        else:
+            result = self.converter.convert(str(msg_file))
+            markdown_content = result.text_content
+            metadata = self._extract_metadata(msg_file, markdown_content)
 
-        metadata = self._extract_metadata(msg_file, markdown_content)
+        metadata.original_chars = len(markdown_content)
+        stripped = ""
+        if self.settings.md_strip_quoted:
+            markdown_content, stripped = clean_markdown(markdown_content)
+        metadata.markdown_chars = len(markdown_content)
 
-        md_filename = msg_file.stem + ".md"
-        md_path = Path(output_dir) / md_filename
+        md_path = Path(output_dir) / (msg_file.stem + ".md")
         md_path.write_text(markdown_content, encoding="utf-8")
+        sidecar_path = Path(output_dir) / (msg_file.stem + STRIPPED_SUFFIX)
+        if self.settings.md_keep_stripped and stripped:
+            sidecar_path.write_text(stripped, encoding="utf-8")
+        else:
+            # 재변환 시 이전 사이드카가 남지 않도록 정리
+            sidecar_path.unlink(missing_ok=True)
 
         metadata.markdown_path = str(md_path)
         return metadata
@@ -46,6 +138,221 @@ class MsgToMarkdownConverter:
 
         return results
 
+    def convert_safe(self, msg_path: str, output_dir: str) -> ConversionResult:
+        """단일 MSG 파일 변환. 실패 시 예외 대신 실패 결과를 반환"""
+        try:
+            metadata = self.convert_single(msg_path, output_dir)
+        except Exception as e:
+            return ConversionResult(
+                source_path=msg_path,
+                success=False,
+                error_type=type(e).__name__,
+                error_message=str(e),
+            )
+        return ConversionResult(source_path=msg_path, success=True, metadata=metadata)
+
+    def convert_batch_parallel(
+        self,
+        input_dir: str,
+        output_dir: str,
+        workers: int | None = None,
+    ) -> list[ConversionResult]:
+        """디렉토리 내 모든 MSG 파일을 프로세스 풀로 병렬 변환.
+
+        워커 프로세스마다 MarkItDown 인스턴스를 따로 생성하며,
+        결과는 파일명 순서로 정렬되어 반환된다 (실행마다 동일한 순서).
+        파일별 실패는 ConversionResult(success=False)로 반환한다.
+
+        Args:
+            input_dir: MSG 파일 디렉토리
+            output_dir: 마크다운 출력 디렉토리
+            workers: 워커 프로세스 수 (None이면 settings.convert_workers,
+                0이면 CPU 코어 수, 1이면 현재 프로세스에서 순차 변환)
+        """
+        msg_paths = [str(p) for p in sorted(Path(input_dir).glob("*.msg"))]
+        return self.convert_files_parallel(msg_paths, output_dir, workers=workers)
+
+    def convert_files_parallel(
+        self,
+        msg_paths: list[str],
+        output_dir: str,
+        workers: int | None = None,
+    ) -> list[ConversionResult]:
+        """지정한 MSG 파일 목록을 병렬 변환 (결과는 입력 순서와 동일)"""
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        workers = self._resolve_workers(workers, len(msg_paths))
+
+        if workers <= 1:
+            return [self.convert_safe(path, str(output_path)) for path in msg_paths]
+
+        # 파일당 작업이 짧으므로 워커당 여러 청크로 나누어 IPC 오버헤드를 줄인다
+        chunksize = max(1, len(msg_paths) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.settings,),
+        ) as executor:
+            return list(
+                executor.map(
+                    _convert_in_worker,
+                    msg_paths,
+                    repeat(str(output_path)),
+                    chunksize=chunksize,
+                )
+            )
+
+    def iter_convert_parallel(
+        self,
+        msg_paths: list[str],
+        output_dir: str,
+        workers: int | None = None,
+    ) -> Iterator[ConversionResult]:
+        """지정한 MSG 파일 목록을 병렬 변환하며 끝나는 순서대로 결과를 내보냄.
+
+        워커당 몇 개씩만 미리 제출하므로, 소비 측이 결과를 늦게 가져가면
+        변환도 그만큼 멈춘다 (업로드 파이프라인의 백프레셔).
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        workers = self._resolve_workers(workers, len(msg_paths))
+
+        if workers <= 1:
+            for path in msg_paths:
+                yield self.convert_safe(path, str(output_path))
+            return
+
+        remaining = iter(msg_paths)
+        window = workers * 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.settings,),
+        ) as executor:
+            running = set()
+            while True:
+                for path in remaining:
+                    running.add(executor.submit(_convert_in_worker, path, str(output_path)))
+                    if len(running) >= window:
+                        break
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _resolve_workers(self, workers: int | None, file_count: int) -> int:
+        """실제 사용할 워커 수 결정 (파일 수보다 많이 띄우지 않음)"""
+        if workers is None:
+            workers = self.settings.convert_workers
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, file_count))
+
+    def _convert_single_parse(self, msg_file: Path) -> tuple[str, EmailMetadata]:
+        """MSG 파일을 한 번만 열어 마크다운과 메타데이터를 함께 생성.
+
+        MarkItDown(olefile)과 extract-msg가 같은 파일을 각각 파싱하던 것을
+        extract-msg 한 번으로 합친다. 첨부파일은 delayAttachments로 로드를 미루고
+        개수만 스토리지 목록에서 센다.
+        """
+        msg = extract_msg.Message(str(msg_file), delayAttachments=True)
+        try:
+            markdown_content = self._render_markdown(msg)
+            metadata = self._build_metadata(
+                msg_file, msg, has_attachments=self._count_attachments(msg) > 0
+            )
+        finally:
+            msg.close()
+        return markdown_content, metadata
+
+    def _render_markdown(self, msg: extract_msg.Message) -> str:
+        """MarkItDown OutlookMsgConverter와 동일한 형식의 마크다운 생성"""
+        header_encoding, body_encoding = self._string_encodings(msg)
+
+        md_content = "# Email Message\n\n"
+
+        for label, property_id in _HEADER_PROPERTIES:
+            value = self._read_string_property(msg, property_id, header_encoding)
+            if value:
+                md_content += f"**{label}:** {value}\n"
+
+        md_content += "\n## Content\n\n"
+
+        body = self._read_string_property(msg, _BODY_PROPERTY, body_encoding)
+        if body:
+            md_content += body
+
+        # MarkItDown.convert()의 결과 정규화와 동일하게 처리
+        text = "\n".join(line.rstrip() for line in re.split(r"\r?\n", md_content.strip()))
+        return re.sub(r"\n{3,}", "\n\n", text)
+
+    def _string_encodings(self, msg: extract_msg.Message) -> tuple[str | None, str | None]:
+        """PT_STRING8 속성의 (헤더, 본문) 인코딩.
+
+        헤더는 메시지 코드 페이지, 본문은 인터넷 코드 페이지를 우선한다 (MarkItDown과 동일).
+        """
+        message_encoding = self._codepage_codec(msg.getPropertyVal(_MESSAGE_CODEPAGE))
+        internet_encoding = self._codepage_codec(msg.getPropertyVal(_INTERNET_CODEPAGE))
+        return message_encoding or internet_encoding, internet_encoding or message_encoding
+
+    @staticmethod
+    def _codepage_codec(codepage: int | None) -> str | None:
+        """Windows 코드 페이지 번호 -> Python 코덱 이름 (없거나 모르는 코드 페이지면 None)"""
+        if not codepage:
+            return None
+        try:
+            return codecs.lookup(_CODEPAGE_CODECS.get(codepage, f"cp{codepage}")).name
+        except LookupError:
+            return None
+
+    def _read_string_property(
+        self, msg: extract_msg.Message, property_id: str, encoding: str | None = None
+    ) -> str | None:
+        """문자열 속성 스트림 읽기 (PT_UNICODE 우선, 없으면 PT_STRING8).
+
+        PT_STRING8은 메시지가 선언한 코드 페이지(encoding)로 디코딩하고, 선언이 없거나
+        디코딩에 실패하면 charset_normalizer로 인코딩을 추정한다 (MarkItDown과 동일).
+        """
+        data = msg.getStream(f"__substg1.0_{property_id}001F")
+        if data:
+            try:
+                return data.decode("utf-16-le").strip()
+            except UnicodeDecodeError:
+                return data.decode("utf-8", errors="ignore").strip()
+
+        data = msg.getStream(f"__substg1.0_{property_id}001E")
+        if not data:
+            return None
+        data = data.rstrip(b"\x00")
+        if not data:
+            return None
+        if encoding is not None:
+            try:
+                return data.decode(encoding).strip()
+            except UnicodeDecodeError:
+                pass
+        detected = from_bytes(data).best()
+        if detected is not None:
+            return str(detected).strip()
+        return data.decode("utf-8", errors="ignore").strip()
+
+    def _detect_encoding(self, msg: extract_msg.Message, property_id: str) -> str | None:
+        """PT_STRING8 속성 값으로 추정한 인코딩 (추정 실패 시 None)"""
+        data = (msg.getStream(f"__substg1.0_{property_id}001E") or b"").rstrip(b"\x00")
+        detected = from_bytes(data).best() if data else None
+        return detected.encoding if detected is not None else None
+
+    def _count_attachments(self, msg: extract_msg.Message) -> int:
+        """첨부파일 페이로드를 로드하지 않고 첨부 스토리지 개수만 계산"""
+        return len({
+            entry[0]
+            for entry in msg.listDir(False, True, False)
+            if entry[0].startswith("__attach")
+        })
+
     def _extract_metadata(self, msg_file: Path, markdown_content: str) -> EmailMetadata:
         """MSG 파일에서 메타데이터 추출.
 
@@ -53,31 +360,51 @@ class MsgToMarkdownConverter:
         """
         msg = extract_msg.Message(str(msg_file))
         try:
-            sender = msg.sender or ""
-            recipients = msg.to or ""
-            subject = msg.subject or ""
-            date = msg.date
-
-            is_reply = False
-            if subject:
-                upper_subject = subject.upper().strip()
-                is_reply = (
-                    upper_subject.startswith("RE:")
-                    or subject.strip().startswith("답장:")
-                    or subject.strip().startswith("회신:")
-                )
-
-            has_attachments = len(msg.attachments) > 0
-
-            return EmailMetadata(
-                file_name=msg_file.name,
-                subject=subject,
-                sender=sender,
-                recipients=recipients,
-                date=date,
-                is_reply=is_reply,
-                has_attachments=has_attachments,
-                markdown_path="",
+            return self._build_metadata(
+                msg_file, msg, has_attachments=len(msg.attachments) > 0
             )
         finally:
             msg.close()
+
+    def _build_metadata(
+        self, msg_file: Path, msg: extract_msg.Message, has_attachments: bool
+    ) -> EmailMetadata:
+        """열린 extract-msg 객체에서 EmailMetadata 구성"""
+        sender = msg.sender or ""
+        recipients = msg.to or ""
+        subject = msg.subject or ""
+        date = msg.date
+
+        if not msg.areStringsUnicode:
+            # extract-msg는 코드 페이지가 없으면 ISO-8859-15로 읽으므로 직접 디코딩.
+            # 선언된 코드 페이지가 없으면 짧은 헤더 대신 본문으로 추정한 인코딩을 쓴다
+            header_encoding, _ = self._string_encodings(msg)
+            if header_encoding is None:
+                header_encoding = self._detect_encoding(msg, _BODY_PROPERTY)
+            subject = self._read_string_property(msg, "0037", header_encoding) or subject
+            name = self._read_string_property(msg, "0C1A", header_encoding)  # PR_SENDER_NAME
+            email = self._read_string_property(msg, "5D01", header_encoding)
+            if name:
+                sender = f"{name} <{email}>" if email else name
+            elif email:
+                sender = email
+
+        is_reply = False
+        if subject:
+            upper_subject = subject.upper().strip()
+            is_reply = (
+                upper_subject.startswith("RE:")
+                or subject.strip().startswith("답장:")
+                or subject.strip().startswith("회신:")
+            )
+
+        return EmailMetadata(
+            file_name=msg_file.name,
+            subject=subject,
+            sender=sender,
+            recipients=recipients,
+            date=date,
+            is_reply=is_reply,
+            has_attachments=has_attachments,
+            markdown_path="",
+        )
@@ -0,0 +1,397 @@
+import queue
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from email_writer.converter.bundle import (
+    BundleBuilder,
+    PendingBundle,
+    bundle_id,
+    bundle_metadata,
+    render_bundle,
+)
+from email_writer.converter.dedup import MinHasher, NearDuplicateIndex
+from email_writer.converter.manifest import (
+    UPLOAD_DONE,
+    BundleEntry,
+    ConversionManifest,
+    ManifestEntry,
+    ManifestPlan,
+)
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from email_writer.gemini.file_search import FileSearchManager
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.upload import IngestSummary, UploadResult
+
+
+class IngestPipeline:
+    """MSG 변환과 File Search 업로드를 겹쳐 실행하는 스트리밍 파이프라인.
+
+    변환 스레드가 끝난 파일부터 매니페스트에 기록하고 크기가 제한된 큐에 넣으면,
+    호출 스레드의 업로드 루프가 큐에서 꺼내 바로 업로드를 시작한다. 업로드가
+    밀려 큐가 가득 차면 변환도 멈추므로(백프레셔) 대기 중인 메타데이터는
+    queue_size개를 넘지 않는다. 파일마다 결과를 매니페스트에 즉시 기록하므로
+    중간에 중단되어도 다음 실행에서 남은 파일만 이어서 처리한다.
+
+    dedup이 켜져 있으면 큐에 넣기 전에 MinHash + LSH로 유사 중복을 찾아
+    묶음마다 가장 긴 메일(앞선 메일을 모두 인용한 마지막 회신 등) 하나만 업로드한다.
+
+    bundle이 켜져 있으면 bundle_small_chars 이하의 짧은 메일을 수신 도메인(또는 월)별로
+    모아 bundle_max_chars를 넘지 않는 묶음 문서로 합쳐 올린다. 매니페스트에 묶음과
+    구성 메일을 기록해 두므로 구성 메일이 바뀌거나 삭제되면 그 묶음만 해제해 다시 만든다.
+    """
+
+    def __init__(
+        self,
+        converter: MsgToMarkdownConverter,
+        fs_manager: FileSearchManager,
+        manifest: ConversionManifest,
+        store_name: str,
+        queue_size: int | None = None,
+        report: Callable[[str], None] | None = None,
+        dedup: bool | None = None,
+        bundle: bool | None = None,
+    ):
+        settings = converter.settings
+        self.converter = converter
+        self.fs_manager = fs_manager
+        self.manifest = manifest
+        self.store_name = store_name
+        self.queue_size = max(1, queue_size or settings.ingest_queue_size)
+        self.report = report or (lambda message: None)
+        self.dedup = settings.dedup_enabled if dedup is None else dedup
+        self.bundle = settings.bundle_enabled if bundle is None else bundle
+        self.summary = IngestSummary()
+        self._convert_total = 0
+        self._queued = 0
+        self._finished = 0
+        self._error: BaseException | None = None
+        # 중복 판정 상태 (변환 스레드에서만 사용, _superseded는 _lock으로 보호)
+        self._hasher: MinHasher | None = None
+        self._index: NearDuplicateIndex | None = None
+        self._lengths: dict[str, int] = {}
+        self._superseded: set[str] = set()
+        self._lock = threading.Lock()
+        # 묶음 상태 (_bundler는 변환 스레드에서만 사용,
+        # _bundles는 묶음 ID -> (구성 메일 수, 업로드 메타데이터))
+        self._bundler: BundleBuilder | None = None
+        self._bundles: dict[str, tuple[int, EmailMetadata]] = {}
+
+    def remove_sources(self, entries: list[ManifestEntry]) -> None:
+        """원본이 사라진 메일 정리 (Store 문서, 마크다운, 매니페스트 기록).
+
+        묶음에 들어 있던 메일이면 묶음을 해제하므로, 남은 구성 메일은 다음 run()에서
+        다시 묶여 업로드된다.
+        """
+        for entry in entries:
+            bundle = self.manifest.bundle_of(entry.source_path)
+            if bundle is not None:
+                self._release_bundle(bundle)
+            elif entry.document_name and entry.store_name:
+                self.fs_manager.delete_document(entry.store_name, entry.document_name)
+            Path(entry.markdown_path).unlink(missing_ok=True)
+            self.manifest.remove(entry.source_path)
+            self.report(f"삭제: {entry.metadata.file_name}")
+
+    def run(
+        self,
+        plan: ManifestPlan,
+        output_dir: str,
+        workers: int | None = None,
+        upload_concurrency: int | None = None,
+    ) -> IngestSummary:
+        """계획의 신규/변경 파일을 변환하면서 업로드하고, 이전 실행에서 남은 업로드도 처리.
+
+        Args:
+            plan: ConversionManifest.plan() 결과
+            output_dir: 마크다운 출력 디렉토리
+            workers: 변환 워커 수 (None이면 settings.convert_workers)
+            upload_concurrency: 동시 업로드 작업 수 (None이면 settings.upload_concurrency)
+        """
+        started = time.monotonic()
+        to_convert = set(plan.to_convert)
+        # 구성 메일이 바뀌었거나 업로드가 끝나지 않은 묶음은 해제 (구성 메일은 업로드 대기로)
+        self._release_stale_bundles(to_convert)
+        # 이미 변환되었지만 업로드가 끝나지 않은 항목 (이전 실행 중단/실패, Store 변경)
+        resume = [
+            entry.source_path
+            for entry in self.manifest.pending_uploads(self.store_name)
+            if entry.source_path not in to_convert
+        ]
+        self.summary = IngestSummary()
+        self._convert_total = len(plan.to_convert)
+        self._queued = 0
+        self._finished = 0
+        self._error = None
+        self._bundles = {}
+        if self.dedup:
+            self._load_representatives(to_convert)
+        settings = self.converter.settings
+        self._bundler = (
+            BundleBuilder(settings.bundle_max_chars, settings.bundle_group_by)
+            if self.bundle
+            else None
+        )
+
+        ready: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce,
+            args=(plan, output_dir, workers, resume, ready, stop),
+            name="ingest-convert",
+            daemon=True,
+        )
+        producer.start()
+        try:
+            self.fs_manager.upload_stream(
+                self.store_name, ready, self._uploaded, concurrency=upload_concurrency
+            )
+        finally:
+            stop.set()
+            producer.join()
+
+        if self._error is not None:
+            raise self._error
+        self.summary.elapsed = time.monotonic() - started
+        return self.summary
+
+    def _produce(
+        self,
+        plan: ManifestPlan,
+        output_dir: str,
+        workers: int | None,
+        resume: list[str],
+        ready: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        """변환 스레드: 변환 결과를 기록하고 업로드 큐에 넣음.
+
+        SQLite 연결은 스레드별로 따로 사용한다.
+        """
+        manifest = ConversionManifest(self.manifest.db_path)
+        try:
+            results = self.converter.iter_convert_parallel(
+                plan.to_convert, output_dir, workers=workers
+            )
+            for result in results:
+                if not result.success:
+                    self.summary.convert_failed += 1
+                    self._progress(
+                        f"변환 실패: {result.source_path} - "
+                        f"{result.error_type}: {result.error_message}"
+                    )
+                    continue
+                manifest.record_conversion(
+                    result.source_path, plan.hashes[result.source_path], result.metadata
+                )
+                self.summary.converted += 1
+                self.summary.original_chars += result.metadata.original_chars
+                self.summary.markdown_chars += result.metadata.markdown_chars
+                if not self._enqueue(manifest, result.source_path, ready, stop):
+                    return
+            for source_path in resume:
+                if not self._enqueue(manifest, source_path, ready, stop):
+                    return
+            if self._bundler is not None:
+                for pending in self._bundler.flush():
+                    if not self._enqueue_bundle(manifest, pending, ready, stop):
+                        return
+        except BaseException as e:
+            self._error = e
+        finally:
+            manifest.close()
+            self._put(ready, None, stop)
+
+    def _enqueue(
+        self,
+        manifest: ConversionManifest,
+        source_path: str,
+        ready: queue.Queue,
+        stop: threading.Event,
+    ) -> bool:
+        """이전 버전 문서를 지우고 업로드 큐에 추가 (중단되었으면 False)"""
+        entry = manifest.get(source_path)
+        if entry.document_name and entry.store_name:
+            self.fs_manager.delete_document(entry.store_name, entry.document_name)
+            manifest.clear_document(source_path)
+        if self._index is not None and not self._is_representative(manifest, entry):
+            return True
+        if self._bundler is not None:
+            chars = entry.metadata.markdown_chars or len(
+                Path(entry.markdown_path).read_text(encoding="utf-8")
+            )
+            if chars <= self.converter.settings.bundle_small_chars:
+                sealed = self._bundler.add(source_path, entry.metadata, chars)
+                return sealed is None or self._enqueue_bundle(manifest, sealed, ready, stop)
+        self._queued += 1
+        return self._put(ready, (source_path, entry.metadata), stop)
+
+    def _enqueue_bundle(
+        self,
+        manifest: ConversionManifest,
+        pending: PendingBundle,
+        ready: queue.Queue,
+        stop: threading.Event,
+    ) -> bool:
+        """묶음 문서를 만들어 기록하고 업로드 큐에 추가 (1건뿐이면 그대로 개별 업로드)"""
+        self._queued += 1
+        if len(pending.members) == 1:
+            source_path, metadata, _ = pending.members[0]
+            return self._put(ready, (source_path, metadata), stop)
+
+        members = pending.metadata
+        key = bundle_id(pending.key, pending.source_paths)
+        markdown_path = Path(self.converter.settings.bundle_dir) / f"{key}.md"
+        markdown_path.parent.mkdir(parents=True, exist_ok=True)
+        markdown_path.write_text(render_bundle(pending.key, members), encoding="utf-8")
+        manifest.record_bundle(key, str(markdown_path), pending.source_paths)
+        metadata = bundle_metadata(pending.key, members, str(markdown_path))
+        self._bundles[key] = (len(members), metadata)
+        self.summary.bundles += 1
+        self.summary.bundled += len(members)
+        return self._put(ready, (key, metadata), stop)
+
+    def _release_stale_bundles(self, to_convert: set[str]) -> None:
+        for bundle in self.manifest.bundles():
+            if (
+                bundle.upload_status == UPLOAD_DONE
+                and bundle.store_name == self.store_name
+                and not to_convert.intersection(bundle.members)
+            ):
+                continue
+            self._release_bundle(bundle)
+            self.report(f"묶음 해제: {bundle.bundle_id} ({len(bundle.members)}건)")
+
+    def _release_bundle(self, bundle: BundleEntry) -> None:
+        if bundle.document_name and bundle.store_name:
+            self.fs_manager.delete_document(bundle.store_name, bundle.document_name)
+        Path(bundle.markdown_path).unlink(missing_ok=True)
+        self.manifest.release_bundle(bundle.bundle_id)
+
+    def _put(self, ready: queue.Queue, item, stop: threading.Event) -> bool:
+        # 큐가 가득 차면 업로드가 자리를 비울 때까지 대기 (업로드 쪽이 중단되면 포기)
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.5)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _load_representatives(self, skip: set[str]) -> None:
+        """이미 Store에 올라간 메일로 중복 인덱스 구성 (저장된 서명이 없으면 계산해 저장)"""
+        settings = self.converter.settings
+        self._hasher = MinHasher(settings.dedup_num_perm, settings.dedup_shingle_size)
+        self._index = NearDuplicateIndex(settings.dedup_threshold, settings.dedup_num_perm)
+        self._lengths = {}
+        self._superseded = set()
+
+        stored = self.manifest.signatures()
+        for entry in self.manifest.entries():
+            if (
+                entry.source_path in skip
+                or entry.upload_status != UPLOAD_DONE
+                or entry.store_name != self.store_name
+            ):
+                continue
+            signature, length = stored.get(entry.source_path, (b"", 0))
+            signature = np.frombuffer(signature, dtype=np.uint32)
+            if signature.size != settings.dedup_num_perm:
+                if not Path(entry.markdown_path).is_file():
+                    continue
+                signature, length = self._signature(self.manifest, entry)
+            self._index.add(entry.source_path, signature)
+            self._lengths[entry.source_path] = length
+
+    def _is_representative(self, manifest: ConversionManifest, entry: ManifestEntry) -> bool:
+        """유사 중복 묶음의 대표로 업로드할지 판정 (중복이면 매니페스트에 표시하고 False)"""
+        signature, length = self._signature(manifest, entry)
+        matches = self._index.query(signature)
+        if not matches:
+            self._index.add(entry.source_path, signature)
+            self._lengths[entry.source_path] = length
+            return True
+
+        representative, similarity = matches[0]
+        self.summary.duplicates += 1
+        if length <= self._lengths[representative]:
+            manifest.mark_duplicate(entry.source_path, representative)
+            self._progress(
+                f"중복 제외: {entry.metadata.file_name} "
+                f"({Path(representative).name}와 유사도 {similarity:.2f})"
+            )
+            return False
+
+        # 더 긴 메일(이전 메일을 인용한 회신 등)이 대표를 넘겨받음.
+        # 이전 대표가 이미 닫힌 묶음에 들어 있으면 그 묶음은 다음 재구성 때까지 그대로 둔다.
+        if self._bundler is not None:
+            self._bundler.discard(representative)
+        self._index.remove(representative)
+        self._index.add(entry.source_path, signature)
+        self._lengths[entry.source_path] = length
+        with self._lock:
+            self._superseded.add(representative)
+            previous = manifest.get(representative)
+            if previous.document_name and previous.store_name:
+                self.fs_manager.delete_document(previous.store_name, previous.document_name)
+                manifest.clear_document(representative)
+            manifest.mark_duplicate(representative, entry.source_path)
+        self._progress(
+            f"중복 대표 교체: {previous.metadata.file_name} -> {entry.metadata.file_name} "
+            f"(유사도 {similarity:.2f})"
+        )
+        return True
+
+    def _signature(
+        self, manifest: ConversionManifest, entry: ManifestEntry
+    ) -> tuple[np.ndarray, int]:
+        text = Path(entry.markdown_path).read_text(encoding="utf-8")
+        signature = self._hasher.signature(text)
+        manifest.save_signature(entry.source_path, signature.tobytes(), len(text))
+        return signature, len(text)
+
+    def _uploaded(self, source_path: str, result: UploadResult) -> None:
+        self._finished += 1
+        if source_path in self._bundles:
+            self._bundle_uploaded(source_path, result)
+            return
+        with self._lock:
+            if source_path in self._superseded:
+                # 업로드 중에 더 긴 중복 메일이 대표가 됨: 방금 올린 문서는 삭제
+                if result.success and result.document_name:
+                    self.fs_manager.delete_document(self.store_name, result.document_name)
+                return
+            if result.success:
+                self.manifest.mark_uploaded(source_path, self.store_name, result.document_name)
+            else:
+                self.manifest.mark_upload_failed(source_path, result.error)
+        if result.success:
+            self.summary.uploaded += 1
+            self._progress(f"업로드: {result.file_name} ({result.elapsed:.1f}초)")
+        else:
+            self.summary.upload_failed += 1
+            self._progress(f"업로드 실패: {result.file_name} - {result.error}")
+
+    def _bundle_uploaded(self, key: str, result: UploadResult) -> None:
+        count, metadata = self._bundles[key]
+        if result.success:
+            self.manifest.mark_bundle_uploaded(
+                key, self.store_name, result.document_name, metadata
+            )
+            self.summary.uploaded += 1
+            self._progress(f"묶음 업로드: {result.file_name} ({count}건, {result.elapsed:.1f}초)")
+        else:
+            self.manifest.mark_bundle_failed(key, result.error)
+            self.summary.upload_failed += 1
+            self._progress(f"묶음 업로드 실패: {result.file_name} ({count}건) - {result.error}")
+
+    def _progress(self, message: str) -> None:
+        summary = self.summary
+        converted = summary.converted + summary.convert_failed
+        counts = f"변환 {converted}/{self._convert_total}, 업로드 {self._finished}/{self._queued}"
+        if self.dedup:
+            counts += f", 중복 {summary.duplicates}"
+        self.report(f"[{counts}] {message}")
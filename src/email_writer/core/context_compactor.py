@@ -0,0 +1,99 @@
+import re
+
+# "-----Original Message-----" 류의 인용 구분선
+_SEPARATOR = re.compile(
+    r"^-{2,}\s*(original message|forwarded message|원본 메시지|전달된 메시지)\s*-{2,}$",
+    re.IGNORECASE,
+)
+# 인용 헤더 블록의 첫 줄 (From: / 보낸 사람:)
+_FROM_FIELD = re.compile(r"^(from|보낸\s*사람|발신자?)\s*:", re.IGNORECASE)
+# 인용 헤더 블록의 나머지 필드
+_HEADER_FIELD = re.compile(
+    r"^(sent|date|to|cc|subject|보낸\s*날짜|날짜|받는\s*사람|수신자?|참조|제목)\s*:",
+    re.IGNORECASE,
+)
+# "On Mon, Jan 13, 2025 at 10:00 AM Kim <kim@example.com> wrote:"
+_WROTE_LINE = re.compile(r"^on .+ wrote:$", re.IGNORECASE)
+
+# From: 다음 몇 줄 안에 다른 헤더 필드가 있어야 인용 헤더로 본다
+_HEADER_WINDOW = 8
+# 서명/면책 문구를 찾을 메일 끝부분 줄 수
+_SIGNATURE_LINES = 12
+
+
+def _is_boundary(lines: list[str], index: int) -> bool:
+    line = lines[index]
+    if _SEPARATOR.match(line) or _WROTE_LINE.match(line):
+        return True
+    if _FROM_FIELD.match(line):
+        window = lines[index + 1 : index + 1 + _HEADER_WINDOW]
+        return any(_HEADER_FIELD.match(candidate) for candidate in window)
+    return False
+
+
+def split_messages(text: str) -> list[list[str]]:
+    """플레인 텍스트 본문을 인용 구분선/헤더 블록 기준으로 메일 단위로 분리.
+
+    Returns:
+        메일별 줄 목록 (첫 번째가 가장 최근 메일, 인용 헤더는 해당 메일에 포함)
+    """
+    messages: list[list[str]] = [[]]
+    lines = text.splitlines()
+    for index, line in enumerate(lines):
+        # 구분선 바로 뒤의 From: 헤더는 같은 인용 블록
+        if _is_boundary(lines, index) and any(
+            not _SEPARATOR.match(existing) for existing in messages[-1]
+        ):
+            messages.append([])
+        messages[-1].append(line)
+    return [message for message in messages if message]
+
+
+def drop_repeated_signatures(messages: list[list[str]]) -> list[list[str]]:
+    """이전 메일 끝부분에서 더 최근 메일에 이미 나온 줄(서명/면책 문구) 제거.
+
+    최근 메일부터 끝부분 줄을 모아 두고, 그보다 오래된 메일은 끝에서부터
+    이미 나온 줄이 이어지는 동안 잘라낸다. 본문 중간의 줄은 건드리지 않는다.
+    """
+    seen: set[str] = set()
+    compacted = []
+    for message in messages:
+        end = len(message)
+        while end > 0 and message[end - 1].strip() in seen:
+            end -= 1
+        seen.update(line.strip() for line in message[-_SIGNATURE_LINES:])
+        if end:
+            compacted.append(message[:end])
+    return compacted
+
+
+def compact_context(text: str, max_chars: int) -> str:
+    """인용 스레드 본문을 max_chars 안에 최근 메일부터 채워 넣음.
+
+    1. 인용 구분선/헤더 블록으로 메일 단위 분리
+    2. 반복되는 서명/면책 문구 제거
+    3. 가장 최근 메일부터 예산을 채우고, 다 들어가지 않는 메일은 앞부분만 남김
+
+    Args:
+        text: 플레인 텍스트 본문 (맨 위가 가장 최근 메일)
+        max_chars: 최대 글자 수
+
+    Returns:
+        max_chars 이하의 본문 (원래 순서 유지)
+    """
+    if not text or max_chars <= 0:
+        return ""
+
+    kept: list[str] = []
+    remaining = max_chars
+    for message in drop_repeated_signatures(split_messages(text)):
+        block = "\n".join(message)
+        if kept:
+            # 메일 사이 줄바꿈
+            remaining -= 1
+        if remaining <= 0:
+            break
+        kept.append(block[:remaining])
+        remaining -= len(kept[-1])
+
+    return "\n".join(kept)
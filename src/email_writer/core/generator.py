@@ -1,9 +1,26 @@
-from bs4 import BeautifulSoup
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator
+from functools import partial
+from pathlib import Path
 
 from email_writer.config import Settings
+from email_writer.converter.manifest import ConversionManifest
+from email_writer.core.html_text import html_to_text
+from email_writer.core.metadata_filter import MetadataFilterBuilder
+from email_writer.core.metrics import GenerationMetrics
 from email_writer.core.prompt_builder import PromptBuilder
+from email_writer.core.response_cache import ResponseCache, make_cache_key
+from email_writer.core.single_flight import SingleFlight
 from email_writer.gemini.client import GeminiClient
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.prompt import BuiltPrompt
 from email_writer.models.request import GenerateEmailRequest
+from email_writer.retrieval.index import RetrievalIndex
+
+# 로컬 검색 질의에 포함할 메일 본문 앞부분 글자 수
+_QUERY_BODY_CHARS = 1000
 
 
 class EmailGenerator:
@@ -11,8 +28,49 @@ class EmailGenerator:
 
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.gemini_client = GeminiClient(settings)
+        self.metrics = GenerationMetrics()
+        self.gemini_client = GeminiClient(settings, metrics=self.metrics)
         self.prompt_builder = PromptBuilder(settings)
+        self._semaphore: asyncio.Semaphore | None = None
+        self.cache: ResponseCache | None = None
+        if settings.response_cache_enabled:
+            self.cache = ResponseCache(
+                max_entries=settings.response_cache_max_entries,
+                ttl=settings.response_cache_ttl,
+                path=settings.response_cache_path,
+            )
+        # 같은 프롬프트의 동시 요청은 Gemini 호출 1건을 공유
+        self.flights: SingleFlight | None = SingleFlight() if settings.coalesce_requests else None
+        self._retriever: RetrievalIndex | None = None
+        # 인덱스를 열 때의 meta.json 상태 (prepare_emails.py로 다시 만들면 바뀜)
+        self._retriever_state: tuple[int, int] | None = None
+        self._retriever_lock = threading.Lock()
+        self._filter_builder: MetadataFilterBuilder | None = None
+        # 필터 catalog를 만들 때의 매니페스트 파일 상태 (바뀌면 다시 읽음)
+        self._filter_manifest_state: tuple[int, int] | None = None
+        self._filter_lock = threading.Lock()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """동시 Gemini 호출 수 제한 (이벤트 루프 안에서 처음 사용할 때 생성)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.settings.generation_concurrency)
+        return self._semaphore
+
+    @property
+    def retriever(self) -> RetrievalIndex | None:
+        """로컬 검색 인덱스 (retrieval_mode가 file_search이면 None, 처음 사용할 때 로드)
+
+        인덱스가 다시 만들어지면 서버 재시작 없이 새로 연다.
+        """
+        if self.settings.retrieval_mode == "file_search":
+            return None
+        with self._retriever_lock:
+            state = _file_state(RetrievalIndex.meta_path(self.settings.retrieval_index_dir))
+            if self._retriever is None or state != self._retriever_state:
+                self._retriever = RetrievalIndex.load(self.settings.retrieval_index_dir)
+                self._retriever_state = state
+            return self._retriever
 
     def generate(self, request: GenerateEmailRequest) -> str:
         """이메일 생성 메인 흐름 (동기).
@@ -22,38 +80,280 @@ class EmailGenerator:
         3. Gemini API 호출 (File Search 포함)
         4. 생성된 텍스트 반환
         """
-        plain_body = self._html_to_text(request.full_body)
+        with self.metrics.request("sync"):
+            prompt = self._build_prompt(request)
+            cache_key = self._cache_key(prompt)
+            cached = self._cache_lookup(cache_key, request)
+            if cached is not None:
+                return cached
+
+            with self.metrics.stage("model"), self.metrics.model_calls_in_flight.track():
+                generated = self.gemini_client.generate_with_file_search(
+                    prompt.text, metadata_filter=prompt.metadata_filter
+                )
+            self._cache_store(cache_key, generated)
+            return generated
+
+    async def generate_async(self, request: GenerateEmailRequest) -> str:
+        """이메일 생성 메인 흐름 (비동기).
+
+        HTML 파싱과 프롬프트 구성은 CPU 작업이므로 스레드에서 수행하고,
+        Gemini 호출은 비동기 클라이언트로 수행한다. 동시 호출 수는
+        settings.generation_concurrency 세마포어로 제한되고, 같은 프롬프트로
+        동시에 들어온 요청은 진행 중인 호출 1건의 결과를 함께 받는다.
+        regenerate 요청은 기존 결과를 대체하려는 것이므로 병합하지 않고 새로 호출한다.
+        """
+        with self.metrics.request("async"):
+            prompt = await asyncio.to_thread(self._build_prompt, request)
+            cache_key = self._cache_key(prompt)
+            cached = await self._cache_lookup_async(cache_key, request)
+            if cached is not None:
+                return cached
+
+            source = partial(self._generate_once, prompt, cache_key)
+            with self.metrics.stage("model"):
+                if self.flights is not None and not request.regenerate:
+                    return await self.flights.run(cache_key, source)
+                return "".join([chunk async for chunk in source()])
+
+    async def generate_stream(self, request: GenerateEmailRequest) -> AsyncIterator[str]:
+        """이메일 생성 메인 흐름 (비동기 스트리밍).
+
+        generate_async()와 같은 흐름이지만 생성된 텍스트를 조각 단위로 반환한다.
+        캐시에 있으면 전체 텍스트를 한 조각으로 반환하고, 스트림이 끝까지
+        완료된 경우에만 캐시에 저장한다.
+        """
+        with self.metrics.request("stream"):
+            prompt = await asyncio.to_thread(self._build_prompt, request)
+            cache_key = self._cache_key(prompt)
+            cached = await self._cache_lookup_async(cache_key, request)
+            if cached is not None:
+                yield cached
+                return
+
+            source = partial(self._stream_once, prompt, cache_key)
+            if self.flights is not None and not request.regenerate:
+                chunks = self.flights.stream(cache_key, source)
+            else:
+                chunks = source()
+            started = time.perf_counter()
+            first = True
+            with self.metrics.stage("model"):
+                async for chunk in chunks:
+                    if first:
+                        elapsed = time.perf_counter() - started
+                        self.metrics.observe_stage("model_first_chunk", elapsed)
+                        first = False
+                    yield chunk
+
+    async def generate_candidates_async(
+        self, request: GenerateEmailRequest, count: int
+    ) -> list[str]:
+        """같은 요청으로 후보 초안 count개 생성.
+
+        candidate_strategy가 parallel이면 온도를 달리한 호출을 동시에 보내고,
+        candidate_count면 한 번의 호출로 후보를 받는다. 다양한 표현을 받는 것이
+        목적이므로 응답 캐시와 동일 요청 합치기는 사용하지 않는다.
+        """
+        with self.metrics.request("candidates"):
+            prompt = await asyncio.to_thread(self._build_prompt, request)
+            with self.metrics.stage("model"):
+                if self.settings.candidate_strategy == "candidate_count":
+                    async with self.semaphore:
+                        with self.metrics.model_calls_in_flight.track():
+                            return await self.gemini_client.generate_candidates_async(
+                                prompt.text, count, metadata_filter=prompt.metadata_filter
+                            )
+                return list(
+                    await asyncio.gather(
+                        *(
+                            self._generate_with_temperature(prompt, temperature)
+                            for temperature in self._candidate_temperatures(count)
+                        )
+                    )
+                )
+
+    async def generate_batch_async(
+        self, requests: list[GenerateEmailRequest]
+    ) -> list[str | BaseException]:
+        """여러 요청을 batch_concurrency개씩 동시에 생성 (요청 순서대로 결과 또는 예외 반환)
+
+        항목마다 generate_async()를 사용하므로 응답 캐시와 동일 요청 합치기,
+        전체 동시 호출 제한(generation_concurrency)이 그대로 적용된다.
+        """
+        limit = asyncio.Semaphore(self.settings.batch_concurrency)
+
+        async def generate_one(request: GenerateEmailRequest) -> str:
+            async with limit:
+                return await self.generate_async(request)
 
-        prompt = self.prompt_builder.build(
-            context_body=plain_body,
-            selected_text=request.selected_text,
-            subject=request.subject,
-            to_recipients=request.to_recipients,
-            is_reply=request.is_reply,
-            additional_prompt=request.additional_prompt,
+        return list(
+            await asyncio.gather(
+                *(generate_one(request) for request in requests), return_exceptions=True
+            )
         )
 
-        generated = self.gemini_client.generate_with_file_search(prompt)
-        return generated
+    def _candidate_temperatures(self, count: int) -> list[float]:
+        """기본 온도를 중심으로 candidate_temperature_spread 범위에 고르게 나눈 온도 (0~2)"""
+        base = self.settings.gemini_temperature
+        if count == 1:
+            return [base]
+        spread = self.settings.candidate_temperature_spread
+        low = base - spread / 2
+        return [
+            round(min(2.0, max(0.0, low + spread * i / (count - 1))), 3) for i in range(count)
+        ]
 
-    def _html_to_text(self, html: str) -> str:
-        """HTML 메일 본문을 플레인 텍스트로 변환.
+    async def _generate_with_temperature(self, prompt: BuiltPrompt, temperature: float) -> str:
+        async with self.semaphore:
+            with self.metrics.model_calls_in_flight.track():
+                return await self.gemini_client.generate_with_file_search_async(
+                    prompt.text, metadata_filter=prompt.metadata_filter, temperature=temperature
+                )
+
+    async def _generate_once(self, prompt: BuiltPrompt, cache_key: str) -> AsyncIterator[str]:
+        """Gemini 비스트리밍 호출 1건 (결과를 한 조각으로 반환)"""
+        async with self.semaphore:
+            with self.metrics.model_calls_in_flight.track():
+                generated = await self.gemini_client.generate_with_file_search_async(
+                    prompt.text, metadata_filter=prompt.metadata_filter
+                )
+        await self._cache_store_async(cache_key, generated)
+        yield generated
+
+    async def _stream_once(self, prompt: BuiltPrompt, cache_key: str) -> AsyncIterator[str]:
+        """Gemini 스트리밍 호출 1건 (끝까지 받은 경우에만 캐시에 저장)"""
+        chunks = []
+        async with self.semaphore:
+            with self.metrics.model_calls_in_flight.track():
+                async for chunk in self.gemini_client.stream_with_file_search_async(
+                    prompt.text, metadata_filter=prompt.metadata_filter
+                ):
+                    chunks.append(chunk)
+                    yield chunk
+        await self._cache_store_async(cache_key, "".join(chunks))
+
+    def _cache_key(self, prompt: BuiltPrompt) -> str:
+        """프롬프트와 모델/검색 설정으로 캐시 키 생성"""
+        return make_cache_key(
+            prompt.text,
+            self.settings.gemini_model,
+            self.settings.gemini_temperature,
+            self.settings.file_search_store_name,
+            prompt.metadata_filter,
+        )
+
+    def _cache_lookup(self, cache_key: str, request: GenerateEmailRequest) -> str | None:
+        """캐시 조회 (캐시 비활성화 또는 regenerate 요청이면 None)"""
+        if self.cache is None or request.regenerate:
+            return None
+        return self.cache.get(cache_key)
+
+    def _cache_store(self, cache_key: str, generated: str) -> None:
+        if self.cache is not None:
+            self.cache.set(cache_key, generated)
+
+    async def _cache_lookup_async(
+        self, cache_key: str, request: GenerateEmailRequest
+    ) -> str | None:
+        """_cache_lookup()의 비동기 버전 (SQLite 조회가 이벤트 루프를 막지 않음)"""
+        if self.cache is None or request.regenerate:
+            return None
+        return await self.cache.get_async(cache_key)
+
+    async def _cache_store_async(self, cache_key: str, generated: str) -> None:
+        if self.cache is not None:
+            await self.cache.set_async(cache_key, generated)
+
+    def _build_prompt(self, request: GenerateEmailRequest) -> BuiltPrompt:
+        """요청으로부터 Gemini 프롬프트 구성 (추정 토큰 수 포함, 단계별 소요 시간 기록)"""
+        with self.metrics.stage("html_to_text"):
+            plain_body = self._html_to_text(request.full_body, max_chars=self._scan_length())
+
+        with self.metrics.stage("retrieval"):
+            examples = self._find_examples(request, plain_body)
+            metadata_filter = self._metadata_filter(request)
 
-        BeautifulSoup을 사용하여 HTML 태그를 제거하고 텍스트만 추출.
-        Outlook HTML 메일에는 style, head 등 불필요한 요소가 많으므로
-        이를 제거하여 프롬프트 토큰을 절약한다.
+        with self.metrics.stage("prompt_build"):
+            prompt = self.prompt_builder.build_prompt(
+                context_body=plain_body,
+                selected_text=request.selected_text,
+                subject=request.subject,
+                to_recipients=request.to_recipients,
+                is_reply=request.is_reply,
+                additional_prompt=request.additional_prompt,
+                examples=examples,
+            )
+        prompt.metadata_filter = metadata_filter
+        return prompt
+
+    def _metadata_filter(self, request: GenerateEmailRequest) -> str | None:
+        """요청에 맞는 File Search 메타데이터 필터 (비활성화 또는 local 모드면 None)"""
+        if not self.settings.metadata_filter_enabled or self.settings.retrieval_mode == "local":
+            return None
+        with self._filter_lock:
+            # 재업로드 등으로 매니페스트가 바뀌면 서버 재시작 없이 catalog를 다시 만든다
+            state = _file_state(self.settings.manifest_path)
+            if self._filter_builder is None or state != self._filter_manifest_state:
+                self._filter_builder = MetadataFilterBuilder(
+                    self.settings, self._uploaded_catalog()
+                )
+                self._filter_manifest_state = state
+                # 문서가 바뀌었으므로 검색 결과가 없던 필터도 다시 시도
+                self.gemini_client.forget_ungrounded_filters()
+            builder = self._filter_builder
+        return builder.build(request)
+
+    def _uploaded_catalog(self) -> list[EmailMetadata]:
+        """Store 문서별 업로드 메타데이터 (매니페스트가 없으면 빈 목록 = 필터 없음)
+
+        필터 키 없이 올라간 이전 문서는 빼고, 묶음은 묶음 문서 1건으로 센다.
         """
-        if not html or not html.strip():
-            return ""
+        if not Path(self.settings.manifest_path).is_file():
+            return []
+        with ConversionManifest(self.settings.manifest_path) as manifest:
+            return manifest.uploaded_documents(self.settings.file_search_store_name)
+
+    def _find_examples(self, request: GenerateEmailRequest, plain_body: str) -> list[str] | None:
+        """로컬 검색 인덱스에서 요청과 비슷한 이전 메일 본문 검색 (file_search 모드면 None)"""
+        retriever = self.retriever
+        if retriever is None:
+            return None
+        query = "\n".join(
+            [request.subject, request.selected_text, plain_body[:_QUERY_BODY_CHARS]]
+        )
+        results = retriever.search(
+            query,
+            top_k=self.settings.retrieval_top_k,
+            vector_weight=self.settings.retrieval_vector_weight,
+        )
+        return [result.text[: self.settings.retrieval_example_chars] for result in results]
 
-        soup = BeautifulSoup(html, "html.parser")
+    def _scan_length(self) -> int:
+        """HTML 본문에서 추출할 글자 수.
 
-        for tag in soup(["script", "style", "head"]):
-            tag.decompose()
+        앞에서부터 자르는 경우 프롬프트에 들어갈 max_context_length자면 충분하고,
+        압축하는 경우 서명 등을 뺀 자리에 이전 메일을 채울 수 있도록 더 많이 읽는다.
+        """
+        if self.settings.context_compaction:
+            return max(self.settings.context_scan_length, self.settings.max_context_length)
+        return self.settings.max_context_length
 
-        text = soup.get_text(separator="\n")
+    def _html_to_text(self, html: str, max_chars: int | None = None) -> str:
+        """HTML 메일 본문을 플레인 텍스트로 변환.
+
+        HTML 태그를 제거하고 텍스트만 추출한다. Outlook HTML 메일에는
+        style, head 등 불필요한 요소가 많으므로 이를 제거하여 프롬프트 토큰을 절약한다.
+        트리를 만들지 않는 스트리밍 추출기를 사용하며, max_chars를 지정하면
+        그만큼 모인 뒤 나머지(긴 인용 스레드 등)는 파싱하지 않는다.
+        """
+        return html_to_text(html, max_chars=max_chars)
 
-        lines = [line.strip() for line in text.splitlines()]
-        text = "\n".join(line for line in lines if line)
 
-        return text
+def _file_state(path: str | Path) -> tuple[int, int] | None:
+    """파일의 (수정 시각, 크기) (없으면 None, 바뀌었는지 비교용)"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,136 @@
+from html.parser import HTMLParser
+
+# 하위 텍스트를 통째로 버리는 태그 (본문이 아닌 요소)
+_REMOVED_TAGS = frozenset({"script", "style", "head"})
+# 화면에 본문으로 표시되지 않는 텍스트를 담는 태그
+_HIDDEN_TEXT_TAGS = frozenset({"template", "rt", "rp"})
+_IGNORED_TAGS = _REMOVED_TAGS | _HIDDEN_TEXT_TAGS
+# 닫는 태그 없이 바로 닫히는 태그 (열린 태그 스택에 넣지 않음)
+_VOID_TAGS = frozenset({
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame",
+    "hr", "image", "img", "input", "isindex", "keygen", "link", "menuitem", "meta",
+    "nextid", "param", "source", "spacer", "track", "wbr",
+})
+
+
+class _StopParsing(Exception):
+    """필요한 만큼 텍스트를 모았을 때 파싱 중단용"""
+
+
+class _TextExtractor(HTMLParser):
+    """HTMLParser 이벤트로 텍스트 줄만 모으는 추출기.
+
+    트리를 만들지 않고 열린 태그 이름 스택만 유지한다. 닫는 태그는 가장 가까운
+    같은 이름의 열린 태그까지 닫고, 열려 있지 않은 태그의 닫는 태그는 무시한다
+    (BeautifulSoup html.parser 트리 빌더와 같은 규칙).
+    """
+
+    def __init__(self, max_chars: int | None):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.lines: list[str] = []
+        # 줄바꿈으로 이었을 때의 길이 + 1
+        self.length = 0
+        self._stack: list[str] = []
+        self._open: dict[str, int] = {}
+        self._ignored_depth = 0
+        # 아직 줄로 나누지 않은 텍스트 조각 (태그 경계에서 한 문자열로 합침)
+        self._pending: list[str] = []
+        # <br>처럼 여는 태그로 이미 닫힌 빈 태그: 뒤따르는 </br>은 경계가 아님
+        self._closed_void: dict[str, int] = {}
+
+    def handle_starttag(self, tag, attrs):
+        self.flush()
+        if tag in _VOID_TAGS:
+            self._closed_void[tag] = self._closed_void.get(tag, 0) + 1
+            return
+        self._stack.append(tag)
+        self._open[tag] = self._open.get(tag, 0) + 1
+        if tag in _IGNORED_TAGS:
+            self._ignored_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <tag/>: 열리자마자 닫히므로 경계 역할만 함
+        self.flush()
+
+    def handle_endtag(self, tag):
+        if self._closed_void.get(tag):
+            self._closed_void[tag] -= 1
+            return
+        self.flush()
+        if not self._open.get(tag):
+            return
+        while True:
+            name = self._stack.pop()
+            self._open[name] -= 1
+            if name in _IGNORED_TAGS:
+                self._ignored_depth -= 1
+            if name == tag:
+                return
+
+    def handle_data(self, data):
+        if not self._ignored_depth:
+            self._pending.append(data)
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_decl(self, decl):
+        self.flush()
+
+    def handle_pi(self, data):
+        self.flush()
+
+    def unknown_decl(self, data):
+        self.flush()
+        # <![CDATA[...]]>의 내용은 텍스트로 취급
+        if data.upper().startswith("CDATA[") and not any(
+            self._open.get(tag) for tag in _REMOVED_TAGS
+        ):
+            self._pending.append(data[len("CDATA["):])
+            self.flush()
+
+    def flush(self) -> None:
+        """모인 텍스트를 줄 단위로 정리하여 추가"""
+        if not self._pending:
+            return
+        data = "".join(self._pending)
+        self._pending.clear()
+        for line in data.splitlines():
+            line = line.strip()
+            if line:
+                self.lines.append(line)
+                self.length += len(line) + 1
+        if self.max_chars is not None and self.length > self.max_chars:
+            raise _StopParsing
+
+
+def html_to_text(html: str, max_chars: int | None = None) -> str:
+    """HTML에서 텍스트만 추출 (줄 단위 공백 제거, 빈 줄 제외).
+
+    script/style/head 등은 트리를 만들지 않고 건너뛰므로 큰 Outlook 본문에서도
+    빠르다. max_chars를 지정하면 그만큼 텍스트가 모이는 즉시 파싱을 멈추고
+    앞의 max_chars자만 반환한다 (전체 결과를 max_chars로 자른 것과 같다).
+
+    Args:
+        html: HTML 문자열
+        max_chars: 필요한 최대 글자 수 (None이면 전체)
+
+    Returns:
+        줄바꿈으로 구분된 플레인 텍스트
+    """
+    if not html or not html.strip():
+        return ""
+
+    extractor = _TextExtractor(max_chars)
+    try:
+        extractor.feed(html)
+        extractor.close()
+        extractor.flush()
+    except _StopParsing:
+        pass
+
+    text = "\n".join(extractor.lines)
+    if max_chars is not None:
+        text = text[:max_chars]
+    return text
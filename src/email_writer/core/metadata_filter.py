@@ -0,0 +1,93 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime
+
+from email_writer.config import Settings
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.request import GenerateEmailRequest
+
+_DOMAIN_PATTERN = re.compile(r"@([\w.-]+\w)")
+
+
+def recipient_domain(recipients: str) -> str:
+    """수신자 문자열에서 첫 번째 이메일 주소의 도메인 (소문자, 없으면 빈 문자열)"""
+    match = _DOMAIN_PATTERN.search(recipients or "")
+    return match.group(1).lower() if match else ""
+
+
+def date_number(value: date) -> int:
+    """날짜를 YYYYMMDD 정수로 (File Search 필터의 범위 비교는 숫자 값에만 적용되므로)"""
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class MetadataFilterBuilder:
+    """요청의 수신자/회신 여부로 File Search metadata_filter 구성.
+
+    조건은 같은 수신자 도메인, 같은 회신 여부, 최근 N년 이내 메일이다.
+    업로드된 메일 목록(catalog)으로 조건에 맞는 문서 수를 세어 min_documents보다
+    적으면 최근 기간 -> 회신 여부 -> 도메인 순으로 조건을 빼고, 모두 빼도 부족하면
+    필터 없이 전체 Store를 검색한다.
+    """
+
+    def __init__(self, settings: Settings, catalog: list[EmailMetadata]):
+        self.settings = settings
+        # (도메인, 회신 여부) -> 정렬된 YYYYMMDD 목록 (날짜 없는 메일은 0)
+        self._dates: dict[tuple[str, bool], list[int]] = defaultdict(list)
+        for metadata in catalog:
+            number = date_number(metadata.date) if metadata.date else 0
+            self._dates[(recipient_domain(metadata.recipients), metadata.is_reply)].append(number)
+        for dates in self._dates.values():
+            dates.sort()
+
+    def build(self, request: GenerateEmailRequest, now: datetime | None = None) -> str | None:
+        """요청에 맞는 필터 식 (충분한 문서가 없으면 None = 필터 없음)"""
+        settings = self.settings
+        domain = ""
+        if settings.metadata_filter_same_domain:
+            domain = recipient_domain(request.to_recipients)
+        is_reply = request.is_reply if settings.metadata_filter_same_reply else None
+        since = 0
+        if settings.metadata_filter_recent_years > 0:
+            now = now or datetime.now()
+            # 2월 29일에도 유효한 날짜가 되도록 일자는 28일 이하로 맞춤
+            cutoff = now.replace(
+                year=now.year - settings.metadata_filter_recent_years, day=min(now.day, 28)
+            )
+            since = date_number(cutoff)
+
+        # 조건을 하나씩 빼면서 충분한 문서가 남는 가장 좁은 필터를 찾음
+        for conditions in ((domain, is_reply, since), (domain, is_reply, 0), (domain, None, 0)):
+            expression = self._expression(*conditions)
+            if expression is None:
+                break
+            if self.count(*conditions) >= settings.metadata_filter_min_documents:
+                return expression
+        return None
+
+    def count(self, domain: str, is_reply: bool | None, since: int) -> int:
+        """조건에 맞는 업로드 문서 수 (빈 값/None/0인 조건은 무시)"""
+        total = 0
+        for (doc_domain, doc_reply), dates in self._dates.items():
+            if domain and doc_domain != domain:
+                continue
+            if is_reply is not None and doc_reply != is_reply:
+                continue
+            total += len(dates) - bisect_left(dates, since) if since else len(dates)
+        return total
+
+    @staticmethod
+    def _expression(domain: str, is_reply: bool | None, since: int) -> str | None:
+        """File Search metadata_filter 식 (업로드 시 custom_metadata 키 기준)"""
+        clauses = []
+        if domain:
+            clauses.append(f"recipient_domain = {_quote(domain)}")
+        if is_reply is not None:
+            clauses.append(f"is_reply = {_quote(str(is_reply))}")
+        if since:
+            clauses.append(f"date_ymd >= {since}")
+        return " AND ".join(clauses) or None
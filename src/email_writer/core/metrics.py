@@ -0,0 +1,248 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 기본 지연 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# usage_metadata 필드 -> 토큰 종류 라벨
+_USAGE_FIELDS = {
+    "prompt_token_count": "prompt",
+    "candidates_token_count": "candidates",
+    "tool_use_prompt_token_count": "tool_use_prompt",
+    "cached_content_token_count": "cached",
+    "thoughts_token_count": "thoughts",
+}
+
+# 현재 요청의 단계별 소요 시간 (Server-Timing 헤더용, collect_timings()로 활성화)
+_timings: ContextVar[dict[str, float] | None] = ContextVar("stage_timings", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """라벨별 값을 가지는 지표의 공통 부분"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """증가만 하는 누적 값"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """증가/감소하는 현재 값 (진행 중인 요청 수 등)"""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        """블록 실행 동안 값을 1 증가"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """관측값 분포 (누적 버킷, 합계, 건수)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # 라벨 -> (버킷별 건수, 합계, 건수)
+        self._values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class GenerationMetrics:
+    """이메일 생성 지표 (Prometheus 텍스트 형식으로 출력).
+
+    - 단계별 소요 시간 (html_to_text, retrieval, prompt_build, model, model_first_chunk)
+    - 요청 전체 소요 시간과 진행 중인 요청 수 (mode: sync, async, stream)
+    - 예외 종류별 오류 수
+    - Gemini 응답 usage_metadata의 토큰 수
+    """
+
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            "email_writer_stage_seconds", "생성 단계별 소요 시간 (초)", ("stage",)
+        )
+        self.request_seconds = Histogram(
+            "email_writer_request_seconds", "생성 요청 전체 소요 시간 (초)", ("mode",)
+        )
+        self.requests_in_flight = Gauge(
+            "email_writer_requests_in_flight", "처리 중인 생성 요청 수", ("mode",)
+        )
+        self.model_calls_in_flight = Gauge(
+            "email_writer_model_calls_in_flight", "진행 중인 Gemini 호출 수"
+        )
+        self.errors = Counter(
+            "email_writer_errors_total", "생성 요청 오류 수 (예외 종류별)", ("mode", "type")
+        )
+        self.tokens = Counter(
+            "email_writer_tokens_total", "Gemini usage_metadata 토큰 수 (종류별)", ("kind",)
+        )
+        self._metrics = [
+            self.stage_seconds,
+            self.request_seconds,
+            self.requests_in_flight,
+            self.model_calls_in_flight,
+            self.errors,
+            self.tokens,
+        ]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """블록 소요 시간을 단계 히스토그램과 현재 요청의 Server-Timing에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - started)
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        self.stage_seconds.observe(seconds, stage=name)
+        timings = _timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def request(self, mode: str) -> Iterator[None]:
+        """생성 요청 1건: 진행 중 수, 전체 소요 시간, 예외 종류별 오류 수 기록"""
+        started = time.perf_counter()
+        self.requests_in_flight.inc(mode=mode)
+        try:
+            yield
+        except Exception as e:
+            self.errors.inc(mode=mode, type=type(e).__name__)
+            raise
+        finally:
+            self.requests_in_flight.dec(mode=mode)
+            self.request_seconds.observe(time.perf_counter() - started, mode=mode)
+
+    def record_usage(self, usage_metadata) -> None:
+        """Gemini 응답의 usage_metadata 토큰 수 누적 (없으면 무시)"""
+        if usage_metadata is None:
+            return
+        for field, kind in _USAGE_FIELDS.items():
+            value = getattr(usage_metadata, field, None)
+            if value:
+                self.tokens.inc(value, kind=kind)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict[str, float]]:
+    """블록 안에서 기록된 단계별 소요 시간(초)을 모으는 dict 반환 (Server-Timing 헤더용)"""
+    timings: dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def format_server_timing(timings: dict[str, float]) -> str:
+    """단계별 소요 시간을 Server-Timing 헤더 값으로 변환 (밀리초)"""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
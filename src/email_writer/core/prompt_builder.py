@@ -1,4 +1,7 @@
 from email_writer.config import Settings
+from email_writer.core.context_compactor import compact_context
+from email_writer.core.token_estimator import TokenEstimator
+from email_writer.models.prompt import BuiltPrompt
 
 
 class PromptBuilder:
@@ -16,8 +19,19 @@ class PromptBuilder:
 5. 생성된 이메일 본문만 출력하세요 (제목, 설명, 마크다운 포맷 등 불필요).
 6. 기존 이메일에서 자주 사용하는 표현, 인사말, 마무리 패턴을 적극 활용하세요."""
 
-    def __init__(self, settings: Settings):
+    # 토큰 예산 모드에서 본문 외 섹션이 예산을 받는 순서 (본문은 남은 예산을 사용)
+    SECTION_PRIORITY = (
+        "selected_text", "additional_prompt", "examples", "subject", "to_recipients"
+    )
+
+    # 로컬 검색 참고 메일 사이 구분선
+    EXAMPLE_SEPARATOR = "\n\n---\n\n"
+
+    def __init__(self, settings: Settings, estimator: TokenEstimator | None = None):
         self.settings = settings
+        self.estimator = estimator or TokenEstimator.load(
+            settings.token_calibration_path, settings.gemini_model
+        )
 
     def build(
         self,
@@ -27,8 +41,66 @@ class PromptBuilder:
         to_recipients: str,
         is_reply: bool,
         additional_prompt: str,
+        examples: list[str] | None = None,
     ) -> str:
         """컨텍스트 기반 프롬프트 구성"""
+        return self.build_prompt(
+            context_body=context_body,
+            selected_text=selected_text,
+            subject=subject,
+            to_recipients=to_recipients,
+            is_reply=is_reply,
+            additional_prompt=additional_prompt,
+            examples=examples,
+        ).text
+
+    def build_prompt(
+        self,
+        context_body: str,
+        selected_text: str,
+        subject: str,
+        to_recipients: str,
+        is_reply: bool,
+        additional_prompt: str,
+        examples: list[str] | None = None,
+    ) -> BuiltPrompt:
+        """컨텍스트 기반 프롬프트 구성 (추정 토큰 수 포함).
+
+        prompt_token_budget이 0이면 본문만 max_context_length(글자 수)로 줄이고,
+        0보다 크면 SECTION_PRIORITY 순서로 섹션별 예산 안에서 자른 뒤
+        남은 예산만큼 본문을 채워 전체 추정 토큰 수를 예산 이내로 맞춘다.
+        examples는 로컬 검색 인덱스에서 찾은 참고 메일 본문 목록이다.
+        """
+        sections = {
+            "context_body": context_body or "",
+            "selected_text": selected_text or "",
+            "subject": subject or "",
+            "to_recipients": to_recipients or "",
+            "additional_prompt": additional_prompt or "",
+            "examples": self.EXAMPLE_SEPARATOR.join(filter(None, examples or [])),
+        }
+
+        if self.settings.prompt_token_budget > 0:
+            trimmed = self._fit_token_budget(sections, is_reply)
+        else:
+            trimmed = []
+            if sections["context_body"]:
+                fitted = self._fit_context(sections["context_body"])
+                if fitted != sections["context_body"]:
+                    trimmed.append("context_body")
+                sections["context_body"] = fitted
+
+        text = self._assemble(sections, is_reply)
+        return BuiltPrompt(
+            text=text,
+            estimated_tokens=self.estimator.estimate(text),
+            section_tokens={
+                name: self.estimator.estimate(value) for name, value in sections.items()
+            },
+            trimmed_sections=trimmed,
+        )
+
+    def _assemble(self, sections: dict[str, str], is_reply: bool) -> str:
         parts = []
 
         if is_reply:
@@ -36,21 +108,95 @@ class PromptBuilder:
         else:
             parts.append("다음 정보를 바탕으로 새 이메일을 작성하세요.")
 
-        if context_body:
-            truncated = context_body[: self.settings.max_context_length]
-            parts.append(f"\n--- 메일 본문 (맥락) ---\n{truncated}")
+        if sections["context_body"]:
+            parts.append(f"\n--- 메일 본문 (맥락) ---\n{sections['context_body']}")
 
-        if to_recipients:
-            parts.append(f"\n수신자: {to_recipients}")
+        if sections["to_recipients"]:
+            parts.append(f"\n수신자: {sections['to_recipients']}")
 
-        if subject:
-            parts.append(f"제목: {subject}")
+        if sections["subject"]:
+            parts.append(f"제목: {sections['subject']}")
 
-        parts.append(f"\n--- 작성 요지/키워드 ---\n{selected_text}")
+        if sections["examples"]:
+            parts.append(f"\n--- 참고할 이전 메일 ---\n{sections['examples']}")
 
-        parts.append("\n이전에 작성한 이메일들을 검색하여 문체와 패턴을 참고하세요.")
+        parts.append(f"\n--- 작성 요지/키워드 ---\n{sections['selected_text']}")
+
+        if self.settings.retrieval_mode == "local":
+            parts.append("\n참고할 이전 메일의 문체와 패턴을 따르세요.")
+        else:
+            parts.append("\n이전에 작성한 이메일들을 검색하여 문체와 패턴을 참고하세요.")
 
-        if additional_prompt:
-            parts.append(f"\n--- 추가 지시사항 ---\n{additional_prompt}")
+        if sections["additional_prompt"]:
+            parts.append(f"\n--- 추가 지시사항 ---\n{sections['additional_prompt']}")
 
         return "\n".join(parts)
+
+    def _fit_token_budget(self, sections: dict[str, str], is_reply: bool) -> list[str]:
+        """섹션 내용을 토큰 예산에 맞게 줄임 (sections를 직접 수정, 잘린 섹션 이름 반환)"""
+        estimator = self.estimator
+        caps = {
+            "selected_text": self.settings.selected_text_token_budget,
+            "additional_prompt": self.settings.additional_prompt_token_budget,
+            "examples": self.settings.examples_token_budget,
+            "subject": self.settings.subject_token_budget,
+            "to_recipients": self.settings.recipients_token_budget,
+        }
+        trimmed = []
+
+        # 지시문과 섹션 제목 등 고정 부분 (추정치는 문자 단위로 더해지므로 차이로 계산)
+        overhead = estimator.weigh(self._assemble(sections, is_reply)) - sum(
+            estimator.weigh(value) for value in sections.values()
+        )
+        remaining = self.settings.prompt_token_budget - overhead
+
+        for name in self.SECTION_PRIORITY:
+            value = sections[name]
+            allowed = min(caps[name], remaining)
+            if estimator.weigh(value) > allowed:
+                value = estimator.truncate(value, allowed)
+                sections[name] = value
+                trimmed.append(name)
+            remaining -= estimator.weigh(value)
+
+        body = sections["context_body"]
+        if body:
+            fitted = self._fit_context(body)
+            if estimator.weigh(fitted) > remaining:
+                fitted = self._fit_context_tokens(body, remaining)
+            if fitted != body:
+                trimmed.append("context_body")
+            sections["context_body"] = fitted
+
+        return trimmed
+
+    def _fit_context_tokens(self, context_body: str, max_tokens: float) -> str:
+        """본문을 추정 토큰 수 max_tokens 이내로 줄임 (글자 수 예산을 이분 탐색)"""
+        if max_tokens <= 0:
+            return ""
+        if not self.settings.context_compaction:
+            return self.estimator.truncate(
+                context_body[: self.settings.max_context_length], max_tokens
+            )
+
+        best = ""
+        low, high = 0, min(len(context_body), self.settings.max_context_length)
+        while low <= high:
+            middle = (low + high) // 2
+            candidate = compact_context(context_body, middle)
+            if self.estimator.weigh(candidate) <= max_tokens:
+                best = candidate
+                low = middle + 1
+            else:
+                high = middle - 1
+        return best
+
+    def _fit_context(self, context_body: str) -> str:
+        """본문을 max_context_length 이내로 줄임.
+
+        context_compaction이 켜져 있으면 인용 스레드를 메일 단위로 나누어
+        반복되는 서명을 빼고 가장 최근 메일부터 채운다. 꺼져 있으면 앞에서부터 자른다.
+        """
+        if self.settings.context_compaction:
+            return compact_context(context_body, self.settings.max_context_length)
+        return context_body[: self.settings.max_context_length]
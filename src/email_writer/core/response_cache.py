@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+"""
+
+
+def make_cache_key(
+    prompt: str, model: str, temperature: float, store_name: str, metadata_filter: str | None = None
+) -> str:
+    """캐시 키: 공백을 정규화한 프롬프트와 모델 설정(검색 필터 포함)의 해시"""
+    normalized = " ".join(prompt.split())
+    parts = [normalized, model, temperature, store_name]
+    if metadata_filter:
+        parts.append(metadata_filter)
+    payload = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """동일한 생성 요청의 응답 캐시 (TTL + LRU).
+
+    메모리에 최대 max_entries개를 최근 사용 순으로 유지하고, ttl초가 지난 항목은 버린다.
+    path를 지정하면 SQLite 파일에도 기록하여 서버 재시작 후에도 재사용한다.
+    히트 시 마지막 사용 시각은 메모리에만 기록하고, 만료된 항목도 메모리에서만 지운 뒤
+    다음 set()이나 close()에서 SQLite에 한꺼번에 반영한다 (조회마다 디스크 쓰기를 하지 않도록).
+    이벤트 루프에서는 get_async()/set_async()를 써서 SQLite 입출력을 스레드에서 수행한다.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0, path: str = ""):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # SQLite에 아직 반영하지 않은 마지막 사용 시각 (키 -> 시각)
+        self._touched: dict[str, float] = {}
+        # _lock은 메모리 항목, _db_lock은 SQLite 연결 보호 (디스크 입출력 중에도 메모리 조회 가능)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+
+    def get(self, key: str) -> str | None:
+        """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+        entry = self._memory_entry(key)
+        if entry is None and self._db is not None:
+            entry = self._load(key)
+        return self._resolve(key, entry)
+
+    async def get_async(self, key: str) -> str | None:
+        """get()의 비동기 버전 (메모리에 없어 SQLite를 읽어야 할 때만 스레드에서 조회)"""
+        entry = self._memory_entry(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._load, key)
+        return self._resolve(key, entry)
+
+    def set(self, key: str, value: str) -> None:
+        """응답 저장 (가장 오래 사용되지 않은 항목부터 밀어냄)"""
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self._evict()
+            touched, self._touched = self._touched, {}
+        touched.pop(key, None)
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._flush_touched(touched)
+            self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    async def set_async(self, key: str, value: str) -> None:
+        """set()의 비동기 버전 (SQLite 기록은 스레드에서 수행)"""
+        if self._db is None:
+            self.set(key, value)
+        else:
+            await asyncio.to_thread(self.set, key, value)
+
+    def stats(self) -> dict:
+        """히트/미스 카운터와 현재 항목 수"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        with self._db_lock:
+            if self._db is not None:
+                self._flush_touched(touched)
+                self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def _flush_touched(self, touched: dict[str, float]) -> None:
+        """메모리에 모아 둔 마지막 사용 시각을 SQLite에 반영 (commit은 호출 측에서)"""
+        if touched:
+            self._db.executemany(
+                "UPDATE responses SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in touched.items()],
+            )
+
+    def _memory_entry(self, key: str) -> tuple[float, str] | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _load(self, key: str) -> tuple[float, str] | None:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _resolve(self, key: str, entry: tuple[float, str] | None) -> str | None:
+        """조회한 항목으로 히트/미스 처리 (만료 항목의 디스크 삭제는 다음 set()으로 미룸)"""
+        now = time.time()
+        with self._lock:
+            # 조회하는 동안 set()으로 바뀌었으면 메모리의 최신 값을 씀
+            entry = self._entries.get(key, entry)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                self._touched.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            if self._db is not None:
+                self._touched[key] = now
+            self.hits += 1
+            return entry[1]
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
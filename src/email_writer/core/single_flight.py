@@ -0,0 +1,98 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+
+
+class _Flight:
+    """진행 중인 생성 호출 1건: 도착한 텍스트 조각을 모든 구독자에게 전달"""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._updated = asyncio.Event()
+        # 실제 호출을 수행하는 작업 (참조를 유지하여 GC로 사라지지 않게 함)
+        self.task: asyncio.Task | None = None
+
+    def publish(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """처음부터 지금까지의 조각과 이후 도착하는 조각을 차례로 반환"""
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._updated.wait()
+
+
+class SingleFlight:
+    """같은 키의 동시 생성 호출을 하나로 합침 (single-flight).
+
+    키가 같은 호출이 진행 중이면 새 Gemini 호출을 시작하지 않고 진행 중인 호출의
+    결과를 함께 받는다. 스트리밍 구독자는 이미 도착한 조각부터 이어서 받는다.
+    실제 호출은 별도 작업으로 실행되므로 처음 요청한 클라이언트가 연결을 끊어도
+    나머지 구독자는 결과를 받는다. 호출이 끝나면 키는 바로 해제된다 (결과 재사용은 응답 캐시 담당).
+    """
+
+    def __init__(self):
+        self._flights: dict[str, _Flight] = {}
+        # 실제로 시작한 호출 수 / 진행 중인 호출에 합류하여 절약한 호출 수
+        self.calls = 0
+        self.coalesced = 0
+
+    def stream(
+        self, key: str, source: Callable[[], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        """key의 진행 중인 호출을 구독 (없으면 source()로 새 호출 시작)"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            self.calls += 1
+            flight.task = asyncio.get_running_loop().create_task(
+                self._produce(key, flight, source())
+            )
+        else:
+            self.coalesced += 1
+        return flight.subscribe()
+
+    async def run(self, key: str, source: Callable[[], AsyncIterator[str]]) -> str:
+        """key의 호출 결과 전체 텍스트 (조각을 이어 붙임)"""
+        return "".join([chunk async for chunk in self.stream(key, source)])
+
+    def stats(self) -> dict:
+        """호출/합류 카운터와 진행 중인 호출 수"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
+
+    async def _produce(self, key: str, flight: _Flight, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                flight.publish(chunk)
+        except BaseException as e:
+            flight.finish(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            flight.finish()
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
@@ -0,0 +1,96 @@
+import json
+import math
+import re
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+_HANGUL = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]+")
+
+
+class TokenEstimator:
+    """API 호출 없이 텍스트의 토큰 수를 추정.
+
+    문자 종류별 가중치(ASCII는 4자에 1토큰, 한글은 음절당 0.6토큰 등)의 합에
+    보정 계수(scale)를 곱한다. 가중치가 문자 단위로 더해지므로 여러 조각의
+    추정치를 더하면 이어 붙인 텍스트의 추정치와 같다.
+    보정 계수는 calibrate()로 모델의 count_tokens 결과에 맞추고, 모델별로 파일에 저장해 재사용한다.
+    """
+
+    ASCII_WEIGHT = 0.25
+    HANGUL_WEIGHT = 0.6
+    OTHER_WEIGHT = 1.0
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+
+    def weigh(self, text: str) -> float:
+        """보정 계수를 적용한 토큰 수 (소수)"""
+        if not text:
+            return 0.0
+        ascii_chars = len(text.encode("ascii", "ignore"))
+        hangul_chars = sum(map(len, _HANGUL.findall(text)))
+        other_chars = len(text) - ascii_chars - hangul_chars
+        raw = (
+            ascii_chars * self.ASCII_WEIGHT
+            + hangul_chars * self.HANGUL_WEIGHT
+            + other_chars * self.OTHER_WEIGHT
+        )
+        return raw * self.scale
+
+    def estimate(self, text: str) -> int:
+        """추정 토큰 수"""
+        return math.ceil(self.weigh(text))
+
+    def truncate(self, text: str, max_tokens: float) -> str:
+        """추정 토큰 수가 max_tokens 이하가 되는 가장 긴 앞부분"""
+        if max_tokens <= 0:
+            return ""
+        if self.weigh(text) <= max_tokens:
+            return text
+
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.weigh(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low]
+
+    def calibrate(self, samples: Iterable[str], count_tokens: Callable[[str], int]) -> float:
+        """실제 토큰 수에 맞게 보정 계수 갱신.
+
+        Args:
+            samples: 보정에 사용할 텍스트 (실제 프롬프트와 비슷한 메일 본문)
+            count_tokens: 텍스트의 실제 토큰 수를 반환하는 함수 (GeminiClient.count_tokens)
+
+        Returns:
+            새 보정 계수
+        """
+        raw = TokenEstimator()
+        estimated = actual = 0.0
+        for sample in samples:
+            if not sample:
+                continue
+            estimated += raw.weigh(sample)
+            actual += count_tokens(sample)
+        if estimated:
+            self.scale = actual / estimated
+        return self.scale
+
+    @classmethod
+    def load(cls, path: str | Path, model: str) -> "TokenEstimator":
+        """저장된 모델별 보정 계수로 생성 (없으면 기본값)"""
+        path = Path(path)
+        if not path.is_file():
+            return cls()
+        scales = json.loads(path.read_text(encoding="utf-8"))
+        return cls(scale=scales.get(model, 1.0))
+
+    def save(self, path: str | Path, model: str) -> None:
+        """보정 계수를 모델별로 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        scales = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+        scales[model] = self.scale
+        path.write_text(json.dumps(scales, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -1,40 +1,290 @@
-from google import genai
-from google.genai import types
+import time
+from collections.abc import AsyncIterator
+
+from google.genai import errors, types
 
 from email_writer.config import Settings
+from email_writer.core.metrics import GenerationMetrics
 from email_writer.core.prompt_builder import PromptBuilder
+from email_writer.gemini.client_factory import get_genai_client
+from email_writer.gemini.context_cache import ContextCacheManager, load_exemplars
+
+# 캐시가 만료/삭제되었을 때 API가 돌려주는 상태 코드
+_CACHE_MISSING_CODES = (403, 404)
 
 
 class GeminiClient:
     """Gemini API 호출을 담당하는 클라이언트"""
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, metrics: GenerationMetrics | None = None):
         self.settings = settings
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        self.client = get_genai_client(settings)
         self.model = settings.gemini_model
+        # 지정하면 응답의 usage_metadata 토큰 수를 기록
+        self.metrics = metrics
+        # 참고 문서를 하나도 찾지 못한 metadata_filter (다음 요청부터 필터 없이 검색)
+        self._ungrounded_filters: set[str] = set()
+        self.context_cache: ContextCacheManager | None = None
+        if settings.context_cache_enabled:
+            self.context_cache = ContextCacheManager(
+                self.client,
+                self.model,
+                self._cache_config(),
+                ttl=settings.context_cache_ttl,
+                refresh_margin=settings.context_cache_refresh_margin,
+            )
 
-    def generate_with_file_search(self, prompt: str) -> str:
+    def generate_with_file_search(self, prompt: str, metadata_filter: str | None = None) -> str:
         """File Search를 활용한 이메일 생성 (동기 호출)
 
-        google-genai SDK의 client.models.generate_content()는 동기 메서드.
-        FastAPI가 threadpool에서 동기 함수를 실행하므로 동기 호출로 충분함.
-        """
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                system_instruction=PromptBuilder.SYSTEM_INSTRUCTION,
-                tools=[
-                    types.Tool(
-                        file_search=types.FileSearch(
-                            file_search_store_names=[
-                                self.settings.file_search_store_name
-                            ]
-                        )
-                    )
-                ],
-                temperature=0.7,
-            ),
-        )
+        스크립트 등 이벤트 루프 밖에서 사용. 서버는 generate_with_file_search_async()를 사용한다.
+        metadata_filter를 지정하면 조건에 맞는 문서만 검색하고, 검색된 문서가 없으면
+        필터 없이 다시 생성한다.
+        """
+        metadata_filter = self._active_filter(metadata_filter)
+        response = self._call_sync(prompt, metadata_filter)
+        self._record_usage(response.usage_metadata)
+        if self._ungrounded(metadata_filter, response.candidates):
+            response = self._call_sync(prompt, None)
+            self._record_usage(response.usage_metadata)
+
+        return response.text
 
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None, temperature: float | None = None
+    ) -> str:
+        """File Search를 활용한 이메일 생성 (비동기 호출)
+
+        SDK의 비동기 클라이언트(client.aio)를 사용하므로 응답을 기다리는 동안
+        스레드를 점유하지 않는다. temperature를 지정하면 설정값 대신 사용한다.
+        """
+        response = await self._generate_async(prompt, metadata_filter, temperature=temperature)
         return response.text
+
+    async def generate_candidates_async(
+        self, prompt: str, count: int, metadata_filter: str | None = None
+    ) -> list[str]:
+        """한 번의 호출로 후보 count개 생성 (candidate_count)"""
+        response = await self._generate_async(prompt, metadata_filter, candidate_count=count)
+        return [
+            "".join(part.text for part in candidate.content.parts if part.text)
+            for candidate in response.candidates or []
+            if candidate.content and candidate.content.parts
+        ]
+
+    async def stream_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> AsyncIterator[str]:
+        """File Search를 활용한 이메일 생성 (비동기 스트리밍)
+
+        generate_content_stream으로 생성되는 텍스트 조각을 도착하는 대로 반환한다.
+        이미 보낸 조각은 되돌릴 수 없으므로 필터 검색 결과가 없어도 다시 생성하지 않고,
+        그 필터를 기록해 다음 요청부터 필터 없이 검색한다.
+        """
+        metadata_filter = self._active_filter(metadata_filter)
+        stream, chunk = await self._call_async(self._open_stream, prompt, metadata_filter)
+        usage_metadata = None
+        candidates = []
+        while chunk is not None:
+            # 토큰 수는 마지막 조각의 usage_metadata에 누적되어 옴
+            usage_metadata = chunk.usage_metadata or usage_metadata
+            candidates.extend(chunk.candidates or [])
+            if chunk.text:
+                yield chunk.text
+            chunk = await anext(stream, None)
+        self._record_usage(usage_metadata)
+        self._ungrounded(metadata_filter, candidates)
+
+    async def _open_stream(
+        self, **kwargs
+    ) -> tuple[AsyncIterator[types.GenerateContentResponse], types.GenerateContentResponse | None]:
+        """스트림을 열고 첫 조각까지 받음 (스트림, 첫 조각 또는 None)
+
+        SDK의 스트림은 첫 조각을 꺼낼 때 요청을 보내고 오류도 그때 발생하므로,
+        _call_async의 캐시 만료 재시도가 적용되도록 첫 조각까지 이 안에서 받는다.
+        """
+        stream = await self.client.aio.models.generate_content_stream(**kwargs)
+        return stream, await anext(stream, None)
+
+    async def _generate_async(
+        self, prompt: str, metadata_filter: str | None, **options
+    ) -> types.GenerateContentResponse:
+        """비동기 생성 호출 (필터 검색 결과가 없으면 필터 없이 한 번 더 호출)"""
+        metadata_filter = self._active_filter(metadata_filter)
+        method = self.client.aio.models.generate_content
+        response = await self._call_async(method, prompt, metadata_filter, **options)
+        self._record_usage(response.usage_metadata)
+        if self._ungrounded(metadata_filter, response.candidates):
+            response = await self._call_async(method, prompt, None, **options)
+            self._record_usage(response.usage_metadata)
+        return response
+
+    def _call_sync(self, prompt: str, metadata_filter: str | None) -> types.GenerateContentResponse:
+        """동기 생성 호출 (컨텍스트 캐시가 있으면 참조, 만료되었으면 다시 만들어 한 번 재시도)"""
+        cached_content = None
+        if self._can_use_cache(metadata_filter):
+            cached_content = self.context_cache.acquire_sync()
+
+        try:
+            return self.client.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=self._build_config(metadata_filter, cached_content),
+            )
+        except errors.ClientError as e:
+            if not self._cache_missing(cached_content, e):
+                raise
+            self.context_cache.invalidate()
+            return self.client.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=self._build_config(metadata_filter, self.context_cache.acquire_sync()),
+            )
+
+    async def _call_async(self, method, prompt: str, metadata_filter: str | None, **options):
+        """비동기 생성 호출 (컨텍스트 캐시가 있으면 참조, 만료되었으면 다시 만들어 한 번 재시도)
+
+        options는 요청 설정에 덮어쓸 값 (temperature, candidate_count 등, None이면 무시)
+        """
+        cached_content = None
+        if self._can_use_cache(metadata_filter):
+            cached_content = await self.context_cache.acquire()
+
+        try:
+            return await method(
+                model=self.model,
+                contents=prompt,
+                config=self._build_config(metadata_filter, cached_content, **options),
+            )
+        except errors.ClientError as e:
+            if not self._cache_missing(cached_content, e):
+                raise
+            self.context_cache.invalidate()
+            cached_content = await self.context_cache.acquire()
+            return await method(
+                model=self.model,
+                contents=prompt,
+                config=self._build_config(metadata_filter, cached_content, **options),
+            )
+
+    async def warm_up(self) -> float:
+        """비동기 클라이언트의 연결(DNS, TLS)을 미리 열어 둠.
+
+        모델 정보 조회처럼 가벼운 요청을 보내 연결 풀에 연결을 만든다.
+        서버 시작 시와 유휴 시간 동안 주기적으로 호출한다.
+
+        Returns:
+            요청에 걸린 시간 (초)
+        """
+        started = time.perf_counter()
+        await self.client.aio.models.get(model=self.model)
+        return time.perf_counter() - started
+
+    def count_tokens(self, text: str) -> int:
+        """모델 기준 실제 토큰 수 조회 (토큰 추정기 보정용)"""
+        response = self.client.models.count_tokens(model=self.model, contents=text)
+        return response.total_tokens
+
+    def _can_use_cache(self, metadata_filter: str | None) -> bool:
+        """컨텍스트 캐시 사용 가능 여부.
+
+        캐시를 참조하는 요청은 도구를 따로 지정할 수 없으므로, 캐시에 들어 있는
+        필터 없는 File Search 도구와 다른 metadata_filter가 필요하면 캐시를 쓰지 않는다.
+        """
+        if self.context_cache is None:
+            return False
+        return not metadata_filter or self.settings.retrieval_mode == "local"
+
+    def forget_ungrounded_filters(self) -> None:
+        """검색 결과가 없던 필터 기록 삭제 (Store 문서가 바뀌어 다시 시도할 때)"""
+        self._ungrounded_filters.clear()
+
+    def _active_filter(self, metadata_filter: str | None) -> str | None:
+        """이번 호출에 쓸 필터 (이전에 검색 결과가 없던 필터면 None)"""
+        if metadata_filter in self._ungrounded_filters:
+            return None
+        return metadata_filter
+
+    def _ungrounded(self, metadata_filter: str | None, candidates: list | None) -> bool:
+        """필터를 건 File Search가 참고 문서를 하나도 찾지 못했는지 (그렇다면 필터를 기록).
+
+        매니페스트 기준으로는 조건에 맞는 문서가 있어도 실제 Store 문서의 메타데이터가
+        다르면 필터에 걸리는 문서가 없어 참고 메일 없이 생성된다.
+        """
+        if not metadata_filter:
+            return False
+        for candidate in candidates or []:
+            grounding = candidate.grounding_metadata
+            if grounding is not None and grounding.grounding_chunks:
+                return False
+        self._ungrounded_filters.add(metadata_filter)
+        return True
+
+    @staticmethod
+    def _cache_missing(cached_content: str | None, error: errors.ClientError) -> bool:
+        return cached_content is not None and error.code in _CACHE_MISSING_CODES
+
+    def _record_usage(self, usage_metadata: types.GenerateContentResponseUsageMetadata | None):
+        """응답의 토큰 수를 지표에 기록 (metrics 미지정 시 무시)"""
+        if self.metrics is not None:
+            self.metrics.record_usage(usage_metadata)
+
+    def _tools(self, metadata_filter: str | None = None) -> list[types.Tool] | None:
+        """File Search 도구 (retrieval_mode가 local이면 None)
+
+        local 모드는 참고 메일을 프롬프트에 직접 넣으므로 File Search 도구를 붙이지 않는다.
+        metadata_filter는 File Search 검색 범위를 제한한다.
+        """
+        if self.settings.retrieval_mode == "local":
+            return None
+        return [
+            types.Tool(
+                file_search=types.FileSearch(
+                    file_search_store_names=[
+                        self.settings.file_search_store_name
+                    ],
+                    metadata_filter=metadata_filter,
+                )
+            )
+        ]
+
+    def _cache_config(self) -> dict:
+        """컨텍스트 캐시에 넣을 내용: 시스템 지시문, File Search 도구, 대표 예시 메일"""
+        config = {
+            "display_name": "email-writer-context",
+            "system_instruction": PromptBuilder.SYSTEM_INSTRUCTION,
+            "tools": self._tools(),
+        }
+        exemplars = load_exemplars(
+            self.settings.context_cache_exemplar_dir, self.settings.context_cache_max_exemplars
+        )
+        if exemplars:
+            text = "다음은 사용자가 이전에 작성한 대표 이메일들입니다. 문체를 참고하세요.\n\n"
+            config["contents"] = [
+                types.Content(
+                    role="user",
+                    parts=[types.Part(text=text + "\n\n---\n\n".join(exemplars))],
+                )
+            ]
+        return config
+
+    def _build_config(
+        self,
+        metadata_filter: str | None = None,
+        cached_content: str | None = None,
+        **options,
+    ) -> types.GenerateContentConfig:
+        """생성 요청 설정 (시스템 지시문 + File Search 도구)
+
+        cached_content를 지정하면 시스템 지시문과 도구는 캐시에 들어 있으므로 캐시 이름만 참조한다.
+        options(temperature, candidate_count 등)는 None이 아닌 값만 설정에 반영한다.
+        """
+        config = {"temperature": self.settings.gemini_temperature}
+        config.update({key: value for key, value in options.items() if value is not None})
+        if cached_content:
+            return types.GenerateContentConfig(cached_content=cached_content, **config)
+        return types.GenerateContentConfig(
+            system_instruction=PromptBuilder.SYSTEM_INSTRUCTION,
+            tools=self._tools(metadata_filter),
+            **config,
+        )
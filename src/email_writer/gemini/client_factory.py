@@ -0,0 +1,63 @@
+import threading
+
+import httpx
+from google import genai
+from google.genai import types
+
+from email_writer.config import Settings
+
+_clients: dict[tuple, genai.Client] = {}
+_lock = threading.Lock()
+
+
+def _client_key(settings: Settings) -> tuple:
+    return (
+        settings.gemini_api_key,
+        settings.gemini_base_url,
+        settings.gemini_timeout,
+        settings.http_max_connections,
+        settings.http_max_keepalive_connections,
+        settings.http_keepalive_expiry,
+    )
+
+
+def build_http_options(settings: Settings) -> types.HttpOptions:
+    """연결 풀 크기와 keep-alive 유지 시간(및 지정 시 API 주소, 타임아웃)을 지정한 HTTP 옵션"""
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    return types.HttpOptions(
+        base_url=settings.gemini_base_url or None,
+        # SDK 타임아웃 단위는 밀리초
+        timeout=int(settings.gemini_timeout * 1000) or None,
+        client_args={"limits": limits},
+        # aiohttp가 설치돼 있으면 SDK가 client.aio에 aiohttp를 쓰고 limits를 버리므로,
+        # transport를 직접 넘겨 비동기 호출도 같은 제한의 httpx 연결 풀을 쓰게 함
+        async_client_args={"transport": httpx.AsyncHTTPTransport(limits=limits)},
+    )
+
+
+def get_genai_client(settings: Settings) -> genai.Client:
+    """프로세스 공용 genai.Client 반환.
+
+    GeminiClient와 FileSearchManager가 같은 HTTP 연결 풀을 공유하도록
+    API 키와 연결 설정이 같으면 한 번 만든 클라이언트를 재사용한다.
+    """
+    key = _client_key(settings)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = genai.Client(
+                api_key=settings.gemini_api_key,
+                http_options=build_http_options(settings),
+            )
+            _clients[key] = client
+        return client
+
+
+def reset_genai_clients() -> None:
+    """공용 클라이언트 캐시 비우기 (테스트/설정 변경용)"""
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# 만료 직전 캐시를 요청에 쓰지 않도록 두는 여유 시간 (초)
+_EXPIRY_SAFETY = 10.0
+
+
+def load_exemplars(exemplar_dir: str, max_exemplars: int) -> list[str]:
+    """대표 예시 메일(마크다운) 로드 (이름순, 디렉토리가 없으면 빈 목록)"""
+    if not exemplar_dir or not Path(exemplar_dir).is_dir():
+        return []
+    paths = sorted(Path(exemplar_dir).glob("*.md"))[:max_exemplars]
+    return [path.read_text(encoding="utf-8") for path in paths]
+
+
+class ContextCacheManager:
+    """시스템 지시문/도구/대표 예시 메일을 담은 Gemini 명시적 컨텍스트 캐시 관리.
+
+    요청마다 같은 시스템 지시문과 예시를 다시 보내지 않도록 캐시 리소스를 만들고
+    이름(cachedContents/...)을 빌려준다. 만료가 refresh_margin초 안으로 다가오면
+    refresh()가 TTL을 연장하고, 연장에 실패하거나 캐시가 사라졌으면 새로 만든다.
+    생성에 실패하면 retry_interval초 동안은 캐시 없이 진행한다 (요청은 실패하지 않음).
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str,
+        cache_config: dict,
+        ttl: int = 3600,
+        refresh_margin: int = 300,
+        retry_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.model = model
+        self.cache_config = cache_config
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self.name: str | None = None
+        self.expires_at = 0.0
+        # 생성/연장 횟수 (통계/테스트용)
+        self.created = 0
+        self.renewed = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock: asyncio.Lock | None = None
+
+    def current(self) -> str | None:
+        """지금 요청에 쓸 수 있는 캐시 이름 (없거나 곧 만료되면 None)"""
+        if self.name and self.clock() < self.expires_at - _EXPIRY_SAFETY:
+            return self.name
+        return None
+
+    def invalidate(self) -> None:
+        """캐시가 만료/삭제되었음을 표시 (다음 acquire에서 새로 생성)"""
+        self.name = None
+        self.expires_at = 0.0
+        self._retry_at = 0.0
+
+    def acquire_sync(self) -> str | None:
+        """유효한 캐시 이름 반환 (없으면 동기 클라이언트로 생성, 실패하면 None)"""
+        name = self.current()
+        if name or self.clock() < self._retry_at:
+            return name
+        with self._lock:
+            if self.current() is None and self.clock() >= self._retry_at:
+                try:
+                    cache = self.client.caches.create(
+                        model=self.model, config=self._create_config()
+                    )
+                except Exception as e:
+                    self._create_failed(e)
+                else:
+                    self._created(cache)
+            return self.current()
+
+    async def acquire(self) -> str | None:
+        """유효한 캐시 이름 반환 (없으면 비동기 클라이언트로 생성, 실패하면 None)"""
+        name = self.current()
+        if name or self.clock() < self._retry_at:
+            return name
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self.current() is None and self.clock() >= self._retry_at:
+                try:
+                    cache = await self.client.aio.caches.create(
+                        model=self.model, config=self._create_config()
+                    )
+                except Exception as e:
+                    self._create_failed(e)
+                else:
+                    self._created(cache)
+            return self.current()
+
+    async def refresh(self) -> None:
+        """만료가 가까우면 TTL 연장 (실패하면 다시 생성)"""
+        if self.name is None:
+            await self.acquire()
+            return
+        if self.expires_at - self.clock() > self.refresh_margin:
+            return
+        try:
+            await self.client.aio.caches.update(
+                name=self.name, config=types.UpdateCachedContentConfig(ttl=f"{self.ttl}s")
+            )
+        except Exception as e:
+            logger.warning("컨텍스트 캐시 TTL 연장 실패, 다시 생성합니다: %s", e)
+            self.invalidate()
+            await self.acquire()
+        else:
+            self.expires_at = self.clock() + self.ttl
+            self.renewed += 1
+
+    async def run(self) -> None:
+        """백그라운드 작업: 캐시를 만들어 두고 만료 전에 주기적으로 연장"""
+        interval = max(1.0, self.refresh_margin / 2)
+        while True:
+            await self.refresh()
+            await asyncio.sleep(interval)
+
+    def _create_config(self) -> types.CreateCachedContentConfig:
+        return types.CreateCachedContentConfig(ttl=f"{self.ttl}s", **self.cache_config)
+
+    def _created(self, cache) -> None:
+        self.name = cache.name
+        self.expires_at = self.clock() + self.ttl
+        self.created += 1
+        logger.info("컨텍스트 캐시 생성: %s (TTL %d초)", cache.name, self.ttl)
+
+    def _create_failed(self, error: Exception) -> None:
+        # 캐시할 내용이 모델의 최소 토큰 수보다 적으면 생성이 거부됨 (예시 메일을 추가해야 함)
+        logger.warning("컨텍스트 캐시 생성 실패, 캐시 없이 진행합니다: %s", error)
+        self.name = None
+        self._retry_at = self.clock() + self.retry_interval
@@ -1,16 +1,37 @@
+import queue
 import time
-
-from google import genai
+from collections.abc import Callable, Hashable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 
 from email_writer.config import Settings
+from email_writer.core.metadata_filter import date_number, recipient_domain
+from email_writer.gemini.client_factory import get_genai_client
+from email_writer.gemini.operations import OperationTracker, PollBackoff
 from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.upload import UploadResult
+
+
+class _PendingUpload:
+    """upload_many에서 진행 중인 업로드 작업 1건의 상태"""
+
+    def __init__(self, operation, started: float, backoff: PollBackoff):
+        self.operation = operation
+        self.started = started
+        # 업로드 요청이 반환된 시점 (이후는 인덱싱 대기 시간)
+        self.accepted_at = time.monotonic()
+        self.backoff = backoff
+        self.next_poll_at = self.accepted_at
+        self.schedule_next_poll()
+
+    def schedule_next_poll(self) -> None:
+        self.next_poll_at = time.monotonic() + self.backoff.next_interval()
 
 
 class FileSearchManager:
     """Gemini File Search Store 생성/관리"""
 
     def __init__(self, settings: Settings):
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        self.client = get_genai_client(settings)
         self.settings = settings
 
     def create_store(self, display_name: str = "email-patterns") -> str:
@@ -20,35 +41,273 @@ class FileSearchManager:
         )
         return store.name
 
+    @property
+    def tracker(self) -> OperationTracker:
+        """업로드 작업 상태 추적기 (설정의 폴링 백오프 값 사용)"""
+        return OperationTracker(
+            self.client,
+            initial_interval=self.settings.upload_poll_initial,
+            max_interval=self.settings.upload_poll_max,
+            multiplier=self.settings.upload_poll_multiplier,
+            jitter=self.settings.upload_poll_jitter,
+        )
+
     def upload_markdown(
         self,
         store_name: str,
         md_file_path: str,
         metadata: EmailMetadata,
-        poll_interval: float = 2.0,
+        poll_interval: float | None = None,
         max_wait: float = 120.0,
-    ) -> None:
+    ) -> UploadResult:
         """마크다운 파일을 File Search Store에 업로드.
 
         google-genai SDK의 upload_to_file_search_store()를 사용하여
         파일 업로드와 Store 등록을 단일 호출로 수행한다.
-        LongRunningOperation을 반환하므로 완료까지 폴링한다.
+        LongRunningOperation을 반환하므로 client.operations.get()으로 상태를 갱신하며
+        완료까지 폴링한다. 폴링 간격은 짧게 시작하여 지수적으로 늘어난다.
 
         Args:
             store_name: File Search Store 리소스 이름
             md_file_path: 업로드할 마크다운 파일 경로
             metadata: 이메일 메타데이터
-            poll_interval: 폴링 간격 (초, 기본 2초)
+            poll_interval: 고정 폴링 간격 (초, None이면 설정의 지수 백오프 사용)
             max_wait: 최대 대기 시간 (초, 기본 120초)
 
+        Returns:
+            업로드 결과 (문서 리소스 이름, 전체 소요 시간, 인덱싱 대기 시간)
+
         Raises:
             TimeoutError: max_wait 초과 시
             Exception: 업로드 실패 시
         """
+        tracker = self.tracker
+        if poll_interval is not None:
+            tracker = OperationTracker(
+                self.client,
+                initial_interval=poll_interval,
+                max_interval=poll_interval,
+                multiplier=1.0,
+                jitter=0.0,
+            )
+
+        started = time.monotonic()
+        operation = self._start_upload(store_name, md_file_path, metadata)
+
+        try:
+            operation, indexing_latency = tracker.wait(
+                operation,
+                max_wait=max_wait - (time.monotonic() - started),
+                description=metadata.file_name,
+            )
+        except TimeoutError:
+            raise TimeoutError(
+                f"파일 업로드 타임아웃 ({max_wait}초 초과): {metadata.file_name}"
+            ) from None
+
+        if operation.error:
+            raise Exception(
+                f"파일 업로드 실패: {metadata.file_name} - {operation.error}"
+            )
+
+        return UploadResult(
+            file_name=metadata.file_name,
+            markdown_path=md_file_path,
+            success=True,
+            document_name=operation.response.document_name if operation.response else None,
+            elapsed=time.monotonic() - started,
+            indexing_latency=indexing_latency,
+        )
+
+    def upload_many(
+        self,
+        store_name: str,
+        items: list[EmailMetadata],
+        concurrency: int | None = None,
+        max_wait: float = 120.0,
+    ) -> list[UploadResult]:
+        """여러 마크다운 파일을 동시에 업로드 (진행 중 작업 수 제한).
+
+        Args:
+            store_name: File Search Store 리소스 이름
+            items: 업로드할 이메일 메타데이터 목록 (markdown_path 사용)
+            concurrency: 동시 진행 작업 수 (None이면 settings.upload_concurrency)
+            max_wait: 문서별 최대 대기 시간 (초)
+
+        Returns:
+            items와 같은 순서의 문서별 업로드 결과 (실패도 예외 대신 결과로 반환)
+        """
+        source: queue.Queue = queue.Queue()
+        for item in enumerate(items):
+            source.put(item)
+        source.put(None)
+
+        results: list[UploadResult | None] = [None] * len(items)
+
+        def collect(index: int, result: UploadResult) -> None:
+            results[index] = result
+
+        self.upload_stream(store_name, source, collect, concurrency, max_wait)
+        return results
+
+    def upload_stream(
+        self,
+        store_name: str,
+        source: queue.Queue,
+        on_result: Callable[[Hashable, UploadResult], None],
+        concurrency: int | None = None,
+        max_wait: float = 120.0,
+    ) -> None:
+        """큐에서 꺼낸 파일을 차례로 업로드 (진행 중 작업 수 제한).
+
+        최대 concurrency개의 업로드를 동시에 진행시킨다. 업로드 요청(파일 전송)은
+        스레드 풀에서 동시에 보내고, 요청이 끝난 작업은 폴링 시각이 된 것들끼리
+        한 라운드에서 함께 갱신한다. 작업마다 폴링 간격은 지수 백오프를 따르며,
+        빈 자리가 생기면 다음 폴링 시각까지 큐에서 새 파일을 기다린다.
+        자리가 모두 차 있으면 큐에서 꺼내지 않으므로 생산 측이 put에서 멈춘다.
+
+        Args:
+            store_name: File Search Store 리소스 이름
+            source: (key, EmailMetadata) 항목 큐. None을 넣으면 입력 끝
+            on_result: 문서 하나가 끝날 때마다 (key, 업로드 결과)로 호출 (완료 순서)
+            concurrency: 동시 진행 작업 수 (None이면 settings.upload_concurrency)
+            max_wait: 문서별 최대 대기 시간 (초)
+        """
+        concurrency = max(1, concurrency or self.settings.upload_concurrency)
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="upload-start"
+        ) as executor:
+            self._upload_stream(store_name, source, on_result, concurrency, max_wait, executor)
+
+    def _upload_stream(
+        self,
+        store_name: str,
+        source: queue.Queue,
+        on_result: Callable[[Hashable, UploadResult], None],
+        concurrency: int,
+        max_wait: float,
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        tracker = self.tracker
+        # 업로드 요청을 보내는 중인 작업 (future -> key, 메타데이터, 시작 시각)
+        starting: dict[Future, tuple[Hashable, EmailMetadata, float]] = {}
+        # 업로드 요청이 끝나 인덱싱 완료를 폴링 중인 작업
+        pending: dict[Hashable, tuple[EmailMetadata, _PendingUpload]] = {}
+        exhausted = False
+
+        def finish(
+            key: Hashable,
+            metadata: EmailMetadata,
+            started: float,
+            indexing_latency: float | None = None,
+            **fields,
+        ):
+            on_result(
+                key,
+                UploadResult(
+                    file_name=metadata.file_name,
+                    markdown_path=metadata.markdown_path,
+                    elapsed=time.monotonic() - started,
+                    indexing_latency=indexing_latency,
+                    **fields,
+                ),
+            )
+
+        while not exhausted or pending or starting:
+            for future in [future for future in starting if future.done()]:
+                key, metadata, started = starting.pop(future)
+                try:
+                    operation = future.result()
+                except Exception as e:
+                    finish(key, metadata, started, success=False, error=str(e))
+                    continue
+                pending[key] = (metadata, _PendingUpload(operation, started, tracker.backoff()))
+
+            now = time.monotonic()
+            for key, (metadata, upload) in list(pending.items()):
+                if not upload.operation.done and now < upload.next_poll_at:
+                    continue
+                try:
+                    if not upload.operation.done:
+                        upload.operation = tracker.refresh(upload.operation)
+                except Exception as e:
+                    del pending[key]
+                    finish(key, metadata, upload.started, success=False, error=str(e))
+                    continue
+
+                operation = upload.operation
+                if operation.done:
+                    del pending[key]
+                    latency = time.monotonic() - upload.accepted_at
+                    if operation.error:
+                        finish(
+                            key, metadata, upload.started, latency,
+                            success=False, error=str(operation.error),
+                        )
+                    else:
+                        document_name = (
+                            operation.response.document_name if operation.response else None
+                        )
+                        finish(
+                            key, metadata, upload.started, latency,
+                            success=True, document_name=document_name,
+                        )
+                elif time.monotonic() - upload.started >= max_wait:
+                    del pending[key]
+                    finish(
+                        key, metadata, upload.started, success=False,
+                        error=f"파일 업로드 타임아웃 ({max_wait}초 초과)",
+                    )
+                else:
+                    upload.schedule_next_poll()
+
+            next_poll_at = min(
+                (upload.next_poll_at for _, upload in pending.values()), default=None
+            )
+
+            # 빈 자리 채우기: 진행 중 작업이 있으면 가장 이른 폴링 시각까지만 새 파일을 기다림.
+            # 업로드 요청을 보내는 중이면 그 완료도 확인해야 하므로 큐를 기다리지 않음
+            idle = False
+            while not exhausted and len(pending) + len(starting) < concurrency:
+                timeout = None
+                if starting:
+                    timeout = 0.0
+                elif next_poll_at is not None:
+                    timeout = max(0.0, next_poll_at - time.monotonic())
+                try:
+                    item = source.get(timeout=timeout)
+                except queue.Empty:
+                    idle = True
+                    break
+                if item is None:
+                    exhausted = True
+                    break
+                key, metadata = item
+                future = executor.submit(
+                    self._start_upload, store_name, metadata.markdown_path, metadata
+                )
+                starting[future] = (key, metadata, time.monotonic())
+
+            # 자리가 다 찼거나 입력이 끝났으면(또는 새 파일이 없으면) 다음 일까지 대기:
+            # 업로드 요청 중인 작업이 있으면 그 완료 또는 가장 이른 폴링 시각까지
+            waiting = exhausted or idle or len(pending) + len(starting) >= concurrency
+            if starting and waiting:
+                timeout = None
+                if next_poll_at is not None:
+                    timeout = max(0.0, next_poll_at - time.monotonic())
+                wait(starting, timeout=timeout, return_when=FIRST_COMPLETED)
+            elif pending and waiting:
+                delay = next_poll_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def _start_upload(self, store_name: str, md_file_path: str, metadata: EmailMetadata):
+        """업로드 작업 시작 (LongRunningOperation 반환)"""
         custom_metadata = [
             {"key": "subject", "string_value": metadata.subject},
             {"key": "sender", "string_value": metadata.sender},
             {"key": "recipients", "string_value": metadata.recipients},
+            {"key": "recipient_domain", "string_value": recipient_domain(metadata.recipients)},
             {"key": "is_reply", "string_value": str(metadata.is_reply)},
         ]
 
@@ -56,8 +315,12 @@ class FileSearchManager:
             custom_metadata.append(
                 {"key": "date", "string_value": metadata.date.isoformat()}
             )
+            # 기간 필터용 숫자 값 (범위 비교는 numeric_value에만 적용됨)
+            custom_metadata.append(
+                {"key": "date_ymd", "numeric_value": date_number(metadata.date)}
+            )
 
-        operation = self.client.file_search_stores.upload_to_file_search_store(
+        return self.client.file_search_stores.upload_to_file_search_store(
             file_search_store_name=store_name,
             file=md_file_path,
             config={
@@ -66,35 +329,19 @@ class FileSearchManager:
             },
         )
 
-        elapsed = 0.0
-        while not operation.done:
-            if elapsed >= max_wait:
-                raise TimeoutError(
-                    f"파일 업로드 타임아웃 ({max_wait}초 초과): {metadata.file_name}"
-                )
-            time.sleep(poll_interval)
-            elapsed += poll_interval
-
-        if operation.error:
-            raise Exception(
-                f"파일 업로드 실패: {metadata.file_name} - {operation.error}"
-            )
-
     def list_stores(self):
         """전체 File Search Store 목록 조회"""
         return self.client.file_search_stores.list()
 
     def list_documents(self, store_name: str):
         """Store 내 문서 목록 조회"""
-        return self.client.file_search_stores.documents.list(
-            file_search_store_name=store_name
-        )
+        return self.client.file_search_stores.documents.list(parent=store_name)
 
     def delete_document(self, store_name: str, document_name: str):
         """Store에서 문서 삭제"""
+        # 문서 이름에 Store 이름이 포함됨. 청크가 남아 있어도 삭제되도록 force 지정
         self.client.file_search_stores.documents.delete(
-            file_search_store_name=store_name,
-            name=document_name,
+            name=document_name, config={"force": True}
         )
 
     def delete_store(self, store_name: str):
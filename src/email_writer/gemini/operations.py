@@ -0,0 +1,88 @@
+import random
+import time
+
+
+class PollBackoff:
+    """폴링 간격 계산 (지수 백오프 + 지터).
+
+    첫 간격을 짧게 두어 빨리 끝나는 작업은 곧바로 감지하고,
+    오래 걸리는 작업은 간격을 max_interval까지 늘려 API 호출을 줄인다.
+    지터는 여러 작업의 폴링 시점이 한꺼번에 몰리지 않도록 간격을 흩뜨린다.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = 0.1,
+        max_interval: float = 5.0,
+        multiplier: float = 1.5,
+        jitter: float = 0.2,
+    ):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._current = initial_interval
+
+    def next_interval(self) -> float:
+        """다음 폴링까지 대기할 시간 (초)"""
+        interval = self._current
+        self._current = min(self._current * self.multiplier, self.max_interval)
+        if self.jitter:
+            interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return interval
+
+
+class OperationTracker:
+    """LongRunningOperation 상태 추적.
+
+    operation 객체는 생성 시점의 스냅샷이므로, client.operations.get()으로
+    다시 조회해야 done/error/response가 갱신된다.
+    """
+
+    def __init__(
+        self,
+        client,
+        initial_interval: float = 0.1,
+        max_interval: float = 5.0,
+        multiplier: float = 1.5,
+        jitter: float = 0.2,
+    ):
+        self.client = client
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def backoff(self) -> PollBackoff:
+        """작업 1건용 폴링 간격 계산기 생성"""
+        return PollBackoff(
+            initial_interval=self.initial_interval,
+            max_interval=self.max_interval,
+            multiplier=self.multiplier,
+            jitter=self.jitter,
+        )
+
+    def refresh(self, operation):
+        """작업 상태를 API에서 다시 조회"""
+        return self.client.operations.get(operation)
+
+    def wait(self, operation, max_wait: float, description: str = ""):
+        """작업 완료까지 대기.
+
+        Returns:
+            (완료된 operation, 대기 시작부터 완료 확인까지 걸린 시간(초))
+
+        Raises:
+            TimeoutError: max_wait 초과 시
+        """
+        started = time.monotonic()
+        backoff = self.backoff()
+
+        while not operation.done:
+            remaining = max_wait - (time.monotonic() - started)
+            if remaining <= 0:
+                raise TimeoutError(f"작업 대기 타임아웃 ({max_wait}초 초과): {description}")
+            time.sleep(min(backoff.next_interval(), remaining))
+            operation = self.refresh(operation)
+
+        return operation, time.monotonic() - started
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+from email_writer.models.email_metadata import EmailMetadata
+
+
+class ConversionResult(BaseModel):
+    """MSG 파일 1건의 변환 결과 (일괄 변환 시 파일별로 반환)"""
+
+    source_path: str = Field(description="원본 MSG 파일 경로")
+    success: bool = Field(description="변환 성공 여부")
+    metadata: EmailMetadata | None = Field(
+        default=None,
+        description="변환 성공 시 메타데이터"
+    )
+    error_type: str | None = Field(
+        default=None,
+        description="변환 실패 시 예외 타입 이름"
+    )
+    error_message: str | None = Field(
+        default=None,
+        description="변환 실패 시 메시지"
+    )
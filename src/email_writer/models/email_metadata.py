@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class EmailMetadata(BaseModel):
@@ -14,3 +14,5 @@ class EmailMetadata(BaseModel):
     is_reply: bool = False
     has_attachments: bool = False
     markdown_path: str
+    original_chars: int = Field(default=0, description="인용/서명 제거 전 마크다운 글자 수")
+    markdown_chars: int = Field(default=0, description="저장한 마크다운 글자 수")
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+
+class BuiltPrompt(BaseModel):
+    """PromptBuilder가 구성한 프롬프트와 추정 토큰 수"""
+
+    text: str = Field(description="Gemini에 전달할 프롬프트")
+    estimated_tokens: int = Field(description="프롬프트의 추정 토큰 수")
+    section_tokens: dict[str, int] = Field(
+        default_factory=dict,
+        description="섹션별 추정 토큰 수 (context_body, selected_text 등)"
+    )
+    trimmed_sections: list[str] = Field(
+        default_factory=list,
+        description="예산 때문에 잘린 섹션 이름"
+    )
+    metadata_filter: str | None = Field(
+        default=None,
+        description="File Search 검색 범위를 제한하는 메타데이터 필터 식 (None이면 전체 검색)"
+    )
@@ -26,3 +26,27 @@ class GenerateEmailRequest(BaseModel):
         default="",
         description="사용자 추가 지시사항"
     )
+    regenerate: bool = Field(
+        default=False,
+        description="응답 캐시를 무시하고 새로 생성"
+    )
+
+
+class GenerateCandidatesRequest(GenerateEmailRequest):
+    """후보 초안 여러 개를 한 번에 요청"""
+
+    candidate_count: int = Field(
+        default=3,
+        ge=1,
+        le=8,
+        description="생성할 후보 초안 수"
+    )
+
+
+class BatchGenerateRequest(BaseModel):
+    """여러 메일의 초안을 한 번에 요청 (결과는 같은 순서로 반환)"""
+
+    requests: list[GenerateEmailRequest] = Field(
+        min_length=1,
+        description="생성 요청 목록"
+    )
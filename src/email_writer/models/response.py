@@ -13,3 +13,31 @@ class GenerateEmailResponse(BaseModel):
         default=None,
         description="에러 발생 시 메시지"
     )
+
+
+class GenerateCandidatesResponse(BaseModel):
+    """후보 초안 여러 개에 대한 응답"""
+
+    success: bool = Field(description="요청 처리 성공 여부")
+    candidates: list[str] = Field(
+        default_factory=list,
+        description="생성된 후보 초안 목록"
+    )
+    error_message: str | None = Field(
+        default=None,
+        description="에러 발생 시 메시지"
+    )
+
+
+class BatchGenerateResponse(BaseModel):
+    """일괄 생성 응답 (results는 요청과 같은 순서, 항목별 성공/실패)"""
+
+    success: bool = Field(description="요청 처리 성공 여부 (항목별 실패와 무관)")
+    results: list[GenerateEmailResponse] = Field(
+        default_factory=list,
+        description="요청 순서대로의 항목별 결과"
+    )
+    error_message: str | None = Field(
+        default=None,
+        description="요청 전체가 실패했을 때 메시지"
+    )
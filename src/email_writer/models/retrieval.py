@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+from email_writer.models.email_metadata import EmailMetadata
+
+
+class RetrievedEmail(BaseModel):
+    """로컬 검색 인덱스에서 찾은 이전 메일 1건"""
+
+    metadata: EmailMetadata = Field(description="이메일 메타데이터")
+    text: str = Field(description="변환된 마크다운 본문")
+    score: float = Field(description="검색 점수 (높을수록 유사)")
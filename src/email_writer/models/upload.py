@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+
+
+class UploadResult(BaseModel):
+    """File Search Store 문서 1건의 업로드 결과"""
+
+    file_name: str = Field(description="문서 표시 이름 (원본 MSG 파일명)")
+    markdown_path: str = Field(description="업로드한 마크다운 파일 경로")
+    success: bool = Field(description="업로드 및 인덱싱 성공 여부")
+    document_name: str | None = Field(
+        default=None,
+        description="등록된 문서 리소스 이름"
+    )
+    error: str | None = Field(
+        default=None,
+        description="실패 시 메시지"
+    )
+    elapsed: float = Field(
+        default=0.0,
+        description="업로드 시작부터 완료까지 걸린 시간 (초)"
+    )
+    indexing_latency: float | None = Field(
+        default=None,
+        description="업로드 요청 반환 후 인덱싱 완료 확인까지 걸린 시간 (초)"
+    )
+
+
+class IngestSummary(BaseModel):
+    """변환→업로드 파이프라인 1회 실행 결과"""
+
+    converted: int = Field(default=0, description="변환 성공 파일 수")
+    convert_failed: int = Field(default=0, description="변환 실패 파일 수")
+    uploaded: int = Field(default=0, description="업로드 성공 문서 수")
+    upload_failed: int = Field(default=0, description="업로드 실패 문서 수")
+    duplicates: int = Field(default=0, description="유사 중복으로 업로드하지 않은 메일 수")
+    bundles: int = Field(default=0, description="새로 만든 묶음 문서 수")
+    bundled: int = Field(default=0, description="묶음 문서에 넣은 메일 수")
+    original_chars: int = Field(default=0, description="변환한 메일의 인용/서명 제거 전 글자 수 합")
+    markdown_chars: int = Field(default=0, description="변환한 메일의 저장된 글자 수 합")
+    elapsed: float = Field(default=0.0, description="전체 소요 시간 (초)")
@@ -0,0 +1,38 @@
+import math
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from email_writer.retrieval.tokenizer import tokenize
+
+
+class HashingEmbedder:
+    """토큰 해싱 기반 로컬 임베딩 (API 호출 없음).
+
+    토큰을 고정 차원으로 해싱하고 부호를 붙여 누적한 뒤 L2 정규화한다.
+    학습된 임베딩만큼 의미를 잡지는 못하지만, 표기가 조금 다른 문서도
+    비슷한 벡터가 되어 BM25 점수를 보완한다.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        """텍스트 1건의 정규화된 벡터 (float32)"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, count in Counter(tokenize(text)).items():
+            digest = zlib.crc32(token.encode("utf-8"))
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dim] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+
+    def embed_many(self, texts: list[str]) -> np.ndarray:
+        """여러 텍스트의 벡터 행렬 (len(texts) x dim)"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix
@@ -0,0 +1,260 @@
+import json
+import math
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.retrieval import RetrievedEmail
+from email_writer.retrieval.embedding import HashingEmbedder
+from email_writer.retrieval.tokenizer import tokenize
+
+_META_FILE = "meta.json"
+_DOCUMENTS_FILE = "documents.jsonl"
+_DOC_OFFSETS_FILE = "doc_offsets.npy"
+_VOCAB_FILE = "vocab.json"
+_POSTINGS_DOC_FILE = "postings_doc.npy"
+_POSTINGS_TF_FILE = "postings_tf.npy"
+_DOC_LENGTHS_FILE = "doc_lengths.npy"
+_VECTORS_FILE = "vectors.npy"
+
+INDEX_VERSION = 1
+
+
+class RetrievalIndex:
+    """변환된 마크다운 메일의 로컬 검색 인덱스 (BM25 + 선택적 해시 임베딩 벡터).
+
+    prepare_emails.py 실행 시 build()로 디렉토리에 저장하고, 서버는 load()로 연다.
+    역색인(postings)과 벡터 행렬은 .npy 파일을 메모리 매핑하므로 로드가 빠르고
+    여러 워커 프로세스가 같은 페이지 캐시를 공유한다. 메일 본문은 메모리에 올리지 않고
+    검색 결과로 뽑힌 문서만 documents.jsonl에서 바이트 오프셋으로 읽는다.
+    """
+
+    def __init__(
+        self,
+        documents_path: str | Path,
+        doc_offsets: np.ndarray,
+        vocab: dict[str, list[int]],
+        postings_doc: np.ndarray,
+        postings_tf: np.ndarray,
+        doc_lengths: np.ndarray,
+        vectors: np.ndarray | None = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        embedder: HashingEmbedder | None = None,
+    ):
+        # 재생성(파일 교체) 중에도 같은 파일을 읽도록 열어 둠 (seek + read는 락으로 보호)
+        self._documents = open(documents_path, "rb")  # noqa: SIM115
+        self._documents_lock = threading.Lock()
+        self.doc_offsets = doc_offsets
+        self.vocab = vocab
+        self.postings_doc = postings_doc
+        self.postings_tf = postings_tf
+        self.doc_lengths = doc_lengths
+        self.vectors = vectors
+        self.k1 = k1
+        self.b = b
+        self.embedder = embedder
+        self.avg_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    @staticmethod
+    def meta_path(index_dir: str | Path) -> Path:
+        """인덱스 메타 파일 경로 (build()가 마지막에 쓰므로 갱신 여부 확인에 사용)"""
+        return Path(index_dir) / _META_FILE
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def close(self) -> None:
+        self._documents.close()
+
+    def document(self, doc_id: int) -> dict:
+        """문서 1건의 {"metadata": ..., "text": ...} (documents.jsonl에서 해당 줄만 읽음)"""
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        with self._documents_lock:
+            self._documents.seek(start)
+            line = self._documents.read(end - start)
+        return json.loads(line)
+
+    @classmethod
+    def build(
+        cls,
+        items: list[EmailMetadata],
+        index_dir: str | Path,
+        vectors: bool = True,
+        dim: int = 256,
+    ) -> "RetrievalIndex":
+        """마크다운 파일들로 인덱스를 만들어 index_dir에 저장 후 로드.
+
+        Args:
+            items: 변환된 이메일 메타데이터 (markdown_path의 파일을 읽음)
+            index_dir: 인덱스 저장 디렉토리 (기존 파일은 덮어씀)
+            vectors: 해시 임베딩 벡터도 저장할지 여부
+            dim: 임베딩 차원
+        """
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        texts = [Path(item.markdown_path).read_text(encoding="utf-8") for item in items]
+        term_docs: dict[str, list[tuple[int, int]]] = {}
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                term_docs.setdefault(term, []).append((doc_id, tf))
+
+        vocab: dict[str, list[int]] = {}
+        postings_doc = []
+        postings_tf = []
+        for term in sorted(term_docs):
+            postings = term_docs[term]
+            vocab[term] = [len(postings_doc), len(postings)]
+            postings_doc.extend(doc_id for doc_id, _ in postings)
+            postings_tf.extend(tf for _, tf in postings)
+
+        _save_array(index_dir / _POSTINGS_DOC_FILE, np.asarray(postings_doc, dtype=np.int32))
+        _save_array(index_dir / _POSTINGS_TF_FILE, np.asarray(postings_tf, dtype=np.float32))
+        _save_array(index_dir / _DOC_LENGTHS_FILE, doc_lengths)
+        if vectors:
+            _save_array(index_dir / _VECTORS_FILE, HashingEmbedder(dim).embed_many(texts))
+        else:
+            (index_dir / _VECTORS_FILE).unlink(missing_ok=True)
+
+        vocab_json = json.dumps(vocab, ensure_ascii=False)
+        _write_bytes(index_dir / _VOCAB_FILE, vocab_json.encode("utf-8"))
+        lines = [
+            (
+                json.dumps(
+                    {"metadata": item.model_dump(mode="json"), "text": text}, ensure_ascii=False
+                )
+                + "\n"
+            ).encode("utf-8")
+            for item, text in zip(items, texts)
+        ]
+        offsets = np.zeros(len(lines) + 1, dtype=np.int64)
+        np.cumsum([len(line) for line in lines], out=offsets[1:])
+        _write_bytes(index_dir / _DOCUMENTS_FILE, b"".join(lines))
+        _save_array(index_dir / _DOC_OFFSETS_FILE, offsets)
+        # meta.json을 마지막에 써서 서버가 갱신을 알아채는 기준으로 삼음
+        meta = {"version": INDEX_VERSION, "documents": len(texts), "vectors": vectors, "dim": dim}
+        _write_bytes(index_dir / _META_FILE, json.dumps(meta).encode("utf-8"))
+
+        return cls.load(index_dir)
+
+    @classmethod
+    def load(cls, index_dir: str | Path) -> "RetrievalIndex":
+        """저장된 인덱스 로드 (npy 파일은 메모리 매핑)
+
+        Raises:
+            FileNotFoundError: 인덱스가 없을 때
+        """
+        index_dir = Path(index_dir)
+        meta_path = cls.meta_path(index_dir)
+        if not meta_path.is_file():
+            raise FileNotFoundError(
+                f"검색 인덱스가 없습니다: {index_dir} (scripts/prepare_emails.py로 생성하세요)"
+            )
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+
+        offsets_path = index_dir / _DOC_OFFSETS_FILE
+        if offsets_path.is_file():
+            doc_offsets = np.load(offsets_path, mmap_mode="r")
+        else:
+            # 오프셋 파일이 없는 이전 버전 인덱스: 줄 위치만 한 번 훑어서 계산
+            doc_offsets = _line_offsets(index_dir / _DOCUMENTS_FILE)
+
+        vectors = None
+        embedder = None
+        if meta.get("vectors"):
+            vectors = np.load(index_dir / _VECTORS_FILE, mmap_mode="r")
+            embedder = HashingEmbedder(meta["dim"])
+
+        return cls(
+            documents_path=index_dir / _DOCUMENTS_FILE,
+            doc_offsets=doc_offsets,
+            vocab=json.loads((index_dir / _VOCAB_FILE).read_text(encoding="utf-8")),
+            postings_doc=np.load(index_dir / _POSTINGS_DOC_FILE, mmap_mode="r"),
+            postings_tf=np.load(index_dir / _POSTINGS_TF_FILE, mmap_mode="r"),
+            doc_lengths=np.load(index_dir / _DOC_LENGTHS_FILE, mmap_mode="r"),
+            vectors=vectors,
+            embedder=embedder,
+        )
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        """문서별 BM25 점수"""
+        total = len(self)
+        scores = np.zeros(total, dtype=np.float32)
+        for term in set(tokenize(query)):
+            entry = self.vocab.get(term)
+            if entry is None:
+                continue
+            offset, df = entry
+            docs = self.postings_doc[offset : offset + df]
+            tf = self.postings_tf[offset : offset + df]
+            idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[docs] / self.avg_length)
+            scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return scores
+
+    def search(
+        self, query: str, top_k: int = 3, vector_weight: float = 0.3
+    ) -> list[RetrievedEmail]:
+        """질의와 가장 비슷한 메일 top_k건 (점수 내림차순).
+
+        BM25 점수를 최댓값으로 정규화하고, 벡터가 있으면 코사인 유사도와
+        vector_weight 비율로 섞는다. 점수가 0인 문서는 제외한다.
+        """
+        if not len(self) or top_k <= 0:
+            return []
+
+        scores = self.bm25_scores(query)
+        if scores.max() > 0:
+            scores /= scores.max()
+        if self.vectors is not None and vector_weight > 0:
+            similarity = np.asarray(self.vectors @ self.embedder.embed(query))
+            scores = (1.0 - vector_weight) * scores + vector_weight * np.maximum(similarity, 0.0)
+
+        top_k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        ranked = sorted(candidates, key=lambda doc_id: (-scores[doc_id], doc_id))
+        results = []
+        for doc_id in ranked:
+            if scores[doc_id] <= 0:
+                continue
+            document = self.document(doc_id)
+            results.append(
+                RetrievedEmail(
+                    metadata=EmailMetadata.model_validate(document["metadata"]),
+                    text=document["text"],
+                    score=float(scores[doc_id]),
+                )
+            )
+        return results
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체 (서버가 메모리 매핑/열어 둔 기존 파일은 그대로 유지됨)"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _save_array(path: Path, array: np.ndarray) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _line_offsets(path: Path) -> np.ndarray:
+    """파일의 줄 시작 바이트 위치 (마지막 값은 파일 끝)"""
+    offsets = [0]
+    with open(path, "rb") as f:
+        for line in f:
+            offsets.append(offsets[-1] + len(line))
+    return np.asarray(offsets, dtype=np.int64)
+
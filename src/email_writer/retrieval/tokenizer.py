@@ -0,0 +1,21 @@
+import re
+
+_WORD = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """검색용 토큰 분리.
+
+    영문/숫자는 단어 단위(소문자), 한글은 띄어쓰기와 조사에 덜 민감하도록
+    음절 바이그램으로 나눈다 (한 음절 단어는 그대로).
+    """
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 or word.isdigit():
+            tokens.append(word)
+    return tokens
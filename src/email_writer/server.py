@@ -1,36 +1,270 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
-from email_writer.config import Settings
-from email_writer.core.generator import EmailGenerator
-from email_writer.models.request import GenerateEmailRequest
-from email_writer.models.response import GenerateEmailResponse
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-app = FastAPI(title="Email Writer API")
-settings = Settings()
-generator = EmailGenerator(settings)
+from email_writer.core.metrics import collect_timings, format_server_timing
+from email_writer.models.request import (
+    BatchGenerateRequest,
+    GenerateCandidatesRequest,
+    GenerateEmailRequest,
+)
+from email_writer.models.response import (
+    BatchGenerateResponse,
+    GenerateCandidatesResponse,
+    GenerateEmailResponse,
+)
+
+if TYPE_CHECKING:
+    from email_writer.config import Settings
+    from email_writer.core.generator import EmailGenerator
+
+logger = logging.getLogger(__name__)
+
+# 설정 로드와 EmailGenerator 생성(google-genai import 포함)은 서버가 포트를 연 뒤
+# lifespan의 백그라운드 작업에서 수행한다. 그 전에 들어온 요청은 초기화를 기다린다.
+settings: "Settings | None" = None
+generator: "EmailGenerator | None" = None
+_init_error: str | None = None
+_init_lock = threading.Lock()
+
+
+def _initialize() -> None:
+    """설정 로드 및 EmailGenerator 생성 (여러 번 호출해도 한 번만 수행)"""
+    global settings, generator, _init_error
+    with _init_lock:
+        if generator is not None:
+            return
+        try:
+            from email_writer.config import Settings
+            from email_writer.core.generator import EmailGenerator
+
+            if settings is None:
+                settings = Settings()
+            generator = EmailGenerator(settings)
+            _init_error = None
+        except Exception as e:
+            _init_error = str(e)
+            raise
+
+
+async def get_generator() -> "EmailGenerator":
+    """초기화된 EmailGenerator 반환 (초기화 전이면 완료까지 대기)"""
+    if generator is None:
+        await asyncio.to_thread(_initialize)
+    return generator
+
+
+async def _warm_up() -> None:
+    """Gemini API 연결 예열 (실패해도 서버 동작에는 영향 없음)"""
+    try:
+        elapsed = await generator.gemini_client.warm_up()
+        logger.info("Gemini 연결 예열 완료 (%.0f ms)", elapsed * 1000)
+    except Exception as e:
+        logger.warning("Gemini 연결 예열 실패: %s", e)
+
+
+async def _keep_alive(interval: float) -> None:
+    """유휴 연결이 만료되지 않도록 주기적으로 가벼운 요청 전송"""
+    while True:
+        await asyncio.sleep(interval)
+        await _warm_up()
+
+
+async def _startup() -> None:
+    """백그라운드 초기화: 생성기 준비 -> 연결 예열 -> 주기적 keep-alive / 컨텍스트 캐시 연장"""
+    try:
+        await asyncio.to_thread(_initialize)
+    except Exception as e:
+        logger.error("서버 초기화 실패: %s", e)
+        return
+
+    if settings.warmup_on_startup:
+        await _warm_up()
+
+    background = []
+    if settings.keepalive_interval > 0:
+        background.append(_keep_alive(settings.keepalive_interval))
+    context_cache = generator.gemini_client.context_cache
+    if context_cache is not None:
+        background.append(context_cache.run())
+    if background:
+        await asyncio.gather(*background)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """초기화를 백그라운드로 시작하고 바로 요청을 받음, 종료 시 정리"""
+    startup = asyncio.create_task(_startup())
+
+    yield
+
+    startup.cancel()
+    try:
+        await startup
+    except asyncio.CancelledError:
+        pass
+    if generator is not None and generator.cache is not None:
+        # 히트 시 미뤄 둔 마지막 사용 시각을 디스크 캐시에 반영
+        generator.cache.close()
+
+
+app = FastAPI(title="Email Writer API", lifespan=lifespan)
 
 
 @app.post("/api/generate-email", response_model=GenerateEmailResponse)
-def generate_email(request: GenerateEmailRequest):
+async def generate_email(request: GenerateEmailRequest, response: Response):
     """이메일 생성 엔드포인트 - VBA에서 호출
 
-    동기 함수로 정의. FastAPI는 동기 엔드포인트를 자동으로
-    threadpool executor에서 실행하므로 이벤트 루프를 블로킹하지 않음.
+    비동기 함수로 정의. Gemini 호출을 SDK의 비동기 클라이언트로 수행하므로
+    threadpool 워커를 점유하지 않으며, 동시 호출 수는 generation_concurrency로 제한됨.
+    server_timing_header가 켜져 있으면 단계별 소요 시간을 Server-Timing 헤더로 반환한다.
     """
     try:
-        generated_text = generator.generate(request)
+        with collect_timings() as timings:
+            generated_text = await (await get_generator()).generate_async(request)
+        if settings.server_timing_header:
+            response.headers["Server-Timing"] = format_server_timing(timings)
         return GenerateEmailResponse(
             success=True,
             generated_text=generated_text,
         )
     except Exception as e:
+        logger.exception("이메일 생성 실패")
         return GenerateEmailResponse(
             success=False,
             error_message=str(e),
         )
 
 
+@app.post("/api/generate-email/candidates", response_model=GenerateCandidatesResponse)
+async def generate_email_candidates(request: GenerateCandidatesRequest):
+    """후보 초안 candidate_count개를 한 번에 생성 (다시 생성을 반복하지 않고 골라 쓰기용)"""
+    try:
+        email_generator = await get_generator()
+        candidates = await email_generator.generate_candidates_async(
+            request, request.candidate_count
+        )
+        return GenerateCandidatesResponse(success=True, candidates=candidates)
+    except Exception as e:
+        logger.exception("후보 초안 생성 실패")
+        return GenerateCandidatesResponse(success=False, error_message=str(e))
+
+
+@app.post("/api/generate-email/batch", response_model=BatchGenerateResponse)
+async def generate_email_batch(batch: BatchGenerateRequest):
+    """여러 메일의 초안을 동시에 생성 (결과는 요청 순서대로, 항목별 성공/실패)"""
+    try:
+        email_generator = await get_generator()
+        limit = settings.batch_max_requests
+        if len(batch.requests) > limit:
+            return BatchGenerateResponse(
+                success=False, error_message=f"한 번에 최대 {limit}건까지 요청할 수 있습니다."
+            )
+        outcomes = await email_generator.generate_batch_async(batch.requests)
+    except Exception as e:
+        logger.exception("일괄 생성 실패")
+        return BatchGenerateResponse(success=False, error_message=str(e))
+
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            logger.warning("일괄 생성 항목 실패: %s", outcome)
+            results.append(GenerateEmailResponse(success=False, error_message=str(outcome)))
+        else:
+            results.append(GenerateEmailResponse(success=True, generated_text=outcome))
+    return BatchGenerateResponse(success=True, results=results)
+
+
+@app.post("/api/generate-email/stream")
+async def generate_email_stream(request: GenerateEmailRequest):
+    """이메일 생성 스트리밍 엔드포인트 - VBA 스트리밍 모드에서 호출
+
+    생성된 텍스트 조각을 Server-Sent Events로 도착하는 대로 전송한다.
+    - 텍스트 조각: data: {"text": "..."}
+    - 에러: event: error / data: {"error_message": "..."}
+    - 완료: event: done / data: {}
+    """
+
+    async def events():
+        try:
+            email_generator = await get_generator()
+            async for chunk in email_generator.generate_stream(request):
+                yield _sse({"text": chunk})
+        except Exception as e:
+            logger.exception("이메일 스트리밍 생성 실패")
+            yield _sse({"error_message": str(e)}, event="error")
+            return
+        yield _sse({}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(data: dict, event: str | None = None) -> str:
+    """SSE 이벤트 1건 직렬화 (VBA 파서와 맞추기 위해 '"key": "value"' 형식 유지)"""
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
 @app.get("/api/health")
 async def health_check():
-    """서버 상태 확인"""
+    """서버 상태 확인 (초기화 여부와 관계없이 즉시 응답)"""
     return {"status": "ok"}
+
+
+def _not_ready() -> JSONResponse:
+    """초기화 전/실패 시 응답 (상태 조회 엔드포인트는 초기화를 기다리지 않음)"""
+    return JSONResponse(status_code=503, content={"ready": False, "error": _init_error})
+
+
+@app.get("/api/ready")
+async def readiness_check():
+    """요청 처리 준비 상태 확인 (초기화 전/실패 시 503)"""
+    if generator is not None:
+        return {"ready": True}
+    return _not_ready()
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """응답 캐시 히트/미스 통계 (초기화 전/실패 시 503)"""
+    if generator is None:
+        return _not_ready()
+    if generator.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **generator.cache.stats()}
+
+
+@app.get("/api/metrics")
+async def prometheus_metrics():
+    """단계별 지연 시간, 오류 수, 진행 중인 요청 수, 토큰 수 (Prometheus 텍스트 형식)
+
+    초기화 전/실패 시 503
+    """
+    if generator is None:
+        return _not_ready()
+    return PlainTextResponse(generator.metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/coalescing/stats")
+async def coalescing_stats():
+    """동일 요청 합치기(single-flight) 통계: 실제 호출 수와 절약한 호출 수
+
+    초기화 전/실패 시 503
+    """
+    if generator is None:
+        return _not_ready()
+    if generator.flights is None:
+        return {"enabled": False}
+    return {"enabled": True, **generator.flights.stats()}
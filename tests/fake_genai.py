@@ -0,0 +1,209 @@
+"""테스트용 가짜 google-genai 클라이언트
+
+실제 API 호출 없이 File Search 업로드 작업(LongRunningOperation)의 진행을 흉내낸다.
+FakeClock으로 time.monotonic/time.sleep을 대체하면 대기 없이 시간 흐름을 검증할 수 있다.
+"""
+import itertools
+from types import SimpleNamespace
+
+
+class FakeClock:
+    """time.monotonic/time.sleep 대체용 가상 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeOperation:
+    """업로드 LongRunningOperation (get으로 갱신해야 상태가 바뀜)"""
+
+    def __init__(self, name: str, document_name: str, done: bool = False, error=None):
+        self.name = name
+        self.done = done
+        self.error = error
+        self.response = SimpleNamespace(document_name=document_name) if done else None
+        self._document_name = document_name
+
+    def refreshed(self, done: bool, error=None) -> "FakeOperation":
+        op = FakeOperation(self.name, self._document_name, done=done, error=error)
+        if done and error:
+            op.response = None
+        return op
+
+
+class FakeFileSearchStores:
+    def __init__(self, backend: "FakeGenaiClient"):
+        self._backend = backend
+        # SDK의 Documents.list(*, parent, config)/delete(*, name, config)와 같은 시그니처
+        self.documents = SimpleNamespace(
+            list=lambda *, parent, config=None: [],
+            delete=backend._delete_document,
+        )
+
+    def create(self, config):
+        return SimpleNamespace(name="fileSearchStores/fake-store")
+
+    def upload_to_file_search_store(self, file_search_store_name, file, config):
+        return self._backend._start(file_search_store_name, file, config)
+
+
+class FakeOperations:
+    def __init__(self, backend: "FakeGenaiClient"):
+        self._backend = backend
+
+    def get(self, operation):
+        return self._backend._refresh(operation)
+
+
+class FakeGenaiClient:
+    """업로드 작업이 latency초 뒤에 완료되는 가짜 genai.Client
+
+    Args:
+        clock: 시간 기준 (FakeClock 또는 monotonic 메서드를 가진 객체)
+        latency: 업로드 시작부터 인덱싱 완료까지 걸리는 시간 (초)
+        fail_files: 업로드가 실패로 끝나야 하는 파일 경로 집합
+    """
+
+    def __init__(self, clock, latency: float = 1.0, fail_files: set[str] | None = None):
+        self.clock = clock
+        self.latency = latency
+        self.fail_files = fail_files or set()
+        self.file_search_stores = FakeFileSearchStores(self)
+        self.operations = FakeOperations(self)
+        self.uploads: list[dict] = []
+        self.deleted: list[str] = []
+        self.get_calls = 0
+        self.max_in_flight = 0
+        self._ids = itertools.count()
+        self._ops: dict[str, dict] = {}
+
+    def in_flight(self) -> int:
+        return sum(1 for op in self._ops.values() if not op["finished"])
+
+    def _start(self, store_name, file, config):
+        op_id = next(self._ids)
+        name = f"operations/upload-{op_id}"
+        self._ops[name] = {
+            "ready_at": self.clock.monotonic() + self.latency,
+            "file": file,
+            "finished": False,
+        }
+        self.uploads.append({"store": store_name, "file": file, "config": config})
+        self.max_in_flight = max(self.max_in_flight, self.in_flight())
+        return FakeOperation(name, f"{store_name}/documents/doc-{op_id}")
+
+    def _refresh(self, operation):
+        self.get_calls += 1
+        state = self._ops[operation.name]
+        if self.clock.monotonic() < state["ready_at"]:
+            return operation.refreshed(done=False)
+        state["finished"] = True
+        error = "indexing failed" if state["file"] in self.fail_files else None
+        return operation.refreshed(done=True, error=error)
+
+    def _delete_document(self, *, name, config=None):
+        self.deleted.append(name)
+
+
+class FakeCaches:
+    """컨텍스트 캐시 API (caches.create/update): expire_at이 지나면 사라진 것으로 처리"""
+
+    def __init__(self, clock, fail_create: bool = False):
+        self.clock = clock
+        self.fail_create = fail_create
+        self.configs: list = []
+        self.updates: list[str] = []
+        self.expire_at: dict[str, float] = {}
+        self._ids = itertools.count()
+
+    def create(self, model, config):
+        if self.fail_create:
+            raise ValueError("Cached content is too small")
+        name = f"cachedContents/cache-{next(self._ids)}"
+        self.configs.append(config)
+        self.expire_at[name] = self.clock.monotonic() + int(config.ttl.rstrip("s"))
+        return SimpleNamespace(name=name)
+
+    def update(self, name, config):
+        if not self.alive(name):
+            raise ValueError(f"{name} not found")
+        self.updates.append(name)
+        self.expire_at[name] = self.clock.monotonic() + int(config.ttl.rstrip("s"))
+        return SimpleNamespace(name=name)
+
+    def alive(self, name: str) -> bool:
+        return self.clock.monotonic() < self.expire_at.get(name, 0.0)
+
+
+class FakeModels:
+    """generate_content(_stream) 호출 설정을 기록. 만료된 캐시를 참조하면 403 ClientError"""
+
+    def __init__(self, caches: FakeCaches):
+        self.caches = caches
+        self.configs: list = []
+        # False면 metadata_filter를 건 요청은 File Search 검색 결과(grounding) 없이 응답
+        self.filter_matches = True
+
+    def generate_content(self, model, contents, config):
+        self._check_cache(config)
+        self.configs.append(config)
+        return self._response("생성된 본문", config)
+
+    def generate_content_stream(self, model, contents, config):
+        """SDK와 같이 첫 조각을 꺼낼 때 요청을 보내는(오류도 그때 나는) 스트림"""
+
+        async def chunks():
+            self._check_cache(config)
+            self.configs.append(config)
+            for text in ("생성된 ", "본문"):
+                yield self._response(text, config)
+
+        return chunks()
+
+    def _response(self, text: str, config) -> SimpleNamespace:
+        tools = config.tools or []
+        filtered = any(tool.file_search.metadata_filter for tool in tools)
+        chunks = [] if filtered and not self.filter_matches else [SimpleNamespace()]
+        candidate = SimpleNamespace(grounding_metadata=SimpleNamespace(grounding_chunks=chunks))
+        return SimpleNamespace(text=text, usage_metadata=None, candidates=[candidate])
+
+    def _check_cache(self, config) -> None:
+        from google.genai import errors
+
+        if config.cached_content and not self.caches.alive(config.cached_content):
+            error = {"message": "CachedContent not found", "status": "PERMISSION_DENIED"}
+            raise errors.ClientError(403, {"error": error})
+
+
+class _AsyncProxy:
+    """동기 메서드를 코루틴으로 감싸 client.aio.* 흉내"""
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        method = getattr(self._target, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+class FakeCachingGenaiClient:
+    """컨텍스트 캐시와 생성 호출을 흉내내는 가짜 genai.Client (동기/비동기)"""
+
+    def __init__(self, clock, fail_create: bool = False):
+        self.caches = FakeCaches(clock, fail_create=fail_create)
+        self.models = FakeModels(self.caches)
+        self.aio = SimpleNamespace(
+            caches=_AsyncProxy(self.caches), models=_AsyncProxy(self.models)
+        )
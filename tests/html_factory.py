@@ -0,0 +1,120 @@
+"""테스트/벤치마크용 Outlook HTML 본문 생성기
+
+Outlook(Word 편집기)이 만드는 HTML과 같은 구조를 흉내 낸다:
+긴 <head>의 mso 스타일과 조건부 주석, MsoNormal 문단과 <o:p>, &nbsp;,
+그리고 회신이 거듭될수록 아래로 쌓이는 인용 스레드(구분선 + From/Sent/To/Subject 헤더).
+"""
+
+_HEAD = """<html xmlns:v="urn:schemas-microsoft-com:vml"
+xmlns:o="urn:schemas-microsoft-com:office:office"
+xmlns:w="urn:schemas-microsoft-com:office:word"
+xmlns:m="http://schemas.microsoft.com/office/2004/12/omml"
+xmlns="http://www.w3.org/TR/REC-html40">
+<head>
+<meta http-equiv=Content-Type content="text/html; charset=ks_c_5601-1987">
+<meta name=Generator content="Microsoft Word 15 (filtered medium)">
+<!--[if !mso]><style>v\\:* {behavior:url(#default#VML);}
+o\\:* {behavior:url(#default#VML);}
+</style><![endif]--><style><!--
+/* Font Definitions */
+@font-face
+	{font-family:"맑은 고딕";
+	panose-1:2 11 5 3 2 0 0 2 0 4;}
+{rules}
+--></style><!--[if gte mso 9]><xml>
+<o:shapedefaults v:ext="edit" spidmax="1026" />
+</xml><![endif]--><!--[if gte mso 9]><xml>
+<o:shapelayout v:ext="edit">
+<o:idmap v:ext="edit" data="1" />
+</o:shapelayout></xml><![endif]-->
+</head>
+<body lang=KO link="#0563C1" vlink="#954F72" style='word-wrap:break-word'>
+<div class=WordSection1>
+"""
+
+_TAIL = """</div>
+</body>
+</html>
+"""
+
+_RULE = """p.MsoNormal{i}, li.MsoNormal{i}, div.MsoNormal{i}
+	{{margin:0cm;
+	text-align:justify;
+	text-justify:inter-ideograph;
+	font-size:10.0pt;
+	font-family:"맑은 고딕";}}
+span.EmailStyle{i}
+	{{mso-style-type:personal-reply;
+	font-family:"맑은 고딕";
+	color:windowtext;}}"""
+
+
+def _paragraph(text: str) -> str:
+    return (
+        "<p class=MsoNormal><span lang=EN-US style='font-size:10.0pt'>"
+        f"{text}<o:p></o:p></span></p>\n"
+    )
+
+
+def _blank() -> str:
+    return "<p class=MsoNormal><span lang=EN-US><o:p>&nbsp;</o:p></span></p>\n"
+
+
+def _signature(name: str) -> str:
+    return (
+        _paragraph("--")
+        + _paragraph(f"{name} 드림")
+        + _paragraph("ABC 주식회사 | 기술영업팀")
+        + _paragraph("Tel: 02-1234-5678 &nbsp;|&nbsp; Mobile: 010-1234-5678")
+    )
+
+
+def _reply_header(sender: str, date: str, to: str, subject: str) -> str:
+    return (
+        "<div style='border:none;border-top:solid #E1E1E1 1.0pt;padding:3.0pt 0cm 0cm 0cm'>\n"
+        f"<p class=MsoNormal><b><span lang=EN-US>From:</span></b><span lang=EN-US> {sender}"
+        f" &lt;{sender.lower()}@example.com&gt; <br><b>Sent:</b> {date}<br>"
+        f"<b>To:</b> {to}<br><b>Subject:</b> {subject}<o:p></o:p></span></p>\n</div>\n"
+    )
+
+
+def outlook_html(
+    messages: int = 3,
+    lines_per_message: int = 8,
+    css_rules: int = 20,
+    subject: str = "프로젝트 일정 협의",
+) -> str:
+    """messages개의 메일이 인용된 Outlook 회신 HTML 본문.
+
+    맨 위가 가장 최근 메일이고, 그 아래로 이전 메일이 구분선과 헤더를 두고 이어진다.
+    모든 메일에 같은 서명이 반복된다.
+    """
+    rules = "\n".join(_RULE.format(i=i) for i in range(css_rules))
+    parts = [_HEAD.replace("{rules}", rules)]
+    for index in range(messages):
+        sender = "김철수" if index % 2 == 0 else "Lee Younghee"
+        if index:
+            parts.append(
+                _reply_header(
+                    sender,
+                    f"Monday, January {13 - index % 10}, 2025 10:{index % 60:02d} AM",
+                    "홍길동; Park Minsu",
+                    f"RE: {subject}" if index < messages - 1 else subject,
+                )
+            )
+            parts.append(_blank())
+        parts.append(_paragraph("안녕하세요, 홍길동 과장님."))
+        parts.append(_blank())
+        for line in range(lines_per_message):
+            parts.append(
+                _paragraph(
+                    f"[{index}-{line}] 일정 검토 결과를 공유드립니다 &amp; "
+                    "다음 주 회의에서 R&amp;D 관련 세부 사항을 논의하고자 합니다."
+                )
+            )
+        parts.append(_blank())
+        parts.append(_paragraph("감사합니다."))
+        parts.append(_signature(sender))
+        parts.append(_blank())
+    parts.append(_TAIL)
+    return "".join(parts)
@@ -0,0 +1,115 @@
+"""테스트/벤치마크용 .msg 파일 생성기
+
+extract-msg에 포함된 OleWriter로 Outlook MSG(OLE 복합 파일)의 최소 구조를 만든다.
+MarkItDown과 extract-msg가 모두 읽을 수 있는 수준의 속성만 기록한다.
+encoding을 주면 문자열을 PT_STRING8(001E)로 쓰는 비유니코드 MSG를 만든다.
+"""
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+
+from extract_msg.ole_writer import OleWriter
+
+_FILETIME_EPOCH = datetime(1601, 1, 1, tzinfo=timezone.utc)
+
+
+def _utf16(text: str) -> bytes:
+    return text.encode("utf-16-le")
+
+
+def _fixed_entry(tag: int, value: bytes) -> bytes:
+    """고정 길이 속성 엔트리 (tag, flags, 8바이트 값)"""
+    return struct.pack("<II", tag, 6) + value.ljust(8, b"\0")
+
+
+def _variable_entry(tag: int, size: int) -> bytes:
+    """가변 길이 속성 엔트리 (실제 값은 별도 스트림에 저장)"""
+    return struct.pack("<IIII", tag, 6, size, 0)
+
+
+def write_msg(
+    path: str | Path,
+    subject: str = "테스트 메일",
+    sender: str = "sender@example.com",
+    sender_name: str = "보내는 사람",
+    to_name: str = "받는 사람",
+    to_address: str = "recipient@example.com",
+    body: str = "안녕하세요.\r\n테스트 본문입니다.\r\n감사합니다.",
+    date: datetime | None = datetime(2025, 1, 15, 10, 30, tzinfo=timezone.utc),
+    attachments: int = 0,
+    attachment_size: int = 64,
+    encoding: str | None = None,
+    codepage: int | None = None,
+    internet_codepage: int | None = None,
+) -> Path:
+    """최소 구성의 MSG 파일을 생성하고 경로를 반환.
+
+    encoding이 None이면 Unicode(001F) MSG, 아니면 그 인코딩의 PT_STRING8(001E) MSG를
+    만든다. codepage/internet_codepage는 PR_MESSAGE_CODEPAGE/PR_INTERNET_CPID 값
+    (None이면 기록하지 않음).
+    """
+    writer = OleWriter()
+    string_type = 0x001F if encoding is None else 0x001E
+
+    def encode(text: str) -> bytes:
+        return _utf16(text) if encoding is None else text.encode(encoding)
+
+    strings = {
+        0x001A: "IPM.Note",
+        0x0037: subject,
+        0x0C1F: sender,
+        0x0C1A: sender_name,
+        0x0E04: to_name,
+        0x1000: body,
+    }
+    entries = b""
+    for prop_id, value in strings.items():
+        data = encode(value)
+        writer.addEntry(f"__substg1.0_{prop_id:04X}{string_type:04X}", data)
+        entries += _variable_entry((prop_id << 16) | string_type, len(data) + 2)
+
+    if date is not None:
+        filetime = int((date - _FILETIME_EPOCH).total_seconds() * 10**7)
+        entries += _fixed_entry(0x00390040, struct.pack("<Q", filetime))
+    # PR_STORE_SUPPORT_MASK: Unicode MSG면 STORE_UNICODE_OK
+    store_support = 0x00040000 if encoding is None else 0
+    entries += _fixed_entry(0x340D0003, struct.pack("<I", store_support))
+    if codepage is not None:
+        entries += _fixed_entry(0x3FFD0003, struct.pack("<I", codepage))
+    if internet_codepage is not None:
+        entries += _fixed_entry(0x3FDE0003, struct.pack("<I", internet_codepage))
+
+    header = b"\0" * 8 + struct.pack("<IIII", 1, attachments, 1, attachments) + b"\0" * 8
+    writer.addEntry("__properties_version1.0", header + entries)
+
+    recip = "__recip_version1.0_#00000000"
+    writer.addEntry(recip, storage=True)
+    recip_entries = _fixed_entry(0x0C150003, struct.pack("<I", 1))
+    for prop_id, value in {0x3001: to_name, 0x39FE: to_address, 0x3003: to_address}.items():
+        data = encode(value)
+        writer.addEntry(f"{recip}/__substg1.0_{prop_id:04X}{string_type:04X}", data)
+        recip_entries += _variable_entry((prop_id << 16) | string_type, len(data) + 2)
+    writer.addEntry(f"{recip}/__properties_version1.0", b"\0" * 8 + recip_entries)
+
+    for index in range(attachments):
+        attach = f"__attach_version1.0_#{index:08X}"
+        file_name = f"attachment_{index}.bin"
+        data = b"\xab" * attachment_size
+        writer.addEntry(attach, storage=True)
+        writer.addEntry(f"{attach}/__substg1.0_37010102", data)
+        writer.addEntry(f"{attach}/__substg1.0_3707001F", _utf16(file_name))
+        attach_entries = (
+            _variable_entry(0x37010102, len(data))
+            + _variable_entry(0x3707001F, len(_utf16(file_name)) + 2)
+            + _fixed_entry(0x37050003, struct.pack("<I", 1))
+        )
+        writer.addEntry(f"{attach}/__properties_version1.0", b"\0" * 8 + attach_entries)
+
+    nameid = "__nameid_version1.0"
+    writer.addEntry(nameid, storage=True)
+    for stream_id in ("00020102", "00030102", "00040102"):
+        writer.addEntry(f"{nameid}/__substg1.0_{stream_id}", b"")
+
+    path = Path(path)
+    writer.write(str(path))
+    return path
@@ -0,0 +1,64 @@
+"""벤치마크 기준값 비교 테스트 (측정 자체는 하지 않음)"""
+import json
+
+from benchmarks.suite import compare, load_baselines, machine_id, save_baselines
+
+
+def test_compare_flags_only_slowdowns_over_threshold():
+    baselines = {
+        "threshold": 0.3,
+        "cases": {
+            "fast": {"min_ms": 10.0},
+            "slow": {"min_ms": 10.0},
+            "loose": {"min_ms": 10.0, "threshold": 1.0},
+        },
+    }
+    results = {
+        "fast": {"min_ms": 12.0},
+        "slow": {"min_ms": 14.0},
+        "loose": {"min_ms": 19.0},
+        "new": {"min_ms": 1.0},
+    }
+
+    regressions = compare(results, baselines)
+
+    assert [r["name"] for r in regressions] == ["slow"]
+    assert regressions[0]["ratio"] == 1.4
+    assert compare(results, baselines, threshold=0.5) == []
+
+
+def test_save_keeps_unmeasured_cases_and_thresholds(tmp_path):
+    path = tmp_path / "baselines.json"
+    save_baselines({"a": {"min_ms": 1.0}, "b": {"min_ms": 2.0}}, path, threshold=0.2, machine="m1")
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    stored["machines"]["m1"]["a"]["threshold"] = 0.5
+    path.write_text(json.dumps(stored), encoding="utf-8")
+
+    save_baselines({"a": {"min_ms": 3.0}}, path, machine="m1")
+
+    assert load_baselines(path, "m1") == {
+        "threshold": 0.2,
+        "cases": {"a": {"min_ms": 3.0, "threshold": 0.5}, "b": {"min_ms": 2.0}},
+    }
+
+
+def test_baselines_stored_per_machine(tmp_path):
+    path = tmp_path / "baselines.json"
+    save_baselines({"a": {"min_ms": 1.0}}, path, machine="fast-box")
+    save_baselines({"a": {"min_ms": 5.0}}, path, machine="slow-box")
+
+    assert load_baselines(path, "fast-box")["cases"] == {"a": {"min_ms": 1.0}}
+    assert load_baselines(path, "slow-box")["cases"] == {"a": {"min_ms": 5.0}}
+    # 기준값이 없는 기계에서는 비교하지 않음
+    other = load_baselines(path, "new-box")
+    assert other["cases"] == {}
+    assert compare({"a": {"min_ms": 100.0}}, other) == []
+
+
+def test_default_machine_id(tmp_path):
+    path = tmp_path / "baselines.json"
+    save_baselines({"a": {"min_ms": 1.0}}, path)
+
+    stored = json.loads(path.read_text(encoding="utf-8"))
+    assert list(stored["machines"]) == [machine_id()]
+    assert load_baselines(path)["cases"] == {"a": {"min_ms": 1.0}}
@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+from email_writer.converter.bundle import (
+    BundleBuilder,
+    bundle_id,
+    bundle_metadata,
+    group_key,
+    render_bundle,
+)
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from email_writer.models.email_metadata import EmailMetadata
+from tests.msg_factory import write_msg
+
+
+def _metadata(name: str, recipients: str = "kim@a.com", **kwargs) -> EmailMetadata:
+    kwargs.setdefault("markdown_path", f"/tmp/{name}.md")
+    return EmailMetadata(
+        file_name=f"{name}.msg",
+        subject=f"제목 {name}",
+        sender="me@example.com",
+        recipients=recipients,
+        **kwargs,
+    )
+
+
+class TestBundleBuilder:
+    def test_group_key(self):
+        metadata = _metadata(
+            "a", recipients="kim@a.com", is_reply=True,
+            date=datetime(2025, 3, 4, tzinfo=timezone.utc),
+        )
+
+        assert group_key(metadata, "recipient") == "a.com-reply"
+        assert group_key(metadata, "month") == "2025-03-reply"
+        assert group_key(_metadata("b", recipients=""), "recipient") == "unknown-new"
+
+    def test_seals_when_full_and_groups_separately(self):
+        builder = BundleBuilder(max_chars=100)
+
+        assert builder.add("a", _metadata("a"), 60) is None
+        assert builder.add("x", _metadata("x", recipients="lee@b.com"), 60) is None
+        sealed = builder.add("b", _metadata("b"), 60)
+
+        assert sealed.source_paths == ["a"]
+        assert sorted(p.source_paths[0] for p in builder.flush()) == ["b", "x"]
+        assert builder.flush() == []
+
+    def test_discard_open_member(self):
+        builder = BundleBuilder(max_chars=100)
+        builder.add("a", _metadata("a"), 10)
+        builder.add("b", _metadata("b"), 10)
+
+        builder.discard("a")
+
+        [pending] = builder.flush()
+        assert pending.source_paths == ["b"]
+        assert pending.chars == 10
+
+    def test_bundle_id_depends_on_members_only(self):
+        assert bundle_id("a.com-new", ["x", "y"]) == bundle_id("a.com-new", ["y", "x"])
+        assert bundle_id("a.com-new", ["x", "y"]) != bundle_id("a.com-new", ["x"])
+        assert bundle_id("a.com/new", ["x"]).startswith("bundle-a.com_new-")
+
+
+class TestRenderBundle:
+    def test_render_and_metadata(self, settings, tmp_path):
+        converter = MsgToMarkdownConverter(settings)
+        members = []
+        for name in ("a", "b"):
+            msg_path = write_msg(tmp_path / f"{name}.msg", subject=name, body=f"{name} 본문")
+            converted = converter.convert_single(str(msg_path), str(tmp_path))
+            members.append(
+                _metadata(name, markdown_path=converted.markdown_path, markdown_chars=30,
+                          date=datetime(2025, 1, 1 + len(members), tzinfo=timezone.utc))
+            )
+
+        text = render_bundle("a.com-new", members)
+        metadata = bundle_metadata("a.com-new", members, str(tmp_path / "bundle.md"))
+
+        assert text.startswith("# 메일 묶음: a.com-new (2건)")
+        assert (
+            "## [1] 제목 a\n\n**File:** a.msg\n**Date:** 2025-01-01T00:00:00+00:00\n\n"
+            "**From:** sender@example.com\n"
+        ) in text
+        assert "### Content\n\nb 본문" in text
+        assert "Email Message" not in text
+        assert metadata.file_name == "bundle.md"
+        assert metadata.recipients == "kim@a.com"
+        assert metadata.date == datetime(2025, 1, 2, tzinfo=timezone.utc)
+        assert metadata.markdown_chars == 60
@@ -0,0 +1,63 @@
+import pytest
+from google.genai import _api_client
+
+from email_writer.gemini.client import GeminiClient
+from email_writer.gemini.client_factory import get_genai_client, reset_genai_clients
+from email_writer.gemini.file_search import FileSearchManager
+
+
+@pytest.fixture(autouse=True)
+def _fresh_clients():
+    reset_genai_clients()
+    yield
+    reset_genai_clients()
+
+
+class TestGetGenaiClient:
+    """공용 genai.Client 팩토리 테스트"""
+
+    def test_reuses_client_for_same_settings(self, settings):
+        assert get_genai_client(settings) is get_genai_client(settings.model_copy())
+
+    def test_new_client_for_different_key(self, settings):
+        other = settings.model_copy(update={"gemini_api_key": "other-key"})
+
+        assert get_genai_client(settings) is not get_genai_client(other)
+
+    def test_generation_and_file_search_share_client(self, settings):
+        assert GeminiClient(settings).client is FileSearchManager(settings).client
+
+    def test_applies_connection_pool_limits(self, settings):
+        custom = settings.model_copy(
+            update={
+                "http_max_connections": 7,
+                "http_max_keepalive_connections": 3,
+                "http_keepalive_expiry": 42.0,
+            }
+        )
+        api_client = get_genai_client(custom)._api_client
+
+        for http_client in (api_client._httpx_client, api_client._async_httpx_client):
+            pool = http_client._transport._pool
+            assert pool._max_connections == 7
+            assert pool._max_keepalive_connections == 3
+            assert pool._keepalive_expiry == 42.0
+
+    def test_async_calls_use_limited_httpx_pool_with_aiohttp(self, settings, monkeypatch):
+        """aiohttp가 설치돼 있어도 client.aio는 연결 수 제한이 걸린 httpx를 씀"""
+        monkeypatch.setattr(_api_client, "has_aiohttp", True)
+        custom = settings.model_copy(update={"http_max_connections": 5})
+        api_client = get_genai_client(custom)._api_client
+
+        assert not api_client._use_aiohttp()
+        assert api_client._async_httpx_client._transport._pool._max_connections == 5
+
+    def test_applies_base_url_and_timeout(self, settings):
+        custom = settings.model_copy(
+            update={"gemini_base_url": "http://127.0.0.1:8600", "gemini_timeout": 2.5}
+        )
+        http_options = get_genai_client(custom)._api_client._http_options
+
+        assert http_options.base_url.rstrip("/") == "http://127.0.0.1:8600"
+        assert http_options.timeout == 2500
+        assert get_genai_client(custom) is not get_genai_client(settings)
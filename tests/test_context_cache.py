@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from email_writer.core.prompt_builder import PromptBuilder
+from email_writer.gemini.client import GeminiClient
+from tests.fake_genai import FakeCachingGenaiClient, FakeClock
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _client(settings, clock, fail_create: bool = False, **overrides) -> GeminiClient:
+    update = {"context_cache_enabled": True, "context_cache_ttl": 600, **overrides}
+    gemini = GeminiClient(settings.model_copy(update=update))
+    fake = FakeCachingGenaiClient(clock, fail_create=fail_create)
+    gemini.client = fake
+    gemini.context_cache.client = fake
+    gemini.context_cache.clock = clock.monotonic
+    return gemini
+
+
+class TestContextCache:
+    """GeminiClient 컨텍스트 캐시 사용/연장/재생성 테스트"""
+
+    def test_requests_reference_cache(self, settings, clock):
+        gemini = _client(settings, clock)
+
+        for _ in range(3):
+            asyncio.run(gemini.generate_with_file_search_async("프롬프트"))
+
+        fake = gemini.client
+        assert len(fake.caches.configs) == 1
+        cache_config = fake.caches.configs[0]
+        assert cache_config.system_instruction == PromptBuilder.SYSTEM_INSTRUCTION
+        assert cache_config.tools[0].file_search.file_search_store_names == ["test-store"]
+        for config in fake.models.configs:
+            assert config.cached_content == "cachedContents/cache-0"
+            assert config.system_instruction is None
+            assert config.tools is None
+
+    def test_exemplars_included(self, settings, clock, tmp_path):
+        (tmp_path / "a.md").write_text("대표 메일 A", encoding="utf-8")
+        (tmp_path / "b.md").write_text("대표 메일 B", encoding="utf-8")
+        gemini = _client(settings, clock, context_cache_exemplar_dir=str(tmp_path))
+
+        gemini.generate_with_file_search("프롬프트")
+
+        text = gemini.client.caches.configs[0].contents[0].parts[0].text
+        assert "대표 메일 A" in text and "대표 메일 B" in text
+
+    def test_expired_cache_recreated_and_retried(self, settings, clock):
+        gemini = _client(settings, clock)
+        gemini.generate_with_file_search("프롬프트")
+
+        # 서버 쪽 캐시만 먼저 사라진 경우: 403 응답 후 새 캐시로 한 번 재시도
+        gemini.client.caches.expire_at["cachedContents/cache-0"] = 0.0
+        result = asyncio.run(gemini.generate_with_file_search_async("프롬프트"))
+
+        assert result == "생성된 본문"
+        assert gemini.context_cache.created == 2
+        assert gemini.client.models.configs[-1].cached_content == "cachedContents/cache-1"
+
+    def test_expired_cache_recreated_and_retried_streaming(self, settings, clock):
+        gemini = _client(settings, clock)
+        gemini.generate_with_file_search("프롬프트")
+        gemini.client.caches.expire_at["cachedContents/cache-0"] = 0.0
+
+        async def collect():
+            return [chunk async for chunk in gemini.stream_with_file_search_async("프롬프트")]
+
+        assert asyncio.run(collect()) == ["생성된 ", "본문"]
+        assert gemini.context_cache.created == 2
+        assert gemini.client.models.configs[-1].cached_content == "cachedContents/cache-1"
+
+    def test_refresh_extends_ttl_near_expiry(self, settings, clock):
+        gemini = _client(settings, clock, context_cache_refresh_margin=120)
+        cache = gemini.context_cache
+        asyncio.run(cache.refresh())
+
+        clock.now += 300
+        asyncio.run(cache.refresh())
+        assert gemini.client.caches.updates == []
+
+        clock.now += 200
+        asyncio.run(cache.refresh())
+        assert gemini.client.caches.updates == ["cachedContents/cache-0"]
+        assert cache.current() == "cachedContents/cache-0"
+
+        # 연장 시점부터 TTL이 다시 계산됨
+        clock.now += 580
+        assert cache.current() == "cachedContents/cache-0"
+
+    def test_refresh_recreates_missing_cache(self, settings, clock):
+        gemini = _client(settings, clock, context_cache_refresh_margin=120)
+        cache = gemini.context_cache
+        asyncio.run(cache.refresh())
+        gemini.client.caches.expire_at["cachedContents/cache-0"] = 0.0
+
+        clock.now += 500
+        asyncio.run(cache.refresh())
+
+        assert cache.current() == "cachedContents/cache-1"
+
+    def test_creation_failure_falls_back_without_cache(self, settings, clock):
+        gemini = _client(settings, clock, fail_create=True)
+
+        assert gemini.generate_with_file_search("프롬프트") == "생성된 본문"
+
+        config = gemini.client.models.configs[0]
+        assert config.cached_content is None
+        assert config.system_instruction == PromptBuilder.SYSTEM_INSTRUCTION
+
+    def test_metadata_filter_bypasses_cache(self, settings, clock):
+        gemini = _client(settings, clock)
+
+        gemini.generate_with_file_search("프롬프트", metadata_filter='is_reply = "True"')
+
+        config = gemini.client.models.configs[0]
+        assert config.cached_content is None
+        assert config.tools[0].file_search.metadata_filter == 'is_reply = "True"'
+
+    def test_disabled_by_default(self, settings):
+        assert GeminiClient(settings).context_cache is None
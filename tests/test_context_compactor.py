@@ -0,0 +1,100 @@
+from email_writer.core.context_compactor import (
+    compact_context,
+    drop_repeated_signatures,
+    split_messages,
+)
+from email_writer.core.html_text import html_to_text
+from tests.html_factory import outlook_html
+
+SIGNATURE = "--\n홍길동 드림\nABC 주식회사 | 기술영업팀\nTel: 02-1234-5678"
+
+THREAD = f"""네, 목요일 오후 2시로 확정하겠습니다.
+감사합니다.
+{SIGNATURE}
+-----Original Message-----
+From: 김철수 <kim@example.com>
+Sent: Monday, January 13, 2025 10:00 AM
+To: 홍길동 <hong@example.com>
+Subject: RE: 회의 일정
+목요일 오후는 어떠신가요?
+감사합니다.
+김철수 드림
+보낸 사람: 홍길동 <hong@example.com>
+보낸 날짜: 2025년 1월 10일 금요일 오후 3:12
+받는 사람: 김철수 <kim@example.com>
+제목: 회의 일정
+다음 주 회의 가능한 시간을 알려주세요.
+감사합니다.
+{SIGNATURE}"""
+
+
+class TestSplitMessages:
+    """인용 스레드 분리 테스트"""
+
+    def test_splits_on_separator_and_korean_header(self):
+        messages = split_messages(THREAD)
+
+        assert len(messages) == 3
+        assert messages[0][0] == "네, 목요일 오후 2시로 확정하겠습니다."
+        # 구분선과 바로 뒤의 From: 헤더는 한 메일로 묶임
+        assert messages[1][0] == "-----Original Message-----"
+        assert messages[1][1].startswith("From:")
+        assert messages[2][0].startswith("보낸 사람:")
+
+    def test_from_without_header_fields_is_body(self):
+        text = "작업 범위를 정리했습니다.\nFrom: 3월 1일\n까지 진행합니다."
+
+        assert len(split_messages(text)) == 1
+
+    def test_splits_html_reply_headers(self):
+        """HTML에서 추출한 헤더(레이블과 값이 별도 줄)도 분리"""
+        text = html_to_text(outlook_html(messages=3))
+
+        messages = split_messages(text)
+
+        assert len(messages) == 3
+        assert messages[1][0] == "From:"
+
+
+class TestDropRepeatedSignatures:
+    """반복 서명 제거 테스트"""
+
+    def test_keeps_newest_signature_only(self):
+        messages = drop_repeated_signatures(split_messages(THREAD))
+
+        assert messages[0][-1] == "Tel: 02-1234-5678"
+        assert messages[2][-1] == "다음 주 회의 가능한 시간을 알려주세요."
+        # 다른 사람의 서명은 유지
+        assert messages[1][-1] == "김철수 드림"
+
+
+class TestCompactContext:
+    """컨텍스트 압축 테스트"""
+
+    def test_short_thread_only_loses_repeated_signatures(self):
+        compacted = compact_context(THREAD, 8000)
+
+        assert compacted.count("ABC 주식회사") == 1
+        assert "다음 주 회의 가능한 시간을 알려주세요." in compacted
+
+    def test_newest_message_survives_long_history(self):
+        """오래된 인용 메일이 길어도 최근 메일은 잘리지 않음"""
+        text = html_to_text(outlook_html(messages=20, lines_per_message=30))
+        newest = split_messages(text)[0]
+
+        compacted = compact_context(text, 4000)
+
+        assert len(compacted) <= 4000
+        assert compacted.startswith("\n".join(newest))
+
+    def test_respects_budget(self):
+        text = html_to_text(outlook_html(messages=10))
+
+        for max_chars in (1, 100, 999, 5000):
+            assert len(compact_context(text, max_chars)) <= max_chars
+
+    def test_single_message_matches_truncation(self):
+        body = "A" * 9000
+
+        assert compact_context(body, 8000) == body[:8000]
+        assert compact_context("", 8000) == ""
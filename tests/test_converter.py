@@ -0,0 +1,247 @@
+from pathlib import Path
+
+import pytest
+
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from tests.msg_factory import write_msg
+
+GOLDEN_DIR = Path(__file__).parent / "fixtures" / "golden"
+
+# 골든 파일은 기존 경로(MarkItDown + extract-msg)의 출력으로 생성됨
+GOLDEN_CASES = {
+    "reply_korean": {
+        "subject": "RE: 회의 일정 확인",
+        "sender": "kim@example.com",
+        "sender_name": "김철수",
+        "to_name": "이영희",
+        "to_address": "lee@example.com",
+        "body": "안녕하세요.\r\n\r\n회의 일정 확인 부탁드립니다.   \r\n\r\n\r\n\r\n감사합니다.\r\n",
+        "attachments": 2,
+    },
+    "new_english": {
+        "subject": "Quarterly report",
+        "sender": "park@example.com",
+        "to_name": "Team",
+        "body": "Hello team,\n\nPlease find the report attached.\n\nBest regards,\nPark",
+        "attachments": 1,
+    },
+    "empty_body": {
+        "subject": "회신: 빈 본문",
+        "body": "",
+        "date": None,
+    },
+    # 비유니코드(PT_STRING8) MSG: 인터넷 코드 페이지만 있음
+    "ansi_internet_cpid": {
+        "subject": "RE: 납품 일정 협의",
+        "sender_name": "김철수",
+        "to_name": "이영희; 박민수",
+        "body": "안녕하세요.\r\n\r\n납품 일정은 다음 주 화요일까지 확정하여 회신드리겠습니다.\r\n",
+        "encoding": "cp949",
+        "internet_codepage": 949,
+    },
+    # 비유니코드 MSG: 코드 페이지 속성 없음 (인코딩 추정)
+    "ansi_no_codepage": {
+        "subject": "회신: 다음 주 회의 일정 확인 부탁드립니다",
+        "sender_name": "김철수",
+        "to_name": "이영희",
+        "body": "안녕하세요.\r\n\r\n회의 자료는 첨부와 같이 정리하여 공유드립니다.\r\n",
+        "encoding": "cp949",
+    },
+}
+
+
+@pytest.fixture
+def msg_dir(tmp_path):
+    """테스트용 MSG 파일 디렉토리 (정상 3개 + 손상 1개)"""
+    input_dir = tmp_path / "msg"
+    input_dir.mkdir()
+    write_msg(input_dir / "b_reply.msg", subject="RE: 회의 일정", attachments=1)
+    write_msg(input_dir / "a_new.msg", subject="신규 프로젝트 안내")
+    write_msg(input_dir / "c_korean_reply.msg", subject="회신: 견적 요청")
+    (input_dir / "broken.msg").write_bytes(b"not an ole file")
+    return input_dir
+
+
+class TestMsgToMarkdownConverter:
+    """MsgToMarkdownConverter 변환 테스트"""
+
+    def test_convert_single(self, settings, tmp_path):
+        """단일 파일 변환 시 마크다운과 메타데이터가 생성되는지 확인"""
+        msg_path = write_msg(tmp_path / "email.msg", subject="RE: 회의 일정", attachments=2)
+        converter = MsgToMarkdownConverter(settings)
+
+        metadata = converter.convert_single(str(msg_path), str(tmp_path))
+
+        assert metadata.file_name == "email.msg"
+        assert metadata.subject == "RE: 회의 일정"
+        assert metadata.is_reply is True
+        assert metadata.has_attachments is True
+        assert metadata.date is not None
+        markdown = Path(metadata.markdown_path).read_text(encoding="utf-8")
+        assert "테스트 본문입니다." in markdown
+
+    def test_convert_batch_parallel_serial_mode(self, settings, msg_dir, tmp_path):
+        """workers=1이면 현재 프로세스에서 순차 변환, 결과는 파일명 순서"""
+        converter = MsgToMarkdownConverter(settings)
+
+        results = converter.convert_batch_parallel(
+            str(msg_dir), str(tmp_path / "out"), workers=1
+        )
+
+        assert [Path(r.source_path).name for r in results] == [
+            "a_new.msg", "b_reply.msg", "broken.msg", "c_korean_reply.msg",
+        ]
+        assert [r.success for r in results] == [True, True, False, True]
+
+    def test_convert_batch_parallel_failure_is_structured(self, settings, msg_dir, tmp_path):
+        """변환 실패는 예외 대신 실패 결과로 반환"""
+        converter = MsgToMarkdownConverter(settings)
+
+        results = converter.convert_batch_parallel(
+            str(msg_dir), str(tmp_path / "out"), workers=1
+        )
+        broken = next(r for r in results if r.source_path.endswith("broken.msg"))
+
+        assert broken.success is False
+        assert broken.metadata is None
+        assert broken.error_type
+        assert broken.error_message
+
+    def test_convert_batch_parallel_matches_serial(self, settings, msg_dir, tmp_path):
+        """프로세스 풀 변환 결과가 순차 변환과 동일한지 확인"""
+        converter = MsgToMarkdownConverter(settings)
+
+        serial = converter.convert_batch_parallel(
+            str(msg_dir), str(tmp_path / "serial"), workers=1
+        )
+        parallel = converter.convert_batch_parallel(
+            str(msg_dir), str(tmp_path / "parallel"), workers=2
+        )
+
+        assert [r.source_path for r in parallel] == [r.source_path for r in serial]
+        assert [r.success for r in parallel] == [r.success for r in serial]
+        for s, p in zip(serial, parallel):
+            if s.success:
+                assert p.metadata.subject == s.metadata.subject
+                assert (
+                    Path(p.metadata.markdown_path).read_text(encoding="utf-8")
+                    == Path(s.metadata.markdown_path).read_text(encoding="utf-8")
+                )
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_iter_convert_parallel_yields_all(self, settings, msg_dir, tmp_path, workers):
+        """스트리밍 변환은 순서와 무관하게 모든 파일의 결과를 내보냄"""
+        converter = MsgToMarkdownConverter(settings)
+        msg_paths = [str(p) for p in sorted(msg_dir.glob("*.msg"))]
+
+        results = list(
+            converter.iter_convert_parallel(msg_paths, str(tmp_path / "out"), workers=workers)
+        )
+
+        assert sorted(r.source_path for r in results) == msg_paths
+        assert sum(not r.success for r in results) == 1
+
+    def test_quoted_history_stripped_with_sizes(self, settings, tmp_path):
+        """인용된 이전 메일은 빼고 저장하며, 제거 전/후 크기를 메타데이터에 기록"""
+        body = (
+            "확인했습니다.\r\n\r\n-----Original Message-----\r\nFrom: 이영희\r\n"
+            "Sent: Monday\r\nSubject: 견적 요청\r\n\r\n견적 부탁드립니다."
+        )
+        msg_path = write_msg(tmp_path / "reply.msg", subject="RE: 견적 요청", body=body)
+
+        metadata = MsgToMarkdownConverter(settings).convert_single(str(msg_path), str(tmp_path))
+
+        markdown = Path(metadata.markdown_path).read_text(encoding="utf-8")
+        assert markdown.endswith("## Content\n\n확인했습니다.")
+        assert metadata.markdown_chars == len(markdown)
+        assert metadata.original_chars > metadata.markdown_chars
+        assert not (tmp_path / "reply.stripped.txt").exists()
+
+    def test_stripped_sidecar(self, settings, tmp_path):
+        """md_keep_stripped면 제거한 부분을 사이드카로 저장, 끄면 원문 그대로 저장"""
+        body = "확인했습니다.\r\n\r\nOn Mon, Jan 13, 2025 Kim <k@x.com> wrote:\r\n> 견적 요청"
+        msg_path = write_msg(tmp_path / "reply.msg", body=body)
+
+        keep = settings.model_copy(update={"md_keep_stripped": True})
+        MsgToMarkdownConverter(keep).convert_single(str(msg_path), str(tmp_path))
+        sidecar = tmp_path / "reply.stripped.txt"
+        assert sidecar.read_text(encoding="utf-8").endswith("> 견적 요청")
+
+        raw = settings.model_copy(update={"md_strip_quoted": False})
+        metadata = MsgToMarkdownConverter(raw).convert_single(str(msg_path), str(tmp_path))
+        assert "> 견적 요청" in Path(metadata.markdown_path).read_text(encoding="utf-8")
+        assert metadata.original_chars == metadata.markdown_chars
+        assert not sidecar.exists()
+
+
+class TestSingleParseConversion:
+    """단일 파싱 경로가 기존 경로와 동일한 결과를 내는지 테스트"""
+
+    @pytest.mark.parametrize("case", sorted(GOLDEN_CASES))
+    def test_markdown_matches_golden(self, settings, tmp_path, case):
+        """단일 파싱 마크다운이 골든 파일(기존 MarkItDown 출력)과 동일"""
+        msg_path = write_msg(tmp_path / f"{case}.msg", **GOLDEN_CASES[case])
+        converter = MsgToMarkdownConverter(settings)
+
+        metadata = converter.convert_single(str(msg_path), str(tmp_path))
+
+        expected = (GOLDEN_DIR / f"{case}.md").read_text(encoding="utf-8")
+        assert Path(metadata.markdown_path).read_text(encoding="utf-8") == expected
+
+    @pytest.mark.parametrize("case", sorted(GOLDEN_CASES))
+    def test_metadata_matches_legacy_path(self, settings, tmp_path, case):
+        """단일 파싱 메타데이터가 기존 2회 파싱 경로와 동일"""
+        msg_path = write_msg(tmp_path / f"{case}.msg", **GOLDEN_CASES[case])
+        legacy_settings = settings.model_copy(update={"msg_single_parse": False})
+        (tmp_path / "single").mkdir()
+        (tmp_path / "legacy").mkdir()
+
+        single = MsgToMarkdownConverter(settings).convert_single(
+            str(msg_path), str(tmp_path / "single")
+        )
+        legacy = MsgToMarkdownConverter(legacy_settings).convert_single(
+            str(msg_path), str(tmp_path / "legacy")
+        )
+
+        assert single.model_dump(exclude={"markdown_path"}) == legacy.model_dump(
+            exclude={"markdown_path"}
+        )
+        assert (
+            Path(single.markdown_path).read_text(encoding="utf-8")
+            == Path(legacy.markdown_path).read_text(encoding="utf-8")
+        )
+
+    @pytest.mark.parametrize("case", ["ansi_internet_cpid", "ansi_no_codepage"])
+    def test_non_unicode_metadata_decoded(self, settings, tmp_path, case):
+        """비유니코드 MSG의 제목/보낸 사람도 마크다운과 같은 인코딩으로 디코딩"""
+        msg_path = write_msg(tmp_path / f"{case}.msg", **GOLDEN_CASES[case])
+
+        metadata = MsgToMarkdownConverter(settings).convert_single(str(msg_path), str(tmp_path))
+
+        assert metadata.subject == GOLDEN_CASES[case]["subject"]
+        assert metadata.sender == "김철수"
+        assert metadata.recipients
+        assert metadata.is_reply is True
+
+    def test_single_parse_does_not_load_attachments(self, settings, tmp_path, monkeypatch):
+        """첨부파일 개수 확인에 첨부 객체를 생성하지 않음"""
+        import extract_msg
+
+        msg_path = write_msg(tmp_path / "attach.msg", attachments=3)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("첨부파일 객체가 생성됨")
+
+        monkeypatch.setattr(extract_msg.Message, "initAttachmentFunc", property(lambda self: fail))
+
+        metadata = MsgToMarkdownConverter(settings).convert_single(str(msg_path), str(tmp_path))
+        assert metadata.has_attachments is True
+
+    def test_single_parse_does_not_create_markitdown(self, settings, tmp_path):
+        """기본 경로에서는 MarkItDown 인스턴스를 만들지 않음"""
+        msg_path = write_msg(tmp_path / "email.msg")
+        converter = MsgToMarkdownConverter(settings)
+
+        converter.convert_single(str(msg_path), str(tmp_path))
+
+        assert converter._markitdown is None
@@ -0,0 +1,81 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from email_writer.converter.dedup import MinHasher, NearDuplicateIndex, lsh_params, shingles
+
+_BODY = (
+    "안녕하세요. 지난주 회의에서 논의한 견적 건 관련하여 연락드립니다. "
+    "첨부한 자료를 검토하신 뒤 다음 주 화요일까지 회신 부탁드립니다. "
+    "일정 조율이 필요하시면 편하게 말씀해 주세요. 감사합니다. "
+) * 4
+
+
+def _jaccard(a: str, b: str) -> float:
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+class TestMinHasher:
+    def test_shingles_normalize_whitespace_and_case(self):
+        assert shingles("Hello   World", 5) == shingles("hello world", 5)
+        assert shingles("짧음", 5) == {"짧음"}
+        assert shingles("   ", 5) == set()
+
+    def test_signature_estimates_jaccard(self):
+        hasher = MinHasher(num_perm=256)
+        edited = _BODY.replace("화요일", "수요일").replace("견적", "계약") + " 추가 문장입니다."
+
+        estimate = np.mean(hasher.signature(_BODY) == hasher.signature(edited))
+
+        assert estimate == pytest.approx(_jaccard(_BODY, edited), abs=0.08)
+
+    def test_signature_is_deterministic(self):
+        assert np.array_equal(MinHasher().signature(_BODY), MinHasher().signature(_BODY))
+
+    def test_long_text_matches_unchunked(self):
+        hasher = MinHasher(num_perm=16)
+        text = "".join(chr(0xAC00 + i % 2000) for i in range(20000))
+
+        # 청크로 나눠 계산해도 전체 shingle에 대한 최솟값과 같음
+        hashes = np.array(
+            [zlib.crc32(s.encode("utf-8")) for s in shingles(text)],
+            dtype=np.uint64,
+        )
+        expected = (
+            ((hasher._a * hashes + hasher._b) % np.uint64((1 << 61) - 1))
+            & np.uint64(0xFFFFFFFF)
+        ).min(axis=1)
+        assert np.array_equal(hasher.signature(text), expected.astype(np.uint32))
+
+
+class TestNearDuplicateIndex:
+    @pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+    def test_lsh_params_fit_signature(self, threshold):
+        bands, rows = lsh_params(threshold, 128)
+
+        assert bands * rows <= 128
+        # 후보 확률이 절반이 되는 지점이 임계값 근처
+        assert (1 / bands) ** (1 / rows) == pytest.approx(threshold, abs=0.1)
+
+    def test_finds_near_duplicates_only(self):
+        hasher = MinHasher()
+        index = NearDuplicateIndex(threshold=0.8)
+        index.add("original", hasher.signature(_BODY))
+        index.add("other", hasher.signature("전혀 다른 내용의 메일입니다. 내일 뵙겠습니다." * 5))
+
+        matches = index.query(hasher.signature(_BODY + " 감사합니다."))
+
+        assert [key for key, _ in matches] == ["original"]
+        assert matches[0][1] >= 0.8
+
+    def test_remove(self):
+        hasher = MinHasher()
+        index = NearDuplicateIndex()
+        index.add("original", hasher.signature(_BODY))
+
+        index.remove("original")
+
+        assert len(index) == 0
+        assert index.query(hasher.signature(_BODY)) == []
@@ -0,0 +1,133 @@
+"""로컬 가짜 Gemini 서버 + 부하 테스트 도구 테스트 (실제 SDK를 가짜 서버에 연결)"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+import uvicorn
+from google.genai import errors
+
+from benchmarks.bench_load import free_port, run
+from benchmarks.fake_gemini import FakeGeminiBehavior, create_app
+from email_writer.gemini.client import GeminiClient
+from email_writer.gemini.client_factory import reset_genai_clients
+from email_writer.gemini.file_search import FileSearchManager
+from email_writer.models.email_metadata import EmailMetadata
+
+
+@contextmanager
+def _serve(app):
+    """앱을 백그라운드 스레드의 uvicorn으로 실행하고 주소 반환"""
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_clients():
+    reset_genai_clients()
+    yield
+    reset_genai_clients()
+
+
+def _fake_settings(settings, base_url: str):
+    return settings.model_copy(
+        update={
+            "gemini_base_url": base_url,
+            "upload_poll_initial": 0.02,
+            "warmup_on_startup": False,
+            "keepalive_interval": 0,
+        }
+    )
+
+
+def _behavior(**kwargs) -> FakeGeminiBehavior:
+    kwargs.setdefault("latency_median", 0.01)
+    kwargs.setdefault("latency_sigma", 0.0)
+    return FakeGeminiBehavior(seed=1, chunk_interval=0.0, index_latency=0.05, **kwargs)
+
+
+class TestFakeGemini:
+    def test_generate_and_stream_through_sdk(self, settings):
+        with _serve(create_app(_behavior())) as base_url:
+            gemini = GeminiClient(_fake_settings(settings, base_url))
+
+            text = gemini.generate_with_file_search("프롬프트")
+
+            async def stream():
+                return [chunk async for chunk in gemini.stream_with_file_search_async("프롬프트")]
+
+            chunks = asyncio.run(stream())
+
+        assert text.startswith("안녕하세요.")
+        assert len(chunks) == 8
+        assert "".join(chunks) == text
+
+    def test_injects_rate_limit_and_server_errors(self, settings):
+        app = create_app(_behavior(rate_limit_rate=1.0))
+        with _serve(app) as base_url:
+            gemini = GeminiClient(_fake_settings(settings, base_url))
+            with pytest.raises(errors.ClientError) as rate_limited:
+                gemini.generate_with_file_search("프롬프트")
+
+        with _serve(create_app(_behavior(error_rate=1.0))) as base_url:
+            reset_genai_clients()
+            gemini = GeminiClient(_fake_settings(settings, base_url))
+            with pytest.raises(errors.ServerError):
+                gemini.generate_with_file_search("프롬프트")
+
+        assert rate_limited.value.code == 429
+        assert app.state.stats["errors"] >= 1
+
+    def test_file_search_upload_and_delete(self, settings, tmp_path):
+        md_path = tmp_path / "a.md"
+        md_path.write_text("## Email Message\n\n본문", encoding="utf-8")
+        metadata = EmailMetadata(
+            file_name="a.msg",
+            subject="제목",
+            sender="me@example.com",
+            recipients="you@example.com",
+            markdown_path=str(md_path),
+        )
+        with _serve(create_app(_behavior())) as base_url:
+            manager = FileSearchManager(_fake_settings(settings, base_url))
+            store = manager.create_store("test")
+
+            result = manager.upload_markdown(store, str(md_path), metadata)
+            listed = [document.name for document in manager.list_documents(store)]
+            manager.delete_document(store, result.document_name)
+            remaining = list(manager.list_documents(store))
+
+        assert result.document_name.startswith(f"{store}/documents/")
+        assert result.indexing_latency >= 0.05
+        assert listed == [result.document_name]
+        assert remaining == []
+
+
+def test_load_generator_reports_percentiles_and_errors(settings):
+    from email_writer import server
+    from email_writer.core.generator import EmailGenerator
+
+    with _serve(create_app(_behavior(rate_limit_rate=0.3))) as base_url:
+        app_settings = _fake_settings(settings, base_url)
+        generator = EmailGenerator(app_settings)
+        with patch.object(server, "settings", app_settings), \
+                patch.object(server, "generator", generator), \
+                _serve(server.app) as url:
+            result = asyncio.run(run(url, rate=20, duration=1.0, timeout=10))
+
+    assert result["sent"] == 20
+    assert result["succeeded"] + result["failed"] == 20
+    assert set(result["errors"]) <= {"rate_limited"}
+    assert 0 < result["errors"]["rate_limited"] < 20
+    assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] <= result["max_ms"]
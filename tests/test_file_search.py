@@ -0,0 +1,242 @@
+import inspect
+import threading
+from datetime import datetime
+
+import pytest
+from google.genai.documents import Documents
+
+from email_writer.gemini import file_search
+from email_writer.gemini.file_search import FileSearchManager
+from email_writer.gemini.operations import PollBackoff
+from email_writer.models.email_metadata import EmailMetadata
+from tests.fake_genai import FakeClock, FakeGenaiClient
+
+
+def _items(count: int) -> list[EmailMetadata]:
+    return [
+        EmailMetadata(
+            file_name=f"email_{i}.msg",
+            subject=f"제목 {i}",
+            sender="me@example.com",
+            recipients="you@example.com",
+            markdown_path=f"/data/email_{i}.md",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(file_search.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(file_search.time, "sleep", clock.sleep)
+    return clock
+
+
+def _manager(settings, client) -> FileSearchManager:
+    # 지터 없이 결정적인 폴링 간격 사용
+    manager = FileSearchManager(settings.model_copy(update={"upload_poll_jitter": 0.0}))
+    manager.client = client
+    return manager
+
+
+class TestUploadMany:
+    """FileSearchManager.upload_many 동시 업로드 테스트"""
+
+    def test_results_in_input_order(self, settings, clock):
+        """모든 문서가 입력 순서대로 성공 결과를 반환"""
+        client = FakeGenaiClient(clock, latency=1.0)
+        items = _items(5)
+
+        results = _manager(settings, client).upload_many("stores/s", items, concurrency=2)
+
+        assert [r.file_name for r in results] == [m.file_name for m in items]
+        assert all(r.success for r in results)
+        assert len({r.document_name for r in results}) == 5
+        assert all(r.elapsed >= 1.0 for r in results)
+
+    def test_concurrency_limit_respected(self, settings, clock):
+        """진행 중인 작업 수가 concurrency를 넘지 않음"""
+        client = FakeGenaiClient(clock, latency=3.0)
+
+        _manager(settings, client).upload_many("stores/s", _items(20), concurrency=4)
+
+        assert client.max_in_flight == 4
+
+    def test_throughput_scales_with_concurrency(self, settings, monkeypatch):
+        """동시 작업 수에 비례하여 전체 소요 시간이 줄어듦"""
+        durations = {}
+        for concurrency in (1, 10):
+            clock = FakeClock()
+            monkeypatch.setattr(file_search.time, "monotonic", clock.monotonic)
+            monkeypatch.setattr(file_search.time, "sleep", clock.sleep)
+            client = FakeGenaiClient(clock, latency=2.0)
+
+            _manager(settings, client).upload_many(
+                "stores/s", _items(20), concurrency=concurrency
+            )
+            durations[concurrency] = clock.now
+
+        assert durations[10] * 5 <= durations[1]
+
+    def test_upload_requests_sent_concurrently(self, settings, clock):
+        """업로드 요청(파일 전송) 자체도 concurrency개까지 동시에 보냄"""
+        client = FakeGenaiClient(clock, latency=1.0)
+        # 요청 4건이 동시에 들어와야 통과하는 장벽 (순차 전송이면 타임아웃으로 실패)
+        barrier = threading.Barrier(4, timeout=5)
+        start = client._start
+
+        def blocking_start(*args):
+            barrier.wait()
+            return start(*args)
+
+        client._start = blocking_start
+        results = _manager(settings, client).upload_many("stores/s", _items(4), concurrency=4)
+
+        assert all(r.success for r in results)
+        assert client.max_in_flight == 4
+
+    def test_polls_pending_operations_together(self, settings, clock):
+        """라운드마다 한 번만 대기하고 진행 중 작업 전체를 함께 폴링"""
+        client = FakeGenaiClient(clock, latency=1.0)
+
+        results = _manager(settings, client).upload_many("stores/s", _items(4), concurrency=4)
+
+        # 간격 0.1, 0.15, 0.225, 0.3375, 0.50625 -> 누적 1.31초에 완료 확인
+        assert len(clock.sleeps) == 5
+        assert client.get_calls == 4 * 5
+        assert all(r.indexing_latency == pytest.approx(1.31875) for r in results)
+
+    def test_per_document_failure(self, settings, clock):
+        """일부 문서 실패는 해당 결과에만 기록"""
+        client = FakeGenaiClient(clock, latency=1.0, fail_files={"/data/email_1.md"})
+
+        results = _manager(settings, client).upload_many("stores/s", _items(3), concurrency=3)
+
+        assert [r.success for r in results] == [True, False, True]
+        assert "indexing failed" in results[1].error
+        assert results[1].document_name is None
+
+    def test_timeout(self, settings, clock):
+        """max_wait를 넘긴 작업은 타임아웃 실패"""
+        client = FakeGenaiClient(clock, latency=100.0)
+
+        results = _manager(settings, client).upload_many(
+            "stores/s", _items(2), concurrency=2, max_wait=5.0
+        )
+
+        assert not any(r.success for r in results)
+        assert all("타임아웃" in r.error for r in results)
+
+
+class TestUploadMarkdown:
+    """FileSearchManager.upload_markdown 폴링 테스트"""
+
+    def test_refreshes_operation_state(self, settings, clock):
+        """operations.get으로 상태를 갱신하여 빠른 인덱싱은 1초 안에 반환"""
+        client = FakeGenaiClient(clock, latency=0.3)
+        metadata = _items(1)[0]
+
+        result = _manager(settings, client).upload_markdown(
+            "stores/s", metadata.markdown_path, metadata
+        )
+
+        assert result.success is True
+        assert result.document_name == "stores/s/documents/doc-0"
+        assert client.get_calls == 3
+        assert result.indexing_latency == pytest.approx(0.475)
+        assert result.indexing_latency < 1.0
+
+    def test_uploads_numeric_date_for_range_filter(self, settings, clock):
+        """기간 필터용 날짜는 숫자 값(YYYYMMDD)으로도 업로드"""
+        client = FakeGenaiClient(clock, latency=0.1)
+        metadata = _items(1)[0].model_copy(update={"date": datetime(2025, 1, 15, 10, 30)})
+
+        _manager(settings, client).upload_markdown("stores/s", metadata.markdown_path, metadata)
+
+        custom_metadata = client.uploads[0]["config"]["custom_metadata"]
+        assert {"key": "date_ymd", "numeric_value": 20250115} in custom_metadata
+
+    def test_slow_indexing_backs_off(self, settings, clock):
+        """오래 걸리는 인덱싱은 간격을 늘려 API 호출 수를 제한"""
+        client = FakeGenaiClient(clock, latency=60.0)
+        metadata = _items(1)[0]
+
+        result = _manager(settings, client).upload_markdown(
+            "stores/s", metadata.markdown_path, metadata
+        )
+
+        assert result.indexing_latency >= 60.0
+        assert client.get_calls < 25
+        assert max(clock.sleeps) == settings.upload_poll_max
+
+    def test_fixed_poll_interval(self, settings, clock):
+        """poll_interval을 주면 백오프 대신 고정 간격으로 폴링"""
+        client = FakeGenaiClient(clock, latency=5.0)
+        metadata = _items(1)[0]
+
+        _manager(settings, client).upload_markdown(
+            "stores/s", metadata.markdown_path, metadata, poll_interval=2.0
+        )
+
+        assert clock.sleeps == [2.0, 2.0, 2.0]
+
+    def test_timeout(self, settings, clock):
+        """max_wait를 넘기면 파일명을 포함한 TimeoutError"""
+        client = FakeGenaiClient(clock, latency=100.0)
+        metadata = _items(1)[0]
+
+        with pytest.raises(TimeoutError, match="email_0.msg"):
+            _manager(settings, client).upload_markdown(
+                "stores/s", metadata.markdown_path, metadata, max_wait=10.0
+            )
+
+    def test_failed_operation_raises(self, settings, clock):
+        """인덱싱 실패 시 예외"""
+        client = FakeGenaiClient(clock, latency=0.1, fail_files={"/data/email_0.md"})
+        metadata = _items(1)[0]
+
+        with pytest.raises(Exception, match="파일 업로드 실패"):
+            _manager(settings, client).upload_markdown(
+                "stores/s", metadata.markdown_path, metadata
+            )
+
+
+class TestDocuments:
+    """Store 문서 조회/삭제 테스트"""
+
+    def test_list_and_delete(self, settings, clock):
+        client = FakeGenaiClient(clock)
+        manager = _manager(settings, client)
+
+        assert list(manager.list_documents("stores/s")) == []
+        manager.delete_document("stores/s", "stores/s/documents/doc-0")
+
+        assert client.deleted == ["stores/s/documents/doc-0"]
+
+    @pytest.mark.parametrize("method", ["list", "delete"])
+    def test_fake_matches_sdk_signature(self, clock, method):
+        """가짜 클라이언트가 SDK와 같은 키워드 전용 인자를 받는지 (호출 인자 불일치 검출용)"""
+        fake = getattr(FakeGenaiClient(clock).file_search_stores.documents, method)
+        real = inspect.signature(getattr(Documents, method))
+        expected = [p for p in real.parameters.values() if p.name != "self"]
+
+        assert [
+            (p.name, p.kind) for p in inspect.signature(fake).parameters.values()
+        ] == [(p.name, p.kind) for p in expected]
+
+
+class TestPollBackoff:
+    """PollBackoff 간격 계산 테스트"""
+
+    def test_exponential_until_max(self):
+        backoff = PollBackoff(initial_interval=0.5, max_interval=2.0, multiplier=2.0, jitter=0.0)
+
+        assert [backoff.next_interval() for _ in range(5)] == [0.5, 1.0, 2.0, 2.0, 2.0]
+
+    def test_jitter_bounds(self):
+        backoff = PollBackoff(initial_interval=1.0, max_interval=1.0, jitter=0.2)
+
+        intervals = [backoff.next_interval() for _ in range(200)]
+        assert all(0.8 <= i <= 1.2 for i in intervals)
+        assert len(set(intervals)) > 1
@@ -1,6 +1,10 @@
+import asyncio
+import threading
+
 import pytest
 
 from email_writer.core.generator import EmailGenerator
+from email_writer.models.request import GenerateEmailRequest
 
 
 class TestEmailGeneratorHtmlToText:
@@ -90,3 +94,272 @@ class TestEmailGeneratorHtmlToText:
         assert "WordSection1" not in text
         assert "xmlns" not in text
         assert "font-family" not in text
+
+
+class _SlowGeminiClient:
+    """호출 동시성을 기록하는 가짜 GeminiClient"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.prompts = []
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return "생성된 본문"
+
+    async def stream_with_file_search_async(self, prompt: str, metadata_filter: str | None = None):
+        self.prompts.append(prompt)
+        for chunk in ["생성된 ", "본문"]:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class TestEmailGeneratorAsync:
+    """EmailGenerator.generate_async 테스트"""
+
+    def _request(self, i: int = 0) -> GenerateEmailRequest:
+        return GenerateEmailRequest(
+            full_body=f"<p>원본 메일 {i}</p>",
+            selected_text="일정 확인 요청",
+        )
+
+    def test_generate_async_builds_prompt(self, settings):
+        """비동기 경로도 HTML 변환 후 프롬프트를 구성하여 호출"""
+        generator = EmailGenerator(settings)
+        generator.gemini_client = _SlowGeminiClient(delay=0)
+
+        result = asyncio.run(generator.generate_async(self._request()))
+
+        assert result == "생성된 본문"
+        assert "원본 메일 0" in generator.gemini_client.prompts[0]
+        assert "<p>" not in generator.gemini_client.prompts[0]
+
+    def test_concurrency_limited_by_semaphore(self, settings):
+        """동시 Gemini 호출 수가 generation_concurrency를 넘지 않음"""
+        generator = EmailGenerator(settings.model_copy(update={"generation_concurrency": 3}))
+        generator.gemini_client = _SlowGeminiClient()
+
+        async def run_all():
+            return await asyncio.gather(
+                *(generator.generate_async(self._request(i)) for i in range(10))
+            )
+
+        results = asyncio.run(run_all())
+
+        assert len(results) == 10
+        assert generator.gemini_client.max_active == 3
+
+    def test_identical_concurrent_requests_coalesced(self, settings):
+        """같은 요청이 동시에 들어오면 Gemini 호출 1건을 공유"""
+        generator = EmailGenerator(settings)
+        generator.gemini_client = _SlowGeminiClient()
+
+        async def run_all():
+            return await asyncio.gather(
+                *(generator.generate_async(self._request()) for _ in range(10))
+            )
+
+        results = asyncio.run(run_all())
+
+        assert results == ["생성된 본문"] * 10
+        assert len(generator.gemini_client.prompts) == 1
+        assert generator.flights.stats()["coalesced"] == 9
+
+    def test_regenerate_not_coalesced(self, settings):
+        """진행 중인 같은 요청이 있어도 regenerate 요청은 새로 호출 (비동기/스트리밍)"""
+        generator = EmailGenerator(settings)
+        generator.gemini_client = _SlowGeminiClient()
+        regenerate = self._request().model_copy(update={"regenerate": True})
+
+        async def collect(request):
+            return "".join([chunk async for chunk in generator.generate_stream(request)])
+
+        async def run_all():
+            await asyncio.gather(
+                generator.generate_async(self._request()), generator.generate_async(regenerate)
+            )
+            await asyncio.gather(collect(self._request()), collect(regenerate))
+
+        asyncio.run(run_all())
+
+        assert len(generator.gemini_client.prompts) == 4
+        assert generator.flights.stats()["coalesced"] == 0
+
+    def test_coalescing_disabled(self, settings):
+        generator = EmailGenerator(settings.model_copy(update={"coalesce_requests": False}))
+        generator.gemini_client = _SlowGeminiClient()
+
+        async def run_all():
+            return await asyncio.gather(
+                *(generator.generate_async(self._request()) for _ in range(3))
+            )
+
+        asyncio.run(run_all())
+
+        assert generator.flights is None
+        assert len(generator.gemini_client.prompts) == 3
+
+    def test_generate_stream_yields_chunks(self, settings):
+        """스트리밍 경로는 텍스트 조각을 순서대로 반환"""
+        generator = EmailGenerator(settings)
+        generator.gemini_client = _SlowGeminiClient()
+
+        async def collect():
+            return [chunk async for chunk in generator.generate_stream(self._request())]
+
+        assert asyncio.run(collect()) == ["생성된 ", "본문"]
+        assert "원본 메일 0" in generator.gemini_client.prompts[0]
+
+
+class _CountingGeminiClient:
+    """호출 횟수를 기록하는 동기 가짜 GeminiClient"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_with_file_search(self, prompt: str, metadata_filter: str | None = None) -> str:
+        self.calls += 1
+        return f"생성 {self.calls}"
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        return self.generate_with_file_search(prompt, metadata_filter)
+
+
+class TestEmailGeneratorCache:
+    """EmailGenerator 응답 캐시 테스트"""
+
+    def _generator(self, settings, enabled: bool = True) -> EmailGenerator:
+        generator = EmailGenerator(
+            settings.model_copy(update={"response_cache_enabled": enabled})
+        )
+        generator.gemini_client = _CountingGeminiClient()
+        return generator
+
+    def test_identical_request_served_from_cache(self, settings):
+        generator = self._generator(settings)
+        request = GenerateEmailRequest(full_body="<p>본문</p>", selected_text="키워드")
+
+        assert generator.generate(request) == "생성 1"
+        assert generator.generate(request) == "생성 1"
+        assert generator.gemini_client.calls == 1
+        assert generator.cache.stats()["hits"] == 1
+
+    def test_regenerate_bypasses_cache(self, settings):
+        generator = self._generator(settings)
+        request = GenerateEmailRequest(full_body="<p>본문</p>", selected_text="키워드")
+
+        generator.generate(request)
+        fresh = generator.generate(request.model_copy(update={"regenerate": True}))
+
+        assert fresh == "생성 2"
+        assert generator.gemini_client.calls == 2
+        # 새로 생성한 결과로 캐시가 갱신됨
+        assert generator.generate(request) == "생성 2"
+
+    def test_async_generation_uses_async_disk_cache(self, settings, tmp_path):
+        """비동기 생성의 디스크 캐시 조회/저장은 이벤트 루프 스레드 밖에서 수행"""
+        generator = EmailGenerator(
+            settings.model_copy(
+                update={
+                    "response_cache_enabled": True,
+                    "response_cache_path": str(tmp_path / "cache.sqlite3"),
+                }
+            )
+        )
+        generator.gemini_client = _CountingGeminiClient()
+        request = GenerateEmailRequest(full_body="<p>본문</p>", selected_text="키워드")
+
+        threads = []
+        generator.cache._db.set_trace_callback(lambda _: threads.append(threading.get_ident()))
+
+        assert asyncio.run(generator.generate_async(request)) == "생성 1"
+        assert asyncio.run(generator.generate_async(request)) == "생성 1"
+        assert generator.gemini_client.calls == 1
+        assert threads
+        assert threading.get_ident() not in threads
+        generator.cache.close()
+
+    def test_cache_disabled_by_default(self, settings):
+        generator = self._generator(settings, enabled=False)
+        request = GenerateEmailRequest(full_body="<p>본문</p>", selected_text="키워드")
+
+        generator.generate(request)
+        generator.generate(request)
+
+        assert generator.cache is None
+        assert generator.gemini_client.calls == 2
+
+
+class _CandidateGeminiClient(_SlowGeminiClient):
+    """온도/후보 수를 기록하고, 선택 텍스트에 '실패'가 있으면 예외를 내는 가짜 GeminiClient"""
+
+    def __init__(self, delay: float = 0.01):
+        super().__init__(delay)
+        self.temperatures = []
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None, temperature: float | None = None
+    ) -> str:
+        self.temperatures.append(temperature)
+        await super().generate_with_file_search_async(prompt)
+        if "실패" in prompt:
+            raise RuntimeError("생성 실패")
+        return f"초안 (온도 {temperature})" if temperature is not None else prompt.split("\n")[-1]
+
+    async def generate_candidates_async(
+        self, prompt: str, count: int, metadata_filter: str | None = None
+    ) -> list[str]:
+        self.prompts.append(prompt)
+        return [f"후보 {i}" for i in range(count)]
+
+
+class TestEmailGeneratorCandidatesAndBatch:
+    """후보 초안/일괄 생성 테스트"""
+
+    def test_parallel_candidates_use_spread_temperatures(self, settings):
+        generator = EmailGenerator(settings)
+        generator.gemini_client = _CandidateGeminiClient()
+        request = GenerateEmailRequest(full_body="<p>본문</p>", selected_text="키워드")
+
+        candidates = asyncio.run(generator.generate_candidates_async(request, 3))
+
+        assert candidates == ["초안 (온도 0.5)", "초안 (온도 0.7)", "초안 (온도 0.9)"]
+        # 후보 호출은 동시에 진행
+        assert generator.gemini_client.max_active == 3
+
+    def test_candidate_count_strategy_single_call(self, settings):
+        generator = EmailGenerator(
+            settings.model_copy(update={"candidate_strategy": "candidate_count"})
+        )
+        generator.gemini_client = _CandidateGeminiClient()
+        request = GenerateEmailRequest(full_body="<p>본문</p>", selected_text="키워드")
+
+        candidates = asyncio.run(generator.generate_candidates_async(request, 2))
+
+        assert candidates == ["후보 0", "후보 1"]
+        assert len(generator.gemini_client.prompts) == 1
+
+    def test_batch_keeps_order_and_item_errors(self, settings):
+        generator = EmailGenerator(settings.model_copy(update={"batch_concurrency": 2}))
+        generator.gemini_client = _CandidateGeminiClient()
+        requests = [
+            GenerateEmailRequest(full_body="", selected_text=text, additional_prompt=text)
+            for text in ["첫째", "실패", "셋째", "넷째"]
+        ]
+
+        results = asyncio.run(generator.generate_batch_async(requests))
+
+        assert "첫째" in results[0]
+        assert isinstance(results[1], RuntimeError)
+        assert "셋째" in results[2] and "넷째" in results[3]
+        assert generator.gemini_client.max_active == 2
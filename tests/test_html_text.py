@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from email_writer.core.html_text import html_to_text
+from tests.html_factory import outlook_html
+
+HTML_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def _reference(html: str) -> str:
+    """기존 BeautifulSoup 구현 (출력 비교 기준)"""
+    if not html or not html.strip():
+        return ""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "head"]):
+        tag.decompose()
+    text = soup.get_text(separator="\n")
+    lines = [line.strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+CORPUS = {
+    **{path.stem: path.read_text(encoding="utf-8") for path in sorted(HTML_DIR.glob("*.html"))},
+    "outlook_thread": outlook_html(messages=4),
+    "outlook_single": outlook_html(messages=1, lines_per_message=2),
+}
+
+EDGE_CASES = [
+    "plain text only",
+    "<p>a</p><p>b</p>",
+    "<div><head>hidden</div>visible",
+    "<head><title>t</title><div>unclosed head body",
+    "<p>a</span>b</p>",
+    "<p>x<br>y<br/>z</br>w</p>",
+    "<script/>after<style>s</style>",
+    "<template>tpl</template>t<ruby>漢<rt>han</rt><rp>(</rp></ruby>",
+    "<![CDATA[cdata text]]>after",
+    "<!DOCTYPE html><!-- comment --><?xml version='1.0'?>body",
+    "line1\r\nline2\x0bline3 line4",
+    "&nbsp;&nbsp;<b>&lt;tag&gt;</b> &amp; &#8217; &#x2014; &#150;",
+    "<TABLE><TR><TD>Cell</TD></TR></TABLE>",
+    "<o:p>&nbsp;</o:p><v:shape>vml</v:shape>",
+]
+
+
+class TestHtmlToText:
+    """스트리밍 HTML 텍스트 추출기 테스트"""
+
+    @pytest.mark.parametrize("name", sorted(CORPUS))
+    def test_matches_reference_on_outlook_corpus(self, name):
+        html = CORPUS[name]
+        assert html_to_text(html) == _reference(html)
+
+    @pytest.mark.parametrize("html", EDGE_CASES)
+    def test_matches_reference_on_edge_cases(self, html):
+        assert html_to_text(html) == _reference(html)
+
+    def test_empty_input(self):
+        assert html_to_text("") == ""
+        assert html_to_text("   ") == ""
+        assert html_to_text(None) == ""
+
+    @pytest.mark.parametrize("max_chars", [0, 1, 50, 500, 3000])
+    def test_max_chars_equals_truncated_full_text(self, max_chars):
+        html = outlook_html(messages=10)
+        assert html_to_text(html, max_chars=max_chars) == _reference(html)[:max_chars]
+
+    def test_max_chars_stops_early(self, monkeypatch):
+        """필요한 만큼 모이면 나머지 HTML은 파싱하지 않음"""
+        from email_writer.core import html_text
+
+        seen = []
+        original = html_text._TextExtractor.handle_data
+
+        def spy(self, data):
+            seen.append(data)
+            original(self, data)
+
+        monkeypatch.setattr(html_text._TextExtractor, "handle_data", spy)
+        html = outlook_html(messages=50)
+
+        html_to_text(html, max_chars=200)
+
+        assert "[49-0]" not in "".join(seen)
@@ -0,0 +1,226 @@
+import os
+
+import pytest
+
+from email_writer.converter.manifest import (
+    UPLOAD_DONE,
+    UPLOAD_DUPLICATE,
+    UPLOAD_FAILED,
+    ConversionManifest,
+)
+from email_writer.models.email_metadata import EmailMetadata
+
+
+def _metadata(name: str) -> EmailMetadata:
+    return EmailMetadata(
+        file_name=name,
+        subject="제목",
+        sender="me@example.com",
+        recipients="you@example.com",
+        markdown_path=f"/tmp/{name}.md",
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with ConversionManifest(tmp_path / "manifest.sqlite3") as m:
+        yield m
+
+
+def _record_all(manifest, plan):
+    for path in plan.to_convert:
+        manifest.record_conversion(path, plan.hashes[path], _metadata(os.path.basename(path)))
+
+
+class TestConversionManifest:
+    """ConversionManifest 증분 처리 테스트"""
+
+    def test_first_run_all_new(self, manifest, tmp_path):
+        """처음 실행 시 모든 파일이 신규"""
+        a = tmp_path / "a.msg"
+        b = tmp_path / "b.msg"
+        a.write_bytes(b"aaa")
+        b.write_bytes(b"bbb")
+
+        plan = manifest.plan([a, b])
+
+        assert plan.new == [str(a.resolve()), str(b.resolve())]
+        assert plan.changed == [] and plan.unchanged == [] and plan.removed == []
+
+    def test_rerun_detects_changed_unchanged_removed(self, manifest, tmp_path):
+        """재실행 시 변경/유지/삭제 파일 구분"""
+        a, b, c = (tmp_path / f"{n}.msg" for n in "abc")
+        for path in (a, b, c):
+            path.write_bytes(path.name.encode())
+        _record_all(manifest, manifest.plan([a, b, c]))
+
+        b.write_bytes(b"modified content")
+        c.unlink()
+        d = tmp_path / "d.msg"
+        d.write_bytes(b"ddd")
+
+        plan = manifest.plan([a, b, d])
+
+        assert plan.new == [str(d.resolve())]
+        assert plan.changed == [str(b.resolve())]
+        assert plan.unchanged == [str(a.resolve())]
+        assert [e.source_path for e in plan.removed] == [str(c.resolve())]
+
+    def test_touched_file_with_same_content_is_unchanged(self, manifest, tmp_path):
+        """수정 시각만 바뀌고 내용이 같으면 변경 없음"""
+        a = tmp_path / "a.msg"
+        a.write_bytes(b"same")
+        _record_all(manifest, manifest.plan([a]))
+
+        stat = a.stat()
+        os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        plan = manifest.plan([a])
+        assert plan.unchanged == [str(a.resolve())]
+        assert manifest.get(str(a.resolve())).mtime_ns == stat.st_mtime_ns + 10**9
+
+    def test_force_reconverts_everything(self, manifest, tmp_path):
+        """force=True면 변경 없는 파일도 재변환 대상"""
+        a = tmp_path / "a.msg"
+        a.write_bytes(b"same")
+        _record_all(manifest, manifest.plan([a]))
+
+        plan = manifest.plan([a], force=True)
+        assert plan.changed == [str(a.resolve())]
+
+    def test_upload_status_tracking(self, manifest, tmp_path):
+        """업로드 상태에 따라 pending_uploads가 결정됨"""
+        a, b = tmp_path / "a.msg", tmp_path / "b.msg"
+        a.write_bytes(b"a")
+        b.write_bytes(b"b")
+        _record_all(manifest, manifest.plan([a, b]))
+        a_path, b_path = str(a.resolve()), str(b.resolve())
+
+        manifest.mark_uploaded(a_path, "stores/s1", "stores/s1/documents/a")
+        manifest.mark_upload_failed(b_path, "quota")
+
+        pending = manifest.pending_uploads("stores/s1")
+        assert [e.source_path for e in pending] == [b_path]
+        assert pending[0].upload_status == UPLOAD_FAILED
+        assert manifest.get(a_path).upload_status == UPLOAD_DONE
+        # 다른 Store로 바뀌면 전부 재업로드 대상
+        assert len(manifest.pending_uploads("stores/s2")) == 2
+
+    def test_reconversion_keeps_previous_document(self, manifest, tmp_path):
+        """재변환 시 이전 문서 이름을 유지하여 교체 삭제가 가능"""
+        a = tmp_path / "a.msg"
+        a.write_bytes(b"v1")
+        _record_all(manifest, manifest.plan([a]))
+        a_path = str(a.resolve())
+        manifest.mark_uploaded(a_path, "stores/s1", "stores/s1/documents/a")
+
+        a.write_bytes(b"version 2")
+        _record_all(manifest, manifest.plan([a]))
+
+        entry = manifest.get(a_path)
+        assert entry.upload_status == "pending"
+        assert entry.document_name == "stores/s1/documents/a"
+
+    def test_duplicates_skipped_and_released(self, manifest, tmp_path):
+        """중복 표시된 항목은 업로드 대상이 아니고, 대표가 사라지면 다시 업로드 대상"""
+        a, b, c = (tmp_path / f"{n}.msg" for n in "abc")
+        for path in (a, b, c):
+            path.write_bytes(path.name.encode())
+        _record_all(manifest, manifest.plan([a, b, c]))
+        a_path, b_path, c_path = (str(p.resolve()) for p in (a, b, c))
+        for path in (a_path, b_path, c_path):
+            manifest.save_signature(path, b"sig", 10)
+        manifest.mark_uploaded(a_path, "stores/s1", "stores/s1/documents/a")
+        manifest.mark_duplicate(b_path, a_path)
+        # 대표가 a에서 c로 바뀌면 b도 c를 가리킴
+        manifest.mark_duplicate(a_path, c_path)
+
+        assert manifest.get(b_path).upload_status == UPLOAD_DUPLICATE
+        assert manifest.duplicate_of(b_path) == c_path
+        assert [e.source_path for e in manifest.pending_uploads("stores/s1")] == [c_path]
+
+        manifest.remove(c_path)
+
+        assert {e.source_path for e in manifest.pending_uploads("stores/s1")} == {a_path, b_path}
+        assert manifest.duplicate_of(b_path) is None
+        assert c_path not in manifest.signatures()
+
+    def test_bundle_tracks_members(self, manifest, tmp_path):
+        """묶음 업로드가 구성 메일에 반영되고, 해제하면 구성 메일이 다시 업로드 대상"""
+        a, b, c = (tmp_path / f"{n}.msg" for n in "abc")
+        for path in (a, b, c):
+            path.write_bytes(path.name.encode())
+        _record_all(manifest, manifest.plan([a, b, c]))
+        a_path, b_path, c_path = (str(p.resolve()) for p in (a, b, c))
+        manifest.mark_duplicate(c_path, a_path)
+
+        manifest.record_bundle("bundle-x", "/tmp/bundle-x.md", [a_path, b_path, c_path])
+        manifest.mark_bundle_uploaded(
+            "bundle-x", "stores/s1", "stores/s1/documents/x", _metadata("bundle-x.md")
+        )
+
+        assert manifest.pending_uploads("stores/s1") == []
+        assert manifest.get(a_path).document_name is None
+        assert manifest.get(c_path).upload_status == UPLOAD_DUPLICATE
+        bundle = manifest.bundle_of(b_path)
+        assert bundle.document_name == "stores/s1/documents/x"
+        assert bundle.members == sorted([a_path, b_path, c_path])
+
+        manifest.remove(c_path)
+        manifest.release_bundle("bundle-x")
+
+        assert manifest.bundles() == []
+        assert manifest.bundle_of(a_path) is None
+        assert {e.source_path for e in manifest.pending_uploads("stores/s1")} == {a_path, b_path}
+
+    def test_uploaded_documents_counts_bundle_once(self, manifest, tmp_path):
+        """필터 대상 문서: 개별 업로드 메일 + 묶음 문서 1건 (업로드 전/다른 Store 제외)"""
+        paths = [tmp_path / f"{n}.msg" for n in "abcde"]
+        for path in paths:
+            path.write_bytes(path.name.encode())
+        _record_all(manifest, manifest.plan(paths))
+        a_path, b_path, c_path, d_path, _ = (str(p.resolve()) for p in paths)
+        manifest.mark_uploaded(a_path, "stores/s1", "stores/s1/documents/a")
+        manifest.mark_uploaded(d_path, "stores/s2", "stores/s2/documents/d")
+        manifest.record_bundle("bundle-x", "/tmp/bundle-x.md", [b_path, c_path])
+        manifest.mark_bundle_uploaded(
+            "bundle-x", "stores/s1", "stores/s1/documents/x", _metadata("bundle-x.md")
+        )
+
+        documents = manifest.uploaded_documents("stores/s1")
+
+        assert sorted(m.file_name for m in documents) == ["a.msg", "bundle-x.md"]
+
+    def test_legacy_uploads_excluded_from_filter_catalog(self, tmp_path):
+        """업로드 메타데이터 열이 없던 매니페스트의 업로드 문서는 필터 대상에서 제외"""
+        db_path = tmp_path / "manifest.sqlite3"
+        a = tmp_path / "a.msg"
+        a.write_bytes(b"a")
+        with ConversionManifest(db_path) as manifest:
+            _record_all(manifest, manifest.plan([a]))
+            manifest.mark_uploaded(str(a.resolve()), "stores/s1", "stores/s1/documents/a")
+            # 이전 버전 스키마로 되돌림
+            manifest.conn.execute("ALTER TABLE files DROP COLUMN upload_metadata_json")
+            manifest.conn.execute("ALTER TABLE bundles DROP COLUMN upload_metadata_json")
+            manifest.conn.commit()
+
+        with ConversionManifest(db_path) as manifest:
+            assert manifest.get(str(a.resolve())).upload_status == UPLOAD_DONE
+            assert manifest.uploaded_documents("stores/s1") == []
+
+            manifest.mark_uploaded(str(a.resolve()), "stores/s1", "stores/s1/documents/a2")
+            assert [m.file_name for m in manifest.uploaded_documents("stores/s1")] == ["a.msg"]
+
+    def test_persists_across_reopen(self, tmp_path):
+        """매니페스트가 디스크에 저장되어 재실행 간 유지됨"""
+        a = tmp_path / "a.msg"
+        a.write_bytes(b"a")
+        db_path = tmp_path / "manifest.sqlite3"
+
+        with ConversionManifest(db_path) as manifest:
+            _record_all(manifest, manifest.plan([a]))
+            manifest.set_store_name("stores/s1")
+
+        with ConversionManifest(db_path) as manifest:
+            assert manifest.plan([a]).unchanged == [str(a.resolve())]
+            assert manifest.get_store_name() == "stores/s1"
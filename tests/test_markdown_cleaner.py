@@ -0,0 +1,124 @@
+import pytest
+
+from email_writer.converter.markdown_cleaner import clean_markdown, split_authored
+
+_SIGNATURE = """김철수 과장
+영업팀 | ABC주식회사
+Tel: 02-123-4567 | Mobile: 010-1234-5678
+kim@abc.com"""
+
+_QUOTED = """-----Original Message-----
+From: 이영희 <lee@example.com>
+Sent: Monday, January 13, 2025 10:00 AM
+To: 김철수
+Subject: 견적 요청
+
+견적 부탁드립니다."""
+
+_DISCLAIMER = (
+    "본 메일은 지정된 수신자만을 위한 것으로 기밀 정보를 포함하고 있습니다.\n"
+    "수신자가 아닌 경우 즉시 삭제해 주시기 바랍니다."
+)
+
+
+class TestSplitAuthored:
+    """작성 본문과 인용/서명/면책 문구 분리 테스트"""
+
+    def test_strips_quoted_history_and_contact_signature(self):
+        body = f"견적 검토 결과 공유드립니다.\n\n감사합니다.\n\n{_SIGNATURE}\n\n{_QUOTED}"
+
+        kept, stripped = split_authored(body)
+
+        assert kept == "견적 검토 결과 공유드립니다.\n\n감사합니다."
+        assert stripped.startswith("김철수 과장")
+        assert "견적 부탁드립니다." in stripped
+
+    def test_strips_wrote_line_quote(self):
+        body = "Thanks, will do.\n\nBest,\nPark\n\nOn Mon, Jan 13, 2025 Kim <k@x.com> wrote:\n> hi"
+
+        kept, stripped = split_authored(body)
+
+        assert kept == "Thanks, will do.\n\nBest,\nPark"
+        assert stripped.endswith("> hi")
+
+    def test_strips_disclaimer_keeps_closing(self):
+        kept, stripped = split_authored(
+            f"회의록 첨부합니다.\n\n감사합니다.\n김철수 드림\n\n{_DISCLAIMER}"
+        )
+
+        assert kept == "회의록 첨부합니다.\n\n감사합니다.\n김철수 드림"
+        assert stripped == _DISCLAIMER
+
+    def test_strips_signature_delimiter(self):
+        kept, stripped = split_authored("See below.\n\n--\nPark Jisoo\nProduct Manager")
+
+        assert kept == "See below."
+        assert stripped == "--\nPark Jisoo\nProduct Manager"
+
+    def test_strips_signature_disclaimer_and_separator(self):
+        body = (
+            f"Thanks, will do.\n\nBest regards,\n\n{_SIGNATURE}\n\n"
+            "________________________________\n"
+            "THIS MESSAGE IS CONFIDENTIAL. IF IT WAS SENT TO YOU IN ERROR, DELETE IT."
+        )
+
+        kept, stripped = split_authored(body)
+
+        assert kept == "Thanks, will do.\n\nBest regards,"
+        assert stripped.startswith("김철수 과장")
+        assert stripped.endswith("DELETE IT.")
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            "내일 뵙겠습니다.\n\n감사합니다.\n김철수 드림",
+            "본 메일은 지난 회의 결과를 정리한 것입니다.\n\n감사합니다.",
+            "안녕하세요.\n\n기밀 자료 첨부합니다.\n\n감사합니다.",
+            "Tel: 02-123-4567",
+        ],
+    )
+    def test_authored_only_body_unchanged(self, body):
+        assert split_authored(body) == (body, "")
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            # 본문 문장에 면책 표현이 한 번 나옴
+            "Hi Minsu,\n\nPlease keep the attached pricing sheet confidential until the launch "
+            "next Tuesday.\n\nThanks,\nJisoo",
+            "Hi Minsu,\n\nPlease keep the attached pricing sheet confidential until the launch "
+            "next Tuesday.",
+            "안녕하세요.\n\n첨부한 단가표는 기밀 유지 부탁드리며, 출시 전까지 외부에 공유하지 "
+            "말아 주세요.\n\n감사합니다.\n홍길동 드림",
+            # 본문의 연락처 줄
+            "내일 오전 10시에 방문 예정입니다.\n담당자 전화: 010-1234-5678",
+            "방문 일정 공유드립니다.\n\n감사합니다.\n\n담당자 전화: 010-1234-5678",
+            # 본문 중간의 "--"
+            "회의 안건 공유드립니다.\n--\n1. 예산\n2. 채용\n3. 기타\n\n감사합니다.",
+            "Agenda for tomorrow:\n--\nBudget review\nHiring plan\n\nThanks,\nPark",
+        ],
+    )
+    def test_sender_text_not_stripped(self, body):
+        """본문 문장/맺음말/연락처 안내는 서명이나 면책 문구로 보지 않음"""
+        assert split_authored(body) == (body, "")
+
+
+class TestCleanMarkdown:
+    def test_keeps_header(self):
+        markdown = (
+            "# Email Message\n\n**From:** kim@abc.com\n**Subject:** RE: 견적\n\n"
+            f"## Content\n\n확인했습니다.\n\n{_QUOTED}"
+        )
+
+        cleaned, stripped = clean_markdown(markdown)
+
+        assert cleaned == (
+            "# Email Message\n\n**From:** kim@abc.com\n**Subject:** RE: 견적\n\n"
+            "## Content\n\n확인했습니다."
+        )
+        assert stripped == _QUOTED
+
+    def test_empty_body(self):
+        markdown = "# Email Message\n\n**Subject:** 빈 본문\n\n## Content"
+
+        assert clean_markdown(markdown) == (markdown, "")
@@ -0,0 +1,254 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from email_writer.converter.bundle import bundle_metadata
+from email_writer.converter.manifest import ConversionManifest
+from email_writer.core.generator import EmailGenerator
+from email_writer.core.metadata_filter import MetadataFilterBuilder, recipient_domain
+from email_writer.gemini.client import GeminiClient
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.request import GenerateEmailRequest
+from tests.fake_genai import FakeCachingGenaiClient, FakeClock
+
+_NOW = datetime(2026, 10, 18)
+
+
+def _catalog(domain: str, count: int, is_reply: bool, year: int) -> list[EmailMetadata]:
+    return [
+        EmailMetadata(
+            file_name=f"{domain}_{is_reply}_{year}_{i}.msg",
+            subject="제목",
+            sender="me@example.com",
+            recipients=f"담당자 <user{i}@{domain}>",
+            date=datetime(year, 5, 1),
+            is_reply=is_reply,
+            markdown_path=f"/tmp/{domain}_{i}.md",
+        )
+        for i in range(count)
+    ]
+
+
+def _request(to: str = "kim@acme.co.kr", is_reply: bool = True) -> GenerateEmailRequest:
+    return GenerateEmailRequest(
+        full_body="<p>원본</p>", selected_text="확인", to_recipients=to, is_reply=is_reply
+    )
+
+
+@pytest.fixture
+def filter_settings(settings):
+    return settings.model_copy(
+        update={"metadata_filter_enabled": True, "metadata_filter_min_documents": 5}
+    )
+
+
+class TestRecipientDomain:
+    @pytest.mark.parametrize(
+        "recipients, expected",
+        [
+            ("kim@Acme.co.kr", "acme.co.kr"),
+            ("김철수 <kim@acme.co.kr>; lee@other.com", "acme.co.kr"),
+            ("김철수", ""),
+            ("", ""),
+        ],
+    )
+    def test_first_address_domain(self, recipients, expected):
+        assert recipient_domain(recipients) == expected
+
+
+class TestMetadataFilterBuilder:
+    """요청별 File Search 메타데이터 필터 구성 테스트"""
+
+    def test_all_conditions_when_enough_documents(self, filter_settings):
+        builder = MetadataFilterBuilder(filter_settings, _catalog("acme.co.kr", 5, True, 2025))
+
+        assert builder.build(_request(), now=_NOW) == (
+            'recipient_domain = "acme.co.kr" AND is_reply = "True" AND date_ymd >= 20231018'
+        )
+
+    def test_relaxes_recency_first(self, filter_settings):
+        builder = MetadataFilterBuilder(filter_settings, _catalog("acme.co.kr", 5, True, 2019))
+
+        assert builder.build(_request(), now=_NOW) == (
+            'recipient_domain = "acme.co.kr" AND is_reply = "True"'
+        )
+
+    def test_relaxes_reply_condition(self, filter_settings):
+        catalog = _catalog("acme.co.kr", 3, True, 2025) + _catalog("acme.co.kr", 3, False, 2025)
+        builder = MetadataFilterBuilder(filter_settings, catalog)
+
+        assert builder.build(_request(), now=_NOW) == 'recipient_domain = "acme.co.kr"'
+
+    def test_falls_back_to_unfiltered(self, filter_settings):
+        builder = MetadataFilterBuilder(filter_settings, _catalog("other.com", 100, True, 2025))
+
+        assert builder.build(_request(), now=_NOW) is None
+
+    def test_no_address_skips_domain(self, filter_settings):
+        builder = MetadataFilterBuilder(filter_settings, _catalog("other.com", 5, False, 2025))
+
+        assert builder.build(_request(to="김철수", is_reply=False), now=_NOW) == (
+            'is_reply = "False" AND date_ymd >= 20231018'
+        )
+
+    def test_leap_day(self, filter_settings):
+        builder = MetadataFilterBuilder(filter_settings, _catalog("acme.co.kr", 5, True, 2025))
+
+        assert "date_ymd >= 20210228" in builder.build(_request(), now=datetime(2024, 2, 29))
+
+
+class _FilterRecordingClient:
+    def __init__(self):
+        self.filters = []
+        self.forgotten = 0
+
+    def forget_ungrounded_filters(self) -> None:
+        self.forgotten += 1
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        self.filters.append(metadata_filter)
+        return "생성된 본문"
+
+
+class TestGeneratorMetadataFilter:
+    def _generator(self, settings, tmp_path, catalog):
+        manifest_path = tmp_path / "manifest.sqlite3"
+        with ConversionManifest(manifest_path) as manifest:
+            for i, metadata in enumerate(catalog):
+                source = str(tmp_path / f"{i}.msg")
+                (tmp_path / f"{i}.msg").write_bytes(b"msg")
+                manifest.record_conversion(source, f"hash{i}", metadata)
+                manifest.mark_uploaded(source, settings.file_search_store_name, f"doc{i}")
+        generator = EmailGenerator(
+            settings.model_copy(update={"manifest_path": str(manifest_path)})
+        )
+        generator.gemini_client = _FilterRecordingClient()
+        return generator
+
+    def test_filter_passed_to_client(self, filter_settings, tmp_path):
+        generator = self._generator(
+            filter_settings, tmp_path, _catalog("acme.co.kr", 5, True, datetime.now().year)
+        )
+
+        asyncio.run(generator.generate_async(_request()))
+
+        assert generator.gemini_client.filters[0].startswith('recipient_domain = "acme.co.kr"')
+
+    def test_catalog_reloaded_when_manifest_changes(self, filter_settings, tmp_path):
+        """서버 실행 중 새로 업로드된 메일도 재시작 없이 필터 대상이 됨"""
+        year = datetime.now().year
+        generator = self._generator(filter_settings, tmp_path, _catalog("other.com", 5, True, year))
+        asyncio.run(generator.generate_async(_request()))
+
+        with ConversionManifest(tmp_path / "manifest.sqlite3") as manifest:
+            for i, metadata in enumerate(_catalog("acme.co.kr", 5, True, year)):
+                source = tmp_path / f"new{i}.msg"
+                source.write_bytes(b"msg")
+                manifest.record_conversion(str(source), f"new{i}", metadata)
+                manifest.mark_uploaded(str(source), filter_settings.file_search_store_name, "d")
+        asyncio.run(generator.generate_async(_request()))
+
+        first, second = generator.gemini_client.filters
+        assert first is None
+        assert second.startswith('recipient_domain = "acme.co.kr" AND is_reply = "True"')
+
+    def test_bundle_counted_as_one_document(self, filter_settings, tmp_path):
+        """묶음 구성 메일은 따로 세지 않고 업로드된 묶음 문서 1건으로 셈"""
+        members = _catalog("acme.co.kr", 5, True, datetime.now().year)
+        generator = self._generator(filter_settings, tmp_path, [])
+        with ConversionManifest(tmp_path / "manifest.sqlite3") as manifest:
+            sources = []
+            for i, metadata in enumerate(members):
+                source = tmp_path / f"member{i}.msg"
+                source.write_bytes(b"msg")
+                manifest.record_conversion(str(source), f"member{i}", metadata)
+                sources.append(str(source))
+            manifest.record_bundle("bundle-a", "/tmp/bundle-a.md", sources)
+            manifest.mark_bundle_uploaded(
+                "bundle-a",
+                filter_settings.file_search_store_name,
+                "d",
+                bundle_metadata("acme.co.kr-reply", members, "/tmp/bundle-a.md"),
+            )
+
+        asyncio.run(generator.generate_async(_request()))
+
+        assert generator.gemini_client.filters == [None]
+
+    def test_legacy_uploads_not_counted(self, filter_settings, tmp_path):
+        """필터 키 없이 올라간 이전 문서는 조건에 맞아도 세지 않음"""
+        generator = self._generator(
+            filter_settings, tmp_path, _catalog("acme.co.kr", 5, True, datetime.now().year)
+        )
+        with ConversionManifest(tmp_path / "manifest.sqlite3") as manifest:
+            manifest.conn.execute("UPDATE files SET upload_metadata_json = NULL")
+            manifest.conn.commit()
+
+        asyncio.run(generator.generate_async(_request()))
+
+        assert generator.gemini_client.filters == [None]
+
+    def test_disabled_by_default(self, settings, tmp_path):
+        generator = self._generator(settings, tmp_path, _catalog("acme.co.kr", 100, True, 2025))
+
+        asyncio.run(generator.generate_async(_request()))
+
+        assert generator.gemini_client.filters == [None]
+
+    def test_filter_in_file_search_tool(self, settings):
+        config = GeminiClient(settings)._build_config('is_reply = "True"')
+
+        assert config.tools[0].file_search.metadata_filter == 'is_reply = "True"'
+
+
+class TestUngroundedFilterFallback:
+    """필터에 걸리는 Store 문서가 없을 때 필터 없이 검색하는지"""
+
+    _FILTER = 'recipient_domain = "acme.co.kr"'
+
+    def _client(self, settings) -> GeminiClient:
+        gemini = GeminiClient(settings)
+        gemini.client = FakeCachingGenaiClient(FakeClock())
+        gemini.client.models.filter_matches = False
+        return gemini
+
+    @staticmethod
+    def _filters(gemini) -> list[str | None]:
+        configs = gemini.client.models.configs
+        return [config.tools[0].file_search.metadata_filter for config in configs]
+
+    def test_retries_without_filter(self, settings):
+        gemini = self._client(settings)
+
+        assert gemini.generate_with_file_search("프롬프트", self._FILTER) == "생성된 본문"
+        assert asyncio.run(gemini.generate_with_file_search_async("프롬프트", self._FILTER))
+
+        # 두 번째 요청부터는 필터 없이 바로 검색
+        assert self._filters(gemini) == [self._FILTER, None, None]
+
+    def test_grounded_filter_kept(self, settings):
+        gemini = self._client(settings)
+        gemini.client.models.filter_matches = True
+
+        asyncio.run(gemini.generate_with_file_search_async("프롬프트", self._FILTER))
+        asyncio.run(gemini.generate_with_file_search_async("프롬프트", self._FILTER))
+
+        assert self._filters(gemini) == [self._FILTER, self._FILTER]
+
+    def test_stream_skips_filter_next_time(self, settings):
+        gemini = self._client(settings)
+
+        async def collect():
+            stream = gemini.stream_with_file_search_async("프롬프트", self._FILTER)
+            return [chunk async for chunk in stream]
+
+        assert asyncio.run(collect()) == ["생성된 ", "본문"]
+        asyncio.run(collect())
+        assert self._filters(gemini) == [self._FILTER, None]
+
+        gemini.forget_ungrounded_filters()
+        asyncio.run(collect())
+        assert self._filters(gemini)[-1] == self._FILTER
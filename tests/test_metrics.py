@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from email_writer.core.generator import EmailGenerator
+from email_writer.core.metrics import (
+    Counter,
+    GenerationMetrics,
+    Histogram,
+    collect_timings,
+    format_server_timing,
+)
+from email_writer.models.request import GenerateEmailRequest
+
+
+class TestPrometheusFormat:
+    def test_counter_labels_escaped(self):
+        counter = Counter("errors_total", "오류 수", ("type",))
+        counter.inc(type='Bad"Error')
+        counter.inc(2, type='Bad"Error')
+
+        assert counter.render() == [
+            "# HELP errors_total 오류 수",
+            "# TYPE errors_total counter",
+            'errors_total{type="Bad\\"Error"} 3',
+        ]
+
+    def test_histogram_cumulative_buckets(self):
+        histogram = Histogram("latency_seconds", "지연", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 2.0):
+            histogram.observe(value)
+
+        lines = histogram.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{le="1"} 2' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+        assert "latency_seconds_sum 2.55" in lines
+        assert "latency_seconds_count 3" in lines
+
+
+class TestGenerationMetrics:
+    def test_request_records_error_type(self):
+        metrics = GenerationMetrics()
+
+        with pytest.raises(ValueError), metrics.request("async"):
+            raise ValueError("실패")
+
+        assert metrics.errors.value(mode="async", type="ValueError") == 1
+        assert metrics.requests_in_flight.value(mode="async") == 0
+        assert metrics.request_seconds.count(mode="async") == 1
+
+    def test_record_usage(self):
+        metrics = GenerationMetrics()
+        metrics.record_usage(
+            SimpleNamespace(
+                prompt_token_count=120, candidates_token_count=40, thoughts_token_count=None
+            )
+        )
+        metrics.record_usage(None)
+
+        assert metrics.tokens.value(kind="prompt") == 120
+        assert metrics.tokens.value(kind="candidates") == 40
+        assert metrics.tokens.value(kind="thoughts") == 0
+
+    def test_collect_timings_only_inside_block(self):
+        metrics = GenerationMetrics()
+        with collect_timings() as timings:
+            metrics.observe_stage("model", 0.25)
+        metrics.observe_stage("model", 1.0)
+
+        assert timings == {"model": 0.25}
+        assert format_server_timing(timings) == "model;dur=250.0"
+
+
+class _StubGeminiClient:
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        return "생성된 본문"
+
+
+def test_generator_records_stage_timings(settings):
+    """생성 흐름의 HTML 변환, 검색, 프롬프트 구성, 모델 호출 단계를 모두 기록"""
+    generator = EmailGenerator(settings)
+    generator.gemini_client = _StubGeminiClient()
+    request = GenerateEmailRequest(full_body="<p>원본</p>", selected_text="확인")
+
+    async def run():
+        with collect_timings() as timings:
+            await generator.generate_async(request)
+        return timings
+
+    timings = asyncio.run(run())
+
+    assert set(timings) == {"html_to_text", "retrieval", "prompt_build", "model"}
+    assert generator.metrics.request_seconds.count(mode="async") == 1
+    assert 'email_writer_stage_seconds_count{stage="model"} 1' in generator.metrics.render()
@@ -48,6 +48,7 @@ class TestGenerateEmailRequest:
         assert request.subject == ""
         assert request.is_reply is False
         assert request.additional_prompt == ""
+        assert request.regenerate is False
 
 
 class TestGenerateEmailResponse:
@@ -0,0 +1,304 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from email_writer.converter.manifest import UPLOAD_DONE, UPLOAD_DUPLICATE, ConversionManifest
+from email_writer.converter.msg_to_markdown import MsgToMarkdownConverter
+from email_writer.converter.pipeline import IngestPipeline
+from email_writer.gemini.file_search import FileSearchManager
+from email_writer.models.conversion import ConversionResult
+from email_writer.models.email_metadata import EmailMetadata
+from tests.fake_genai import FakeGenaiClient
+from tests.msg_factory import write_msg
+
+
+class _RecordingConverter:
+    """변환 결과를 내보낼 때마다 그때까지 시작된 업로드 수를 기록하는 가짜 변환기"""
+
+    def __init__(self, settings, client: FakeGenaiClient, delay: float = 0.0):
+        self.settings = settings
+        self.client = client
+        self.delay = delay
+        self.uploads_at_yield: list[int] = []
+
+    def iter_convert_parallel(self, msg_paths, output_dir, workers=None):
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        for path in msg_paths:
+            time.sleep(self.delay)
+            md_path = Path(output_dir) / (Path(path).stem + ".md")
+            md_path.write_text("본문", encoding="utf-8")
+            self.uploads_at_yield.append(len(self.client.uploads))
+            yield ConversionResult(
+                source_path=path,
+                success=True,
+                metadata=EmailMetadata(
+                    file_name=Path(path).name,
+                    subject="제목",
+                    sender="me@example.com",
+                    recipients="you@example.com",
+                    markdown_path=str(md_path),
+                ),
+            )
+
+
+@pytest.fixture
+def fast_settings(settings):
+    return settings.model_copy(update={"upload_poll_initial": 0.01, "upload_poll_jitter": 0.0})
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    with ConversionManifest(tmp_path / "manifest.sqlite3") as m:
+        yield m
+
+
+def _msg_files(tmp_path, count: int) -> list[Path]:
+    msg_dir = tmp_path / "msg"
+    msg_dir.mkdir(exist_ok=True)
+    return [write_msg(msg_dir / f"email_{i}.msg", subject=f"제목 {i}") for i in range(count)]
+
+
+def _pipeline(settings, manifest, converter=None, latency: float = 0.02, **kwargs):
+    # 실제 시간 기준으로 동작하는 가짜 클라이언트 (변환 스레드와 함께 돌아가야 하므로)
+    client = FakeGenaiClient(time, latency=latency)
+    fs_manager = FileSearchManager(settings)
+    fs_manager.client = client
+    converter = converter or MsgToMarkdownConverter(settings)
+    return IngestPipeline(converter, fs_manager, manifest, "stores/s", **kwargs), client
+
+
+class TestIngestPipeline:
+    """변환→업로드 스트리밍 파이프라인 테스트"""
+
+    def test_converts_and_uploads_all(self, fast_settings, manifest, tmp_path):
+        paths = _msg_files(tmp_path, 4)
+        (tmp_path / "msg" / "broken.msg").write_bytes(b"not an ole file")
+        plan = manifest.plan(sorted((tmp_path / "msg").glob("*.msg")))
+        messages = []
+        pipeline, client = _pipeline(fast_settings, manifest, report=messages.append)
+
+        summary = pipeline.run(plan, str(tmp_path / "out"), workers=1)
+
+        assert (summary.converted, summary.convert_failed) == (4, 1)
+        assert (summary.uploaded, summary.upload_failed) == (4, 0)
+        assert len(client.uploads) == 4
+        entries = manifest.entries()
+        assert len(entries) == 4
+        assert all(entry.upload_status == UPLOAD_DONE for entry in entries)
+        assert {Path(e.source_path).name for e in entries} == {p.name for p in paths}
+        assert messages[-1].startswith("[변환 5/5, 업로드 4/4]")
+
+    def test_uploads_start_before_conversion_finishes(self, fast_settings, manifest, tmp_path):
+        _msg_files(tmp_path, 5)
+        plan = manifest.plan(sorted((tmp_path / "msg").glob("*.msg")))
+        pipeline, client = _pipeline(fast_settings, manifest)
+        pipeline.converter = _RecordingConverter(fast_settings, client, delay=0.05)
+
+        pipeline.run(plan, str(tmp_path / "out"))
+
+        # 마지막 파일이 변환되기 전에 이미 앞선 파일들이 업로드되고 있음
+        assert pipeline.converter.uploads_at_yield[-1] >= 3
+
+    def test_backpressure_limits_queued_files(self, fast_settings, manifest, tmp_path):
+        _msg_files(tmp_path, 8)
+        plan = manifest.plan(sorted((tmp_path / "msg").glob("*.msg")))
+        pipeline, client = _pipeline(fast_settings, manifest, latency=0.05, queue_size=2)
+        pipeline.converter = _RecordingConverter(fast_settings, client)
+
+        pipeline.run(plan, str(tmp_path / "out"), upload_concurrency=1)
+
+        # 업로드가 느리면 변환이 큐 크기
+        # (+ 큐에서 꺼내 업로드를 시작하는 중인 1건) 이상 앞서가지 않음
+        for index, started in enumerate(pipeline.converter.uploads_at_yield):
+            assert index - started <= 2 + 1
+        assert len(client.uploads) == 8
+
+    def test_resumes_pending_and_replaces_documents(self, fast_settings, manifest, tmp_path):
+        paths = _msg_files(tmp_path, 3)
+        plan = manifest.plan(paths)
+        pipeline, client = _pipeline(fast_settings, manifest)
+        converter = pipeline.converter
+        out_dir = str(tmp_path / "out")
+        Path(out_dir).mkdir()
+        # 이전 실행: 0번은 업로드 완료, 1번은 변환만 되고 중단, 2번은 아직 변환 전
+        for path in plan.to_convert[:2]:
+            result = converter.convert_safe(path, out_dir)
+            manifest.record_conversion(path, plan.hashes[path], result.metadata)
+        manifest.mark_uploaded(plan.to_convert[0], "stores/s", "stores/s/documents/old-0")
+        # 0번 원본 변경
+        write_msg(paths[0], subject="수정된 제목")
+
+        summary = pipeline.run(manifest.plan(paths), out_dir, workers=1)
+
+        assert summary.converted == 2
+        assert summary.uploaded == 3
+        assert client.deleted == ["stores/s/documents/old-0"]
+        assert all(entry.upload_status == UPLOAD_DONE for entry in manifest.entries())
+        assert manifest.get(plan.to_convert[0]).metadata.subject == "수정된 제목"
+
+    def test_upload_failure_recorded(self, fast_settings, manifest, tmp_path):
+        _msg_files(tmp_path, 2)
+        plan = manifest.plan(sorted((tmp_path / "msg").glob("*.msg")))
+        pipeline, client = _pipeline(fast_settings, manifest)
+        client.fail_files = {str(tmp_path / "out" / "email_1.md")}
+
+        summary = pipeline.run(plan, str(tmp_path / "out"), workers=1)
+
+        assert (summary.uploaded, summary.upload_failed) == (1, 1)
+        assert [e.source_path for e in manifest.pending_uploads("stores/s")] == [
+            plan.to_convert[1]
+        ]
+
+
+_THREAD_BODY = "\n".join(
+    f"{i}. {item} 항목은 {day}까지 {owner} 담당자가 검토 후 회신 예정입니다."
+    for i, (item, day, owner) in enumerate(
+        [
+            ("견적서 단가", "월요일", "구매팀"),
+            ("납품 일정", "화요일", "생산팀"),
+            ("계약 조건", "수요일", "법무팀"),
+            ("품질 기준", "목요일", "품질팀"),
+            ("결제 방식", "금요일", "재무팀"),
+            ("운송 방법", "다음 주 월요일", "물류팀"),
+            ("샘플 제작", "다음 주 화요일", "개발팀"),
+            ("사후 관리", "다음 주 수요일", "영업팀"),
+        ],
+        start=1,
+    )
+)
+
+
+class TestIngestPipelineDedup:
+    """업로드 전 유사 중복 제외 테스트"""
+
+    def _write_thread(self, tmp_path) -> dict[str, Path]:
+        msg_dir = tmp_path / "msg"
+        msg_dir.mkdir()
+        return {
+            "a": write_msg(msg_dir / "a_original.msg", body=_THREAD_BODY),
+            # 다른 폴더에 있던 같은 메일
+            "b": write_msg(msg_dir / "b_copy.msg", body=_THREAD_BODY),
+            # 원문을 인용한 짧은 회신 (원문보다 김)
+            "c": write_msg(msg_dir / "c_reply.msg", body="네, 확인했습니다.\n\n" + _THREAD_BODY),
+            "d": write_msg(msg_dir / "d_other.msg", body="다음 달 출장 일정 공유드립니다. " * 10),
+        }
+
+    def test_keeps_longest_per_cluster(self, fast_settings, manifest, tmp_path):
+        paths = self._write_thread(tmp_path)
+        plan = manifest.plan(sorted(paths.values()))
+        pipeline, client = _pipeline(fast_settings, manifest, dedup=True)
+
+        summary = pipeline.run(plan, str(tmp_path / "out"), workers=1)
+
+        status = {key: manifest.get(str(p.resolve())).upload_status for key, p in paths.items()}
+        assert status == {
+            "a": UPLOAD_DUPLICATE, "b": UPLOAD_DUPLICATE, "c": UPLOAD_DONE, "d": UPLOAD_DONE,
+        }
+        reply = str(paths["c"].resolve())
+        assert manifest.duplicate_of(str(paths["a"].resolve())) == reply
+        assert manifest.duplicate_of(str(paths["b"].resolve())) == reply
+        assert summary.duplicates == 2
+        # 먼저 올라간 원문은 회신이 대표가 되면서 Store에서 삭제됨
+        assert len(client.uploads) - len(client.deleted) == 2
+
+    def test_disabled_uploads_everything(self, fast_settings, manifest, tmp_path):
+        paths = self._write_thread(tmp_path)
+        plan = manifest.plan(sorted(paths.values()))
+        pipeline, _ = _pipeline(fast_settings, manifest)
+
+        summary = pipeline.run(plan, str(tmp_path / "out"), workers=1)
+
+        assert summary.uploaded == 4
+        assert summary.duplicates == 0
+
+    def test_new_file_checked_against_store(self, fast_settings, manifest, tmp_path):
+        paths = self._write_thread(tmp_path)
+        first = [paths["a"], paths["d"]]
+        pipeline, _ = _pipeline(fast_settings, manifest, dedup=True)
+        pipeline.run(manifest.plan(first), str(tmp_path / "out"), workers=1)
+
+        summary = pipeline.run(
+            manifest.plan(first + [paths["b"]]), str(tmp_path / "out"), workers=1
+        )
+
+        assert summary.duplicates == 1
+        assert summary.uploaded == 0
+        assert manifest.get(str(paths["b"].resolve())).upload_status == UPLOAD_DUPLICATE
+
+
+class TestIngestPipelineBundle:
+    """짧은 메일 묶음 업로드 테스트"""
+
+    @pytest.fixture
+    def bundle_settings(self, fast_settings, tmp_path):
+        return fast_settings.model_copy(
+            update={"bundle_dir": str(tmp_path / "bundles"), "bundle_max_chars": 1500}
+        )
+
+    def _write(self, tmp_path) -> list[Path]:
+        msg_dir = tmp_path / "msg"
+        msg_dir.mkdir()
+        paths = [
+            write_msg(msg_dir / f"a_{i}.msg", subject=f"A {i}", to_address=f"kim{i}@a.com")
+            for i in range(4)
+        ]
+        paths.append(write_msg(msg_dir / "b_0.msg", subject="B 0", to_address="lee@b.com"))
+        paths.append(write_msg(msg_dir / "b_1.msg", subject="B 1", to_address="lee@b.com"))
+        paths.append(write_msg(msg_dir / "long.msg", subject="긴 메일", body="긴 본문. " * 1000))
+        return paths
+
+    def test_small_emails_uploaded_as_bundles(self, bundle_settings, manifest, tmp_path):
+        paths = self._write(tmp_path)
+        pipeline, client = _pipeline(bundle_settings, manifest, bundle=True)
+
+        summary = pipeline.run(manifest.plan(paths), str(tmp_path / "out"), workers=1)
+
+        # a.com 4건과 b.com 2건이 각각 묶이고, 긴 메일은 따로 업로드
+        assert len(client.uploads) == summary.uploaded == 3
+        assert (summary.bundles, summary.bundled) == (2, 6)
+        assert all(entry.upload_status == UPLOAD_DONE for entry in manifest.entries())
+        bundles = manifest.bundles()
+        assert sorted(len(bundle.members) for bundle in bundles) == [2, 4]
+        assert all(Path(bundle.markdown_path).is_file() for bundle in bundles)
+        text = Path(manifest.bundle_of(str(paths[0].resolve())).markdown_path).read_text(
+            encoding="utf-8"
+        )
+        assert "A 0" in text and "A 3" in text and "B 0" not in text
+
+    def test_changed_member_rebuilds_only_its_bundle(self, bundle_settings, manifest, tmp_path):
+        paths = self._write(tmp_path)
+        pipeline, client = _pipeline(bundle_settings, manifest, bundle=True)
+        pipeline.run(manifest.plan(paths), str(tmp_path / "out"), workers=1)
+        b_bundle = manifest.bundle_of(str(paths[4].resolve()))
+        a_document = manifest.bundle_of(str(paths[0].resolve())).document_name
+
+        write_msg(paths[0], subject="A 0 수정", to_address="kim0@a.com")
+        summary = pipeline.run(manifest.plan(paths), str(tmp_path / "out"), workers=1)
+
+        assert summary.converted == 1
+        assert summary.uploaded == 1
+        assert client.deleted == [a_document]
+        assert manifest.bundle_of(str(paths[4].resolve())) == b_bundle
+        text = Path(manifest.bundle_of(str(paths[0].resolve())).markdown_path).read_text(
+            encoding="utf-8"
+        )
+        assert "A 0 수정" in text
+
+    def test_removed_member_releases_bundle(self, bundle_settings, manifest, tmp_path):
+        paths = self._write(tmp_path)
+        pipeline, client = _pipeline(bundle_settings, manifest, bundle=True)
+        pipeline.run(manifest.plan(paths), str(tmp_path / "out"), workers=1)
+        old = manifest.bundle_of(str(paths[4].resolve()))
+
+        paths[5].unlink()
+        plan = manifest.plan(paths[:5] + paths[6:])
+        pipeline.remove_sources(plan.removed)
+        summary = pipeline.run(plan, str(tmp_path / "out"), workers=1)
+
+        # 1건만 남은 b.com 메일은 묶지 않고 개별 업로드
+        assert client.deleted == [old.document_name]
+        assert not Path(old.markdown_path).exists()
+        assert (summary.uploaded, summary.bundles) == (1, 0)
+        assert manifest.bundle_of(str(paths[4].resolve())) is None
+        assert manifest.get(str(paths[4].resolve())).document_name is not None
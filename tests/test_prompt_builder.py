@@ -73,10 +73,103 @@ class TestPromptBuilder:
 
         # 프롬프트 내의 본문 섹션은 max_context_length로 잘려야 함
         assert long_body[:settings.max_context_length] in prompt
-        assert long_body in prompt  # 전체가 포함되면 안 됨
+        assert long_body not in prompt  # 전체가 포함되면 안 됨
         # 잘린 버전은 포함됨
         assert len([line for line in prompt.split("\n") if "A" * 100 in line]) > 0
 
+    def test_build_compacts_quoted_thread(self, settings):
+        """인용 스레드는 반복 서명을 빼고 최근 메일부터 채움"""
+        builder = PromptBuilder(settings.model_copy(update={"max_context_length": 200}))
+        newest = "최근 메일입니다.\n홍길동 드림"
+        quoted = "From: 김철수\nSent: 2025-01-13\nSubject: RE: 일정\n" + "오래된 내용 " * 100
+
+        prompt = builder.build(
+            context_body=f"{newest}\n{quoted}\n홍길동 드림",
+            selected_text="회신",
+            subject="",
+            to_recipients="",
+            is_reply=True,
+            additional_prompt="",
+        )
+
+        assert f"{newest}\nFrom: 김철수" in prompt
+        assert prompt.count("홍길동 드림") == 1
+
+    def test_build_without_compaction_slices(self, settings):
+        """context_compaction=False면 앞에서부터 자름"""
+        builder = PromptBuilder(settings.model_copy(update={"context_compaction": False}))
+        body = "서명\n" + "B" * settings.max_context_length
+
+        prompt = builder.build(
+            context_body=body,
+            selected_text="요약",
+            subject="",
+            to_recipients="",
+            is_reply=False,
+            additional_prompt="",
+        )
+
+        assert body[: settings.max_context_length] in prompt
+        assert body not in prompt
+
+    def test_build_prompt_reports_estimated_tokens(self, settings):
+        """build_prompt는 추정 토큰 수를 함께 반환"""
+        builder = PromptBuilder(settings)
+
+        built = builder.build_prompt(
+            context_body="회의 일정 확인 부탁드립니다.",
+            selected_text="회신",
+            subject="일정",
+            to_recipients="김철수",
+            is_reply=True,
+            additional_prompt="",
+        )
+
+        assert built.estimated_tokens == builder.estimator.estimate(built.text)
+        assert built.section_tokens["context_body"] > 0
+        assert built.trimmed_sections == []
+
+    def test_token_budget_limits_all_sections(self, settings):
+        """토큰 예산 모드에서는 모든 섹션을 합쳐 예산 이내"""
+        builder = PromptBuilder(
+            settings.model_copy(
+                update={"prompt_token_budget": 600, "selected_text_token_budget": 100}
+            )
+        )
+
+        built = builder.build_prompt(
+            context_body="인용된 본문 " * 2000,
+            selected_text="핵심 요지 " * 500,
+            subject="제목 " * 500,
+            to_recipients="수신자@example.com; " * 500,
+            is_reply=True,
+            additional_prompt="추가 지시 " * 500,
+        )
+
+        assert built.estimated_tokens <= 600
+        assert built.section_tokens["selected_text"] <= 100
+        assert set(built.trimmed_sections) == {
+            "selected_text", "additional_prompt", "subject", "to_recipients", "context_body",
+        }
+
+    def test_token_budget_trims_body_before_selected_text(self, settings):
+        """본문은 다른 섹션이 예산을 받은 뒤 남은 만큼만 사용"""
+        builder = PromptBuilder(settings.model_copy(update={"prompt_token_budget": 300}))
+        selected_text = "다음 주 화요일 미팅 가능 여부 회신"
+
+        built = builder.build_prompt(
+            context_body="오래된 인용 메일 " * 1000,
+            selected_text=selected_text,
+            subject="",
+            to_recipients="",
+            is_reply=True,
+            additional_prompt="",
+        )
+
+        assert f"--- 작성 요지/키워드 ---\n{selected_text}" in built.text
+        assert built.trimmed_sections == ["context_body"]
+        assert 250 < built.estimated_tokens <= 300
+
     def test_system_instruction_exists(self, settings):
         """SYSTEM_INSTRUCTION이 비어있지 않은지 확인"""
         builder = PromptBuilder(settings)
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+
+import pytest
+
+from email_writer.core import response_cache
+from email_writer.core.response_cache import ResponseCache, make_cache_key
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """time.time 대체용 가변 시각"""
+    current = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: current[0])
+    return current
+
+
+class TestMakeCacheKey:
+    """캐시 키 생성 테스트"""
+
+    def test_whitespace_normalized(self):
+        """공백/줄바꿈 차이는 같은 키"""
+        a = make_cache_key("안녕하세요\n\n회의  일정", "gemini-2.5-flash", 0.7, "stores/s")
+        b = make_cache_key("안녕하세요 회의 일정 ", "gemini-2.5-flash", 0.7, "stores/s")
+        assert a == b
+
+    def test_model_settings_change_key(self):
+        """모델/온도/Store가 다르면 다른 키"""
+        base = make_cache_key("프롬프트", "gemini-2.5-flash", 0.7, "stores/s")
+        assert base != make_cache_key("프롬프트", "gemini-2.5-pro", 0.7, "stores/s")
+        assert base != make_cache_key("프롬프트", "gemini-2.5-flash", 0.2, "stores/s")
+        assert base != make_cache_key("프롬프트", "gemini-2.5-flash", 0.7, "stores/t")
+
+
+class TestResponseCache:
+    """ResponseCache TTL/LRU 테스트"""
+
+    def test_hit_and_miss_counters(self, now):
+        cache = ResponseCache()
+
+        assert cache.get("k") is None
+        cache.set("k", "응답")
+        assert cache.get("k") == "응답"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_ttl_expiry(self, now):
+        cache = ResponseCache(ttl=10)
+        cache.set("k", "응답")
+
+        now[0] += 11
+
+        assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, now):
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # a를 최근 사용으로
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_disk_backend_survives_restart(self, now, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        cache = ResponseCache(path=path)
+        cache.set("k", "저장된 응답")
+        cache.close()
+
+        restarted = ResponseCache(path=path)
+        assert restarted.get("k") == "저장된 응답"
+
+    def test_disk_backend_respects_ttl_and_size(self, now, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        cache = ResponseCache(max_entries=2, ttl=10, path=path)
+        cache.set("a", "1")
+        now[0] += 1
+        cache.set("b", "2")
+        now[0] += 1
+        cache.set("c", "3")
+        cache.close()
+
+        restarted = ResponseCache(max_entries=2, ttl=10, path=path)
+        assert restarted.get("a") is None
+        assert restarted.get("c") == "3"
+        now[0] += 20
+        assert restarted.get("c") is None
+
+    def test_disk_hit_defers_last_used_write(self, now, tmp_path):
+        """히트 시 SQLite에 쓰지 않고, 다음 set()에서 마지막 사용 시각을 반영해 LRU 유지"""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = ResponseCache(max_entries=2, path=path)
+        cache.set("a", "1")
+        now[0] += 1
+        cache.set("b", "2")
+        now[0] += 1
+
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+        assert cache.get("a") == "1"
+        assert statements == []
+
+        now[0] += 1
+        cache.set("c", "3")
+        cache.close()
+
+        restarted = ResponseCache(max_entries=2, path=path)
+        assert restarted.get("b") is None
+        assert restarted.get("a") == "1"
+
+    def test_expired_entry_deleted_on_next_set(self, now, tmp_path):
+        """만료된 항목 조회는 SQLite에 쓰지 않고, 다음 set()에서 디스크에서도 지움"""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = ResponseCache(ttl=10, path=path)
+        cache.set("a", "1")
+        now[0] += 11
+
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+        assert cache.get("a") is None
+        assert statements == []
+
+        cache.set("b", "2")
+        assert cache._db.execute("SELECT key FROM responses").fetchall() == [("b",)]
+        cache.close()
+
+    def test_async_disk_access_runs_off_event_loop(self, now, tmp_path):
+        """get_async()/set_async()의 SQLite 입출력은 이벤트 루프 스레드 밖에서 수행"""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = ResponseCache(path=path)
+        cache.set("a", "1")
+        cache.close()
+        restarted = ResponseCache(path=path)
+        threads = []
+        restarted._db.set_trace_callback(lambda _: threads.append(threading.get_ident()))
+
+        async def scenario():
+            loaded = await restarted.get_async("a")  # 메모리에 없어 디스크 조회
+            await restarted.set_async("b", "2")
+            return loaded
+
+        assert asyncio.run(scenario()) == "1"
+        assert threads
+        assert threading.get_ident() not in threads
+
+        threads.clear()
+        assert asyncio.run(restarted.get_async("a")) == "1"  # 메모리 히트는 디스크 접근 없음
+        assert threads == []
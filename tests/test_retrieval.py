@@ -0,0 +1,219 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from email_writer.core.generator import EmailGenerator
+from email_writer.core.prompt_builder import PromptBuilder
+from email_writer.gemini.client import GeminiClient
+from email_writer.models.email_metadata import EmailMetadata
+from email_writer.models.request import GenerateEmailRequest
+from email_writer.retrieval.embedding import HashingEmbedder
+from email_writer.retrieval.index import RetrievalIndex
+from email_writer.retrieval.tokenizer import tokenize
+
+_EMAILS = {
+    "meeting": "다음주 회의 일정 조율 부탁드립니다. 화요일 오후 2시 가능하신가요?",
+    "invoice": "3월 청구서를 첨부합니다. 결제 기한은 4월 10일입니다. invoice 확인 부탁드립니다.",
+    "report": "주간 보고서 공유드립니다. 진행률은 80%이며 이슈는 없습니다.",
+}
+
+
+def _build(tmp_path, vectors: bool = True) -> RetrievalIndex:
+    items = []
+    for name, body in _EMAILS.items():
+        path = tmp_path / "md" / f"{name}.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"# {name}\n\n{body}", encoding="utf-8")
+        items.append(
+            EmailMetadata(
+                file_name=f"{name}.msg",
+                subject=name,
+                sender="me@example.com",
+                recipients="you@example.com",
+                markdown_path=str(path),
+            )
+        )
+    return RetrievalIndex.build(items, tmp_path / "index", vectors=vectors)
+
+
+class TestTokenizer:
+    def test_ascii_words_and_hangul_bigrams(self):
+        assert tokenize("Invoice 회의일정") == ["invoice", "회의", "의일", "일정"]
+
+    def test_single_syllable_kept(self):
+        assert tokenize("네 a 7") == ["네", "7"]
+
+
+class TestHashingEmbedder:
+    def test_normalised(self):
+        vector = HashingEmbedder(64).embed("회의 일정 조율")
+        assert vector.dtype == np.float32
+        assert np.linalg.norm(vector) == pytest.approx(1.0)
+
+    def test_empty_text_zero_vector(self):
+        assert not HashingEmbedder(64).embed("").any()
+
+
+class TestRetrievalIndex:
+    """로컬 검색 인덱스 생성/로드/검색 테스트"""
+
+    def test_build_and_load_memory_mapped(self, tmp_path):
+        _build(tmp_path)
+        index = RetrievalIndex.load(tmp_path / "index")
+
+        assert len(index) == 3
+        assert isinstance(index.postings_doc, np.memmap)
+        assert isinstance(index.vectors, np.memmap)
+
+    def test_search_ranks_relevant_email_first(self, tmp_path):
+        index = _build(tmp_path)
+
+        results = index.search("회의 일정", top_k=2)
+
+        assert results[0].metadata.file_name == "meeting.msg"
+        assert "화요일" in results[0].text
+        assert results[0].score >= results[-1].score
+
+    def test_bm25_only(self, tmp_path):
+        index = _build(tmp_path, vectors=False)
+
+        results = index.search("청구서 invoice", top_k=3)
+
+        assert index.vectors is None
+        assert [result.metadata.file_name for result in results] == ["invoice.msg"]
+
+    def test_unrelated_query_returns_nothing(self, tmp_path):
+        index = _build(tmp_path, vectors=False)
+
+        assert index.search("zzz", top_k=3) == []
+
+    def test_document_text_read_on_demand(self, tmp_path):
+        """메일 본문은 메모리에 올리지 않고 검색 결과로 뽑힌 문서만 읽음"""
+        index = _build(tmp_path)
+
+        assert not hasattr(index, "documents")
+        assert isinstance(index.doc_offsets, np.memmap)
+        assert index.document(1)["metadata"]["file_name"] == "invoice.msg"
+        assert "결제 기한" in index.document(1)["text"]
+
+    def test_loads_index_without_offsets(self, tmp_path):
+        """오프셋 파일이 없는 이전 버전 인덱스도 열림"""
+        _build(tmp_path)
+        (tmp_path / "index" / "doc_offsets.npy").unlink()
+
+        index = RetrievalIndex.load(tmp_path / "index")
+
+        assert index.search("청구서 invoice", top_k=1)[0].metadata.file_name == "invoice.msg"
+
+    def test_open_index_survives_rebuild(self, tmp_path):
+        """다시 만들어도 이미 연 인덱스는 이전 파일을 그대로 읽음"""
+        index = _build(tmp_path)
+        RetrievalIndex.build([], tmp_path / "index")
+
+        assert index.search("회의 일정", top_k=1)[0].metadata.file_name == "meeting.msg"
+        assert len(RetrievalIndex.load(tmp_path / "index")) == 0
+
+    def test_missing_index(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="검색 인덱스가 없습니다"):
+            RetrievalIndex.load(tmp_path / "missing")
+
+
+class _RecordingGeminiClient:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_with_file_search_async(
+        self, prompt: str, metadata_filter: str | None = None
+    ) -> str:
+        self.prompts.append(prompt)
+        return "생성된 본문"
+
+
+class TestLocalRetrievalMode:
+    """retrieval_mode=local: 검색된 참고 메일을 프롬프트에 넣고 File Search 도구는 생략"""
+
+    def test_prompt_includes_examples(self, settings):
+        builder = PromptBuilder(settings.model_copy(update={"retrieval_mode": "local"}))
+        prompt = builder.build(
+            context_body="",
+            selected_text="일정 확인",
+            subject="",
+            to_recipients="",
+            is_reply=False,
+            additional_prompt="",
+            examples=["예전 메일 1", "예전 메일 2"],
+        )
+
+        assert "--- 참고할 이전 메일 ---" in prompt
+        assert "예전 메일 1" in prompt and "예전 메일 2" in prompt
+        assert "검색하여" not in prompt
+
+    def test_examples_respect_token_budget(self, settings):
+        builder = PromptBuilder(
+            settings.model_copy(
+                update={"prompt_token_budget": 2000, "examples_token_budget": 50}
+            )
+        )
+        built = builder.build_prompt(
+            context_body="",
+            selected_text="일정 확인",
+            subject="",
+            to_recipients="",
+            is_reply=False,
+            additional_prompt="",
+            examples=["가" * 1000],
+        )
+
+        assert "examples" in built.trimmed_sections
+        assert built.section_tokens["examples"] <= 50
+
+    def test_local_mode_omits_file_search_tool(self, settings):
+        assert GeminiClient(settings)._build_config().tools
+        local = GeminiClient(settings.model_copy(update={"retrieval_mode": "local"}))
+        assert not local._build_config().tools
+
+    def test_generator_inlines_retrieved_emails(self, settings, tmp_path):
+        _build(tmp_path)
+        generator = EmailGenerator(
+            settings.model_copy(
+                update={
+                    "retrieval_mode": "local",
+                    "retrieval_index_dir": str(tmp_path / "index"),
+                    "retrieval_top_k": 1,
+                }
+            )
+        )
+        generator.gemini_client = _RecordingGeminiClient()
+        request = GenerateEmailRequest(
+            full_body="<p>안녕하세요</p>", selected_text="회의 일정 조율"
+        )
+
+        asyncio.run(generator.generate_async(request))
+
+        prompt = generator.gemini_client.prompts[0]
+        assert "화요일 오후 2시" in prompt
+        assert "청구서" not in prompt
+
+    def test_generator_reloads_rebuilt_index(self, settings, tmp_path):
+        """prepare_emails.py로 인덱스를 다시 만들면 서버 재시작 없이 반영"""
+        _build(tmp_path)
+        generator = EmailGenerator(
+            settings.model_copy(
+                update={"retrieval_mode": "local", "retrieval_index_dir": str(tmp_path / "index")}
+            )
+        )
+        first = generator.retriever
+        assert generator.retriever is first
+
+        RetrievalIndex.build([], tmp_path / "index")
+
+        assert generator.retriever is not first
+        assert len(generator.retriever) == 0
+
+    def test_file_search_mode_skips_index(self, settings, tmp_path):
+        generator = EmailGenerator(
+            settings.model_copy(update={"retrieval_index_dir": str(tmp_path / "missing")})
+        )
+
+        assert generator.retriever is None
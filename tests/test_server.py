@@ -1,28 +1,28 @@
-from unittest.mock import patch, MagicMock
+import json
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 
 @pytest.fixture
-def client():
+def client(monkeypatch, settings):
     """FastAPI TestClient with mocked Settings and EmailGenerator"""
-    with patch("email_writer.server.Settings") as MockSettings:
-        mock_settings = MockSettings.return_value
-        mock_settings.gemini_api_key = "test-key"
-        mock_settings.gemini_model = "gemini-2.5-flash"
-        mock_settings.file_search_store_name = "test-store"
-        mock_settings.server_host = "127.0.0.1"
-        mock_settings.server_port = 8599
-        mock_settings.max_context_length = 8000
-        mock_settings.default_language = "ko"
-
-        with patch("email_writer.server.EmailGenerator") as MockGenerator:
-            mock_gen = MockGenerator.return_value
-            mock_gen.generate = MagicMock(return_value="생성된 이메일 본문입니다.")
+    monkeypatch.setenv("EMAIL_WRITER_GEMINI_API_KEY", "test-key")
+    server_settings = settings.model_copy(
+        update={"warmup_on_startup": False, "keepalive_interval": 0}
+    )
+    mock_gen = MagicMock()
+    mock_gen.generate_async = AsyncMock(return_value="생성된 이메일 본문입니다.")
+    mock_gen.gemini_client.context_cache = None
 
-            from email_writer.server import app
-            yield TestClient(app), mock_gen
+    from email_writer.server import app
+    # 초기화가 끝난 상태로 간주되도록 설정과 generator를 mock으로 교체
+    with patch("email_writer.server.settings", server_settings), \
+            patch("email_writer.server.generator", mock_gen):
+        yield TestClient(app), mock_gen
 
 
 def test_health_check(client):
@@ -36,7 +36,7 @@ def test_health_check(client):
 def test_generate_email_success(client):
     """POST /api/generate-email 성공 케이스"""
     test_client, mock_gen = client
-    mock_gen.generate.return_value = "안녕하세요, 회의 일정 확인 부탁드립니다."
+    mock_gen.generate_async.return_value = "안녕하세요, 회의 일정 확인 부탁드립니다."
 
     response = test_client.post(
         "/api/generate-email",
@@ -58,7 +58,7 @@ def test_generate_email_success(client):
 def test_generate_email_error(client):
     """POST /api/generate-email 에러 케이스"""
     test_client, mock_gen = client
-    mock_gen.generate.side_effect = Exception("API 호출 실패")
+    mock_gen.generate_async.side_effect = Exception("API 호출 실패")
 
     response = test_client.post(
         "/api/generate-email",
@@ -89,7 +89,7 @@ def test_generate_email_validation_error(client):
 def test_generate_email_minimal_request(client):
     """POST /api/generate-email 최소 필드만 제공"""
     test_client, mock_gen = client
-    mock_gen.generate.return_value = "생성된 응답입니다."
+    mock_gen.generate_async.return_value = "생성된 응답입니다."
 
     response = test_client.post(
         "/api/generate-email",
@@ -103,3 +103,260 @@ def test_generate_email_minimal_request(client):
     data = response.json()
     assert data["success"] is True
     assert data["generated_text"] == "생성된 응답입니다."
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    """SSE 응답 본문을 (event, data) 목록으로 변환"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event = "message"
+        data = {}
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+def test_generate_email_stream(client):
+    """POST /api/generate-email/stream 텍스트 조각을 SSE로 전송"""
+    test_client, mock_gen = client
+
+    async def fake_stream(request):
+        for chunk in ["안녕하세요, ", "회의 일정 ", "확인 부탁드립니다."]:
+            yield chunk
+
+    mock_gen.generate_stream = fake_stream
+
+    response = test_client.post(
+        "/api/generate-email/stream",
+        json={"full_body": "<p>본문</p>", "selected_text": "회의 일정 확인 요청"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert [data["text"] for event, data in events if event == "message"] == [
+        "안녕하세요, ", "회의 일정 ", "확인 부탁드립니다.",
+    ]
+    assert events[-1] == ("done", {})
+    # VBA 파서가 찾는 '"text": "' 형식
+    assert '"text": "' in response.text
+
+
+def test_generate_email_stream_error(client):
+    """스트리밍 중 에러는 error 이벤트로 전송"""
+    test_client, mock_gen = client
+
+    async def failing_stream(request):
+        yield "일부 "
+        raise Exception("API 호출 실패")
+
+    mock_gen.generate_stream = failing_stream
+
+    response = test_client.post(
+        "/api/generate-email/stream",
+        json={"full_body": "<p>본문</p>", "selected_text": "키워드"},
+    )
+
+    events = _parse_sse(response.text)
+    assert events[0] == ("message", {"text": "일부 "})
+    assert events[-1][0] == "error"
+    assert "API 호출 실패" in events[-1][1]["error_message"]
+
+
+def test_cache_stats_disabled(client):
+    """GET /api/cache/stats 캐시 비활성화 시"""
+    test_client, mock_gen = client
+    mock_gen.cache = None
+
+    response = test_client.get("/api/cache/stats")
+
+    assert response.status_code == 200
+    assert response.json() == {"enabled": False}
+
+
+def test_lifespan_warms_up_and_keeps_alive(client, settings):
+    """서버 시작 후 백그라운드에서 연결 예열, 이후 주기적 keep-alive"""
+    test_client, mock_gen = client
+    mock_gen.gemini_client.warm_up = AsyncMock(return_value=0.01)
+    lifespan_settings = settings.model_copy(
+        update={"warmup_on_startup": True, "keepalive_interval": 0.01}
+    )
+
+    with patch("email_writer.server.settings", lifespan_settings):
+        with test_client:
+            # 초기화/예열은 백그라운드 작업이므로 keep-alive가 한 번 더 실행될 때까지 대기
+            for _ in range(200):
+                if mock_gen.gemini_client.warm_up.await_count >= 2:
+                    break
+                time.sleep(0.01)
+            assert mock_gen.gemini_client.warm_up.await_count >= 2
+
+
+def test_lifespan_warm_up_failure_does_not_block_startup(client, settings):
+    """예열 실패(네트워크 오류 등)에도 서버는 정상 시작"""
+    test_client, mock_gen = client
+    mock_gen.gemini_client.warm_up = AsyncMock(side_effect=ConnectionError("offline"))
+    lifespan_settings = settings.model_copy(
+        update={"warmup_on_startup": True, "keepalive_interval": 0}
+    )
+
+    with patch("email_writer.server.settings", lifespan_settings):
+        with test_client:
+            assert test_client.get("/api/health").status_code == 200
+
+
+def test_health_answers_before_initialization(client):
+    """초기화가 끝나기 전에도 /api/health는 즉시 응답하고 /api/ready는 503"""
+    import email_writer.server as server
+
+    test_client, mock_gen = client
+    release = threading.Event()
+
+    def slow_initialize():
+        release.wait(timeout=5)
+        server.generator = mock_gen
+
+    with patch.object(server, "generator", None), \
+            patch.object(server, "_initialize", slow_initialize):
+        with test_client:
+            assert test_client.get("/api/health").json() == {"status": "ok"}
+            assert test_client.get("/api/ready").status_code == 503
+
+            release.set()
+            for _ in range(100):
+                if test_client.get("/api/ready").status_code == 200:
+                    break
+                time.sleep(0.01)
+            assert test_client.get("/api/ready").json() == {"ready": True}
+
+
+def test_initialization_failure_reported(client):
+    """초기화 실패 시 /api/ready에 에러를 표시하고 생성 요청은 실패 응답"""
+    import email_writer.server as server
+
+    test_client, _ = client
+
+    with patch.object(server, "generator", None), \
+            patch("email_writer.config.Settings", side_effect=ValueError("API 키 없음")), \
+            patch.object(server, "settings", None):
+        response = test_client.post(
+            "/api/generate-email",
+            json={"full_body": "", "selected_text": "요지"},
+        )
+        ready = test_client.get("/api/ready")
+
+    assert response.json()["success"] is False
+    assert "API 키 없음" in response.json()["error_message"]
+    assert ready.status_code == 503
+    assert ready.json() == {"ready": False, "error": "API 키 없음"}
+
+
+@pytest.mark.parametrize("path", ["/api/cache/stats", "/api/metrics", "/api/coalescing/stats"])
+def test_stats_unavailable_when_initialization_failed(client, path):
+    """초기화 실패 시 통계 엔드포인트는 500 대신 503과 에러 표시"""
+    import email_writer.server as server
+
+    test_client, _ = client
+
+    with patch.object(server, "generator", None), \
+            patch.object(server, "_init_error", "API 키 없음"):
+        response = test_client.get(path)
+
+    assert response.status_code == 503
+    assert response.json() == {"ready": False, "error": "API 키 없음"}
+
+
+def test_coalescing_stats(client):
+    """GET /api/coalescing/stats"""
+    test_client, mock_gen = client
+    mock_gen.flights.stats.return_value = {"calls": 3, "coalesced": 7, "in_flight": 0}
+
+    response = test_client.get("/api/coalescing/stats")
+
+    assert response.json() == {"enabled": True, "calls": 3, "coalesced": 7, "in_flight": 0}
+
+
+def test_metrics_prometheus_format(client):
+    """GET /api/metrics"""
+    from email_writer.core.metrics import GenerationMetrics
+
+    test_client, mock_gen = client
+    mock_gen.metrics = GenerationMetrics()
+    mock_gen.metrics.observe_stage("model", 0.3)
+
+    response = test_client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'email_writer_stage_seconds_count{stage="model"} 1' in response.text
+
+
+def test_server_timing_header(client, settings):
+    """server_timing_header가 켜져 있으면 단계별 소요 시간을 헤더로 반환"""
+    from email_writer.core.metrics import GenerationMetrics
+
+    test_client, mock_gen = client
+    metrics = GenerationMetrics()
+
+    async def generate(request):
+        metrics.observe_stage("html_to_text", 0.002)
+        metrics.observe_stage("model", 0.5)
+        return "본문"
+
+    mock_gen.generate_async.side_effect = generate
+    payload = {"full_body": "<p>본문</p>", "selected_text": "키워드"}
+
+    assert "server-timing" not in test_client.post("/api/generate-email", json=payload).headers
+
+    timing_settings = settings.model_copy(update={"server_timing_header": True})
+    with patch("email_writer.server.settings", timing_settings):
+        response = test_client.post("/api/generate-email", json=payload)
+
+    assert response.headers["server-timing"] == "html_to_text;dur=2.0, model;dur=500.0"
+
+
+def test_generate_email_candidates(client):
+    """POST /api/generate-email/candidates"""
+    test_client, mock_gen = client
+    mock_gen.generate_candidates_async = AsyncMock(return_value=["초안 1", "초안 2"])
+
+    response = test_client.post(
+        "/api/generate-email/candidates",
+        json={"full_body": "<p>본문</p>", "selected_text": "키워드", "candidate_count": 2},
+    )
+
+    assert response.json() == {
+        "success": True, "candidates": ["초안 1", "초안 2"], "error_message": None
+    }
+    assert mock_gen.generate_candidates_async.await_args.args[1] == 2
+
+
+def test_generate_email_batch_per_item_errors(client):
+    """POST /api/generate-email/batch 항목별 성공/실패를 요청 순서대로 반환"""
+    test_client, mock_gen = client
+    mock_gen.generate_batch_async = AsyncMock(return_value=["첫 번째", RuntimeError("실패")])
+    item = {"full_body": "<p>본문</p>", "selected_text": "키워드"}
+
+    response = test_client.post("/api/generate-email/batch", json={"requests": [item, item]})
+
+    data = response.json()
+    assert data["success"] is True
+    assert data["results"][0] == {
+        "success": True, "generated_text": "첫 번째", "error_message": None
+    }
+    assert data["results"][1]["success"] is False
+    assert data["results"][1]["error_message"] == "실패"
+
+
+def test_generate_email_batch_too_large(client):
+    test_client, _mock_gen = client
+    item = {"full_body": "", "selected_text": "키워드"}
+
+    response = test_client.post("/api/generate-email/batch", json={"requests": [item] * 21})
+
+    assert response.json()["success"] is False
+    assert "최대 20건" in response.json()["error_message"]
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from email_writer.core.single_flight import SingleFlight
+
+
+class _Source:
+    """호출 횟수를 세는 스트리밍 소스"""
+
+    def __init__(self, chunks=("안녕", "하세요"), delay=0.01, error=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+        if self.error is not None:
+            raise self.error
+
+
+class TestSingleFlight:
+    """SingleFlight 요청 합치기 테스트"""
+
+    def test_concurrent_calls_share_one_source(self):
+        flights = SingleFlight()
+        source = _Source()
+
+        async def run_all():
+            return await asyncio.gather(*(flights.run("key", source) for _ in range(5)))
+
+        assert asyncio.run(run_all()) == ["안녕하세요"] * 5
+        assert source.calls == 1
+        assert flights.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_different_keys_not_shared(self):
+        flights = SingleFlight()
+        source = _Source()
+
+        async def run_all():
+            return await asyncio.gather(flights.run("a", source), flights.run("b", source))
+
+        asyncio.run(run_all())
+
+        assert source.calls == 2
+        assert flights.coalesced == 0
+
+    def test_late_stream_subscriber_receives_all_chunks(self):
+        flights = SingleFlight()
+        source = _Source(chunks=("1", "2", "3"))
+
+        async def scenario():
+            first = flights.stream("key", source)
+            received = [await first.__anext__()]
+            # 첫 조각이 도착한 뒤 합류해도 처음부터 받음
+            late = [chunk async for chunk in flights.stream("key", source)]
+            received += [chunk async for chunk in first]
+            return received, late
+
+        received, late = asyncio.run(scenario())
+
+        assert received == ["1", "2", "3"]
+        assert late == ["1", "2", "3"]
+        assert source.calls == 1
+
+    def test_error_propagates_to_all_subscribers(self):
+        flights = SingleFlight()
+        source = _Source(error=RuntimeError("quota exceeded"))
+
+        async def run_all():
+            return await asyncio.gather(
+                *(flights.run("key", source) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(run_all())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert source.calls == 1
+        assert flights.stats()["in_flight"] == 0
+
+    def test_sequential_calls_not_coalesced(self):
+        """완료된 호출은 바로 해제되어 다음 요청은 새로 호출"""
+        flights = SingleFlight()
+        source = _Source()
+
+        async def run_twice():
+            await flights.run("key", source)
+            await flights.run("key", source)
+
+        asyncio.run(run_twice())
+
+        assert source.calls == 2
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        """처음 요청한 쪽이 끊겨도 합류한 요청은 결과를 받음"""
+        flights = SingleFlight()
+        source = _Source(delay=0.02)
+
+        async def scenario():
+            leader = asyncio.create_task(flights.run("key", source))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flights.run("key", source))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(scenario()) == "안녕하세요"
+        assert source.calls == 1
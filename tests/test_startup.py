@@ -0,0 +1,22 @@
+"""서버 시작 시간 회귀 테스트 (새 프로세스에서 측정)"""
+from benchmarks.bench_startup import measure_first_health, measure_import
+
+# 프로세스 시작 시간 편차를 줄이기 위한 반복 측정 횟수 (최솟값끼리 비교)
+REPEAT = 3
+
+
+def test_server_import_is_light():
+    """서버 모듈 import 시 google-genai 등 무거운 모듈을 로드하지 않음"""
+    lazy = [measure_import() for _ in range(REPEAT)]
+    eager = [measure_import(eager=True) for _ in range(REPEAT)]
+
+    assert all(result["heavy_modules"] == [] for result in lazy)
+    # 무거운 모듈을 함께 import할 때보다 빨라야 함 (모듈 최상단으로 돌아오면 차이가 사라짐)
+    assert min(r["seconds"] for r in lazy) < min(r["seconds"] for r in eager)
+
+
+def test_first_health_response_time():
+    """uvicorn 실행 후 헬스체크 첫 응답이 준비 완료보다 먼저 옴"""
+    result = measure_first_health()
+
+    assert 0 < result["health_seconds"] <= result["ready_seconds"]
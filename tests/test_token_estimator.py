@@ -0,0 +1,52 @@
+from email_writer.core.token_estimator import TokenEstimator
+
+
+class TestTokenEstimator:
+    """토큰 추정기 테스트"""
+
+    def test_weights_by_character_class(self):
+        estimator = TokenEstimator()
+
+        assert estimator.estimate("abcd" * 10) == 10
+        assert estimator.estimate("가나다라마") == 3
+        assert estimator.estimate("") == 0
+
+    def test_estimate_is_additive(self):
+        estimator = TokenEstimator(scale=1.3)
+        left, right = "안녕하세요 Kim님, ", "회의 일정은 3/14 (금) 입니다."
+
+        combined = estimator.weigh(left) + estimator.weigh(right)
+
+        assert abs(estimator.weigh(left + right) - combined) < 1e-9
+
+    def test_truncate_fits_budget(self):
+        estimator = TokenEstimator()
+        text = "견적 검토 부탁드립니다. " * 200
+
+        truncated = estimator.truncate(text, 50)
+
+        assert text.startswith(truncated)
+        assert estimator.weigh(truncated) <= 50
+        assert estimator.weigh(text[: len(truncated) + 1]) > 50
+        assert estimator.truncate(text, 0) == ""
+        assert estimator.truncate("짧음", 50) == "짧음"
+
+    def test_calibrate_matches_counter(self):
+        estimator = TokenEstimator()
+        samples = ["a" * 400, "가" * 100]
+
+        # 실제 토큰 수가 기본 추정치의 2배인 모델
+        scale = estimator.calibrate(samples, lambda text: 2 * TokenEstimator().estimate(text))
+
+        assert scale == 2.0
+        assert estimator.estimate("a" * 400) == 200
+
+    def test_save_and_load_per_model(self, tmp_path):
+        path = tmp_path / "calibration.json"
+        TokenEstimator(scale=1.5).save(path, "gemini-2.5-flash")
+        TokenEstimator(scale=0.8).save(path, "gemini-2.5-pro")
+
+        assert TokenEstimator.load(path, "gemini-2.5-flash").scale == 1.5
+        assert TokenEstimator.load(path, "gemini-2.5-pro").scale == 0.8
+        assert TokenEstimator.load(path, "other-model").scale == 1.0
+        assert TokenEstimator.load(tmp_path / "missing.json", "gemini-2.5-flash").scale == 1.0